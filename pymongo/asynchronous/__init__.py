@@ -0,0 +1,36 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Asyncio support for PyMongo.
+
+.. versionadded:: 3.9
+
+:class:`~pymongo.asynchronous.mongo_client.AsyncMongoClient` and the
+classes it returns run on an asyncio event loop without threads. They share
+message encoding, reply decoding, server discovery, and server selection
+with :class:`~pymongo.mongo_client.MongoClient`.
+
+Requires Python 3.5.2+. This package is not installed on older versions of
+Python.
+"""
+
+import sys
+
+if sys.version_info[:3] < (3, 5, 2):
+    raise ImportError("pymongo.asynchronous requires Python 3.5.2+")
+
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.cursor import AsyncCommandCursor, AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.mongo_client import AsyncMongoClient
@@ -0,0 +1,419 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Asyncio collection level operations."""
+
+from itertools import islice
+
+from bson.objectid import ObjectId
+from bson.py3compat import string_type
+from bson.raw_bson import RawBSONDocument
+from bson.son import SON
+from pymongo import common, helpers
+from pymongo.asynchronous.cursor import AsyncCommandCursor, AsyncCursor
+from pymongo.bulk import (_merge_command,
+                          _raise_bulk_write_error,
+                          _Run,
+                          _COMMANDS,
+                          _DELETE_ALL,
+                          _DELETE_ONE)
+from pymongo.collation import validate_collation_or_none
+from pymongo.errors import InvalidName, InvalidOperation
+from pymongo.message import (_do_bulk_write_command,
+                             _randint,
+                             _BulkWriteContext,
+                             _INSERT)
+from pymongo.read_preferences import ReadPreference
+from pymongo.results import (DeleteResult,
+                             InsertManyResult,
+                             InsertOneResult,
+                             UpdateResult)
+from pymongo.server_selectors import writable_server_selector
+
+
+class AsyncCollection(common.BaseObject):
+    """An asyncio collection, the counterpart of
+    :class:`~pymongo.collection.Collection`.
+
+    Get instances from an :class:`~pymongo.asynchronous.database.AsyncDatabase`
+    with ``db.name`` or ``db['name']``. Methods that do I/O are coroutines.
+    """
+
+    def __init__(self, database, name, codec_options=None,
+                 read_preference=None, write_concern=None, read_concern=None):
+        super(AsyncCollection, self).__init__(
+            codec_options or database.codec_options,
+            read_preference or database.read_preference,
+            write_concern or database.write_concern,
+            read_concern or database.read_concern)
+
+        if not isinstance(name, string_type):
+            raise TypeError("name must be an instance "
+                            "of %s" % (string_type.__name__,))
+
+        if not name or ".." in name:
+            raise InvalidName("collection names cannot be empty")
+        if "$" in name and not (name.startswith("oplog.$main") or
+                                name.startswith("$cmd")):
+            raise InvalidName("collection names must not "
+                              "contain '$': %r" % name)
+        if name[0] == "." or name[-1] == ".":
+            raise InvalidName("collection names must not start "
+                              "or end with '.': %r" % name)
+        if "\x00" in name:
+            raise InvalidName("collection names must not contain the "
+                              "null character")
+
+        self.__database = database
+        self.__name = name
+        self.__full_name = "%s.%s" % (database.name, name)
+        self.__write_response_codec_options = self.codec_options._replace(
+            unicode_decode_error_handler='replace',
+            document_class=dict)
+
+    def __getattr__(self, name):
+        """Get a sub-collection of this collection by name."""
+        if name.startswith('_'):
+            full_name = "%s.%s" % (self.__name, name)
+            raise AttributeError(
+                "AsyncCollection has no attribute %r. To access the %s"
+                " collection, use database['%s']." % (
+                    name, full_name, full_name))
+        return self.__getitem__(name)
+
+    def __getitem__(self, name):
+        return AsyncCollection(self.__database,
+                               "%s.%s" % (self.__name, name),
+                               self.codec_options,
+                               self.read_preference,
+                               self.write_concern,
+                               self.read_concern)
+
+    def __repr__(self):
+        return "AsyncCollection(%r, %r)" % (self.__database, self.__name)
+
+    def __eq__(self, other):
+        if isinstance(other, AsyncCollection):
+            return (self.__database == other.database and
+                    self.__name == other.name)
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
+
+    @property
+    def full_name(self):
+        """The full name of this collection, `database_name.name`."""
+        return self.__full_name
+
+    @property
+    def name(self):
+        """The name of this collection."""
+        return self.__name
+
+    @property
+    def database(self):
+        """The :class:`~pymongo.asynchronous.database.AsyncDatabase` this
+        collection is a part of."""
+        return self.__database
+
+    def with_options(self, codec_options=None, read_preference=None,
+                     write_concern=None, read_concern=None):
+        """Get a clone of this collection changing the specified settings."""
+        return AsyncCollection(self.__database,
+                               self.__name,
+                               codec_options or self.codec_options,
+                               read_preference or self.read_preference,
+                               write_concern or self.write_concern,
+                               read_concern or self.read_concern)
+
+    async def _write_command(self, command, bypass_doc_val=False,
+                             check_keys=False):
+        """Run a single insert, update, or delete command on the primary.
+
+        Returns the reply, or None if the write is unacknowledged.
+        """
+        acknowledged = self.write_concern.acknowledged
+        if not self.write_concern.is_server_default:
+            command['writeConcern'] = self.write_concern.document
+
+        async def write(conn, slave_ok):
+            if bypass_doc_val and conn.max_wire_version >= 4:
+                command['bypassDocumentValidation'] = True
+            return await conn.command(
+                self.__database.name, command,
+                codec_options=self.__write_response_codec_options,
+                check_keys=check_keys, unacknowledged=not acknowledged,
+                client=self.__database.client)
+
+        _, result = await self.__database.client._run_on_server(
+            writable_server_selector, write)
+        helpers._check_write_command_response(result)
+        if not acknowledged:
+            return None
+        return result
+
+    async def _write_batches(self, run, ordered, bypass_doc_val):
+        """Send the operations in `run` to the primary, split into as few
+        write commands as the server's size limits allow.
+
+        Returns the bulk API result.
+        """
+        client = self.__database.client
+        write_concern = self.write_concern
+        command = SON([(_COMMANDS[run.op_type], self.__name),
+                       ('ordered', ordered)])
+        if not write_concern.is_server_default:
+            command['writeConcern'] = write_concern.document
+        full_result = {
+            "writeErrors": [],
+            "writeConcernErrors": [],
+            "nInserted": 0,
+            "nUpserted": 0,
+            "nMatched": 0,
+            "nModified": 0,
+            "nRemoved": 0,
+            "upserted": [],
+        }
+
+        async def write(conn, slave_ok):
+            if bypass_doc_val and conn.max_wire_version >= 4:
+                command['bypassDocumentValidation'] = True
+            ctx = _BulkWriteContext(self.__database.name, command, conn,
+                                    _randint(), client._event_listeners,
+                                    None)
+            while run.idx_offset < len(run.ops):
+                request_id, msg, to_send = _do_bulk_write_command(
+                    self.__database.name + '.$cmd', run.op_type, command,
+                    islice(run.ops, run.idx_offset, None),
+                    run.op_type == _INSERT, self.codec_options, ctx)
+                if not to_send:
+                    raise InvalidOperation("cannot do an empty bulk write")
+                result = await conn.write_command(
+                    request_id, msg, ctx, to_send,
+                    write_concern.acknowledged)
+                if result is not None:
+                    client._process_response(result)
+                    _merge_command(run, full_result, run.idx_offset, result)
+                    if ordered and "writeErrors" in result:
+                        break
+                run.idx_offset += len(to_send)
+
+        await client._run_on_server(writable_server_selector, write)
+        if full_result["writeErrors"] or full_result["writeConcernErrors"]:
+            _raise_bulk_write_error(full_result)
+        return full_result
+
+    async def insert_one(self, document, bypass_document_validation=False):
+        """Insert a single document.
+
+        Returns an instance of :class:`~pymongo.results.InsertOneResult`.
+        """
+        common.validate_is_document_type("document", document)
+        if not (isinstance(document, RawBSONDocument) or "_id" in document):
+            document["_id"] = ObjectId()
+        command = SON([('insert', self.__name),
+                       ('ordered', True),
+                       ('documents', [document])])
+        await self._write_command(command, bypass_document_validation,
+                                  check_keys=True)
+        return InsertOneResult(document.get("_id"),
+                               self.write_concern.acknowledged)
+
+    async def insert_many(self, documents, ordered=True,
+                          bypass_document_validation=False):
+        """Insert an iterable of documents.
+
+        Large inserts are split into several insert commands on one
+        connection, like :meth:`pymongo.collection.Collection.insert_many`.
+        Returns an instance of :class:`~pymongo.results.InsertManyResult`.
+        """
+        if (not isinstance(documents, common.abc.Iterable)
+                or isinstance(documents, common.abc.Mapping)
+                or not documents):
+            raise TypeError("documents must be a non-empty list")
+        inserted_ids = []
+        run = _Run(_INSERT)
+        for index, document in enumerate(documents):
+            common.validate_is_document_type("document", document)
+            if not isinstance(document, RawBSONDocument):
+                if "_id" not in document:
+                    document["_id"] = ObjectId()
+                inserted_ids.append(document["_id"])
+            run.add(index, document)
+        await self._write_batches(run, ordered, bypass_document_validation)
+        return InsertManyResult(inserted_ids,
+                                self.write_concern.acknowledged)
+
+    async def _update(self, filter, document, upsert, multi,
+                      bypass_document_validation, collation=None,
+                      array_filters=None):
+        common.validate_is_mapping("filter", filter)
+        common.validate_boolean("upsert", upsert)
+        update_doc = SON([('q', filter),
+                          ('u', document),
+                          ('multi', multi),
+                          ('upsert', upsert)])
+        collation = validate_collation_or_none(collation)
+        if collation is not None:
+            update_doc['collation'] = collation
+        if array_filters is not None:
+            update_doc['arrayFilters'] = array_filters
+        command = SON([('update', self.__name),
+                       ('ordered', True),
+                       ('updates', [update_doc])])
+        result = await self._write_command(
+            command, bypass_document_validation)
+        if result is not None:
+            # The command result has to be published for APM unmodified
+            # so we make a shallow copy here.
+            result = result.copy()
+            # MongoDB >= 2.6.0 returns the upsert _id in an array
+            # element. Break it out for backward compatibility.
+            if 'upserted' in result:
+                result['upserted'] = result['upserted'][0]['_id']
+        return UpdateResult(result, self.write_concern.acknowledged)
+
+    async def replace_one(self, filter, replacement, upsert=False,
+                          bypass_document_validation=False, collation=None):
+        """Replace a single document matching the filter.
+
+        Returns an instance of :class:`~pymongo.results.UpdateResult`.
+        """
+        common.validate_ok_for_replace(replacement)
+        return await self._update(filter, replacement, upsert, False,
+                                  bypass_document_validation, collation)
+
+    async def update_one(self, filter, update, upsert=False,
+                         bypass_document_validation=False, collation=None,
+                         array_filters=None):
+        """Update a single document matching the filter.
+
+        Returns an instance of :class:`~pymongo.results.UpdateResult`.
+        """
+        common.validate_ok_for_update(update)
+        common.validate_list_or_none('array_filters', array_filters)
+        return await self._update(filter, update, upsert, False,
+                                  bypass_document_validation, collation,
+                                  array_filters)
+
+    async def update_many(self, filter, update, upsert=False,
+                          bypass_document_validation=False, collation=None,
+                          array_filters=None):
+        """Update one or more documents that match the filter.
+
+        Returns an instance of :class:`~pymongo.results.UpdateResult`.
+        """
+        common.validate_ok_for_update(update)
+        common.validate_list_or_none('array_filters', array_filters)
+        return await self._update(filter, update, upsert, True,
+                                  bypass_document_validation, collation,
+                                  array_filters)
+
+    async def _delete(self, filter, limit, collation=None):
+        common.validate_is_mapping("filter", filter)
+        delete_doc = SON([('q', filter), ('limit', limit)])
+        collation = validate_collation_or_none(collation)
+        if collation is not None:
+            delete_doc['collation'] = collation
+        command = SON([('delete', self.__name),
+                       ('ordered', True),
+                       ('deletes', [delete_doc])])
+        result = await self._write_command(command)
+        return DeleteResult(result, self.write_concern.acknowledged)
+
+    async def delete_one(self, filter, collation=None):
+        """Delete a single document matching the filter.
+
+        Returns an instance of :class:`~pymongo.results.DeleteResult`.
+        """
+        return await self._delete(filter, _DELETE_ONE, collation)
+
+    async def delete_many(self, filter, collation=None):
+        """Delete one or more documents matching the filter.
+
+        Returns an instance of :class:`~pymongo.results.DeleteResult`.
+        """
+        return await self._delete(filter, _DELETE_ALL, collation)
+
+    def find(self, *args, **kwargs):
+        """Query the collection. Takes the same arguments as
+        :class:`~pymongo.asynchronous.cursor.AsyncCursor`.
+
+        Does no I/O: returns an
+        :class:`~pymongo.asynchronous.cursor.AsyncCursor` which sends the
+        query when it is first iterated::
+
+          async for doc in collection.find({'x': 1}).sort('y'):
+              print(doc)
+        """
+        return AsyncCursor(self, *args, **kwargs)
+
+    async def find_one(self, filter=None, *args, **kwargs):
+        """Get a single document from the database, or None."""
+        if (filter is not None and not
+                isinstance(filter, common.abc.Mapping)):
+            filter = {"_id": filter}
+        cursor = self.find(filter, *args, **kwargs).limit(-1)
+        documents = await cursor.to_list(1)
+        if documents:
+            return documents[0]
+        return None
+
+    async def aggregate(self, pipeline, batch_size=0, **kwargs):
+        """Run an aggregation pipeline.
+
+        Returns an :class:`~pymongo.asynchronous.cursor.AsyncCommandCursor`
+        over the results. Pipelines ending in ``$out`` or ``$merge`` are
+        sent to the primary.
+        """
+        common.validate_list('pipeline', pipeline)
+        cursor = {}
+        if batch_size:
+            cursor['batchSize'] = batch_size
+        cmd = SON([('aggregate', self.__name),
+                   ('pipeline', pipeline),
+                   ('cursor', cursor)])
+        cmd.update(kwargs)
+        read_preference = self.read_preference
+        if pipeline and ('$out' in pipeline[-1] or '$merge' in pipeline[-1]):
+            read_preference = ReadPreference.PRIMARY
+        elif self.read_concern.level:
+            cmd['readConcern'] = self.read_concern.document
+        address, response = await self.__database.client._run_command(
+            self.__database.name, cmd, read_preference,
+            codec_options=self.codec_options,
+            user_fields={'cursor': {'firstBatch': 1}})
+        return AsyncCommandCursor(self, response, address, batch_size)
+
+    async def count_documents(self, filter, **kwargs):
+        """Count the number of documents in this collection, like
+        :meth:`pymongo.collection.Collection.count_documents`."""
+        pipeline = [{'$match': filter}]
+        if 'skip' in kwargs:
+            pipeline.append({'$skip': kwargs.pop('skip')})
+        if 'limit' in kwargs:
+            pipeline.append({'$limit': kwargs.pop('limit')})
+        pipeline.append({'$group': {'_id': 1, 'n': {'$sum': 1}}})
+        if "hint" in kwargs and not isinstance(kwargs["hint"], string_type):
+            kwargs["hint"] = helpers._index_document(kwargs["hint"])
+        cursor = await self.aggregate(pipeline, **kwargs)
+        result = await cursor.to_list(1)
+        if not result:
+            return 0
+        return result[0]['n']
+
+    async def drop(self):
+        """Drop this collection."""
+        await self.__database.drop_collection(self.__name)
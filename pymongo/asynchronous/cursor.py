@@ -0,0 +1,282 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Asyncio cursors over query and command results."""
+
+import collections
+
+from bson.py3compat import integer_types
+from bson.son import SON
+from pymongo import helpers
+from pymongo.collation import validate_collation_or_none
+from pymongo.common import validate_is_mapping
+from pymongo.errors import InvalidOperation
+from pymongo.message import _gen_find_command, _gen_get_more_command
+from pymongo.server import _CURSOR_DOC_FIELDS
+
+
+class _AsyncCursorBase(object):
+    """Iteration, getMore, and killCursors shared by the asyncio cursors."""
+
+    def __init__(self, collection, batch_size=0):
+        self._collection = collection
+        self._collection_name = collection.name
+        self._batch_size = batch_size
+        self._id = None
+        self._address = None
+        self._data = collections.deque()
+        self._killed = False
+
+    @property
+    def collection(self):
+        """The :class:`~pymongo.asynchronous.collection.AsyncCollection` this
+        cursor iterates."""
+        return self._collection
+
+    @property
+    def alive(self):
+        """Does this cursor have the potential to return more data?"""
+        return bool(self._data) or not self._killed
+
+    @property
+    def cursor_id(self):
+        """Returns the id of the cursor, or None before the first batch."""
+        return self._id
+
+    @property
+    def address(self):
+        """The (host, port) of the server used, or None before the first
+        batch."""
+        return self._address
+
+    async def _initial_batch(self):
+        raise NotImplementedError
+
+    def _update(self, response, batch_field):
+        cursor_info = response['cursor']
+        if 'ns' in cursor_info:
+            # Command cursors, like listCollections, may name another
+            # collection than the one they were run on.
+            self._collection_name = cursor_info['ns'].split('.', 1)[1]
+        self._id = cursor_info['id']
+        self._data.extend(cursor_info[batch_field])
+        if not self._id:
+            self._killed = True
+
+    async def _refresh(self):
+        """Get the next batch of results if the buffer is empty.
+
+        Returns the number of documents buffered.
+        """
+        if self._data or self._killed:
+            return len(self._data)
+        if self._id is None:
+            await self._initial_batch()
+            return len(self._data)
+
+        coll = self._collection
+        cmd = _gen_get_more_command(self._id, self._collection_name,
+                                    self._batch_size, None)
+        try:
+            _, response = await coll.database.client._run_command(
+                coll.database.name, cmd, coll.read_preference,
+                codec_options=coll.codec_options,
+                user_fields=_CURSOR_DOC_FIELDS, address=self._address)
+        except BaseException:
+            self._killed = True
+            raise
+        self._update(response, 'nextBatch')
+        return len(self._data)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._data and not self._killed:
+            await self._refresh()
+        if self._data:
+            return self._data.popleft()
+        raise StopAsyncIteration
+
+    async def next(self):
+        """Advance the cursor, or raise :exc:`StopAsyncIteration`."""
+        return await self.__anext__()
+
+    async def to_list(self, length=None):
+        """Get a list of up to `length` documents, or of all documents if
+        `length` is None.
+        """
+        if length is not None and length < 0:
+            raise ValueError("length must be non-negative")
+        result = []
+        while length is None or len(result) < length:
+            if not self._data and not self._killed:
+                await self._refresh()
+            if not self._data:
+                break
+            result.append(self._data.popleft())
+        return result
+
+    async def close(self):
+        """Kill the cursor on the server if it is still open."""
+        cursor_id, self._killed = self._id, True
+        self._data.clear()
+        if cursor_id:
+            coll = self._collection
+            cmd = SON([('killCursors', self._collection_name),
+                       ('cursors', [cursor_id])])
+            await coll.database.client._run_command(
+                coll.database.name, cmd, coll.read_preference,
+                address=self._address)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class AsyncCommandCursor(_AsyncCursorBase):
+    """An asyncio cursor over the result of a command like aggregate.
+
+    Should not be called directly by application developers - see
+    :meth:`~pymongo.asynchronous.collection.AsyncCollection.aggregate`
+    instead.
+    """
+
+    def __init__(self, collection, response, address, batch_size=0):
+        super(AsyncCommandCursor, self).__init__(collection, batch_size)
+        self._address = address
+        self._update(response, 'firstBatch')
+
+
+class AsyncCursor(_AsyncCursorBase):
+    """An asyncio cursor over the result of a find.
+
+    Should not be called directly by application developers - see
+    :meth:`~pymongo.asynchronous.collection.AsyncCollection.find` instead.
+    The query is sent when the cursor is first iterated, until then it can
+    be modified like a :class:`~pymongo.cursor.Cursor`.
+    """
+
+    def __init__(self, collection, filter=None, projection=None, skip=0,
+                 limit=0, sort=None, batch_size=0, hint=None,
+                 max_time_ms=None, collation=None):
+        super(AsyncCursor, self).__init__(collection)
+        if filter is not None:
+            validate_is_mapping("filter", filter)
+        if projection is not None:
+            projection = helpers._fields_list_to_dict(projection, "projection")
+        self.__filter = filter or {}
+        self.__projection = projection
+        self.__sort = None
+        self.__hint = None
+        self.__max_time_ms = None
+        self.__collation = validate_collation_or_none(collation)
+        self.__skip = 0
+        self.__limit = 0
+        self.skip(skip)
+        self.limit(limit)
+        self.batch_size(batch_size)
+        if sort is not None:
+            self.sort(sort)
+        if hint is not None:
+            self.hint(hint)
+        if max_time_ms is not None:
+            self.max_time_ms(max_time_ms)
+
+    def __check_okay_to_chain(self):
+        """Check if it is okay to chain more options onto this cursor."""
+        if self._id is not None:
+            raise InvalidOperation("cannot set options after executing query")
+
+    def skip(self, skip):
+        """Skips the first `skip` results of this cursor."""
+        if not isinstance(skip, integer_types):
+            raise TypeError("skip must be an integer")
+        if skip < 0:
+            raise ValueError("skip must be >= 0")
+        self.__check_okay_to_chain()
+        self.__skip = skip
+        return self
+
+    def limit(self, limit):
+        """Limits the number of results to be returned by this cursor."""
+        if not isinstance(limit, integer_types):
+            raise TypeError("limit must be an integer")
+        self.__check_okay_to_chain()
+        self.__limit = limit
+        return self
+
+    def batch_size(self, batch_size):
+        """Limits the number of documents returned in one batch."""
+        if not isinstance(batch_size, integer_types):
+            raise TypeError("batch_size must be an integer")
+        if batch_size < 0:
+            raise ValueError("batch_size must be >= 0")
+        self.__check_okay_to_chain()
+        self._batch_size = batch_size
+        return self
+
+    def sort(self, key_or_list, direction=None):
+        """Sorts this cursor's results, like
+        :meth:`pymongo.cursor.Cursor.sort`."""
+        self.__check_okay_to_chain()
+        keys = helpers._index_list(key_or_list, direction)
+        self.__sort = helpers._index_document(keys)
+        return self
+
+    def hint(self, index):
+        """Adds a 'hint', telling Mongo the proper index to use for the
+        query."""
+        self.__check_okay_to_chain()
+        if isinstance(index, str):
+            self.__hint = index
+        else:
+            self.__hint = helpers._index_document(index)
+        return self
+
+    def max_time_ms(self, max_time_ms):
+        """Specifies a time limit for the query in milliseconds."""
+        if (not isinstance(max_time_ms, integer_types)
+                and max_time_ms is not None):
+            raise TypeError("max_time_ms must be an integer or None")
+        self.__check_okay_to_chain()
+        self.__max_time_ms = max_time_ms
+        return self
+
+    async def _initial_batch(self):
+        coll = self._collection
+        cmd = _gen_find_command(
+            coll.name, self.__filter, self.__projection, self.__skip,
+            self.__limit, self._batch_size, 0, coll.read_concern,
+            self.__collation)
+        if self.__sort:
+            cmd['sort'] = self.__sort
+        if self.__hint:
+            cmd['hint'] = self.__hint
+        if self.__max_time_ms is not None:
+            cmd['maxTimeMS'] = self.__max_time_ms
+        try:
+            self._address, response = await coll.database.client._run_command(
+                coll.database.name, cmd, coll.read_preference,
+                codec_options=coll.codec_options,
+                user_fields=_CURSOR_DOC_FIELDS)
+        except BaseException:
+            self._killed = True
+            raise
+        self._update(response, 'firstBatch')
+        if self.__limit < 0:
+            # A negative limit means a single batch.
+            self._killed = True
@@ -0,0 +1,143 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Asyncio database level operations."""
+
+from bson.codec_options import DEFAULT_CODEC_OPTIONS
+from bson.py3compat import string_type
+from bson.son import SON
+from pymongo import common
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.cursor import AsyncCommandCursor
+from pymongo.database import _check_name
+from pymongo.read_preferences import ReadPreference
+
+
+class AsyncDatabase(common.BaseObject):
+    """An asyncio database, the counterpart of
+    :class:`~pymongo.database.Database`.
+
+    Get instances from an
+    :class:`~pymongo.asynchronous.mongo_client.AsyncMongoClient` with
+    ``client.name`` or ``client['name']``.
+    """
+
+    def __init__(self, client, name, codec_options=None, read_preference=None,
+                 write_concern=None, read_concern=None):
+        super(AsyncDatabase, self).__init__(
+            codec_options or client.codec_options,
+            read_preference or client.read_preference,
+            write_concern or client.write_concern,
+            read_concern or client.read_concern)
+
+        if not isinstance(name, string_type):
+            raise TypeError("name must be an instance "
+                            "of %s" % (string_type.__name__,))
+
+        if name != '$external':
+            _check_name(name)
+
+        self.__name = name
+        self.__client = client
+
+    @property
+    def client(self):
+        """The client instance for this database."""
+        return self.__client
+
+    @property
+    def name(self):
+        """The name of this database."""
+        return self.__name
+
+    def __eq__(self, other):
+        if isinstance(other, AsyncDatabase):
+            return (self.__client == other.client and
+                    self.__name == other.name)
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "AsyncDatabase(%r, %r)" % (self.__client, self.__name)
+
+    def __getattr__(self, name):
+        """Get a collection of this database by name."""
+        if name.startswith('_'):
+            raise AttributeError(
+                "AsyncDatabase has no attribute %r. To access the %s"
+                " collection, use database[%r]." % (name, name, name))
+        return self.__getitem__(name)
+
+    def __getitem__(self, name):
+        return AsyncCollection(self, name)
+
+    def get_collection(self, name, codec_options=None, read_preference=None,
+                       write_concern=None, read_concern=None):
+        """Get an
+        :class:`~pymongo.asynchronous.collection.AsyncCollection` with the
+        given name and options."""
+        return AsyncCollection(
+            self, name, codec_options, read_preference,
+            write_concern, read_concern)
+
+    async def command(self, command, value=1, check=True,
+                      allowable_errors=None, read_preference=None,
+                      codec_options=DEFAULT_CODEC_OPTIONS, **kwargs):
+        """Issue a MongoDB command, like
+        :meth:`pymongo.database.Database.command`.
+
+        Like the synchronous method, commands are sent to the primary unless
+        a `read_preference` is given.
+        """
+        if isinstance(command, string_type):
+            command = SON([(command, value)])
+        command.update(kwargs)
+        _, response = await self.__client._run_command(
+            self.__name, command, read_preference or ReadPreference.PRIMARY,
+            codec_options=codec_options, check=check,
+            allowable_errors=allowable_errors)
+        return response
+
+    async def list_collection_names(self, filter=None):
+        """Get a list of all the collection names in this database."""
+        cmd = SON([("listCollections", 1), ("cursor", {})])
+        if filter is None:
+            cmd["nameOnly"] = True
+        else:
+            common.validate_is_mapping("filter", filter)
+            cmd["filter"] = filter
+            if not filter or (len(filter) == 1 and "name" in filter):
+                cmd["nameOnly"] = True
+        address, response = await self.__client._run_command(
+            self.__name, cmd, ReadPreference.PRIMARY)
+        cursor = AsyncCommandCursor(self["$cmd"], response, address)
+        return [result["name"] for result in await cursor.to_list()]
+
+    async def drop_collection(self, name_or_collection):
+        """Drop a collection."""
+        name = name_or_collection
+        if isinstance(name, AsyncCollection):
+            name = name.name
+
+        if not isinstance(name, string_type):
+            raise TypeError("name_or_collection must be an "
+                            "instance of %s" % (string_type.__name__,))
+        command = SON([('drop', name)])
+        if not self.write_concern.is_server_default:
+            command['writeConcern'] = self.write_concern.document
+        _, response = await self.__client._run_command(
+            self.__name, command, None, allowable_errors=['ns not found'])
+        return response
@@ -0,0 +1,277 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Tools for connecting to MongoDB from an asyncio event loop."""
+
+import contextlib
+
+from bson.codec_options import DEFAULT_CODEC_OPTIONS
+from bson.py3compat import string_type
+from pymongo import common, helpers, uri_parser
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.topology import AsyncTopology
+from pymongo.client_options import ClientOptions
+from pymongo.errors import (ConfigurationError,
+                            ConnectionFailure,
+                            NetworkTimeout,
+                            NotMasterError,
+                            OperationFailure)
+from pymongo.read_preferences import ReadPreference
+from pymongo.server_selectors import writable_server_selector
+from pymongo.settings import TopologySettings
+from pymongo.topology_description import TOPOLOGY_TYPE
+from pymongo.uri_parser import (_CaseInsensitiveDictionary,
+                                _handle_option_deprecations,
+                                _normalize_options)
+
+
+class AsyncMongoClient(common.BaseObject):
+    """A client for MongoDB for use from an asyncio event loop.
+
+    Takes the same connection string and keyword options as
+    :class:`~pymongo.mongo_client.MongoClient` and reuses its wire protocol
+    encoding, server discovery, and server selection. Connections are
+    asyncio streams and servers are monitored by asyncio tasks, so no
+    threads are involved::
+
+      async def main():
+          client = AsyncMongoClient('mongodb://localhost:27017')
+          await client.test.coll.insert_one({'x': 1})
+          async for doc in client.test.coll.find({'x': 1}):
+              print(doc)
+          client.close()
+
+    No I/O happens until the first operation, so the client can be created
+    outside the event loop, but it must then only be used from one loop.
+
+    Sessions, transactions, change streams, and retryable reads and writes
+    are not supported yet. Only SCRAM authentication is supported. Cursors
+    require MongoDB 3.2+. With ``outlierDetection``, servers are ejected for
+    errors but not for latency.
+
+    .. versionadded:: 3.9
+    """
+
+    HOST = "localhost"
+    PORT = 27017
+
+    def __init__(self, host=None, port=None, document_class=dict,
+                 tz_aware=None, type_registry=None, **kwargs):
+        if host is None:
+            host = self.HOST
+        if isinstance(host, string_type):
+            host = [host]
+        if port is None:
+            port = self.PORT
+        if not isinstance(port, int):
+            raise TypeError("port must be an instance of int")
+
+        seeds = set()
+        username = None
+        password = None
+        dbase = None
+        opts = {}
+        for entity in host:
+            if "://" in entity:
+                res = uri_parser.parse_uri(
+                    entity, port, validate=True, warn=True)
+                seeds.update(res["nodelist"])
+                username = res["username"] or username
+                password = res["password"] or password
+                dbase = res["database"] or dbase
+                opts = res["options"]
+            else:
+                seeds.update(uri_parser.split_hosts(entity, port))
+        if not seeds:
+            raise ConfigurationError("need to specify at least one host")
+
+        keyword_opts = kwargs
+        keyword_opts['document_class'] = document_class
+        if type_registry is not None:
+            keyword_opts['type_registry'] = type_registry
+        if tz_aware is None:
+            tz_aware = opts.get('tz_aware', False)
+        keyword_opts['tz_aware'] = tz_aware
+
+        # Validate kwargs options.
+        keyword_opts = _CaseInsensitiveDictionary(
+            dict(common.validate(k, v) for k, v in keyword_opts.items()))
+        # Handle deprecated options in kwarg list.
+        keyword_opts = _handle_option_deprecations(keyword_opts)
+        # Change kwarg option names to those used internally.
+        keyword_opts = _normalize_options(keyword_opts)
+        # Augment URI options with kwarg options, overriding the former.
+        opts.update(keyword_opts)
+        # Username and password passed as kwargs override user info in URI.
+        username = opts.get("username", username)
+        password = opts.get("password", password)
+        self.__options = options = ClientOptions(
+            username, password, dbase, opts)
+        self.__default_database_name = dbase
+        self._event_listeners = options.pool_options.event_listeners
+
+        super(AsyncMongoClient, self).__init__(options.codec_options,
+                                               options.read_preference,
+                                               options.write_concern,
+                                               options.read_concern)
+
+        self._topology_settings = TopologySettings(
+            seeds=seeds,
+            replica_set_name=options.replica_set_name,
+            pool_options=options.pool_options,
+            local_threshold_ms=options.local_threshold_ms,
+            server_selection_timeout=options.server_selection_timeout,
+            server_selector=options.server_selector,
+            heartbeat_frequency=options.heartbeat_frequency,
+            outlier_detection=options.outlier_detection,
+            outlier_ejection_time=options.outlier_ejection_time)
+        self._topology = AsyncTopology(self._topology_settings,
+                                       options.credentials)
+
+    @property
+    def topology_description(self):
+        """The current :class:`~pymongo.topology_description.TopologyDescription`
+        of the deployment."""
+        return self._topology.description
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self._topology is other._topology
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "AsyncMongoClient(%r)" % (
+            sorted('%s:%d' % address for address in
+                   self._topology_settings.seeds),)
+
+    def __getattr__(self, name):
+        """Get a database by name."""
+        if name.startswith('_'):
+            raise AttributeError(
+                "AsyncMongoClient has no attribute %r. To access the %s"
+                " database, use client[%r]." % (name, name, name))
+        return self.__getitem__(name)
+
+    def __getitem__(self, name):
+        return AsyncDatabase(self, name)
+
+    def get_database(self, name=None, codec_options=None, read_preference=None,
+                     write_concern=None, read_concern=None):
+        """Get an :class:`~pymongo.asynchronous.database.AsyncDatabase` with
+        the given name and options. Defaults to the database named in the
+        connection string."""
+        if name is None:
+            if self.__default_database_name is None:
+                raise ConfigurationError('No default database defined')
+            name = self.__default_database_name
+
+        return AsyncDatabase(
+            self, name, codec_options, read_preference,
+            write_concern, read_concern)
+
+    async def server_info(self):
+        """Get information about the MongoDB server we're connected to."""
+        return await self.admin.command("buildinfo",
+                                        read_preference=ReadPreference.PRIMARY)
+
+    def close(self):
+        """Stop monitoring and close all connections.
+
+        The client reconnects on the next operation.
+        """
+        self._topology.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @contextlib.contextmanager
+    def _reset_on_error(self, server_address):
+        """On "not master" or "node is recovering" errors reset the server
+        according to the SDAM spec, like MongoClient._reset_on_error. Count
+        network errors and successes for outlier detection."""
+        try:
+            yield
+        except NetworkTimeout:
+            # The connection has been closed. Don't reset the server.
+            self._topology.record_operation(server_address, True)
+            raise
+        except NotMasterError:
+            self._topology.reset_server_and_request_check(server_address)
+            raise
+        except ConnectionFailure:
+            self._topology.record_operation(server_address, True)
+            self._topology.reset_server(server_address)
+            raise
+        except OperationFailure as exc:
+            if exc.code in helpers._RETRYABLE_ERROR_CODES:
+                self._topology.reset_server(server_address)
+            raise
+        else:
+            self._topology.record_operation(server_address, False)
+
+    async def _run_on_server(self, selector, func, read_preference=None,
+                             address=None):
+        """Select a server and await ``func(connection, slave_ok)`` with one
+        of its connections.
+
+        Returns the server's address and func's result.
+        """
+        topology = self._topology
+        if address is not None:
+            server = await topology.select_server_by_address(address)
+        else:
+            server = await topology.select_server(selector)
+        address = server.description.address
+        single = topology.description.topology_type == TOPOLOGY_TYPE.Single
+        with self._reset_on_error(address):
+            conn = await server.pool.get_socket()
+            try:
+                # Server Selection Spec: "slaveOK must be sent to mongods
+                # with topology type Single."
+                slave_ok = (single and not conn.is_mongos) or (
+                    read_preference is not None and
+                    read_preference != ReadPreference.PRIMARY)
+                result = await func(conn, slave_ok)
+            finally:
+                server.pool.return_socket(conn)
+        return address, result
+
+    async def _run_command(self, dbname, spec, read_preference,
+                           codec_options=DEFAULT_CODEC_OPTIONS, check=True,
+                           allowable_errors=None, user_fields=None,
+                           address=None):
+        """Run a command, returning the server's address and the reply.
+
+        A `read_preference` of None sends the command to the primary, like
+        a write.
+        """
+        async def command(conn, slave_ok):
+            return await conn.command(
+                dbname, spec, slave_ok,
+                read_preference or ReadPreference.PRIMARY, codec_options,
+                check, allowable_errors, user_fields=user_fields,
+                client=self)
+
+        return await self._run_on_server(
+            read_preference or writable_server_selector, command,
+            read_preference, address)
+
+    def _process_response(self, reply):
+        self._topology.receive_cluster_time(reply.get('$clusterTime'))
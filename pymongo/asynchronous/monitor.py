@@ -0,0 +1,167 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Class to monitor a MongoDB server in an asyncio task."""
+
+import asyncio
+import weakref
+
+from pymongo import common
+from pymongo.errors import OperationFailure
+from pymongo.monotonic import time as _time
+from pymongo.read_preferences import MovingAverage
+from pymongo.server_description import ServerDescription
+from pymongo.server_type import SERVER_TYPE
+
+
+class AsyncMonitor(object):
+    def __init__(
+            self,
+            server_description,
+            topology,
+            pool,
+            topology_settings):
+        """Class to monitor a MongoDB server in an asyncio task, the asyncio
+        counterpart of :class:`~pymongo.monitor.Monitor`.
+
+        Pass an initial ServerDescription, an AsyncTopology, an AsyncPool,
+        and TopologySettings.
+
+        The AsyncTopology is weakly referenced. The AsyncPool must be
+        exclusive to this AsyncMonitor.
+        """
+        self._server_description = server_description
+        self._pool = pool
+        self._settings = topology_settings
+        self._avg_round_trip_time = MovingAverage()
+        self._listeners = self._settings._pool_options.event_listeners
+        pub = self._listeners is not None
+        self._publish = pub and self._listeners.enabled_for_server_heartbeat
+        self._topology = weakref.proxy(topology)
+        self._task = None
+        self._wake = None
+
+    def open(self):
+        """Start monitoring. Must be called with a running event loop.
+
+        Multiple calls have no effect.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def close(self):
+        """Stop monitoring and close the monitor's connection."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pool.reset()
+
+    def request_check(self):
+        """If the monitor is sleeping, wake it soon."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self):
+        while True:
+            self._wake = asyncio.Event()
+            try:
+                self._server_description = await self._check_with_retry()
+                self._topology.on_change(self._server_description)
+            except ReferenceError:
+                # Topology was garbage-collected.
+                self._pool.reset()
+                return
+            try:
+                await asyncio.wait_for(self._wake.wait(),
+                                       self._settings.heartbeat_frequency)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                # Woken early, but never check more often than this.
+                await asyncio.sleep(common.MIN_HEARTBEAT_INTERVAL)
+
+    async def _check_with_retry(self):
+        """Call ismaster once or twice. Reset server's pool on error.
+
+        Returns a ServerDescription.
+        """
+        address = self._server_description.address
+        retry = True
+        if self._server_description.server_type == SERVER_TYPE.Unknown:
+            retry = False
+
+        start = _time()
+        try:
+            return await self._check_once()
+        except ReferenceError:
+            raise
+        except Exception as error:
+            error_time = _time() - start
+            if self._publish:
+                self._listeners.publish_server_heartbeat_failed(
+                    address, error_time, error)
+            self._topology.reset_pool(address)
+            default = ServerDescription(address, error=error)
+            if not retry:
+                self._avg_round_trip_time.reset()
+                # Server type defaults to Unknown.
+                return default
+
+            # Try a second and final time. If it fails return original error.
+            start = _time()
+            try:
+                return await self._check_once()
+            except ReferenceError:
+                raise
+            except Exception as error:
+                error_time = _time() - start
+                if self._publish:
+                    self._listeners.publish_server_heartbeat_failed(
+                        address, error_time, error)
+                self._avg_round_trip_time.reset()
+                return default
+
+    async def _check_once(self):
+        """A single attempt to call ismaster.
+
+        Returns a ServerDescription, or raises an exception.
+        """
+        address = self._server_description.address
+        if self._publish:
+            self._listeners.publish_server_heartbeat_started(address)
+        conn = await self._pool.get_socket()
+        try:
+            start = _time()
+            try:
+                response = await conn.ismaster(
+                    self._pool.opts.metadata,
+                    self._topology.max_cluster_time())
+            except OperationFailure as exc:
+                # Update max cluster time even when isMaster fails.
+                self._topology.receive_cluster_time(
+                    exc.details.get('$clusterTime'))
+                raise
+            round_trip_time = _time() - start
+        finally:
+            self._pool.return_socket(conn)
+
+        self._avg_round_trip_time.add_sample(round_trip_time)
+        sd = ServerDescription(
+            address=address,
+            ismaster=response,
+            round_trip_time=self._avg_round_trip_time.get())
+        if self._publish:
+            self._listeners.publish_server_heartbeat_succeeded(
+                address, round_trip_time, response)
+        return sd
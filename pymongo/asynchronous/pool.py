@@ -0,0 +1,497 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Asyncio connections and connection pool."""
+
+import asyncio
+import collections
+import datetime
+import socket
+
+from bson import DEFAULT_CODEC_OPTIONS
+from bson.son import SON
+from pymongo import auth, helpers, message
+from pymongo.common import (MAX_BSON_SIZE,
+                            MAX_MESSAGE_SIZE,
+                            MAX_WIRE_VERSION,
+                            MAX_WRITE_BATCH_SIZE)
+from pymongo.compression_support import (decompress,
+                                         CompressionStatistics,
+                                         _NO_COMPRESSION)
+from pymongo.errors import (ConfigurationError,
+                            ConnectionFailure,
+                            NotMasterError,
+                            OperationFailure,
+                            ProtocolError)
+from pymongo.ismaster import IsMaster
+from pymongo.message import _UNPACK_REPLY
+from pymongo.monotonic import time as _time
+from pymongo.network import _UNPACK_COMPRESSION_HEADER, _UNPACK_HEADER
+from pymongo.pool import (_raise_connection_failure,
+                          _set_keepalive_times,
+                          is_ip_address)
+from pymongo.read_preferences import ReadPreference
+from pymongo.server_type import SERVER_TYPE
+from pymongo.ssl_match_hostname import match_hostname
+
+
+def _raise_network_error(address, error):
+    """Convert an asyncio network error to ConnectionFailure and raise it."""
+    if isinstance(error, asyncio.TimeoutError):
+        error = socket.timeout('timed out')
+    elif isinstance(error, asyncio.IncompleteReadError):
+        error = socket.error('connection closed')
+    _raise_connection_failure(address, error)
+
+
+class AsyncConnection(object):
+    """An asyncio stream connection to a server, the asyncio counterpart of
+    :class:`~pymongo.pool.SocketInfo`.
+
+    :Parameters:
+      - `reader`: an :class:`asyncio.StreamReader`
+      - `writer`: an :class:`asyncio.StreamWriter`
+      - `pool`: an :class:`AsyncPool`
+      - `address`: the server's (host, port)
+    """
+    def __init__(self, reader, writer, pool, address):
+        self.reader = reader
+        self.writer = writer
+        self.address = address
+        self.opts = pool.opts
+        self.authset = set()
+        self.closed = False
+        self.last_checkin_time = _time()
+        self.performed_handshake = False
+        self.is_writable = False
+        self.max_wire_version = MAX_WIRE_VERSION
+        self.max_bson_size = MAX_BSON_SIZE
+        self.max_message_size = MAX_MESSAGE_SIZE
+        self.max_write_batch_size = MAX_WRITE_BATCH_SIZE
+        self.is_mongos = False
+        self.op_msg_enabled = False
+        self.listeners = pool.opts.event_listeners
+        self.compression_settings = pool.opts.compression_settings
+        self.compression_statistics = pool.compression_statistics
+        self.compression_context = None
+        self.pool_id = pool.pool_id
+
+    async def ismaster(self, metadata, cluster_time=None):
+        cmd = SON([('ismaster', 1)])
+        if not self.performed_handshake:
+            cmd['client'] = metadata
+            if self.compression_settings:
+                cmd['compression'] = self.compression_settings.compressors
+
+        if self.max_wire_version >= 6 and cluster_time is not None:
+            cmd['$clusterTime'] = cluster_time
+
+        ismaster = IsMaster(
+            await self.command('admin', cmd, publish_events=False))
+        self.is_writable = ismaster.is_writable
+        self.max_wire_version = ismaster.max_wire_version
+        self.max_bson_size = ismaster.max_bson_size
+        self.max_message_size = ismaster.max_message_size
+        self.max_write_batch_size = ismaster.max_write_batch_size
+        self.is_mongos = ismaster.server_type == SERVER_TYPE.Mongos
+        if not self.performed_handshake and self.compression_settings:
+            ctx = self.compression_settings.get_compression_context(
+                ismaster.compressors, self.compression_statistics)
+            self.compression_context = ctx
+
+        self.performed_handshake = True
+        self.op_msg_enabled = ismaster.max_wire_version >= 6
+        return ismaster
+
+    async def command(self, dbname, spec, slave_ok=False,
+                      read_preference=ReadPreference.PRIMARY,
+                      codec_options=DEFAULT_CODEC_OPTIONS, check=True,
+                      allowable_errors=None, check_keys=False,
+                      publish_events=True, unacknowledged=False,
+                      user_fields=None, client=None):
+        """Execute a command or raise an error.
+
+        Like :func:`pymongo.network.command`, OP_MSG is used with MongoDB
+        3.6+ and OP_QUERY otherwise.
+        """
+        name = next(iter(spec))
+        listeners = self.listeners if publish_events else None
+        publish = listeners is not None and listeners.enabled_for_commands
+        if publish:
+            start = datetime.datetime.now()
+
+        compression_ctx = self.compression_context
+        if compression_ctx:
+            compression_ctx.reset_last()
+            if name.lower() in _NO_COMPRESSION:
+                compression_ctx.record_skipped(name)
+                compression_ctx = None
+
+        orig = spec
+        if self.op_msg_enabled:
+            flags = 2 if unacknowledged else 0
+            request_id, msg, size, max_doc_size = message._op_msg(
+                flags, spec, dbname, read_preference, slave_ok, check_keys,
+                codec_options, ctx=compression_ctx)
+            if (unacknowledged and
+                    max_doc_size > self.max_bson_size):
+                message._raise_document_too_large(
+                    name, size, self.max_bson_size)
+        else:
+            unacknowledged = False
+            if self.is_mongos:
+                spec = message._maybe_add_read_preference(
+                    spec, read_preference)
+            request_id, msg, size = message.query(
+                4 if slave_ok else 0, dbname + '.$cmd', 0, -1, spec, None,
+                codec_options, check_keys, compression_ctx)
+
+        if size > self.max_bson_size + message._COMMAND_OVERHEAD:
+            message._raise_document_too_large(
+                name, size, self.max_bson_size + message._COMMAND_OVERHEAD)
+
+        if publish:
+            encoding_duration = datetime.datetime.now() - start
+            listeners.publish_command_start(
+                orig, dbname, request_id, self.address)
+            start = datetime.datetime.now()
+
+        try:
+            await self.send_message(msg)
+            if unacknowledged:
+                # Unacknowledged, fake a successful command response.
+                response_doc = {"ok": 1}
+            else:
+                reply = await self.receive_message(request_id, name)
+                response_doc = reply.unpack_response(
+                    codec_options=codec_options, user_fields=user_fields)[0]
+                if client is not None:
+                    client._process_response(response_doc)
+                if check:
+                    helpers._check_command_response(
+                        response_doc, None, allowable_errors)
+        except Exception as exc:
+            if publish:
+                duration = (datetime.datetime.now() - start) + encoding_duration
+                if isinstance(exc, (NotMasterError, OperationFailure)):
+                    failure = exc.details
+                else:
+                    failure = message._convert_exception(exc)
+                listeners.publish_command_failure(
+                    duration, failure, name, request_id, self.address)
+            raise
+        if publish:
+            duration = (datetime.datetime.now() - start) + encoding_duration
+            compression = None
+            if self.compression_context:
+                compression = self.compression_context.last_exchange()
+            listeners.publish_command_success(
+                duration, response_doc, name, request_id, self.address,
+                compression=compression)
+        return response_doc
+
+    async def write_command(self, request_id, msg, ctx, docs,
+                            acknowledged=True):
+        """Send a batched write command built by
+        :func:`pymongo.message._do_bulk_write_command`.
+
+        `ctx` is the :class:`~pymongo.message._BulkWriteContext` used to
+        split the batch, it publishes the command monitoring events.
+        Returns the reply, or None for an unacknowledged OP_MSG write.
+        """
+        if ctx.publish:
+            duration = datetime.datetime.now() - ctx.start_time
+            ctx._start(request_id, docs)
+            start = datetime.datetime.now()
+        try:
+            await self.send_message(msg)
+            if acknowledged or not self.op_msg_enabled:
+                reply = await self.receive_message(request_id, ctx.name)
+                result = reply.command_response()
+                helpers._check_command_response(result)
+            else:
+                result = None
+            if ctx.publish:
+                duration = (datetime.datetime.now() - start) + duration
+                ctx._succeed(request_id, result or {'ok': 1}, duration)
+        except OperationFailure as exc:
+            if ctx.publish:
+                duration = (datetime.datetime.now() - start) + duration
+                ctx._fail(request_id, exc.details, duration)
+            raise
+        finally:
+            ctx._reset_compression()
+            ctx.start_time = datetime.datetime.now()
+        return result
+
+    async def send_message(self, msg):
+        """Send a raw BSON message or raise ConnectionFailure."""
+        try:
+            self.writer.write(msg)
+            await asyncio.wait_for(
+                self.writer.drain(), self.opts.socket_timeout)
+        except BaseException as error:
+            self._close_on_error(error)
+
+    async def receive_message(self, request_id, command_name=None):
+        """Receive a raw BSON message or raise ConnectionFailure."""
+        try:
+            return await asyncio.wait_for(
+                self._receive_message(request_id, command_name),
+                self.opts.socket_timeout)
+        except BaseException as error:
+            self._close_on_error(error)
+
+    async def _receive_message(self, request_id, command_name):
+        read = self.reader.readexactly
+        length, _, response_to, op_code = _UNPACK_HEADER(await read(16))
+        if request_id != response_to:
+            raise ProtocolError("Got response id %r but expected "
+                                "%r" % (response_to, request_id))
+        if length <= 16:
+            raise ProtocolError("Message length (%r) not longer than standard "
+                                "message header size (16)" % (length,))
+        if length > self.max_message_size:
+            raise ProtocolError("Message length (%r) is larger than server max "
+                                "message size (%r)" % (length,
+                                                       self.max_message_size))
+        if op_code == 2012:
+            op_code, _, compressor_id = _UNPACK_COMPRESSION_HEADER(
+                await read(9))
+            data = await read(length - 25)
+            if self.compression_context is not None:
+                data = self.compression_context.decompress_message(
+                    command_name or 'reply', data, compressor_id)
+            else:
+                data = decompress(data, compressor_id)
+        else:
+            data = await read(length - 16)
+
+        try:
+            unpack_reply = _UNPACK_REPLY[op_code]
+        except KeyError:
+            raise ProtocolError("Got opcode %r but expected "
+                                "%r" % (op_code, _UNPACK_REPLY.keys()))
+        return unpack_reply(data)
+
+    def _close_on_error(self, error):
+        """Close the connection and re-raise `error`.
+
+        A cancelled or failed read leaves the stream in an unknown state, so
+        the connection cannot be reused.
+        """
+        self.close()
+        if isinstance(error, (asyncio.TimeoutError, asyncio.IncompleteReadError,
+                              socket.error)):
+            _raise_network_error(self.address, error)
+        raise error
+
+    async def authenticate(self, credentials):
+        """Log in to the server using the SCRAM conversation from
+        :mod:`pymongo.auth`.
+        """
+        mechanism = credentials.mechanism
+        if mechanism == 'DEFAULT':
+            if self.max_wire_version < 3:
+                raise ConfigurationError(
+                    'AsyncMongoClient does not support MONGODB-CR')
+            mechanism = 'SCRAM-SHA-1'
+            if self.max_wire_version >= 7:
+                source = credentials.source
+                cmd = SON([
+                    ('ismaster', 1),
+                    ('saslSupportedMechs',
+                     source + '.' + credentials.username)])
+                res = await self.command(source, cmd, publish_events=False)
+                if 'SCRAM-SHA-256' in res.get('saslSupportedMechs', []):
+                    mechanism = 'SCRAM-SHA-256'
+        elif mechanism not in ('SCRAM-SHA-1', 'SCRAM-SHA-256'):
+            raise ConfigurationError(
+                'AsyncMongoClient does not support %s' % (mechanism,))
+
+        conversation = auth._scram_conversation(credentials, mechanism)
+        response = None
+        try:
+            while True:
+                source, cmd = conversation.send(response)
+                response = await self.command(source, cmd)
+        except StopIteration:
+            pass
+        self.authset.add(credentials)
+
+    def close(self):
+        self.closed = True
+        # Avoid exceptions on interpreter shutdown.
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+    def update_last_checkin_time(self):
+        self.last_checkin_time = _time()
+
+    def idle_time_seconds(self):
+        """Seconds since this connection was last checked into its pool."""
+        return _time() - self.last_checkin_time
+
+    def __repr__(self):
+        return "AsyncConnection(%s)%s at %s" % (
+            repr(self.address),
+            self.closed and " CLOSED" or "",
+            id(self)
+        )
+
+
+class AsyncPool(object):
+    """A LIFO pool of :class:`AsyncConnection` to one server.
+
+    :Parameters:
+      - `address`: a (hostname, port) tuple
+      - `options`: a :class:`~pymongo.pool.PoolOptions` instance
+      - `credentials` (optional): a MongoCredential to authenticate new
+        connections with
+      - `handshake`: whether to call ismaster for each new connection
+    """
+    def __init__(self, address, options, credentials=None, handshake=True):
+        self.address = address
+        self.opts = options
+        self.handshake = handshake
+        self.credentials = credentials
+        self.connections = collections.deque()
+        self.active_sockets = 0
+        self.pool_id = 0
+        # Created on first use so that it belongs to the running loop.
+        self._semaphore = None
+        if self.opts.compression_settings:
+            self.compression_statistics = CompressionStatistics()
+        else:
+            self.compression_statistics = None
+
+    def reset(self):
+        self.pool_id += 1
+        connections, self.connections = self.connections, collections.deque()
+        for conn in connections:
+            conn.close()
+
+    close = reset
+
+    async def connect(self):
+        """Connect to Mongo and return a new, authenticated AsyncConnection.
+
+        Can raise ConnectionFailure or CertificateError.
+        """
+        host, port = self.address
+        ssl_context = self.opts.ssl_context
+        try:
+            if host.endswith('.sock'):
+                if not hasattr(socket, "AF_UNIX"):
+                    raise ConnectionFailure("UNIX-sockets are not supported "
+                                            "on this system")
+                opening = asyncio.open_unix_connection(host)
+            elif ssl_context is not None:
+                # According to RFC6066, section 3, IPv4 and IPv6 literals are
+                # not permitted for SNI hostname.
+                server_hostname = host
+                if is_ip_address(host) and not ssl_context.check_hostname:
+                    server_hostname = ''
+                opening = asyncio.open_connection(
+                    host, port, ssl=ssl_context,
+                    server_hostname=server_hostname)
+            else:
+                opening = asyncio.open_connection(host, port)
+            reader, writer = await asyncio.wait_for(
+                opening, self.opts.connect_timeout)
+        except (asyncio.TimeoutError, socket.error) as error:
+            _raise_network_error(self.address, error)
+
+        sock = writer.get_extra_info('socket')
+        if sock is not None and sock.family != getattr(socket, 'AF_UNIX', None):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE,
+                            self.opts.socket_keepalive)
+            if self.opts.socket_keepalive:
+                _set_keepalive_times(sock)
+        if (ssl_context is not None and ssl_context.verify_mode and not
+                getattr(ssl_context, "check_hostname", False) and
+                self.opts.ssl_match_hostname):
+            try:
+                match_hostname(writer.get_extra_info('peercert'),
+                               hostname=host)
+            except Exception:
+                writer.close()
+                raise
+
+        conn = AsyncConnection(reader, writer, self, self.address)
+        try:
+            if self.handshake:
+                await conn.ismaster(self.opts.metadata)
+            if self.credentials is not None:
+                await conn.authenticate(self.credentials)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    async def get_socket(self):
+        """Check out a connection. Return it with :meth:`return_socket`.
+
+        Can raise ConnectionFailure or OperationFailure.
+        """
+        if self._semaphore is None and self.opts.max_pool_size:
+            self._semaphore = asyncio.Semaphore(self.opts.max_pool_size)
+        if self._semaphore is not None:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(),
+                                       self.opts.wait_queue_timeout)
+            except asyncio.TimeoutError:
+                self._raise_wait_queue_timeout()
+        try:
+            conn = None
+            while conn is None:
+                if not self.connections:
+                    conn = await self.connect()
+                    break
+                conn = self.connections.popleft()
+                if self._is_stale(conn):
+                    conn.close()
+                    conn = None
+        except BaseException:
+            if self._semaphore is not None:
+                self._semaphore.release()
+            raise
+        self.active_sockets += 1
+        return conn
+
+    def return_socket(self, conn):
+        """Return the connection to the pool, or if it's closed discard it."""
+        if self.pool_id != conn.pool_id or conn.closed:
+            conn.close()
+        else:
+            conn.update_last_checkin_time()
+            self.connections.appendleft(conn)
+        self.active_sockets -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def _is_stale(self, conn):
+        """Has the connection been idle too long or closed by the server?"""
+        if (self.opts.max_idle_time_seconds is not None and
+                conn.idle_time_seconds() > self.opts.max_idle_time_seconds):
+            return True
+        return conn.closed or conn.reader.at_eof()
+
+    def _raise_wait_queue_timeout(self):
+        raise ConnectionFailure(
+            'Timed out waiting for socket from pool with max_size %r and'
+            ' wait_queue_timeout %r' % (
+                self.opts.max_pool_size, self.opts.wait_queue_timeout))
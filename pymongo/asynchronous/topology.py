@@ -0,0 +1,340 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Internal class to monitor a topology of one or more servers from an
+asyncio event loop."""
+
+import asyncio
+import random
+import weakref
+
+from pymongo import common
+from pymongo.asynchronous.monitor import AsyncMonitor
+from pymongo.asynchronous.pool import AsyncPool
+from pymongo.errors import ServerSelectionTimeoutError
+from pymongo.monotonic import time as _time
+from pymongo.outlier_detection import OutlierDetector
+from pymongo.pool import PoolOptions
+from pymongo.server_selectors import any_server_selector
+from pymongo.topology import Topology
+from pymongo.topology_description import (updated_topology_description,
+                                          TopologyDescription)
+
+
+class AsyncServer(object):
+    """A server's description, its connection pool and its monitor."""
+
+    def __init__(self, server_description, pool, monitor):
+        self.description = server_description
+        self.pool = pool
+        self._monitor = monitor
+
+    def open(self):
+        self._monitor.open()
+
+    def reset(self):
+        """Clear the connection pool."""
+        self.pool.reset()
+
+    def close(self):
+        self._monitor.close()
+        self.pool.reset()
+
+    def request_check(self):
+        """Check the server's state soon."""
+        self._monitor.request_check()
+
+    def __repr__(self):
+        return '<AsyncServer %r>' % (self.description,)
+
+
+class _PublishNow(object):
+    """Stands in for Topology's events queue: the OutlierDetector's events
+    are published at once, on the event loop's thread."""
+
+    def put(self, event):
+        publish, args = event
+        publish(*args)
+
+
+class AsyncTopology(object):
+    """Monitor a topology of one or more servers, the asyncio counterpart of
+    :class:`~pymongo.topology.Topology`.
+
+    The state is only touched from the event loop's thread, so no locks are
+    needed; waiters in :meth:`select_servers` are woken by an
+    :class:`asyncio.Event` that is replaced after every change.
+    """
+    def __init__(self, topology_settings, credentials=None):
+        self._topology_id = topology_settings._topology_id
+        self._listeners = topology_settings._pool_options.event_listeners
+        pub = self._listeners is not None
+        self._publish_server = pub and self._listeners.enabled_for_server
+        self._publish_tp = pub and self._listeners.enabled_for_topology
+        self._settings = topology_settings
+        self._credentials = credentials
+        self._description = TopologyDescription(
+            topology_settings.get_topology_type(),
+            topology_settings.get_server_descriptions(),
+            topology_settings.replica_set_name,
+            None,
+            None,
+            topology_settings)
+        # Store the seed list to help diagnose errors in _error_message().
+        self._seed_addresses = list(self._description.server_descriptions())
+        self._opened = False
+        self._servers = {}
+        self._max_cluster_time = None
+        self._changed = None
+
+        # Ejects servers whose operations fail from selection. Async pools
+        # don't time operations, so servers aren't ejected for latency.
+        self._outliers = None
+        self._next_outlier_check = 0
+        if topology_settings.outlier_detection:
+            self._events = _PublishNow()
+            self._outliers = OutlierDetector(
+                topology_settings.outlier_ejection_time,
+                self._listeners,
+                weakref.ref(self._events) if self._publish_server else None,
+                self._topology_id)
+
+    # Only reads _description, _settings, and _seed_addresses.
+    _error_message = Topology._error_message
+
+    def open(self):
+        """Start monitoring. Must be called with a running event loop.
+
+        Multiple calls have no effect.
+        """
+        if self._opened:
+            return
+        self._opened = True
+        if self._publish_tp:
+            self._listeners.publish_topology_opened(self._topology_id)
+        self._update_servers()
+
+    async def select_servers(self,
+                             selector,
+                             server_selection_timeout=None,
+                             address=None):
+        """Return a list of AsyncServers matching selector, or time out.
+
+        Raises exc:`ServerSelectionTimeoutError` after
+        `server_selection_timeout` if no matching servers are found.
+        """
+        if server_selection_timeout is None:
+            timeout = self._settings.server_selection_timeout
+        else:
+            timeout = server_selection_timeout
+
+        self.open()
+        now = _time()
+        end_time = now + timeout
+        server_descriptions = self._description.apply_selector(
+            selector, address, custom_selector=self._settings.server_selector)
+
+        while not server_descriptions:
+            # No suitable servers.
+            if timeout == 0 or now > end_time:
+                raise ServerSelectionTimeoutError(
+                    self._error_message(selector))
+
+            for server in self._servers.values():
+                server.request_check()
+
+            # Wait for the topology description to change, or for a timeout.
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait(),
+                    min(end_time - now, common.MIN_HEARTBEAT_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+            self._description.check_compatible()
+            now = _time()
+            server_descriptions = self._description.apply_selector(
+                selector, address,
+                custom_selector=self._settings.server_selector)
+
+        self._description.check_compatible()
+        if self._outliers is not None and address is None:
+            self._check_outliers()
+            server_descriptions = self._outliers.filter(server_descriptions)
+        return [self._servers[sd.address] for sd in server_descriptions]
+
+    async def select_server(self,
+                            selector,
+                            server_selection_timeout=None,
+                            address=None):
+        """Like select_servers, but choose a random server if several match."""
+        return random.choice(await self.select_servers(
+            selector, server_selection_timeout, address))
+
+    async def select_server_by_address(self, address,
+                                       server_selection_timeout=None):
+        """Return an AsyncServer for "address", reconnecting if necessary."""
+        return await self.select_server(any_server_selector,
+                                        server_selection_timeout,
+                                        address)
+
+    def on_change(self, server_description):
+        """Process a new ServerDescription after an ismaster call completes."""
+        # A monitor may finish its check after the server was removed.
+        if not (self._opened and
+                self._description.has_server(server_description.address)):
+            return
+        td_old = self._description
+        if self._publish_server:
+            self._listeners.publish_server_description_changed(
+                td_old._server_descriptions[server_description.address],
+                server_description, server_description.address,
+                self._topology_id)
+
+        self._description = updated_topology_description(
+            self._description, server_description)
+        self._update_servers()
+        self.receive_cluster_time(server_description.cluster_time)
+
+        if self._publish_tp:
+            self._listeners.publish_topology_description_changed(
+                td_old, self._description, self._topology_id)
+
+        # Wake waiters in select_servers().
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def max_cluster_time(self):
+        """Return a document, the highest seen $clusterTime."""
+        return self._max_cluster_time
+
+    def receive_cluster_time(self, cluster_time):
+        if cluster_time:
+            # ">" uses bson.timestamp.Timestamp's comparison operator.
+            if (not self._max_cluster_time
+                or cluster_time['clusterTime'] >
+                    self._max_cluster_time['clusterTime']):
+                self._max_cluster_time = cluster_time
+
+    def record_operation(self, address, failed):
+        """Count an operation on a server for outlier detection, failed if
+        it raised a network error or timed out."""
+        if self._outliers is not None:
+            self._outliers.record(address, failed)
+
+    def _check_outliers(self):
+        """Restore servers whose ejection is over, at most every
+        OUTLIER_CHECK_INTERVAL seconds. There is no thread to do it."""
+        now = _time()
+        if now >= self._next_outlier_check:
+            self._next_outlier_check = now + common.OUTLIER_CHECK_INTERVAL
+            self._outliers.check([])
+
+    def reset_pool(self, address):
+        server = self._servers.get(address)
+        if server:
+            server.pool.reset()
+
+    def reset_server(self, address):
+        """Clear our pool for a server and mark it Unknown.
+
+        Do *not* request an immediate check.
+        """
+        server = self._servers.get(address)
+        if server:
+            server.reset()
+            self._description = self._description.reset_server(address)
+            self._update_servers()
+
+    def reset_server_and_request_check(self, address):
+        """Clear our pool for a server, mark it Unknown, and check it soon."""
+        self.reset_server(address)
+        server = self._servers.get(address)
+        if server:
+            server.request_check()
+
+    def close(self):
+        """Clear pools and terminate monitors. Topology reopens on demand."""
+        for server in self._servers.values():
+            server.close()
+        self._servers = {}
+        # Mark all servers Unknown.
+        self._description = self._description.reset()
+        was_open, self._opened = self._opened, False
+        if was_open and self._publish_tp:
+            self._listeners.publish_topology_closed(self._topology_id)
+
+    @property
+    def description(self):
+        return self._description
+
+    def _update_servers(self):
+        """Sync our AsyncServers from
+        TopologyDescription.server_descriptions.
+        """
+        for address, sd in self._description.server_descriptions().items():
+            if address not in self._servers:
+                monitor = AsyncMonitor(
+                    server_description=sd,
+                    topology=self,
+                    pool=self._create_pool_for_monitor(address),
+                    topology_settings=self._settings)
+                server = AsyncServer(
+                    sd, AsyncPool(address, self._settings.pool_options,
+                                  self._credentials),
+                    monitor)
+                self._servers[address] = server
+                if self._publish_server:
+                    self._listeners.publish_server_opened(
+                        address, self._topology_id)
+                server.open()
+                if self._outliers is not None:
+                    self._outliers.add_server(address)
+            else:
+                self._servers[address].description = sd
+
+        for address, server in list(self._servers.items()):
+            if not self._description.has_server(address):
+                server.close()
+                self._servers.pop(address)
+                if self._outliers is not None:
+                    self._outliers.remove_server(address)
+                if self._publish_server:
+                    self._listeners.publish_server_closed(
+                        address, self._topology_id)
+
+    def _create_pool_for_monitor(self, address):
+        options = self._settings.pool_options
+
+        # According to the Server Discovery And Monitoring Spec, monitors use
+        # connect_timeout for both connect_timeout and socket_timeout. The
+        # pool only has one socket so maxPoolSize and so on aren't needed.
+        monitor_pool_options = PoolOptions(
+            connect_timeout=options.connect_timeout,
+            socket_timeout=options.connect_timeout,
+            ssl_context=options.ssl_context,
+            ssl_match_hostname=options.ssl_match_hostname,
+            event_listeners=options.event_listeners,
+            appname=options.appname,
+            driver=options.driver)
+
+        return AsyncPool(address, monitor_pool_options, handshake=False)
+
+    def __repr__(self):
+        msg = ''
+        if not self._opened:
+            msg = 'CLOSED '
+        return '<%s %s%r>' % (self.__class__.__name__, msg, self._description)
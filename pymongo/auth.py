@@ -17,7 +17,9 @@
 import functools
 import hashlib
 import hmac
+import os
 import socket
+import threading
 
 try:
     from urllib import quote
@@ -37,7 +39,7 @@ except ImportError:
         HAVE_KERBEROS = False
 
 from base64 import standard_b64decode, standard_b64encode
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 from random import SystemRandom
 
 from bson.binary import Binary
@@ -234,10 +236,85 @@ def _parse_scram_response(response):
     return dict(item.split(b"=", 1) for item in response.split(b","))
 
 
-def _authenticate_scram(credentials, sock_info, mechanism):
-    """Authenticate using SCRAM."""
+class _ScramKeyCache(object):
+    """A process-wide LRU cache of SCRAM client and server keys.
 
+    Deriving the keys runs PBKDF2 with thousands of iterations, so every
+    MongoClient (and every MongoCredential) authenticating as the same user
+    shares them. Entries are keyed by an HMAC, under a random per-process
+    secret, of the mechanism, username, password, salt, and iteration count:
+    the cache never holds the password, and the cached keys are overwritten
+    with zeros when they are evicted.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._secret = os.urandom(32)
+        self._lock = threading.Lock()
+        self._keys = OrderedDict()
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def cache_key(self, mechanism, username, password, salt, iterations):
+        mac = hmac.HMAC(self._secret, None, hashlib.sha256)
+        for field in (mechanism, username, password, salt, str(iterations)):
+            if not isinstance(field, bytes):
+                field = field.encode('utf-8')
+            # Length prefixes keep ("ab", "c") and ("a", "bc") apart.
+            mac.update(_to_bytes(len(field), 4, 'big') + field)
+        return mac.digest()
+
+    def get(self, key):
+        """Get (client_key, server_key) or None, marking it recently used."""
+        with self._lock:
+            keys = self._keys.pop(key, None)
+            if keys is None:
+                return None
+            self._keys[key] = keys
+            return bytes(keys[0]), bytes(keys[1])
+
+    def put(self, key, client_key, server_key):
+        with self._lock:
+            old = self._keys.pop(key, None)
+            if old is not None:
+                self._zero(old)
+            self._keys[key] = (bytearray(client_key), bytearray(server_key))
+            while len(self._keys) > self.max_size:
+                self._zero(self._keys.popitem(last=False)[1])
+
+    def clear(self):
+        with self._lock:
+            while self._keys:
+                self._zero(self._keys.popitem()[1])
+
+    def __len__(self):
+        return len(self._keys)
+
+    @staticmethod
+    def _zero(keys):
+        for buf in keys:
+            buf[:] = bytearray(len(buf))
+
+
+_SCRAM_KEY_CACHE_SIZE = 256
+_scram_key_cache = _ScramKeyCache(_SCRAM_KEY_CACHE_SIZE)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_scram_key_cache._after_fork)
+
+
+def _scram_keys(credentials, mechanism, salt, iterations):
+    """Get the SCRAM client and server keys, from the process-wide cache if
+    any client derived them before."""
     username = credentials.username
+    key = _scram_key_cache.cache_key(
+        mechanism, username, credentials.password, salt, iterations)
+    keys = _scram_key_cache.get(key)
+    if keys is not None:
+        return keys
+
+    # Only prepare the password on a miss, saslprep is slow too.
     if mechanism == 'SCRAM-SHA-256':
         digest = "sha256"
         digestmod = hashlib.sha256
@@ -246,6 +323,26 @@ def _authenticate_scram(credentials, sock_info, mechanism):
         digest = "sha1"
         digestmod = hashlib.sha1
         data = _password_digest(username, credentials.password).encode("utf-8")
+    salted_pass = _hi(digest, data, standard_b64decode(salt), iterations)
+    client_key = hmac.HMAC(salted_pass, b"Client Key", digestmod).digest()
+    server_key = hmac.HMAC(salted_pass, b"Server Key", digestmod).digest()
+    _scram_key_cache.put(key, client_key, server_key)
+    return client_key, server_key
+
+
+def _scram_conversation(credentials, mechanism):
+    """The SCRAM conversation as a generator.
+
+    Yields (source, command) pairs and expects the reply to each command to
+    be sent back in, so that both the synchronous and the asyncio drivers can
+    run the same conversation.
+    """
+
+    username = credentials.username
+    if mechanism == 'SCRAM-SHA-256':
+        digestmod = hashlib.sha256
+    else:
+        digestmod = hashlib.sha1
     source = credentials.source
     cache = credentials.cache
 
@@ -261,7 +358,7 @@ def _authenticate_scram(credentials, sock_info, mechanism):
                ('mechanism', mechanism),
                ('payload', Binary(b"n,," + first_bare)),
                ('autoAuthorize', 1)])
-    res = sock_info.command(source, cmd)
+    res = yield source, cmd
 
     server_first = res['payload']
     parsed = _parse_scram_response(server_first)
@@ -282,10 +379,8 @@ def _authenticate_scram(credentials, sock_info, mechanism):
     # Salt and / or iterations could change for a number of different
     # reasons. Either changing invalidates the cache.
     if not client_key or salt != csalt or iterations != citerations:
-        salted_pass = _hi(
-            digest, data, standard_b64decode(salt), iterations)
-        client_key = _hmac(salted_pass, b"Client Key", digestmod).digest()
-        server_key = _hmac(salted_pass, b"Server Key", digestmod).digest()
+        client_key, server_key = _scram_keys(
+            credentials, mechanism, salt, iterations)
         cache.data = (client_key, server_key, salt, iterations)
     stored_key = digestmod(client_key).digest()
     auth_msg = b",".join((first_bare, server_first, without_proof))
@@ -299,7 +394,7 @@ def _authenticate_scram(credentials, sock_info, mechanism):
     cmd = SON([('saslContinue', 1),
                ('conversationId', res['conversationId']),
                ('payload', Binary(client_final))])
-    res = sock_info.command(source, cmd)
+    res = yield source, cmd
 
     parsed = _parse_scram_response(res['payload'])
     if not compare_digest(parsed[b'v'], server_sig):
@@ -311,11 +406,29 @@ def _authenticate_scram(credentials, sock_info, mechanism):
         cmd = SON([('saslContinue', 1),
                    ('conversationId', res['conversationId']),
                    ('payload', Binary(b''))])
-        res = sock_info.command(source, cmd)
+        res = yield source, cmd
         if not res['done']:
             raise OperationFailure('SASL conversation failed to complete.')
 
 
+def _authenticate_scram(credentials, sock_info, mechanism):
+    """Authenticate using SCRAM."""
+    ctx = sock_info.auth_ctx.pop(credentials, None)
+    if ctx and ctx.mechanism == mechanism and ctx.speculate_succeeded():
+        # The handshake already sent saslStart, continue from its reply.
+        conversation = ctx.conversation
+        response = ctx.speculative_authenticate
+    else:
+        conversation = _scram_conversation(credentials, mechanism)
+        response = None
+    try:
+        while True:
+            source, cmd = conversation.send(response)
+            response = sock_info.command(source, cmd)
+    except StopIteration:
+        pass
+
+
 def _password_digest(username, password):
     """Get a password digest to use for authentication.
     """
@@ -493,18 +606,27 @@ def _authenticate_cram_md5(credentials, sock_info):
     sock_info.command(source, cmd)
 
 
-def _authenticate_x509(credentials, sock_info):
-    """Authenticate using MONGODB-X509.
-    """
+def _x509_command(credentials):
     query = SON([('authenticate', 1),
                  ('mechanism', 'MONGODB-X509')])
     if credentials.username is not None:
         query['user'] = credentials.username
-    elif sock_info.max_wire_version < 5:
+    return query
+
+
+def _authenticate_x509(credentials, sock_info):
+    """Authenticate using MONGODB-X509.
+    """
+    ctx = sock_info.auth_ctx.pop(credentials, None)
+    if ctx and ctx.speculate_succeeded():
+        # Authenticated during the connection handshake.
+        return
+    if (credentials.username is None and
+            sock_info.max_wire_version < 5):
         raise ConfigurationError(
             "A username is required for MONGODB-X509 authentication "
             "when connected to MongoDB versions older than 3.4.")
-    sock_info.command('$external', query)
+    sock_info.command('$external', _x509_command(credentials))
 
 
 def _authenticate_mongo_cr(credentials, sock_info):
@@ -528,12 +650,17 @@ def _authenticate_mongo_cr(credentials, sock_info):
 
 def _authenticate_default(credentials, sock_info):
     if sock_info.max_wire_version >= 7:
-        source = credentials.source
-        cmd = SON([
-            ('ismaster', 1),
-            ('saslSupportedMechs', source + '.' + credentials.username)])
-        mechs = sock_info.command(
-            source, cmd, publish_events=False).get('saslSupportedMechs', [])
+        if credentials in sock_info.negotiated_mechanisms:
+            # Asked for during the connection handshake.
+            mechs = sock_info.negotiated_mechanisms.pop(credentials)
+        else:
+            source = credentials.source
+            cmd = SON([
+                ('ismaster', 1),
+                ('saslSupportedMechs', source + '.' + credentials.username)])
+            mechs = sock_info.command(
+                source, cmd, publish_events=False).get(
+                    'saslSupportedMechs', [])
         if 'SCRAM-SHA-256' in mechs:
             return _authenticate_scram(credentials, sock_info, 'SCRAM-SHA-256')
         else:
@@ -544,6 +671,69 @@ def _authenticate_default(credentials, sock_info):
         return _authenticate_mongo_cr(credentials, sock_info)
 
 
+class _AuthContext(object):
+    """Speculative authentication: the first authentication message for
+    `credentials`, sent with the connection handshake's ismaster command.
+
+    Servers that support it reply with a speculativeAuthenticate document,
+    which the authentication mechanism continues from. Other servers ignore
+    it and we authenticate with separate commands as usual.
+    """
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self.speculative_authenticate = None
+
+    @staticmethod
+    def from_credentials(credentials):
+        """Return an _AuthContext, or None if `credentials` uses a mechanism
+        that can't be speculated."""
+        ctx_class = _SPECULATIVE_AUTH_MAP.get(credentials.mechanism)
+        if ctx_class:
+            return ctx_class(credentials)
+        return None
+
+    def speculate_command(self):
+        """The speculativeAuthenticate document for the ismaster command."""
+        raise NotImplementedError
+
+    def parse_response(self, ismaster):
+        self.speculative_authenticate = ismaster.speculative_authenticate
+
+    def speculate_succeeded(self):
+        return bool(self.speculative_authenticate)
+
+
+class _ScramContext(_AuthContext):
+    def __init__(self, credentials, mechanism):
+        super(_ScramContext, self).__init__(credentials)
+        self.mechanism = mechanism
+        self.conversation = _scram_conversation(credentials, mechanism)
+
+    def speculate_command(self):
+        # Run the conversation up to saslStart, the handshake sends it.
+        source, cmd = next(self.conversation)
+        cmd['db'] = source
+        return cmd
+
+
+class _X509Context(_AuthContext):
+    def speculate_command(self):
+        cmd = _x509_command(self.credentials)
+        cmd['db'] = self.credentials.source
+        return cmd
+
+
+_SPECULATIVE_AUTH_MAP = {
+    'MONGODB-X509': _X509Context,
+    'SCRAM-SHA-1': functools.partial(_ScramContext, mechanism='SCRAM-SHA-1'),
+    'SCRAM-SHA-256': functools.partial(_ScramContext,
+                                       mechanism='SCRAM-SHA-256'),
+    # The server chooses SCRAM-SHA-256 when it can.
+    'DEFAULT': functools.partial(_ScramContext, mechanism='SCRAM-SHA-256'),
+}
+
+
 _AUTH_MAP = {
     'CRAM-MD5': _authenticate_cram_md5,
     'GSSAPI': _authenticate_gssapi,
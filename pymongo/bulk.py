@@ -367,8 +367,9 @@ class _Bulk(object):
             self.collection.full_name, run.ops, True, acknowledged, concern,
             not self.ordered, self.collection.codec_options, bwc)
 
-    def execute_op_msg_no_results(self, sock_info, generator):
-        """Execute write commands with OP_MSG and w=0 writeConcern, unordered.
+    def execute_op_msg_no_results(self, sock_info, generator, ordered=False):
+        """Execute write commands with OP_MSG and w=0 writeConcern, unordered
+        unless `ordered` is True.
         """
         db_name = self.collection.database.name
         client = self.collection.database.client
@@ -381,7 +382,7 @@ class _Bulk(object):
 
         while run:
             cmd = SON([(_COMMANDS[run.op_type], self.collection.name),
-                       ('ordered', False),
+                       ('ordered', ordered),
                        ('writeConcern', {'w': 0})])
             bwc = _BulkWriteContext(db_name, cmd, sock_info, op_id,
                                     listeners, None)
@@ -110,6 +110,7 @@ def _parse_pool_options(options):
     """Parse connection pool options."""
     max_pool_size = options.get('maxpoolsize', common.MAX_POOL_SIZE)
     min_pool_size = options.get('minpoolsize', common.MIN_POOL_SIZE)
+    max_connecting = options.get('maxconnecting', common.MAX_CONNECTING)
     default_idle_seconds = common.validate_timeout_or_none(
         'maxidletimems', common.MAX_IDLE_TIME_MS)
     max_idle_time_seconds = options.get('maxidletimems', default_idle_seconds)
@@ -126,6 +127,12 @@ def _parse_pool_options(options):
     compression_settings = CompressionSettings(
         options.get('compressors', []),
         options.get('zlibcompressionlevel', -1))
+    # Hedged reads wait for a percentile of the server's recent latency,
+    # outlier detection compares servers' latencies.
+    track_operation_latency = (
+        options.get('trackoperationlatency', common.TRACK_OPERATION_LATENCY)
+        or options.get('hedgedreads', common.HEDGED_READS)
+        or options.get('outlierdetection', common.OUTLIER_DETECTION))
     ssl_context, ssl_match_hostname = _parse_ssl_options(options)
     return PoolOptions(max_pool_size,
                        min_pool_size,
@@ -136,7 +143,9 @@ def _parse_pool_options(options):
                        _EventListeners(event_listeners),
                        appname,
                        driver,
-                       compression_settings)
+                       compression_settings,
+                       max_connecting,
+                       track_operation_latency)
 
 
 class ClientOptions(object):
@@ -163,10 +172,25 @@ class ClientOptions(object):
         self.__connect = options.get('connect')
         self.__heartbeat_frequency = options.get(
             'heartbeatfrequencyms', common.HEARTBEAT_FREQUENCY)
+        self.__max_heartbeat_frequency = options.get(
+            'maxheartbeatfrequencyms', common.MAX_HEARTBEAT_FREQUENCY)
+        self.__heartbeat_jitter = options.get(
+            'heartbeatjitter', common.HEARTBEAT_JITTER)
         self.__retry_writes = options.get('retrywrites', common.RETRY_WRITES)
         self.__retry_reads = options.get('retryreads', common.RETRY_READS)
+        self.__hedged_reads = options.get('hedgedreads', common.HEDGED_READS)
+        self.__hedge_delay_percentile = options.get(
+            'hedgedelaypercentile', common.HEDGE_DELAY_PERCENTILE)
         self.__server_selector = options.get(
             'server_selector', any_server_selector)
+        self.__server_selection_policy = options.get(
+            'serverselectionpolicy', common.SERVER_SELECTION_POLICY)
+        self.__server_monitoring_mode = options.get(
+            'servermonitoringmode', common.SERVER_MONITORING_MODE)
+        self.__outlier_detection = options.get(
+            'outlierdetection', common.OUTLIER_DETECTION)
+        self.__outlier_ejection_time = options.get(
+            'outlierejectiontimems', common.OUTLIER_EJECTION_TIME)
 
     @property
     def _options(self):
@@ -202,11 +226,46 @@ class ClientOptions(object):
     def server_selector(self):
         return self.__server_selector
 
+    @property
+    def server_selection_policy(self):
+        """How to choose among the suitable servers: 'random' or
+        'leastOutstanding'."""
+        return self.__server_selection_policy
+
+    @property
+    def server_monitoring_mode(self):
+        """How servers are monitored: 'threaded', 'multiplexed', or
+        'streaming'."""
+        return self.__server_monitoring_mode
+
+    @property
+    def outlier_detection(self):
+        """Whether to stop selecting servers with many errors or slow
+        operations for a while."""
+        return self.__outlier_detection
+
+    @property
+    def outlier_ejection_time(self):
+        """How long in seconds an outlier is first ejected for."""
+        return self.__outlier_ejection_time
+
     @property
     def heartbeat_frequency(self):
         """The monitoring frequency in seconds."""
         return self.__heartbeat_frequency
 
+    @property
+    def max_heartbeat_frequency(self):
+        """The longest interval in seconds between checks of a server that
+        isn't changing, or None."""
+        return self.__max_heartbeat_frequency
+
+    @property
+    def heartbeat_jitter(self):
+        """The fraction by which the interval between checks is randomly
+        lengthened or shortened."""
+        return self.__heartbeat_jitter
+
     @property
     def pool_options(self):
         """A :class:`~pymongo.pool.PoolOptions` instance."""
@@ -241,3 +300,14 @@ class ClientOptions(object):
     def retry_reads(self):
         """If this instance should retry supported read operations."""
         return self.__retry_reads
+
+    @property
+    def hedged_reads(self):
+        """If this instance should hedge supported read operations."""
+        return self.__hedged_reads
+
+    @property
+    def hedge_delay_percentile(self):
+        """The percentile of a server's recent operation latency to wait
+        for before hedging a read."""
+        return self.__hedge_delay_percentile
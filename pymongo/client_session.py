@@ -705,6 +705,16 @@ class ClientSession(object):
             if recovery_token:
                 self._transaction.recovery_token = recovery_token
 
+    def _adopt(self, other):
+        """Continue in the server session of `other`, an implicit session
+        that won a hedged read for this one, and end `other` with this
+        session's former server session."""
+        self._server_session, other._server_session = (
+            other._server_session, self._server_session)
+        self._advance_cluster_time(other.cluster_time)
+        self._advance_operation_time(other.operation_time)
+        other._end_session(lock=True)
+
     @property
     def has_ended(self):
         """True if this session is finished."""
@@ -782,11 +792,12 @@ class ClientSession(object):
 
 
 class _ServerSession(object):
-    def __init__(self):
+    def __init__(self, generation=0):
         # Ensure id is type 4, regardless of CodecOptions.uuid_representation.
         self.session_id = {'id': Binary(uuid.uuid4().bytes, 4)}
         self.last_use = monotonic.time()
         self._transaction_id = 0
+        self.generation = generation
 
     def timed_out(self, session_timeout_minutes):
         idle_seconds = monotonic.time() - self.last_use
@@ -808,6 +819,19 @@ class _ServerSessionPool(collections.deque):
 
     This class is not thread-safe, access it while holding the Topology lock.
     """
+    def __init__(self, *args, **kwargs):
+        super(_ServerSessionPool, self).__init__(*args, **kwargs)
+        self.generation = 0
+
+    def reset(self):
+        """Discard all sessions, and sessions in use when they are returned.
+
+        Called in the child process after os.fork(), the sessions belong to
+        the parent.
+        """
+        self.generation += 1
+        self.clear()
+
     def pop_all(self):
         ids = []
         while self:
@@ -828,15 +852,17 @@ class _ServerSessionPool(collections.deque):
             if not s.timed_out(session_timeout_minutes):
                 return s
 
-        return _ServerSession()
+        return _ServerSession(self.generation)
 
     def return_server_session(self, server_session, session_timeout_minutes):
         self._clear_stale(session_timeout_minutes)
-        if not server_session.timed_out(session_timeout_minutes):
+        if (server_session.generation == self.generation and
+                not server_session.timed_out(session_timeout_minutes)):
             self.appendleft(server_session)
 
     def return_server_session_no_lock(self, server_session):
-        self.appendleft(server_session)
+        if server_session.generation == self.generation:
+            self.appendleft(server_session)
 
     def _clear_stale(self, session_timeout_minutes):
         # Clear stale sessions. The least recently used are on the right.
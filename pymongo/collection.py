@@ -43,6 +43,7 @@ from pymongo.helpers import (_check_write_command_response,
                              _raise_last_error)
 from pymongo.message import _UNICODE_REPLACE_CODEC_OPTIONS
 from pymongo.operations import IndexModel
+from pymongo.pipelined_writer import PipelinedWriter
 from pymongo.read_preferences import ReadPreference
 from pymongo.results import (BulkWriteResult,
                              DeleteResult,
@@ -387,6 +388,42 @@ class Collection(common.BaseObject):
                       DeprecationWarning, stacklevel=2)
         return BulkOperationBuilder(self, False, bypass_document_validation)
 
+    def pipelined_writer(self, max_buffer_size=1000,
+                         bypass_document_validation=False):
+        """Get a writer that streams unacknowledged writes to this
+        collection.
+
+        Writes are buffered and sent to the primary on a dedicated
+        connection without waiting for replies. Consecutive writes of the
+        same type are sent as a single command, as OP_MSG messages with the
+        ``moreToCome`` flag on MongoDB 3.6+::
+
+          >>> with db.test.pipelined_writer() as writer:
+          ...     for i in range(10000):
+          ...         writer.insert_one({'i': i})
+          ...     writer.flush()
+          ...
+          >>> db.test.count_documents({})
+          10000
+
+        Write errors are not reported. Call
+        :meth:`~pymongo.pipelined_writer.PipelinedWriter.flush` to wait until
+        the server has processed every write sent so far.
+
+        :Parameters:
+          - `max_buffer_size` (optional): The number of writes to buffer
+            before they are sent. Defaults to 1000.
+          - `bypass_document_validation` (optional): If ``True``, allows the
+            writes to opt-out of document level validation. Not supported
+            with unacknowledged writes on MongoDB 3.2+.
+
+        Returns a :class:`~pymongo.pipelined_writer.PipelinedWriter`.
+
+        .. versionadded:: 3.9
+        """
+        return PipelinedWriter(self, max_buffer_size,
+                               bypass_document_validation)
+
     def initialize_ordered_bulk_op(self, bypass_document_validation=False):
         """**DEPRECATED** - Initialize an ordered batch of write operations.
 
@@ -1389,6 +1426,10 @@ class Collection(common.BaseObject):
 
           - The `limit` option can not be used with an exhaust cursor.
 
+          - With MongoDB 4.2+ the initial batch is returned by a find
+            command and the remaining batches are streamed over OP_MSG after
+            a single getMore.
+
           - Exhaust cursors are not supported by mongos and can not be
             used with a sharded cluster.
 
@@ -1699,7 +1740,7 @@ class Collection(common.BaseObject):
             return result['n']
 
         return self.__database.client._retryable_read(
-            _cmd, self._read_preference_for(session), session)
+            _cmd, self._read_preference_for(session), session, hedge=True)
 
     def count(self, filter=None, session=None, **kwargs):
         """**DEPRECATED** - Get the number of documents in this collection.
@@ -2283,6 +2324,8 @@ class Collection(common.BaseObject):
             "batchSize", kwargs.pop("batchSize", None))
 
         dollar_out = pipeline and '$out' in pipeline[-1]
+        # Don't run a pipeline that writes on two servers.
+        writes = dollar_out or (pipeline and '$merge' in pipeline[-1])
         # If the server does not support the "cursor" option we
         # ignore useCursor and batchSize.
         def _cmd(session, server, sock_info, slave_ok):
@@ -2345,7 +2388,7 @@ class Collection(common.BaseObject):
 
         return self.__database.client._retryable_read(
             _cmd, self._read_preference_for(session), session,
-            retryable=not dollar_out)
+            retryable=not dollar_out, hedge=not writes)
 
     def aggregate(self, pipeline, session=None, **kwargs):
         """Perform an aggregation using the aggregation framework on this
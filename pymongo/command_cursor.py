@@ -95,6 +95,12 @@ class CommandCursor(object):
         """
         self.__die(True)
 
+    def _discard(self):
+        """Kill this cursor without ending its session, which belongs to
+        the cursor returned by the hedged read this one lost."""
+        self.__session = None
+        self.__die()
+
     def batch_size(self, batch_size):
         """Limits the number of documents returned in one batch. Each batch
         requires a round trip to the server. It can be adjusted to optimize
@@ -73,6 +73,19 @@ SERVER_SELECTION_TIMEOUT = 30
 # Spec requires at least 500ms between ismaster calls.
 MIN_HEARTBEAT_INTERVAL = 0.5
 
+# Default value for maxHeartbeatFrequencyMS: don't back off.
+MAX_HEARTBEAT_FREQUENCY = None
+
+# With maxHeartbeatFrequencyMS, how much longer to wait after each heartbeat
+# that finds a server unchanged.
+HEARTBEAT_BACKOFF = 2
+
+# Default value for heartbeatJitter.
+HEARTBEAT_JITTER = 0
+
+# Spec requires at least 60s between SRV rescans.
+MIN_SRV_RESCAN_INTERVAL = 60
+
 # Default connectTimeout in seconds.
 CONNECT_TIMEOUT = 20.0
 
@@ -82,9 +95,18 @@ MAX_POOL_SIZE = 100
 # Default value for minPoolSize.
 MIN_POOL_SIZE = 0
 
+# Default value for maxConnecting.
+MAX_CONNECTING = 2
+
 # Default value for maxIdleTimeMS.
 MAX_IDLE_TIME_MS = None
 
+# Default value for maxIdleTimeMS in seconds.
+MAX_IDLE_TIME_SEC = None
+
+# Default value for waitQueueTimeoutMS in seconds.
+WAIT_QUEUE_TIMEOUT = None
+
 # Default value for localThresholdMS.
 LOCAL_THRESHOLD_MS = 15
 
@@ -94,6 +116,37 @@ RETRY_WRITES = True
 # Default value for retryReads.
 RETRY_READS = True
 
+# Values for serverSelectionPolicy.
+_SERVER_SELECTION_POLICIES = frozenset(['random', 'leastOutstanding'])
+
+# Default value for serverSelectionPolicy.
+SERVER_SELECTION_POLICY = 'random'
+
+# Default value for trackOperationLatency.
+TRACK_OPERATION_LATENCY = False
+
+# Default value for hedgedReads.
+HEDGED_READS = False
+
+# Default value for hedgeDelayPercentile.
+HEDGE_DELAY_PERCENTILE = 95
+
+# Default value for outlierDetection.
+OUTLIER_DETECTION = False
+
+# Default value for outlierEjectionTimeMS in seconds.
+OUTLIER_EJECTION_TIME = 30
+
+# How often to look for servers much slower than the others, in seconds.
+OUTLIER_CHECK_INTERVAL = 1
+
+# Values for serverMonitoringMode.
+_SERVER_MONITORING_MODES = frozenset(
+    ['threaded', 'multiplexed', 'streaming'])
+
+# Default value for serverMonitoringMode.
+SERVER_MONITORING_MODE = 'threaded'
+
 # mongod/s 2.6 and above return code 59 when a command doesn't exist.
 COMMAND_NOT_FOUND_CODES = (59,)
 
@@ -297,6 +350,24 @@ def validate_positive_float_or_zero(option, value):
     return validate_positive_float(option, value)
 
 
+def validate_fraction(option, value):
+    """Validates that 'value' is a float from 0 up to, but excluding, 1."""
+    if value == 0 or value == "0":
+        return 0
+    value = validate_positive_float(option, value)
+    if value >= 1:
+        raise ValueError("%s must be less than 1" % (option,))
+    return value
+
+
+def validate_percentile(option, value):
+    """Validates that 'value' is a float greater than 0 and less than 100."""
+    value = validate_positive_float(option, value)
+    if value >= 100:
+        raise ValueError("%s must be less than 100" % (option,))
+    return value
+
+
 def validate_timeout_or_none(option, value):
     """Validates a timeout specified in milliseconds returning
     a value in floating point seconds.
@@ -306,6 +377,14 @@ def validate_timeout_or_none(option, value):
     return validate_positive_float(option, value) / 1000.0
 
 
+def validate_timeout(option, value):
+    """Validates a timeout specified in milliseconds returning
+    a value in floating point seconds for the case where None and 0 are
+    errors.
+    """
+    return validate_positive_float(option, value) / 1000.0
+
+
 def validate_timeout_or_zero(option, value):
     """Validates a timeout specified in milliseconds returning
     a value in floating point seconds for the case where None is an error
@@ -369,6 +448,22 @@ def validate_uuid_representation(dummy, value):
                          "%s" % (value, tuple(_UUID_REPRESENTATIONS)))
 
 
+def validate_server_selection_policy(option, value):
+    """Validate the serverSelectionPolicy option."""
+    if value not in _SERVER_SELECTION_POLICIES:
+        raise ValueError("%s must be one of %s, not %r" % (
+            option, tuple(sorted(_SERVER_SELECTION_POLICIES)), value))
+    return value
+
+
+def validate_server_monitoring_mode(option, value):
+    """Validate the serverMonitoringMode option."""
+    if value not in _SERVER_MONITORING_MODES:
+        raise ValueError("%s must be one of %s, not %r" % (
+            option, tuple(sorted(_SERVER_MONITORING_MODES)), value))
+    return value
+
+
 def validate_read_preference_tags(name, value):
     """Parse readPreferenceTags if passed as a client kwarg.
     """
@@ -597,9 +692,19 @@ NONSPEC_OPTIONS_VALIDATOR_MAP = {
     'connect': validate_boolean_or_string,
     'driver': validate_driver_or_none,
     'fsync': validate_boolean_or_string,
+    'hedgedelaypercentile': validate_percentile,
+    'hedgedreads': validate_boolean_or_string,
+    'heartbeatjitter': validate_fraction,
+    'maxheartbeatfrequencyms': validate_timeout_or_none,
+    'maxconnecting': validate_positive_integer,
     'minpoolsize': validate_non_negative_integer,
+    'outlierdetection': validate_boolean_or_string,
+    'outlierejectiontimems': validate_timeout,
+    'servermonitoringmode': validate_server_monitoring_mode,
+    'serverselectionpolicy': validate_server_selection_policy,
     'socketkeepalive': validate_boolean_or_string,
     'tlscrlfile': validate_readable,
+    'trackoperationlatency': validate_boolean_or_string,
     'tz_aware': validate_boolean_or_string,
     'unicode_decode_error_handler': validate_unicode_decode_error_handler,
     'uuidrepresentation': validate_uuid_representation,
@@ -665,8 +770,10 @@ VALIDATORS.update(KW_VALIDATORS)
 TIMEOUT_OPTIONS = [
     'connecttimeoutms',
     'heartbeatfrequencyms',
+    'maxheartbeatfrequencyms',
     'maxidletimems',
     'maxstalenessseconds',
+    'outlierejectiontimems',
     'serverselectiontimeoutms',
     'sockettimeoutms',
     'waitqueuetimeoutms',
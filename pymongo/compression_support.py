@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 import warnings
 
 try:
@@ -29,6 +30,23 @@ except ImportError:
     _HAVE_ZLIB = False
 
 from pymongo.monitoring import _SENSITIVE_COMMANDS
+from pymongo.monotonic import time as _time
+
+try:
+    # Python 3.7+. Measure the CPU time used by the current thread only.
+    from time import thread_time as _cpu_time
+except ImportError:
+    try:
+        # Python 3.3+ on Linux.
+        from resource import getrusage as _getrusage, RUSAGE_THREAD
+
+        def _cpu_time():
+            usage = _getrusage(RUSAGE_THREAD)
+            return usage.ru_utime + usage.ru_stime
+    except ImportError:
+        # No per-thread CPU clock: other threads' CPU time would be
+        # counted, so measure wall-clock time instead.
+        _cpu_time = _time
 
 _SUPPORTED_COMPRESSORS = set(["snappy", "zlib"])
 _NO_COMPRESSION = set(['ismaster'])
@@ -76,13 +94,157 @@ class CompressionSettings(object):
         self.compressors = compressors
         self.zlib_compression_level = zlib_compression_level
 
-    def get_compression_context(self, compressors):
+    def get_compression_context(self, compressors, statistics=None):
         if compressors:
             chosen = compressors[0]
             if chosen == "snappy":
-                return SnappyContext()
+                return SnappyContext(statistics)
             elif chosen == "zlib":
-                return ZlibContext(self.zlib_compression_level)
+                return ZlibContext(self.zlib_compression_level, statistics)
+
+
+class _CompressionCounters(object):
+    """Compression counters for a pool or for a single command name."""
+
+    __slots__ = ('messages_compressed', 'messages_decompressed',
+                 'messages_skipped',
+                 'bytes_before_compression', 'bytes_after_compression',
+                 'bytes_before_decompression', 'bytes_after_decompression',
+                 'compress_time', 'decompress_time')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class CompressionStatistics(object):
+    """Wire protocol compression counters for a single connection pool.
+
+    Counters are kept for the pool as a whole and for each command name.
+    Times are CPU seconds spent in the compressor or decompressor. Before
+    Python 3.7 on platforms other than Linux, and on Python 2, they are
+    wall-clock seconds instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._total = _CompressionCounters()
+        self._commands = {}
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def _counters(self, command_name):
+        counters = self._commands.get(command_name)
+        if counters is None:
+            counters = self._commands[command_name] = _CompressionCounters()
+        return self._total, counters
+
+    def record_compressed(self, command_name, before, after, duration):
+        """Record one outgoing message compressed from `before` bytes to
+        `after` bytes in `duration` seconds."""
+        with self._lock:
+            for counters in self._counters(command_name):
+                counters.messages_compressed += 1
+                counters.bytes_before_compression += before
+                counters.bytes_after_compression += after
+                counters.compress_time += duration
+
+    def record_decompressed(self, command_name, before, after, duration):
+        """Record one incoming message decompressed from `before` bytes to
+        `after` bytes in `duration` seconds."""
+        with self._lock:
+            for counters in self._counters(command_name):
+                counters.messages_decompressed += 1
+                counters.bytes_before_decompression += before
+                counters.bytes_after_decompression += after
+                counters.decompress_time += duration
+
+    def record_skipped(self, command_name):
+        """Record one message sent uncompressed on a compressed connection."""
+        with self._lock:
+            for counters in self._counters(command_name):
+                counters.messages_skipped += 1
+
+    def snapshot(self):
+        """Return a copy of the counters as a dict, like::
+
+            {'total': {'messages_compressed': 10, ...},
+             'commands': {'insert': {'messages_compressed': 4, ...}, ...}}
+        """
+        with self._lock:
+            return {
+                'total': self._total.as_dict(),
+                'commands': dict(
+                    (name, counters.as_dict())
+                    for name, counters in self._commands.items())}
+
+
+class _CompressionContext(object):
+    """Base class for the per-connection compression contexts.
+
+    Each SocketInfo owns its context so the `last_compression` and
+    `last_decompression` tuples of (bytes before, bytes after, seconds) are
+    only ever touched by the thread using the connection.
+    """
+
+    compressor_name = None
+
+    def __init__(self, statistics=None):
+        self.statistics = statistics
+        self.last_compression = None
+        self.last_decompression = None
+
+    def compress_message(self, command_name, data):
+        """Compress `data`, recording statistics under `command_name`."""
+        start = _cpu_time()
+        compressed = self.compress(data)
+        duration = _cpu_time() - start
+        self.last_compression = (len(data), len(compressed), duration)
+        if self.statistics is not None:
+            self.statistics.record_compressed(
+                command_name, len(data), len(compressed), duration)
+        return compressed
+
+    def decompress_message(self, command_name, data, compressor_id):
+        """Decompress a reply, recording statistics under `command_name`."""
+        start = _cpu_time()
+        decompressed = decompress(data, compressor_id)
+        duration = _cpu_time() - start
+        self.last_decompression = (len(data), len(decompressed), duration)
+        if self.statistics is not None:
+            self.statistics.record_decompressed(
+                command_name, len(data), len(decompressed), duration)
+        return decompressed
+
+    def record_skipped(self, command_name):
+        if self.statistics is not None:
+            self.statistics.record_skipped(command_name)
+
+    def reset_last(self):
+        self.last_compression = self.last_decompression = None
+
+    def last_exchange(self):
+        """A dict describing the last compressed message and reply, for
+        :class:`~pymongo.monitoring.CommandSucceededEvent`, or None.
+        """
+        if self.last_compression is None and self.last_decompression is None:
+            return None
+        info = {'compressor': self.compressor_name}
+        if self.last_compression is not None:
+            before, after, duration = self.last_compression
+            info['bytes_before_compression'] = before
+            info['bytes_after_compression'] = after
+            info['compress_time'] = duration
+        if self.last_decompression is not None:
+            before, after, duration = self.last_decompression
+            info['bytes_before_decompression'] = before
+            info['bytes_after_decompression'] = after
+            info['decompress_time'] = duration
+        return info
 
 
 def _zlib_no_compress(data):
@@ -91,18 +253,21 @@ def _zlib_no_compress(data):
     return b"".join([cobj.compress(data), cobj.flush()])
 
 
-class SnappyContext(object):
+class SnappyContext(_CompressionContext):
     compressor_id = 1
+    compressor_name = "snappy"
 
     @staticmethod
     def compress(data):
         return snappy.compress(data)
 
 
-class ZlibContext(object):
+class ZlibContext(_CompressionContext):
     compressor_id = 2
+    compressor_name = "zlib"
 
-    def __init__(self, level):
+    def __init__(self, level, statistics=None):
+        super(ZlibContext, self).__init__(statistics)
         # Jython zlib.compress doesn't support -1
         if level == -1:
             self.compress = zlib.compress
@@ -37,6 +37,7 @@ from pymongo.message import (_CursorAddress,
                              _RawBatchGetMore,
                              _Query,
                              _RawBatchQuery)
+from pymongo.monitoring import ConnectionClosedReason
 
 
 _QUERY_OPTIONS = {
@@ -83,9 +84,10 @@ class CursorType(object):
 class _SocketManager:
     """Used with exhaust cursors to ensure the socket is returned.
     """
-    def __init__(self, sock, pool):
+    def __init__(self, sock, pool, more_to_come):
         self.sock = sock
         self.pool = pool
+        self.more_to_come = more_to_come
         self.__closed = False
 
     def __del__(self):
@@ -298,8 +300,11 @@ class Cursor(object):
                 # If this is an exhaust cursor and we haven't completely
                 # exhausted the result set we *must* close the socket
                 # to stop the server from sending more data.
-                self.__exhaust_mgr.sock.close()
-            else:
+                self.__exhaust_mgr.sock.close_socket(
+                    ConnectionClosedReason.ERROR)
+            if not (self.__exhaust_mgr and self.__exhaust_mgr.more_to_come):
+                # The server isn't streaming this cursor's results (yet), so
+                # closing the socket doesn't kill the cursor on the server.
                 address = _CursorAddress(
                     self.__address, self.__collection.full_name)
                 if synchronous:
@@ -978,10 +983,14 @@ class Cursor(object):
             raise
 
         self.__address = response.address
-        if self.__exhaust and not self.__exhaust_mgr:
+        if self.__exhaust:
             # 'response' is an ExhaustResponse.
-            self.__exhaust_mgr = _SocketManager(response.socket_info,
-                                                response.pool)
+            if not self.__exhaust_mgr:
+                self.__exhaust_mgr = _SocketManager(response.socket_info,
+                                                    response.pool,
+                                                    response.more_to_come)
+            else:
+                self.__exhaust_mgr.more_to_come = response.more_to_come
 
         cmd_name = operation.name
         docs = response.docs
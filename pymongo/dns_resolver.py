@@ -0,0 +1,209 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Cached DNS lookups of server addresses and mongodb+srv:// seed lists."""
+
+import os
+import socket
+import threading
+
+try:
+    from dns import resolver as _dns_resolver
+    _HAVE_DNSPYTHON = True
+except ImportError:
+    _HAVE_DNSPYTHON = False
+
+from bson.py3compat import PY3
+from pymongo.errors import ConfigurationError
+from pymongo.monotonic import time as _time
+
+# getaddrinfo doesn't report the records' TTL, cache its results this long.
+_ADDRESS_TTL = 30
+
+# The most (host, port, family, socktype) lookups to cache.
+_MAX_CACHED_ADDRESSES = 1000
+
+
+if PY3:
+    # dnspython can return bytes or str from various parts
+    # of its API depending on version. We always want str.
+    def maybe_decode(text):
+        if isinstance(text, bytes):
+            return text.decode()
+        return text
+else:
+    def maybe_decode(text):
+        return text
+
+
+class Resolver(object):
+    """Does PyMongo's DNS lookups: host lookups with getaddrinfo, SRV and
+    TXT lookups with dnspython.
+
+    To substitute another implementation, for example a stub in tests,
+    subclass Resolver and pass an instance to :func:`set_resolver`.
+    """
+
+    def supports_srv(self):
+        """Can this resolver look up SRV and TXT records?"""
+        return _HAVE_DNSPYTHON
+
+    def getaddrinfo(self, host, port, family, socktype):
+        """Return (getaddrinfo results, seconds to cache them)."""
+        return socket.getaddrinfo(host, port, family, socktype), _ADDRESS_TTL
+
+    def srv_records(self, name):
+        """Return ([(host, port), ...], TTL) for the SRV records `name`."""
+        results = _dns_resolver.query(name, 'SRV')
+        nodes = [(maybe_decode(res.target.to_text(omit_final_dot=True)),
+                  res.port) for res in results]
+        return nodes, results.rrset.ttl
+
+    def txt_records(self, name):
+        """Return the TXT records `name` as a list of strings."""
+        try:
+            results = _dns_resolver.query(name, 'TXT')
+        except (_dns_resolver.NoAnswer, _dns_resolver.NXDOMAIN):
+            return []
+        return [b''.join(res.strings).decode('utf-8') for res in results]
+
+
+class _AddressCache(object):
+    """getaddrinfo results, each kept until its TTL expires."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Maps (host, port, family, socktype) to (results, expiration).
+        self._entries = {}
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and _time() < entry[1]:
+            return entry[0]
+        return None
+
+    def put(self, key, addrinfos, ttl):
+        if ttl <= 0:
+            return
+        now = _time()
+        with self._lock:
+            if len(self._entries) >= _MAX_CACHED_ADDRESSES:
+                self._entries = dict(
+                    (k, v) for k, v in self._entries.items() if now < v[1])
+                if len(self._entries) >= _MAX_CACHED_ADDRESSES:
+                    self._entries.clear()
+            self._entries[key] = (addrinfos, now + ttl)
+
+    def invalidate(self, host, port):
+        with self._lock:
+            for key in list(self._entries):
+                if key[:2] == (host, port):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_resolver = Resolver()
+_address_cache = _AddressCache()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_address_cache._after_fork)
+
+
+def get_resolver():
+    """The current :class:`Resolver`."""
+    return _resolver
+
+
+def set_resolver(resolver):
+    """Use `resolver`, a :class:`Resolver`, for all DNS lookups from now on,
+    or the default Resolver if `resolver` is None. Clears the cache."""
+    global _resolver
+    _resolver = resolver if resolver is not None else Resolver()
+    _address_cache.clear()
+
+
+def getaddrinfo(host, port, family, socktype):
+    """Like socket.getaddrinfo, cached for the resolver's TTL."""
+    key = (host, port, family, socktype)
+    addrinfos = _address_cache.get(key)
+    if addrinfos is None:
+        addrinfos, ttl = _resolver.getaddrinfo(host, port, family, socktype)
+        _address_cache.put(key, addrinfos, ttl)
+    return list(addrinfos)
+
+
+def getaddrinfo_cached(host, port, family, socktype):
+    """The cached results of :func:`getaddrinfo`, or None. Never blocks on
+    a DNS lookup."""
+    addrinfos = _address_cache.get((host, port, family, socktype))
+    if addrinfos is None:
+        return None
+    return list(addrinfos)
+
+
+def invalidate(host, port):
+    """Forget the cached addresses of (host, port), for example after
+    failing to connect to all of them."""
+    _address_cache.invalidate(host, port)
+
+
+def get_srv_hosts(fqdn):
+    """Get ([(host, port), ...], TTL) from the SRV records for a
+    mongodb+srv:// hostname.
+
+    Raises ConfigurationError if the lookup fails or returns hosts outside
+    the hostname's parent domain.
+    """
+    plist = fqdn.split(".")[1:]
+    slen = len(plist)
+    if slen < 2:
+        raise ConfigurationError("Invalid URI host")
+    if not _resolver.supports_srv():
+        raise ConfigurationError('The "dnspython" module must be '
+                                 'installed to use mongodb+srv:// URIs')
+    try:
+        nodes, ttl = _resolver.srv_records('_mongodb._tcp.' + fqdn)
+    except Exception as exc:
+        raise ConfigurationError(str(exc))
+    if not nodes:
+        raise ConfigurationError("No SRV records for %s" % (fqdn,))
+    for node in nodes:
+        try:
+            nlist = node[0].split(".")[1:][-slen:]
+        except Exception:
+            raise ConfigurationError("Invalid SRV host")
+        if plist != nlist:
+            raise ConfigurationError("Invalid SRV host")
+    return nodes, ttl
+
+
+def get_txt_options(fqdn):
+    """Get the URI options from the TXT record for a mongodb+srv://
+    hostname, or None."""
+    try:
+        records = _resolver.txt_records(fqdn)
+    except Exception as exc:
+        raise ConfigurationError(str(exc))
+    if not records:
+        return None
+    if len(records) > 1:
+        raise ConfigurationError('Only one TXT record is supported')
+    return records[0]
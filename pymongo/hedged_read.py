@@ -0,0 +1,242 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Race a read against a slow server with the same read on another."""
+
+import heapq
+import itertools
+import os
+import threading
+import traceback
+
+from pymongo.monotonic import time as _time
+
+# Seconds the timer thread waits for another hedged read before it exits.
+_TIMER_IDLE_TIMEOUT = 10
+
+
+class _Timer(object):
+    """Calls functions after a delay on one shared thread, so that a read
+    answered within its hedge delay doesn't start a thread."""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        # [call time, sequence number, function or None if cancelled].
+        self._heap = []
+        self._counter = itertools.count()
+        self._thread = None
+
+    def schedule(self, delay, func):
+        """Call `func` in `delay` seconds. Returns a handle for cancel()."""
+        if self._pid != os.getpid():
+            # After os.fork() the child doesn't have the parent's thread.
+            self._reset()
+        with self._lock:
+            entry = [_time() + delay, next(self._counter), func]
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                thread = threading.Thread(target=self._run,
+                                          name="pymongo_hedge_timer_thread")
+                thread.daemon = True
+                self._thread = thread
+                thread.start()
+            self._condition.notify()
+            return entry
+
+    def cancel(self, entry):
+        with self._lock:
+            entry[2] = None
+
+    def _run(self):
+        with self._lock:
+            while True:
+                now = _time()
+                while self._heap and self._heap[0][0] <= now:
+                    func = heapq.heappop(self._heap)[2]
+                    if func is None:
+                        continue
+                    self._lock.release()
+                    try:
+                        func()
+                    except Exception:
+                        traceback.print_exc()
+                    finally:
+                        self._lock.acquire()
+                    now = _time()
+                if self._heap:
+                    self._condition.wait(self._heap[0][0] - now)
+                    continue
+                self._condition.wait(_TIMER_IDLE_TIMEOUT)
+                if not self._heap:
+                    break
+            self._thread = None
+
+
+_timer = _Timer()
+
+
+class _Attempt(object):
+    """One of a hedged read's requests."""
+
+    def __init__(self, server):
+        self.server = server
+        # The session the request runs in, set by the target.
+        self.session = None
+        self.sock_info = None
+        self.cancelled = False
+        self.won = False
+        self.error = None
+
+
+class HedgedRead(object):
+    """Runs a read's request to one server and, if it's slow, another
+    request to a second server on its own thread.
+
+    The first request to succeed wins, the others are cancelled by
+    interrupting their connections. If all of them fail, the first
+    request's error is raised.
+    """
+
+    def __init__(self, target):
+        # target(hedged_read, attempt) runs the read on attempt.server. It
+        # calls started() once it has a connection, then succeeded() or
+        # failed().
+        self._target = target
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._attempts = []
+        self._pending = 0
+        self._done = False
+        self._result = None
+        self._winner = None
+        self._error = None
+        self._timer_entry = None
+
+    def _add_attempt(self, server):
+        with self._lock:
+            if self._done:
+                return None
+            attempt = _Attempt(server)
+            self._attempts.append(attempt)
+            self._pending += 1
+            return attempt
+
+    def run(self, server, hedge_server=None, delay=None):
+        """Send the read to `server` on this thread and wait for its reply.
+        If it hasn't answered within `delay` seconds, start(hedge_server).
+        """
+        attempt = self._add_attempt(server)
+        if hedge_server is not None:
+            self._timer_entry = _timer.schedule(
+                delay, lambda: self.start(hedge_server))
+        self._target(self, attempt)
+
+    def start(self, server):
+        """Send the read to `server` on another thread, unless the race is
+        already over."""
+        attempt = self._add_attempt(server)
+        if attempt is None:
+            return
+        thread = threading.Thread(target=self._target, args=(self, attempt),
+                                  name="pymongo_hedged_read_thread")
+        thread.daemon = True
+        thread.start()
+
+    def wait(self, timeout=None):
+        """Wait up to `timeout` seconds, or forever, for a request to
+        succeed or for all of them to fail. Return True if one did."""
+        with self._lock:
+            if timeout is None:
+                while not self._done:
+                    self._condition.wait()
+            else:
+                deadline = _time() + timeout
+                while not self._done:
+                    remaining = deadline - _time()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            return self._done
+
+    def outcome(self):
+        """The winning request's result, or raise the first error."""
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            return self._result
+
+    def winner(self):
+        """The _Attempt that succeeded, or None."""
+        with self._lock:
+            return self._winner
+
+    def started(self, attempt, sock_info):
+        """Called with the attempt's connection before it sends the read.
+        Returns False if the race is already over."""
+        with self._lock:
+            if self._done:
+                return False
+            attempt.sock_info = sock_info
+            return True
+
+    def finished(self, attempt):
+        """Called when the attempt is done with its connection. Returns True
+        if it was cancelled, then the caller must close the connection: it
+        may have been shut down after the reply arrived."""
+        with self._lock:
+            attempt.sock_info = None
+            return attempt.cancelled
+
+    def succeeded(self, attempt, result):
+        """Record the attempt's result. Returns False if another attempt
+        already won, then the caller must dispose of the result."""
+        with self._lock:
+            self._pending -= 1
+            if self._done:
+                return False
+            self._done = True
+            self._result = result
+            self._winner = attempt
+            attempt.won = True
+            for loser in self._attempts:
+                if loser is attempt:
+                    continue
+                loser.cancelled = True
+                # Only interrupt connections still in use, see finished().
+                if loser.sock_info is not None:
+                    loser.sock_info.cancel()
+            self._condition.notify_all()
+        self._cancel_timer()
+        return True
+
+    def failed(self, attempt, error):
+        """Record the attempt's error."""
+        with self._lock:
+            self._pending -= 1
+            attempt.error = error
+            if self._done or self._pending:
+                return
+            self._done = True
+            self._error = self._attempts[0].error
+            self._condition.notify_all()
+        self._cancel_timer()
+
+    def _cancel_timer(self):
+        if self._timer_entry is not None:
+            _timer.cancel(self._timer_entry)
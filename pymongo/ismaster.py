@@ -135,6 +135,12 @@ class IsMaster(object):
     def logical_session_timeout_minutes(self):
         return self._doc.get('logicalSessionTimeoutMinutes')
 
+    @property
+    def topology_version(self):
+        """The topologyVersion of servers that can stream ismaster replies,
+        else None."""
+        return self._doc.get('topologyVersion')
+
     @property
     def is_writable(self):
         return self._is_writable
@@ -156,3 +162,20 @@ class IsMaster(object):
     @property
     def compressors(self):
         return self._doc.get('compression')
+
+    @property
+    def sasl_supported_mechs(self):
+        """Supported authentication mechanisms for the current user.
+
+        For example::
+
+            >>> ismaster.sasl_supported_mechs
+            ["SCRAM-SHA-1", "SCRAM-SHA-256"]
+
+        """
+        return self._doc.get('saslSupportedMechs', [])
+
+    @property
+    def speculative_authenticate(self):
+        """The speculativeAuthenticate field."""
+        return self._doc.get('speculativeAuthenticate')
@@ -258,10 +258,19 @@ class _Query(object):
     def namespace(self):
         return _UJOIN % (self.db, self.coll)
 
+    def with_session(self, session):
+        """A copy of this query that runs in another session."""
+        return self.__class__(
+            self.flags, self.db, self.coll, self.ntoskip, self.spec,
+            self.fields, self.codec_options, self.read_preference, self.limit,
+            self.batch_size, self.read_concern, self.collation, session,
+            self.client)
+
     def use_command(self, sock_info, exhaust):
         use_find_cmd = False
         if sock_info.max_wire_version >= 4:
-            if not exhaust:
+            # MongoDB 4.2+ streams exhaust getMore replies over OP_MSG.
+            if not exhaust or sock_info.max_wire_version >= 8:
                 use_find_cmd = True
         elif not self.read_concern.ok_for_legacy:
             raise ConfigurationError(
@@ -378,7 +387,9 @@ class _GetMore(object):
 
     def use_command(self, sock_info, exhaust):
         sock_info.validate_session(self.client, self.session)
-        return sock_info.max_wire_version >= 4 and not exhaust
+        if exhaust:
+            return sock_info.max_wire_version >= 8
+        return sock_info.max_wire_version >= 4
 
     def as_command(self, sock_info):
         """Return a getMore command document for this query."""
@@ -405,8 +416,13 @@ class _GetMore(object):
         if use_cmd:
             spec = self.as_command(sock_info)[0]
             if sock_info.op_msg_enabled:
+                if self.exhaust_mgr:
+                    # Ask the server to stream the remaining batches.
+                    flags = _OpMsg.EXHAUST_ALLOWED
+                else:
+                    flags = 0
                 request_id, msg, size, _ = _op_msg(
-                    0, spec, self.db, ReadPreference.PRIMARY,
+                    flags, spec, self.db, ReadPreference.PRIMARY,
                     False, False, self.codec_options,
                     ctx=sock_info.compression_context)
                 return request_id, msg, size
@@ -471,9 +487,19 @@ class _CursorAddress(tuple):
 _pack_compression_header = struct.Struct("<iiiiiiB").pack
 _COMPRESSION_HEADER_SIZE = 25
 
-def _compress(operation, data, ctx):
+# Names used for compression statistics when no command name is available.
+_OP_NAMES = {
+    2001: 'update',
+    2002: 'insert',
+    2004: 'query',
+    2005: 'getMore',
+    2006: 'delete',
+    2013: 'msg',
+}
+
+def _compress(operation, data, ctx, name=None):
     """Takes message data, compresses it, and adds an OP_COMPRESSED header."""
-    compressed = ctx.compress(data)
+    compressed = ctx.compress_message(name or _OP_NAMES[operation], data)
     request_id = _randint()
 
     header = _pack_compression_header(
@@ -651,7 +677,7 @@ def _op_msg_compressed(flags, command, identifier, docs, check_keys, opts,
     """Internal OP_MSG message helper."""
     msg, total_size, max_bson_size = _op_msg_no_header(
         flags, command, identifier, docs, check_keys, opts)
-    rid, msg = _compress(2013, msg, ctx)
+    rid, msg = _compress(2013, msg, ctx, next(iter(command)))
     return rid, msg, total_size, max_bson_size
 
 
@@ -725,7 +751,11 @@ def _query_compressed(options, collection_name, num_to_skip,
         field_selector,
         opts,
         check_keys)
-    rid, msg = _compress(2004, op_query, ctx)
+    if collection_name.endswith('.$cmd'):
+        name = next(iter(query))
+    else:
+        name = 'find'
+    rid, msg = _compress(2004, op_query, ctx, name)
     return rid, msg, max_bson_size
 
 
@@ -917,6 +947,7 @@ class _BulkWriteContext(object):
                     duration)
             raise
         finally:
+            self._reset_compression()
             self.start_time = datetime.datetime.now()
         return result
 
@@ -928,7 +959,7 @@ class _BulkWriteContext(object):
             self._start(request_id, docs)
             start = datetime.datetime.now()
         try:
-            reply = self.sock_info.write_command(request_id, msg)
+            reply = self.sock_info.write_command(request_id, msg, self.name)
             if self.publish:
                 duration = (datetime.datetime.now() - start) + duration
                 self._succeed(request_id, reply, duration)
@@ -938,6 +969,7 @@ class _BulkWriteContext(object):
                 self._fail(request_id, exc.details, duration)
             raise
         finally:
+            self._reset_compression()
             self.start_time = datetime.datetime.now()
         return reply
 
@@ -952,9 +984,18 @@ class _BulkWriteContext(object):
 
     def _succeed(self, request_id, reply, duration):
         """Publish a CommandSucceededEvent."""
+        compression = None
+        if self.compress:
+            compression = self.sock_info.compression_context.last_exchange()
         self.listeners.publish_command_success(
             duration, reply, self.name,
-            request_id, self.sock_info.address, self.op_id)
+            request_id, self.sock_info.address, self.op_id,
+            compression=compression)
+
+    def _reset_compression(self):
+        """Forget the sizes and times of the batch that was just sent."""
+        if self.compress:
+            self.sock_info.compression_context.reset_last()
 
     def _fail(self, request_id, failure, duration):
         """Publish a CommandFailedEvent."""
@@ -1161,7 +1202,8 @@ def _batched_op_msg_compressed(
     request_id, msg = _compress(
         2013,
         data,
-        ctx.sock_info.compression_context)
+        ctx.sock_info.compression_context,
+        ctx.name)
     return request_id, msg, to_send
 
 
@@ -1220,7 +1262,8 @@ def _batched_write_command_compressed(
     request_id, msg = _compress(
         2004,
         data,
-        ctx.sock_info.compression_context)
+        ctx.sock_info.compression_context,
+        ctx.name)
     return request_id, msg, to_send
 
 
@@ -1459,6 +1502,11 @@ class _OpMsg(object):
     UNPACK_FROM = struct.Struct("<IBi").unpack_from
     OP_CODE = 2013
 
+    # Flag bits.
+    CHECKSUM_PRESENT = 1
+    MORE_TO_COME = 1 << 1
+    EXHAUST_ALLOWED = 1 << 16  # Only present on requests.
+
     def __init__(self, flags, payload_document):
         self.flags = flags
         self.payload_document = payload_document
@@ -1485,11 +1533,16 @@ class _OpMsg(object):
         """Unpack a command response."""
         return self.unpack_response()[0]
 
+    @property
+    def more_to_come(self):
+        """Is the moreToCome bit set on this response?"""
+        return bool(self.flags & self.MORE_TO_COME)
+
     @classmethod
     def unpack(cls, msg):
         """Construct an _OpMsg from raw bytes."""
         flags, first_payload_type, first_payload_size = cls.UNPACK_FROM(msg)
-        if flags != 0:
+        if flags != 0 and flags != cls.MORE_TO_COME:
             raise ProtocolError("Unsupported OP_MSG flags (%r)" % (flags,))
         if first_payload_type != 0:
             raise ProtocolError(
@@ -33,6 +33,7 @@ access:
 
 import contextlib
 import datetime
+import os
 import threading
 import warnings
 import weakref
@@ -45,6 +46,7 @@ from bson.py3compat import (integer_types,
 from bson.son import SON
 from pymongo import (common,
                      database,
+                     hedged_read,
                      helpers,
                      message,
                      periodic_executor,
@@ -64,7 +66,9 @@ from pymongo.errors import (AutoReconnect,
                             OperationFailure,
                             PyMongoError,
                             ServerSelectionTimeoutError)
+from pymongo.monitoring import ConnectionClosedReason
 from pymongo.read_preferences import ReadPreference
+from pymongo.response import Response
 from pymongo.server_selectors import (writable_preferred_server_selector,
                                       writable_server_selector)
 from pymongo.server_type import SERVER_TYPE
@@ -77,6 +81,19 @@ from pymongo.uri_parser import (_CaseInsensitiveDictionary,
 from pymongo.write_concern import DEFAULT_WRITE_CONCERN
 
 
+# Every live MongoClient, reinitialized in the child after os.fork().
+_CLIENTS = weakref.WeakValueDictionary()
+
+
+def _after_fork_child():
+    for client in list(_CLIENTS.values()):
+        client._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_child)
+
+
 class MongoClient(common.BaseObject):
     """
     A client-side representation of a MongoDB cluster.
@@ -155,7 +172,10 @@ class MongoClient(common.BaseObject):
         <https://github.com/mongodb/specifications/blob/master/source/
         initial-dns-seedlist-discovery/initial-dns-seedlist-discovery.rst>`_
         for more details. Note that the use of SRV URIs implicitly enables
-        TLS support. Pass tls=false in the URI to override.
+        TLS support. Pass tls=false in the URI to override. If the
+        deployment is a sharded cluster, the SRV records are polled in the
+        background and mongoses added to or removed from them are added to
+        or removed from the client's topology.
 
         .. note:: MongoClient creation will block waiting for answers from
           DNS when mongodb+srv:// URIs are used.
@@ -211,6 +231,12 @@ class MongoClient(common.BaseObject):
           - `minPoolSize` (optional): The minimum required number of concurrent
             connections that the pool will maintain to each connected server.
             Default is 0.
+          - `maxConnecting` (optional): The maximum number of connections that
+            each pool can establish concurrently. Operations that need a new
+            connection while this many are being established wait for a
+            connection to be returned to the pool instead. The pool is also
+            filled to `minPoolSize` with this many connections established
+            in parallel. Defaults to 2.
           - `maxIdleTimeMS` (optional): The maximum number of milliseconds that
             a connection can remain idle in the pool before being removed and
             replaced. Defaults to `None` (no limit).
@@ -234,6 +260,22 @@ class MongoClient(common.BaseObject):
             waiting, multiple server monitoring operations may be carried out,
             each controlled by `connectTimeoutMS`. Defaults to ``30000`` (30
             seconds).
+          - `serverSelectionPolicy`: (string) How to choose among the
+            servers suitable for an operation and within the latency window
+            set by `localThresholdMS`. With ``'random'``, the default, a
+            server is chosen at random. With ``'leastOutstanding'``, two
+            suitable servers are picked at random and the operation goes to
+            the one with fewer operations in progress from this client,
+            weighted by its recent operation latency. This steers traffic
+            away from an overloaded or slow mongos or secondary.
+          - `trackOperationLatency`: (boolean) Whether to measure how long
+            each server takes to run operations. If ``True``, a server's round
+            trip time, which decides whether it is within the
+            `localThresholdMS` latency window, is the greater of its
+            heartbeat round trip time and the median duration of the
+            operations run on it in the last minute. Reads then avoid a
+            secondary that answers heartbeats quickly but runs queries
+            slowly. Defaults to ``False``.
           - `waitQueueTimeoutMS`: (integer or None) How long (in milliseconds)
             a thread will wait for a socket from the pool if the pool has no
             free sockets. Defaults to ``None`` (no timeout).
@@ -243,6 +285,31 @@ class MongoClient(common.BaseObject):
           - `heartbeatFrequencyMS`: (optional) The number of milliseconds
             between periodic server checks, or None to accept the default
             frequency of 10 seconds.
+          - `maxHeartbeatFrequencyMS`: (optional) If set, each check that
+            finds a server unchanged doubles the time until its next check,
+            up to this many milliseconds. After a change or an error, or
+            while a replica set has no primary, servers are checked every
+            `heartbeatFrequencyMS` again. Defaults to ``None``: check every
+            `heartbeatFrequencyMS`.
+          - `heartbeatJitter`: (float) Lengthen or shorten each interval
+            between server checks by a random fraction of up to this much,
+            from 0 to 1, so many clients started at once don't check the
+            same servers at the same moments. For example, with ``0.1``
+            and the default `heartbeatFrequencyMS`, checks are 9 to 11
+            seconds apart. Defaults to ``0``.
+          - `serverMonitoringMode`: (string) With ``'threaded'``, the
+            default, each server is monitored by its own thread. With
+            ``'multiplexed'``, one thread per client checks all servers,
+            with non-blocking sockets. This saves a thread for each server
+            when connecting to a large sharded cluster. Hostnames are still
+            resolved by blocking DNS lookups, which are cached. With
+            ``'streaming'``, servers that support it push a new ismaster
+            reply as soon as their state changes, for example when a primary
+            steps down, instead of waiting to be polled every
+            `heartbeatFrequencyMS`. Each such server is then monitored by
+            two threads: one waits for ismaster replies, the other measures
+            the round trip time on a separate connection. Servers that don't
+            support streaming are polled as with ``'threaded'``.
           - `appname`: (string or None) The name of the application that
             created this MongoClient instance. MongoDB 3.4 and newer will
             print this value in the server log upon establishing each
@@ -305,6 +372,41 @@ class MongoClient(common.BaseObject):
             replica set failovers. For an exact definition of which errors
             trigger a retry, see the `retryable reads specification
             <https://github.com/mongodb/specifications/blob/master/source/retryable-reads/retryable-reads.rst>`_.
+          - `hedgedReads`: (boolean) Whether to hedge slow reads. If
+            ``True``, a read that hasn't been answered within the
+            `hedgeDelayPercentile` of its server's recent operation
+            latency is sent to a second server matching the read
+            preference as well. The first reply is used and the other
+            request is cancelled by closing its connection. Only
+            :meth:`~pymongo.collection.Collection.find`,
+            :meth:`~pymongo.collection.Collection.find_one`,
+            :meth:`~pymongo.collection.Collection.aggregate` without
+            ``$out`` or ``$merge``, and
+            :meth:`~pymongo.collection.Collection.count_documents` are
+            hedged, with a read preference other than ``PRIMARY`` and
+            without an explicit session. Implies
+            ``trackOperationLatency=True``. Defaults to ``False``.
+          - `hedgeDelayPercentile`: (float) With `hedgedReads`, the
+            percentile of a server's operation latency in the last minute
+            to wait for before hedging a read on it, greater than 0 and less
+            than 100. Defaults to ``95``: about one read in twenty is
+            hedged.
+          - `outlierDetection`: (boolean) Whether to stop selecting a server
+            for a while when it's an outlier: when at least half of 10 or
+            more operations on it in the last 30 seconds, or 5 in a row,
+            failed with a network error or timeout, or when its median
+            operation latency is over 50ms and over three times that of the
+            servers of the same type. At most half of the servers are
+            ejected at once, and an ejected server is still selected if no
+            other server is suitable. After its ejection, a server is
+            selected more and more often over `outlierEjectionTimeMS` until
+            it's restored. Ejections and restorations are published to
+            :class:`~pymongo.monitoring.ServerListener` instances. Implies
+            ``trackOperationLatency=True``. Defaults to ``False``.
+          - `outlierEjectionTimeMS`: (integer) With `outlierDetection`, how
+            long an outlier is ejected for the first time. Each consecutive
+            ejection is this much longer, up to ten times as long. Defaults
+            to ``30000`` (30 seconds).
 
           - `socketKeepAlive`: (boolean) **DEPRECATED** Whether to send
             periodic keep-alive packets on connected sockets. Defaults to
@@ -474,6 +576,20 @@ class MongoClient(common.BaseObject):
         .. versionchanged:: 3.9
            Added the ``retryReads`` keyword argument and URI option.
            Added the ``tlsInsecure`` keyword argument and URI option.
+           Added the ``maxConnecting`` keyword argument and URI option.
+           Added the ``serverSelectionPolicy`` keyword argument and URI
+           option.
+           Added the ``trackOperationLatency`` keyword argument and URI
+           option.
+           Added the ``serverMonitoringMode`` keyword argument and URI
+           option, with the ``'threaded'``, ``'multiplexed'``, and
+           ``'streaming'`` modes.
+           Added the ``maxHeartbeatFrequencyMS`` and ``heartbeatJitter``
+           keyword arguments and URI options.
+           Added the ``hedgedReads`` and ``hedgeDelayPercentile`` keyword
+           arguments and URI options.
+           Added the ``outlierDetection`` and ``outlierEjectionTimeMS``
+           keyword arguments and URI options.
            The following keyword arguments and URI options were deprecated:
 
              - ``wTimeout`` was deprecated in favor of ``wTimeoutMS``.
@@ -583,6 +699,7 @@ class MongoClient(common.BaseObject):
         password = None
         dbase = None
         opts = {}
+        fqdn = None
         for entity in host:
             if "://" in entity:
                 res = uri_parser.parse_uri(
@@ -592,6 +709,7 @@ class MongoClient(common.BaseObject):
                 password = res["password"] or password
                 dbase = res["database"] or dbase
                 opts = res["options"]
+                fqdn = res["fqdn"]
             else:
                 seeds.update(uri_parser.split_hosts(entity, port))
         if not seeds:
@@ -667,7 +785,14 @@ class MongoClient(common.BaseObject):
             local_threshold_ms=options.local_threshold_ms,
             server_selection_timeout=options.server_selection_timeout,
             server_selector=options.server_selector,
-            heartbeat_frequency=options.heartbeat_frequency)
+            server_selection_policy=options.server_selection_policy,
+            server_monitoring_mode=options.server_monitoring_mode,
+            heartbeat_frequency=options.heartbeat_frequency,
+            max_heartbeat_frequency=options.max_heartbeat_frequency,
+            heartbeat_jitter=options.heartbeat_jitter,
+            outlier_detection=options.outlier_detection,
+            outlier_ejection_time=options.outlier_ejection_time,
+            fqdn=fqdn)
 
         self._topology = Topology(self._topology_settings)
         if connect:
@@ -691,6 +816,21 @@ class MongoClient(common.BaseObject):
         self_ref = weakref.ref(self, executor.close)
         self._kill_cursors_executor = executor
         executor.open()
+        _CLIENTS[id(self)] = self
+
+    def _after_fork(self):
+        """Reinitialize in the child process after os.fork().
+
+        Replaces this client's locks, clears its pools and server sessions,
+        and restarts its background threads, so the child's first operation
+        doesn't pay for the fork.
+        """
+        self.__lock = threading.Lock()
+        self.__index_cache_lock = threading.Lock()
+        # Cursors to kill belong to the parent.
+        self.__kill_cursors_queue = []
+        self._topology._after_fork()
+        self._kill_cursors_executor._after_fork()
 
     def _cache_credentials(self, source, credentials, connect=False):
         """Save a set of authentication credentials.
@@ -990,6 +1130,15 @@ class MongoClient(common.BaseObject):
         """
         return self.__options.pool_options.min_pool_size
 
+    @property
+    def max_connecting(self):
+        """The maximum number of connections that each pool can establish
+        concurrently. Defaults to 2.
+
+        .. versionadded:: 3.9
+        """
+        return self.__options.pool_options.max_connecting
+
     @property
     def max_idle_time_ms(self):
         """The maximum number of milliseconds that a connection can remain
@@ -1068,6 +1217,61 @@ class MongoClient(common.BaseObject):
         """If this instance should retry supported write operations."""
         return self.__options.retry_reads
 
+    def compression_statistics(self):
+        """Wire protocol compression counters for each known server.
+
+        Returns a dict mapping each server's (host, port) to a dict with the
+        counters for the server's connection pool as a whole (``'total'``)
+        and per command name (``'commands'``)::
+
+            >>> client = MongoClient(compressors='zlib')
+            >>> client.compression_statistics()[('localhost', 27017)]['total']
+            {'messages_compressed': 12, 'messages_decompressed': 12,
+             'messages_skipped': 2, 'bytes_before_compression': 4096,
+             'bytes_after_compression': 1024, ...}
+
+        Times (``compress_time`` and ``decompress_time``) are CPU seconds,
+        or wall-clock seconds before Python 3.7 on platforms other than
+        Linux and on Python 2.
+        ``messages_skipped`` counts messages sent uncompressed on a
+        compressed connection, like authentication commands. The dict is
+        empty unless the ``compressors`` option was given.
+
+        .. versionadded:: 3.9
+        """
+        return self._topology.compression_statistics()
+
+    def pool_statistics(self):
+        """Connection pool statistics for each known server.
+
+        Returns a dict mapping each server's (host, port) to a dict describing
+        its connection pool::
+
+            >>> client.pool_statistics()[('localhost', 27017)]
+            {'size': 5, 'in_use': 2, 'available': 3, 'waiters': 0,
+             'connections_created': 7,
+             'connections_closed': {'stale': 2},
+             'checkouts': 1000,
+             'checkout_failures': {},
+             'checkout_wait_time_histogram': [(1, 990), (5, 10), ...],
+             'checkout_wait_time_total': 0.2,
+             'checkout_wait_time_max': 0.004,
+             'tls_handshakes': 7,
+             'tls_sessions_resumed': 6}
+
+        See :class:`~pymongo.pool.PoolStatistics` for the counters. ``size``
+        is the number of connections, ``in_use`` the number checked out or
+        being established, ``available`` the number idle in the pool and
+        ``waiters`` the number of threads blocked waiting for a connection.
+        A steadily non-zero ``waiters`` count or a growing tail in the wait
+        time histogram means ``maxPoolSize`` is too small for the workload.
+        New TLS connections resume the server's most recent TLS session;
+        ``tls_sessions_resumed`` counts how many did.
+
+        .. versionadded:: 3.9
+        """
+        return self._topology.pool_statistics()
+
     def _is_writable(self):
         """Attempt to connect to a writable server, or return False.
         """
@@ -1272,26 +1476,34 @@ class MongoClient(common.BaseObject):
                     unpack_res)
 
         def _cmd(session, server, sock_info, slave_ok):
+            op = operation
+            if session is not operation.session:
+                # A hedged read's second request has its own session.
+                op = operation.with_session(session)
             return server.run_operation_with_response(
                 sock_info,
-                operation,
+                op,
                 slave_ok,
                 self._event_listeners,
                 exhaust,
                 unpack_res)
 
+        is_find = (isinstance(operation, message._Query) and
+                   operation.name == 'find')
         return self._retryable_read(
             _cmd, operation.read_preference, operation.session,
             address=address,
             retryable=isinstance(operation, message._Query),
-            exhaust=exhaust)
+            exhaust=exhaust,
+            hedge=is_find)
 
     @contextlib.contextmanager
     def _reset_on_error(self, server_address, session):
         """On "not master" or "node is recovering" errors reset the server
         according to the SDAM spec.
 
-        Unpin the session on transient transaction errors.
+        Unpin the session on transient transaction errors. Count network
+        errors and successes for outlier detection.
         """
         try:
             try:
@@ -1306,6 +1518,7 @@ class MongoClient(common.BaseObject):
             # Server Discovery And Monitoring Spec: "When an application
             # operation fails because of any network error besides a socket
             # timeout...."
+            self._topology.record_operation(server_address, True)
             raise
         except NotMasterError:
             # "When the client sees a "not master" error it MUST replace the
@@ -1316,6 +1529,7 @@ class MongoClient(common.BaseObject):
         except ConnectionFailure:
             # "Client MUST replace the server's description with type Unknown
             # ... MUST NOT request an immediate check of the server."
+            self._topology.record_operation(server_address, True)
             self.__reset_server(server_address)
             raise
         except OperationFailure as exc:
@@ -1324,6 +1538,8 @@ class MongoClient(common.BaseObject):
                 # shutting down.
                 self.__reset_server(server_address)
             raise
+        else:
+            self._topology.record_operation(server_address, False)
 
     def _retry_with_session(self, retryable, func, session, bulk):
         """Execute an operation with at most one consecutive retries
@@ -1406,17 +1622,27 @@ class MongoClient(common.BaseObject):
                 last_error = exc
 
     def _retryable_read(self, func, read_pref, session, address=None,
-                        retryable=True, exhaust=False):
+                        retryable=True, exhaust=False, hedge=False):
         """Execute an operation with at most one consecutive retries
 
         Returns func()'s return value on success. On error retries the same
         command once.
 
+        With hedged reads enabled, `hedge` means func() is idempotent and its
+        first attempt may run on two servers at once, see _hedged_read.
+
         Re-raises any exception thrown by func().
         """
         retryable = (retryable and
                      self.retry_reads
                      and not (session and session._in_transaction))
+        # An explicit session's reads must stay in order.
+        hedge = (hedge and
+                 self.__options.hedged_reads and
+                 address is None and
+                 not exhaust and
+                 read_pref != ReadPreference.PRIMARY and
+                 not (session and not session._implicit))
         last_error = None
         retrying = False
 
@@ -1426,6 +1652,11 @@ class MongoClient(common.BaseObject):
                     read_pref, session, address=address)
                 if not server.description.retryable_reads_supported:
                     retryable = False
+                if hedge and not retrying:
+                    other, delay = self._hedge_server(read_pref, server)
+                    if other is not None:
+                        return self._hedged_read(
+                            func, session, server, other, delay)
                 with self._slaveok_for_server(read_pref, server, session,
                                               exhaust=exhaust) as (sock_info,
                                                                    slave_ok):
@@ -1457,6 +1688,118 @@ class MongoClient(common.BaseObject):
                 retrying = True
                 last_error = exc
 
+    def _hedge_server(self, read_pref, server):
+        """Return (other server, delay) to hedge a read on `server` with, or
+        (None, None).
+
+        The delay is the hedgeDelayPercentile of the recent operation
+        latency on `server`: reads slower than that also go to another
+        server matching the read preference.
+        """
+        topology = self._get_topology()
+        address = server.description.address
+        delay = topology.operation_latency(
+            address, self.__options.hedge_delay_percentile)
+        if delay is None:
+            return None, None
+        return topology.select_other_server(read_pref, address), delay
+
+    def _hedged_read(self, func, session, server, other, delay):
+        """Run func on `server` on this thread and, if it hasn't answered
+        within `delay` seconds, on `other` on another thread as well.
+        Return the first result and cancel the other request. If both fail,
+        raise the first one's error.
+
+        A session can't be used by two threads at once: the request to
+        `other` runs in its own implicit session. A server cursor must be
+        continued in the session that created it, so if that request wins,
+        a CommandCursor it returned keeps its session and `session` is
+        ended, else `session` adopts its server session.
+        """
+        def target(race, attempt):
+            if attempt.server is server or session is None:
+                attempt.session = session
+            else:
+                attempt.session = self._ensure_session()
+                if attempt.session is None:
+                    # Sessions are no longer supported, don't hedge.
+                    race.failed(attempt, ConfigurationError(
+                        "Sessions are not supported"))
+                    return
+            try:
+                self._hedge_attempt(race, attempt, func)
+            finally:
+                if attempt.session is not session and not attempt.won:
+                    attempt.session.end_session()
+
+        race = hedged_read.HedgedRead(target)
+        race.run(server, other, delay)
+        race.wait()
+        result = race.outcome()
+        hedge_session = race.winner().session
+        if hedge_session is not session:
+            if isinstance(result, CommandCursor):
+                # The cursor owns the session it was created in.
+                session.end_session()
+            else:
+                # Continue the cursor in the session it was created in.
+                session._adopt(hedge_session)
+        return result
+
+    def _hedge_attempt(self, race, attempt, func):
+        """Run one of a hedged read's requests."""
+        server = attempt.server
+        session = attempt.session
+        try:
+            with self._hedge_errors(attempt, session):
+                with server.get_socket(self.__all_credentials) as sock_info:
+                    if not race.started(attempt, sock_info):
+                        return
+                    try:
+                        # Hedged reads don't use the primary read preference.
+                        result = func(session, server, sock_info, True)
+                    finally:
+                        if race.finished(attempt):
+                            sock_info.close_socket(
+                                ConnectionClosedReason.ERROR)
+        except Exception as exc:
+            race.failed(attempt, exc)
+        else:
+            if not race.succeeded(attempt, result):
+                self._discard_hedged_result(result)
+
+    @contextlib.contextmanager
+    def _hedge_errors(self, attempt, session):
+        """Like _reset_on_error, but ignore the errors of a request that
+        lost a hedged read, its connection was closed on purpose."""
+        try:
+            yield
+        except BaseException:
+            if not attempt.cancelled:
+                with self._reset_on_error(attempt.server.description.address,
+                                          session):
+                    raise
+            raise
+        else:
+            self._topology.record_operation(
+                attempt.server.description.address, False)
+
+    def _discard_hedged_result(self, result):
+        """Kill the server cursor opened by a request that finished after
+        losing a hedged read."""
+        if isinstance(result, CommandCursor):
+            result._discard()
+        elif isinstance(result, Response):
+            if result.from_command:
+                cursor = result.docs[0]['cursor']
+                cursor_id = cursor['id']
+                address = message._CursorAddress(result.address, cursor['ns'])
+            else:
+                cursor_id = result.data.cursor_id
+                address = result.address
+            if cursor_id:
+                self._close_cursor(cursor_id, address)
+
     def _retryable_write(self, retryable, func, session):
         """Internal retryable write helper."""
         with self._tmp_session(session) as s:
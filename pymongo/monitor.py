@@ -14,17 +14,107 @@
 
 """Class to monitor a MongoDB server on a background thread."""
 
+import atexit
+import errno
+import os
+import random
+import socket
+import threading
 import weakref
 
-from pymongo import common, periodic_executor
-from pymongo.errors import OperationFailure
+try:
+    from ssl import SSLWantReadError as _SSLWantReadError
+    from ssl import SSLWantWriteError as _SSLWantWriteError
+except ImportError:
+    class _SSLWantReadError(Exception):
+        pass
+
+    class _SSLWantWriteError(Exception):
+        pass
+
+from bson import DEFAULT_CODEC_OPTIONS
+from bson.son import SON
+from pymongo import (common,
+                     dns_resolver,
+                     helpers,
+                     message,
+                     network,
+                     periodic_executor,
+                     pool as pool_module)
+from pymongo.errors import ConnectionFailure, OperationFailure, ProtocolError
+from pymongo.ismaster import IsMaster
+from pymongo.monitoring import ConnectionClosedReason
+from pymongo.message import _OpMsg, _UNPACK_REPLY
+from pymongo.network import _UNPACK_HEADER, _errno_from_exception
 from pymongo.server_type import SERVER_TYPE
 from pymongo.monotonic import time as _time
-from pymongo.read_preferences import MovingAverage
+from pymongo.read_preferences import MovingAverage, ReadPreference
 from pymongo.server_description import ServerDescription
+from pymongo.topology_description import TOPOLOGY_TYPE
+
+
+class _MonitorBase(object):
+    def __init__(self, server_description, pool, topology_settings):
+        self._server_description = server_description
+        self._pool = pool
+        self._settings = topology_settings
+        self._avg_round_trip_time = MovingAverage()
+        self._heartbeat_interval = topology_settings.heartbeat_frequency
+        self._listeners = self._settings._pool_options.event_listeners
+        pub = self._listeners is not None
+        self._publish = pub and self._listeners.enabled_for_server_heartbeat
+
+    def _new_description(self, response, round_trip_time, awaited=False):
+        """Record a successful heartbeat and return a ServerDescription.
+
+        An awaited heartbeat's duration is how long the server waited to
+        push the reply, not a round trip time.
+        """
+        address = self._server_description.address
+        if not awaited:
+            self._avg_round_trip_time.add_sample(round_trip_time)
+        avg_rtt = self._avg_round_trip_time.get()
+        # A server that answers heartbeats quickly but is slow to run
+        # operations isn't near, use the greater of the two.
+        op_latency = self._topology.operation_latency(address)
+        if op_latency is not None:
+            avg_rtt = max(avg_rtt, op_latency)
+        sd = ServerDescription(
+            address=address,
+            ismaster=response,
+            round_trip_time=avg_rtt)
+        if self._publish:
+            self._listeners.publish_server_heartbeat_succeeded(
+                address, round_trip_time, response)
+        return sd
 
+    def _next_heartbeat_interval(self, previous, current):
+        """Seconds until the heartbeat after the one that changed the
+        server's description from `previous` to `current`.
 
-class Monitor(object):
+        With max_heartbeat_frequency the interval doubles while the server
+        is unchanged, and returns to heartbeat_frequency after a change or
+        an error, or while a replica set has no primary.
+        """
+        settings = self._settings
+        if (settings.max_heartbeat_frequency is None or
+                current.error is not None or
+                previous._topology_state() != current._topology_state() or
+                self._topology.description.topology_type ==
+                TOPOLOGY_TYPE.ReplicaSetNoPrimary):
+            self._heartbeat_interval = settings.heartbeat_frequency
+        else:
+            self._heartbeat_interval = min(
+                self._heartbeat_interval * common.HEARTBEAT_BACKOFF,
+                settings.max_heartbeat_frequency)
+        interval = self._heartbeat_interval
+        jitter = settings.heartbeat_jitter
+        if jitter:
+            interval *= random.uniform(1 - jitter, 1 + jitter)
+        return max(interval, common.MIN_HEARTBEAT_INTERVAL)
+
+
+class Monitor(_MonitorBase):
     def __init__(
             self,
             server_description,
@@ -39,13 +129,8 @@ class Monitor(object):
         The Topology is weakly referenced. The Pool must be exclusive to this
         Monitor.
         """
-        self._server_description = server_description
-        self._pool = pool
-        self._settings = topology_settings
-        self._avg_round_trip_time = MovingAverage()
-        self._listeners = self._settings._pool_options.event_listeners
-        pub = self._listeners is not None
-        self._publish = pub and self._listeners.enabled_for_server_heartbeat
+        super(Monitor, self).__init__(
+            server_description, pool, topology_settings)
 
         # We strongly reference the executor and it weakly references us via
         # this closure. When the monitor is freed, stop the executor soon.
@@ -56,11 +141,14 @@ class Monitor(object):
             Monitor._run(monitor)
             return True
 
+        self._streaming = (
+            self._settings.server_monitoring_mode == 'streaming')
         executor = periodic_executor.PeriodicExecutor(
             interval=self._settings.heartbeat_frequency,
             min_interval=common.MIN_HEARTBEAT_INTERVAL,
             target=target,
-            name="pymongo_server_monitor_thread")
+            name="pymongo_server_monitor_thread",
+            long_running=self._streaming)
 
         self._executor = executor
 
@@ -68,6 +156,15 @@ class Monitor(object):
         self_ref = weakref.ref(self, executor.close)
         self._topology = weakref.proxy(topology, executor.close)
 
+        self._rtt_monitor = None
+        # The connection an awaited ismaster is blocked on, or None.
+        self._stream_sock = None
+        if self._streaming:
+            self._rtt_monitor = _RttMonitor(
+                topology._create_pool_for_monitor(server_description.address),
+                topology_settings,
+                self._avg_round_trip_time)
+
     def open(self):
         """Start monitoring, or restart after a fork.
 
@@ -81,6 +178,14 @@ class Monitor(object):
         open() restarts the monitor after closing.
         """
         self._executor.close()
+        if self._rtt_monitor is not None:
+            self._rtt_monitor.close()
+
+        # Interrupt the stream, the server may not reply for
+        # heartbeatFrequencyMS.
+        sock_info = self._stream_sock
+        if sock_info is not None:
+            sock_info.cancel()
 
         # Increment the pool_id and maybe close the socket. If the executor
         # thread has the socket checked out, it will be closed when checked in.
@@ -88,19 +193,128 @@ class Monitor(object):
 
     def join(self, timeout=None):
         self._executor.join(timeout)
+        if self._rtt_monitor is not None:
+            self._rtt_monitor.join(timeout)
+
+    def _after_fork(self):
+        """Reinitialize in the child process after os.fork() and restart
+        monitoring if it was running."""
+        self._pool._after_fork()
+        self._executor._after_fork()
+        if self._rtt_monitor is not None:
+            self._rtt_monitor._after_fork()
 
     def request_check(self):
-        """If the monitor is sleeping, wake and check the server soon."""
+        """If the monitor is sleeping, wake and check the server soon.
+
+        A streaming monitor is already waiting for the server's next state
+        change, so the request only takes effect once the stream ends.
+        """
         self._executor.wake()
 
     def _run(self):
         try:
+            previous = self._server_description
             self._server_description = self._check_with_retry()
             self._topology.on_change(self._server_description)
+            self._executor.update_interval(self._next_heartbeat_interval(
+                previous, self._server_description))
+            # If the stream fails, check and stream again at once, unless
+            # it fails right away; then wait for the next heartbeat.
+            while self._can_stream() and self._stream():
+                self._server_description = self._check_with_retry()
+                self._topology.on_change(self._server_description)
         except ReferenceError:
             # Topology was garbage-collected.
             self.close()
 
+    def _can_stream(self):
+        return (self._streaming and
+                not self._executor._stopped and
+                self._server_description.topology_version is not None)
+
+    def _stream(self):
+        """Wait for the server to push ismaster replies until the stream
+        ends or the monitor is closed.
+
+        Returns True if the stream failed after a reply, or after lasting
+        at least the minimum heartbeat interval.
+        """
+        # Measure the round trip time while the stream lasts.
+        self._rtt_monitor.open()
+        address = self._server_description.address
+        max_await_time = self._settings.heartbeat_frequency
+        cmd = SON([('ismaster', 1),
+                   ('topologyVersion',
+                    self._server_description.topology_version),
+                   ('maxAwaitTimeMS', int(max_await_time * 1000))])
+        cluster_time = self._topology.max_cluster_time()
+        if cluster_time is not None:
+            cmd['$clusterTime'] = cluster_time
+        request_id, msg, _, _ = message._op_msg(
+            _OpMsg.EXHAUST_ALLOWED, cmd, 'admin', ReadPreference.PRIMARY,
+            False, False, DEFAULT_CODEC_OPTIONS)
+        stream_start = _time()
+        received = False
+        with self._pool.get_socket({}) as sock_info:
+            # The server replies within maxAwaitTimeMS even if nothing
+            # changes.
+            sock_info.sock.settimeout(
+                self._pool.opts.connect_timeout + max_await_time)
+            # Unless the server ends the stream, replies may still be in
+            # flight: don't reuse the connection.
+            ended = False
+            self._stream_sock = sock_info
+            try:
+                if self._executor._stopped:
+                    # Closed before close() could see the connection.
+                    return False
+                sock_info.send_message(msg, 0)
+                while not self._executor._stopped:
+                    if self._publish:
+                        self._listeners.publish_server_heartbeat_started(
+                            address)
+                    start = _time()
+                    try:
+                        # Later replies answer the server's previous reply.
+                        reply = sock_info.receive_message(request_id)
+                        request_id = None
+                        response = reply.command_response()
+                        helpers._check_command_response(response)
+                    except ReferenceError:
+                        raise
+                    except Exception as error:
+                        if self._executor._stopped:
+                            # Interrupted by close().
+                            return False
+                        if self._publish:
+                            self._listeners.publish_server_heartbeat_failed(
+                                address, _time() - start, error)
+                        self._topology.reset_pool(address)
+                        return received or (_time() - stream_start >=
+                                            common.MIN_HEARTBEAT_INTERVAL)
+                    received = True
+                    self._server_description = self._new_description(
+                        IsMaster(response), _time() - start, awaited=True)
+                    self._topology.on_change(self._server_description)
+                    if not reply.more_to_come:
+                        # Not streaming after all, poll instead.
+                        ended = True
+                        return False
+                # The monitor was closed.
+                return False
+            except ConnectionFailure:
+                # Couldn't send the command. Poll instead.
+                if not self._executor._stopped:
+                    self._topology.reset_pool(address)
+                return False
+            finally:
+                self._stream_sock = None
+                if ended:
+                    sock_info.sock.settimeout(self._pool.opts.socket_timeout)
+                else:
+                    sock_info.close_socket(ConnectionClosedReason.ERROR)
+
     def _check_with_retry(self):
         """Call ismaster once or twice. Reset server's pool on error.
 
@@ -156,16 +370,7 @@ class Monitor(object):
             self._listeners.publish_server_heartbeat_started(address)
         with self._pool.get_socket({}) as sock_info:
             response, round_trip_time = self._check_with_socket(sock_info)
-            self._avg_round_trip_time.add_sample(round_trip_time)
-            sd = ServerDescription(
-                address=address,
-                ismaster=response,
-                round_trip_time=self._avg_round_trip_time.get())
-            if self._publish:
-                self._listeners.publish_server_heartbeat_succeeded(
-                    address, round_trip_time, response)
-
-            return sd
+            return self._new_description(response, round_trip_time)
 
     def _check_with_socket(self, sock_info):
         """Return (IsMaster, round_trip_time).
@@ -182,3 +387,676 @@ class Monitor(object):
             self._topology.receive_cluster_time(
                 exc.details.get('$clusterTime'))
             raise
+
+
+class _RttMonitor(object):
+    def __init__(self, pool, topology_settings, moving_average):
+        """Measure a server's round trip time on a connection of its own,
+        while a streaming Monitor's connection waits for ismaster replies.
+
+        Adds samples to the Monitor's MovingAverage. The Pool must be
+        exclusive to this _RttMonitor.
+        """
+        self._pool = pool
+        self._moving_average = moving_average
+
+        def target():
+            monitor = self_ref()
+            if monitor is None:
+                return False  # Stop the executor.
+            _RttMonitor._run(monitor)
+            return True
+
+        executor = periodic_executor.PeriodicExecutor(
+            interval=topology_settings.heartbeat_frequency,
+            min_interval=common.MIN_HEARTBEAT_INTERVAL,
+            target=target,
+            name="pymongo_server_rtt_thread")
+
+        self._executor = executor
+        self_ref = weakref.ref(self, executor.close)
+
+    def open(self):
+        self._executor.open()
+
+    def close(self):
+        self._executor.close()
+        self._pool.reset()
+
+    def join(self, timeout=None):
+        self._executor.join(timeout)
+
+    def _after_fork(self):
+        self._pool._after_fork()
+        self._executor._after_fork()
+
+    def _run(self):
+        try:
+            with self._pool.get_socket({}) as sock_info:
+                start = _time()
+                sock_info.ismaster(self._pool.opts.metadata, None)
+                self._moving_average.add_sample(_time() - start)
+        except Exception:
+            # The Monitor reports errors, try again next time.
+            self._pool.reset()
+
+
+# The states of a MultiplexedMonitor's heartbeat.
+(_IDLE, _RESOLVING, _CONNECTING, _TLS_HANDSHAKE, _SENDING,
+ _RECEIVING) = range(6)
+
+_WOULD_BLOCK = frozenset([errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR])
+
+
+def _deadline(timeout):
+    if timeout is None:
+        return None
+    return _time() + timeout
+
+
+class _Resolution(object):
+    """A DNS lookup a MultiplexedMonitor started on a helper thread."""
+
+    def __init__(self):
+        self.addrinfos = None
+        self.error = None
+        self.done = False
+
+
+class _WouldBlock(Exception):
+    """Raised by a MultiplexedMonitor when it must wait for its socket."""
+
+    def __init__(self, want_write):
+        self.want_write = want_write
+
+
+class MultiplexedMonitor(_MonitorBase):
+    def __init__(
+            self,
+            server_description,
+            topology,
+            pool,
+            topology_settings):
+        """Like Monitor, but without a thread of its own: the Topology's
+        MonitorMultiplexer calls ismaster for all its MultiplexedMonitors on
+        one thread, with non-blocking sockets.
+
+        The Pool only supplies the connection options, the monitor makes its
+        own connection. The Topology is weakly referenced.
+        """
+        super(MultiplexedMonitor, self).__init__(
+            server_description, pool, topology_settings)
+        self._multiplexer = topology._monitor_multiplexer
+        self._topology = weakref.proxy(topology)
+        # The rest is only used on the multiplexer's thread.
+        self._sock = None
+        self._state = _IDLE
+        self._want_write = False
+        # When the current step of the heartbeat times out.
+        self._deadline = None
+        self._next_check = _time()
+        self._check_requested = False
+        self._last_check = None
+        self._retry = False
+        self._first_error = None
+        self._check_start = None
+        self._addrinfos = []
+        self._resolution = None
+        self._connect_error = None
+        self._performed_handshake = False
+        self._max_wire_version = 0
+        self._request_id = None
+        self._out = b''
+        self._in = bytearray()
+        self._send_start = None
+
+    def open(self):
+        """Start monitoring. Multiple calls have no effect."""
+        self._multiplexer.add(self)
+
+    def close(self):
+        """Stop monitoring. open() restarts the monitor after closing."""
+        self._multiplexer.remove(self)
+
+    def join(self, timeout=None):
+        pass
+
+    def _after_fork(self):
+        """Discard the parent's connection in the child after os.fork().
+
+        The Topology restarts its MonitorMultiplexer.
+        """
+        self._reset()
+        self._next_check = _time()
+
+    def request_check(self):
+        """If the monitor is idle, check the server soon."""
+        self._check_requested = True
+
+    def _reset(self):
+        """Close the connection and abandon the current heartbeat."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+        self._sock = None
+        self._state = _IDLE
+        # Ignore the result of a lookup that's still running.
+        self._resolution = None
+        self._performed_handshake = False
+        self._max_wire_version = 0
+
+    def _wanted(self):
+        """Return (socket, want_write) to wait for, or None."""
+        if self._state == _IDLE or self._sock is None:
+            return None
+        return self._sock, self._want_write
+
+    def _wake_time(self):
+        """When _step() has something to do, or None."""
+        if self._state != _IDLE:
+            return self._deadline
+        if self._check_requested and self._last_check is not None:
+            return min(self._next_check,
+                       self._last_check + common.MIN_HEARTBEAT_INTERVAL)
+        return self._next_check
+
+    def _step(self, now):
+        """Start a heartbeat when it's due, or time out the current one."""
+        if self._state == _IDLE:
+            if now >= self._wake_time():
+                self._start_check(retry=(self._server_description.server_type
+                                         != SERVER_TYPE.Unknown))
+        elif self._state == _RESOLVING and self._resolution.done:
+            self._resolved()
+        elif self._deadline is not None and now >= self._deadline:
+            self._check_failed(socket.timeout('timed out'))
+
+    def _start_check(self, retry):
+        self._check_requested = False
+        self._retry = retry
+        if retry:
+            self._first_error = None
+        self._check_start = _time()
+        if self._publish:
+            self._listeners.publish_server_heartbeat_started(
+                self._server_description.address)
+        try:
+            if self._sock is None:
+                self._connect()
+            else:
+                self._start_sending()
+            self._advance()
+        except Exception as error:
+            self._check_failed(error)
+
+    def _connect(self):
+        """Start connecting, or raise socket.error."""
+        host, port = self._server_description.address
+        self._deadline = _deadline(self._pool.opts.connect_timeout)
+        if host.endswith('.sock'):
+            if not hasattr(socket, "AF_UNIX"):
+                raise ConnectionFailure("UNIX-sockets are not supported "
+                                        "on this system")
+            self._addrinfos = [
+                (socket.AF_UNIX, socket.SOCK_STREAM, 0, '', host)]
+        else:
+            family = socket.AF_INET
+            if socket.has_ipv6 and host != 'localhost':
+                family = socket.AF_UNSPEC
+            addrinfos = dns_resolver.getaddrinfo_cached(
+                host, port, family, socket.SOCK_STREAM)
+            if addrinfos is None:
+                self._resolve(host, port, family)
+                return
+            self._addrinfos = addrinfos
+        self._connect_error = None
+        self._connect_next()
+
+    def _resolve(self, host, port, family):
+        """Look up the server's address on a helper thread, so that a slow
+        DNS server doesn't delay the other monitors' heartbeats. The
+        multiplexer calls _resolved() when it's done."""
+        resolution = _Resolution()
+        multiplexer = self._multiplexer
+
+        def target():
+            try:
+                resolution.addrinfos = dns_resolver.getaddrinfo(
+                    host, port, family, socket.SOCK_STREAM)
+            except Exception as exc:
+                resolution.error = exc
+            resolution.done = True
+            multiplexer.wake()
+
+        self._resolution = resolution
+        self._state = _RESOLVING
+        thread = threading.Thread(target=target,
+                                  name="pymongo_monitor_resolver_thread")
+        thread.daemon = True
+        thread.start()
+
+    def _resolved(self):
+        """Start connecting to the addresses the helper thread found."""
+        resolution, self._resolution = self._resolution, None
+        if resolution.error is not None:
+            raise resolution.error
+        self._addrinfos = resolution.addrinfos
+        self._connect_error = None
+        self._connect_next()
+        self._advance()
+
+    def _connect_next(self):
+        """Try connecting to the next address."""
+        while self._addrinfos:
+            addrinfo = self._addrinfos.pop(0)
+            try:
+                if addrinfo[0] == getattr(socket, 'AF_UNIX', None):
+                    sock = socket.socket(socket.AF_UNIX)
+                else:
+                    sock = pool_module._new_socket(addrinfo, self._pool.opts)
+                sock.setblocking(False)
+                err = sock.connect_ex(addrinfo[4])
+            except socket.error as exc:
+                self._connect_error = exc
+                continue
+            if err in (0, errno.EISCONN):
+                self._sock = sock
+                self._connected()
+                return
+            if err in pool_module._CONNECT_IN_PROGRESS:
+                self._sock = sock
+                self._state = _CONNECTING
+                self._want_write = True
+                return
+            sock.close()
+            self._connect_error = socket.error(err, os.strerror(err))
+        raise self._connect_error or socket.error('getaddrinfo failed')
+
+    def _connected(self):
+        ssl_context = self._pool.opts.ssl_context
+        if ssl_context is None:
+            self._start_sending()
+            return
+        host = self._server_description.address[0]
+        if (pool_module._HAVE_SNI and
+                (not pool_module.is_ip_address(host) or
+                 pool_module._PY37PLUS)):
+            self._sock = ssl_context.wrap_socket(
+                self._sock, server_hostname=host,
+                do_handshake_on_connect=False)
+        else:
+            self._sock = ssl_context.wrap_socket(
+                self._sock, do_handshake_on_connect=False)
+        self._state = _TLS_HANDSHAKE
+
+    def _start_sending(self):
+        cmd = SON([('ismaster', 1)])
+        if not self._performed_handshake:
+            cmd['client'] = self._pool.opts.metadata
+        cluster_time = self._topology.max_cluster_time()
+        if self._max_wire_version >= 6 and cluster_time is not None:
+            cmd['$clusterTime'] = cluster_time
+        self._request_id, self._out, _ = message.query(
+            0, 'admin.$cmd', 0, -1, cmd, None, DEFAULT_CODEC_OPTIONS)
+        self._in = bytearray()
+        self._state = _SENDING
+        self._want_write = True
+        self._deadline = _deadline(self._pool.opts.socket_timeout)
+        self._send_start = _time()
+
+    def _advance(self):
+        """Make as much progress as possible without blocking."""
+        try:
+            if self._state == _CONNECTING:
+                err = self._sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err:
+                    self._sock.close()
+                    self._sock = None
+                    self._connect_error = socket.error(err, os.strerror(err))
+                    self._connect_next()
+                    if self._state == _CONNECTING:
+                        return
+                else:
+                    self._connected()
+            if self._state == _TLS_HANDSHAKE:
+                self._io(self._sock.do_handshake)
+                opts = self._pool.opts
+                if (opts.ssl_context.verify_mode and not
+                        getattr(opts.ssl_context, "check_hostname", False) and
+                        opts.ssl_match_hostname):
+                    pool_module.match_hostname(
+                        self._sock.getpeercert(),
+                        hostname=self._server_description.address[0])
+                self._start_sending()
+            if self._state == _SENDING:
+                while self._out:
+                    sent = self._io(self._sock.send, self._out)
+                    self._out = self._out[sent:]
+                self._state = _RECEIVING
+                self._want_write = False
+            if self._state == _RECEIVING:
+                self._receive()
+        except _WouldBlock as exc:
+            self._want_write = exc.want_write
+
+    def _io(self, method, *args):
+        """Call a socket method, or raise _WouldBlock."""
+        try:
+            return method(*args)
+        except _SSLWantReadError:
+            raise _WouldBlock(False)
+        except _SSLWantWriteError:
+            raise _WouldBlock(True)
+        except (IOError, OSError, socket.error) as exc:
+            if _errno_from_exception(exc) in _WOULD_BLOCK:
+                raise _WouldBlock(self._state != _RECEIVING)
+            raise
+
+    def _receive(self):
+        while True:
+            chunk = self._io(self._sock.recv, 16384)
+            if not chunk:
+                raise socket.error("connection closed")
+            self._in.extend(chunk)
+            if len(self._in) < 16:
+                continue
+            length, _, response_to, op_code = _UNPACK_HEADER(
+                bytes(self._in[:16]))
+            if response_to != self._request_id:
+                raise ProtocolError("Got response id %r but expected "
+                                    "%r" % (response_to, self._request_id))
+            if length <= 16 or length > common.MAX_MESSAGE_SIZE:
+                raise ProtocolError("Invalid message length %r" % (length,))
+            if len(self._in) >= length:
+                break
+        round_trip_time = _time() - self._send_start
+        try:
+            unpack_reply = _UNPACK_REPLY[op_code]
+        except KeyError:
+            raise ProtocolError("Got opcode %r but expected "
+                                "%r" % (op_code, _UNPACK_REPLY.keys()))
+        doc = unpack_reply(bytes(self._in[16:length])).unpack_response()[0]
+        self._in = bytearray()
+        self._state = _IDLE
+        try:
+            helpers._check_command_response(doc)
+        except OperationFailure as exc:
+            # Update max cluster time even when isMaster fails.
+            self._topology.receive_cluster_time(
+                exc.details.get('$clusterTime'))
+            raise
+        response = IsMaster(doc)
+        self._performed_handshake = True
+        self._max_wire_version = response.max_wire_version
+        self._finish(self._new_description(response, round_trip_time))
+
+    def _check_failed(self, error):
+        """Like Monitor._check_with_retry: reset the server's pool, retry
+        once if the server was known, else report the server Unknown."""
+        address = self._server_description.address
+        if isinstance(error, (IOError, OSError, socket.error)):
+            try:
+                pool_module._raise_connection_failure(address, error)
+            except ConnectionFailure as exc:
+                error = exc
+        self._reset()
+        if self._publish:
+            self._listeners.publish_server_heartbeat_failed(
+                address, _time() - self._check_start, error)
+        self._topology.reset_pool(address)
+        if self._retry:
+            # Try a second and final time. If it fails report this error.
+            self._first_error = error
+            self._start_check(retry=False)
+            return
+        self._avg_round_trip_time.reset()
+        self._finish(ServerDescription(
+            address, error=self._first_error or error))
+
+    def _finish(self, server_description):
+        now = _time()
+        previous = self._server_description
+        self._last_check = now
+        self._server_description = server_description
+        self._topology.on_change(server_description)
+        self._next_check = now + self._next_heartbeat_interval(
+            previous, server_description)
+
+
+class MonitorMultiplexer(object):
+    def __init__(self):
+        """Run the heartbeats of a Topology's MultiplexedMonitors on one
+        thread.
+
+        The thread starts with the first monitor and exits when the last one
+        is closed.
+        """
+        self._lock = threading.Lock()
+        self._monitors = set()
+        # Closed monitors, whose connections the thread closes.
+        self._closed = []
+        self._thread = None
+        self._stopped = False
+        # wake() interrupts the thread's wait by writing to this socket pair.
+        self._waker = _socket_pair()
+        _MULTIPLEXERS.add(self)
+
+    def add(self, monitor):
+        with self._lock:
+            self._monitors.add(monitor)
+            if self._thread is None and not self._stopped:
+                thread = threading.Thread(
+                    target=self._run,
+                    name="pymongo_monitor_multiplexer_thread")
+                thread.daemon = True
+                self._thread = thread
+                thread.start()
+
+    def remove(self, monitor):
+        with self._lock:
+            if monitor in self._monitors:
+                self._monitors.discard(monitor)
+                self._closed.append(monitor)
+
+    def wake(self):
+        """Make the thread step its monitors now."""
+        waker = self._waker
+        if waker is None:
+            # No socket pair, the thread notices within
+            # MIN_HEARTBEAT_INTERVAL.
+            return
+        try:
+            waker[1].send(b'x')
+        except (IOError, OSError, socket.error):
+            # The buffer is full, the thread will wake anyway.
+            pass
+
+    def _after_fork(self):
+        """Reinitialize in the child process after os.fork() and restart
+        the thread if there are monitors."""
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = []
+        _close_socket_pair(self._waker)
+        self._waker = _socket_pair()
+        for monitor in list(self._monitors):
+            self.add(monitor)
+
+    def _shutdown(self):
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+        if thread is not None:
+            thread.join(1)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                closed, self._closed = self._closed, []
+                monitors = list(self._monitors)
+                if self._stopped or not (monitors or closed):
+                    self._thread = None
+                    return
+            for monitor in closed:
+                if monitor not in monitors:
+                    monitor._reset()
+
+            now = _time()
+            wake_time = now + common.MIN_HEARTBEAT_INTERVAL
+            readers, writers, by_sock = [], [], {}
+            waker = self._waker
+            if waker is not None:
+                readers.append(waker[0])
+            for monitor in monitors:
+                self._call(monitor, monitor._step, now)
+                wanted = monitor._wanted()
+                if wanted is not None:
+                    sock, want_write = wanted
+                    (writers if want_write else readers).append(sock)
+                    by_sock[sock] = monitor
+                monitor_wake_time = monitor._wake_time()
+                if monitor_wake_time is not None:
+                    wake_time = min(wake_time, monitor_wake_time)
+
+            for sock in network.wait_ready(readers, writers,
+                                           max(wake_time - _time(), 0)):
+                if waker is not None and sock is waker[0]:
+                    _drain(sock)
+                else:
+                    self._call(by_sock[sock], by_sock[sock]._advance)
+
+    def _call(self, monitor, method, *args):
+        try:
+            try:
+                method(*args)
+            except ReferenceError:
+                raise
+            except Exception as error:
+                monitor._check_failed(error)
+        except ReferenceError:
+            # Topology was garbage-collected.
+            self.remove(monitor)
+
+
+def _socket_pair():
+    """A pair of connected non-blocking sockets, or None if the platform
+    can't make one."""
+    try:
+        pair = socket.socketpair()
+    except (AttributeError, IOError, OSError, socket.error):
+        # Python 2 on Windows.
+        return None
+    for sock in pair:
+        sock.setblocking(False)
+    return pair
+
+
+def _close_socket_pair(pair):
+    if pair is not None:
+        for sock in pair:
+            try:
+                sock.close()
+            except Exception:
+                pass
+
+
+def _drain(sock):
+    """Read everything written to a non-blocking socket so far."""
+    try:
+        while sock.recv(1024):
+            pass
+    except (IOError, OSError, socket.error):
+        pass
+
+
+# Stop the multiplexers' threads at interpreter shutdown, like
+# periodic_executor does for PeriodicExecutors.
+_MULTIPLEXERS = weakref.WeakSet()
+
+
+def _shutdown_multiplexers():
+    for multiplexer in list(_MULTIPLEXERS):
+        multiplexer._shutdown()
+
+atexit.register(_shutdown_multiplexers)
+
+
+class SrvMonitor(object):
+    def __init__(self, topology, topology_settings):
+        """Class to poll the SRV records of a mongodb+srv:// URI's hostname
+        on a background thread.
+
+        Pass a Topology and TopologySettings. Polls every
+        MIN_SRV_RESCAN_INTERVAL seconds or the records' TTL, whichever is
+        longer, and reports new seed lists with Topology.on_srv_update.
+
+        The Topology is weakly referenced.
+        """
+        self._settings = topology_settings
+        self._fqdn = topology_settings.fqdn
+        # The seeds were just looked up by MongoClient.
+        self._startup_time = _time()
+
+        def target():
+            monitor = self_ref()
+            if monitor is None:
+                return False  # Stop the executor.
+            SrvMonitor._run(monitor)
+            return True
+
+        executor = periodic_executor.PeriodicExecutor(
+            interval=common.MIN_SRV_RESCAN_INTERVAL,
+            min_interval=common.MIN_HEARTBEAT_INTERVAL,
+            target=target,
+            name="pymongo_srv_polling_thread")
+
+        self._executor = executor
+
+        # Avoid cycles. When self or topology is freed, stop executor soon.
+        self_ref = weakref.ref(self, executor.close)
+        self._topology = weakref.proxy(topology, executor.close)
+
+    def open(self):
+        """Start polling. Multiple calls have no effect."""
+        self._executor.open()
+
+    def close(self):
+        """Stop polling. open() restarts it."""
+        self._executor.close()
+
+    def join(self, timeout=None):
+        self._executor.join(timeout)
+
+    def _after_fork(self):
+        """Reinitialize in the child process after os.fork() and restart
+        polling if it was running."""
+        self._executor._after_fork()
+
+    def _run(self):
+        if _time() - self._startup_time < common.MIN_SRV_RESCAN_INTERVAL:
+            return
+        seedlist = self._get_seedlist()
+        if seedlist:
+            try:
+                self._topology.on_srv_update(seedlist)
+            except ReferenceError:
+                # Topology was garbage-collected.
+                self.close()
+
+    def _get_seedlist(self):
+        """Poll the SRV records, return the new seed list or None.
+
+        On errors the topology is left unchanged and the records are polled
+        again after heartbeatFrequencyMS.
+        """
+        try:
+            seedlist, ttl = dns_resolver.get_srv_hosts(self._fqdn)
+        except Exception:
+            self._executor.update_interval(
+                self._settings.heartbeat_frequency)
+            return None
+        self._executor.update_interval(
+            max(ttl, common.MIN_SRV_RESCAN_INTERVAL))
+        return seedlist
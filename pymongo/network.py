@@ -16,9 +16,11 @@
 
 import datetime
 import errno
+import math
 import select
 import struct
 import threading
+import time
 
 _HAS_POLL = True
 _EVENT_MASK = 0
@@ -43,7 +45,7 @@ from pymongo.errors import (AutoReconnect,
                             NotMasterError,
                             OperationFailure,
                             ProtocolError)
-from pymongo.message import _UNPACK_REPLY
+from pymongo.message import _OP_NAMES, _UNPACK_REPLY
 
 
 _UNPACK_HEADER = struct.Struct("<iiii").unpack
@@ -111,8 +113,14 @@ def command(sock, dbname, spec, slave_ok, is_mongos,
     if publish:
         start = datetime.datetime.now()
 
-    if compression_ctx and name.lower() in _NO_COMPRESSION:
-        compression_ctx = None
+    # Keep the connection's context to decompress and account for the reply
+    # even if this command itself is sent uncompressed.
+    sock_compression_ctx = compression_ctx
+    if compression_ctx:
+        compression_ctx.reset_last()
+        if name.lower() in _NO_COMPRESSION:
+            compression_ctx.record_skipped(name)
+            compression_ctx = None
 
     if use_op_msg:
         flags = 2 if unacknowledged else 0
@@ -145,7 +153,9 @@ def command(sock, dbname, spec, slave_ok, is_mongos,
             # Unacknowledged, fake a successful command response.
             response_doc = {"ok": 1}
         else:
-            reply = receive_message(sock, request_id)
+            reply = receive_message(sock, request_id,
+                                    compression_ctx=sock_compression_ctx,
+                                    command_name=name)
             unpacked_docs = reply.unpack_response(
                 codec_options=codec_options, user_fields=user_fields)
 
@@ -168,14 +178,23 @@ def command(sock, dbname, spec, slave_ok, is_mongos,
         raise
     if publish:
         duration = (datetime.datetime.now() - start) + encoding_duration
+        compression = None
+        if sock_compression_ctx:
+            compression = sock_compression_ctx.last_exchange()
         listeners.publish_command_success(
-            duration, response_doc, name, request_id, address)
+            duration, response_doc, name, request_id, address,
+            compression=compression)
     return response_doc
 
 _UNPACK_COMPRESSION_HEADER = struct.Struct("<iiB").unpack
 
-def receive_message(sock, request_id, max_message_size=MAX_MESSAGE_SIZE):
-    """Receive a raw BSON message or raise socket.error."""
+def receive_message(sock, request_id, max_message_size=MAX_MESSAGE_SIZE,
+                    compression_ctx=None, command_name=None):
+    """Receive a raw BSON message or raise socket.error.
+
+    If `compression_ctx` is given, time spent decompressing the reply is
+    recorded in its statistics under `command_name`.
+    """
     # Ignore the response's request id.
     length, _, response_to, op_code = _UNPACK_HEADER(
         _receive_data_on_socket(sock, 16))
@@ -193,8 +212,13 @@ def receive_message(sock, request_id, max_message_size=MAX_MESSAGE_SIZE):
     if op_code == 2012:
         op_code, _, compressor_id = _UNPACK_COMPRESSION_HEADER(
             _receive_data_on_socket(sock, 9))
-        data = decompress(
-            _receive_data_on_socket(sock, length - 25), compressor_id)
+        data = _receive_data_on_socket(sock, length - 25)
+        if compression_ctx is not None:
+            data = compression_ctx.decompress_message(
+                command_name or _OP_NAMES.get(op_code, 'reply'), data,
+                compressor_id)
+        else:
+            data = decompress(data, compressor_id)
     else:
         data = _receive_data_on_socket(sock, length - 16)
 
@@ -303,3 +327,106 @@ class SocketChecker(object):
                 # or invalid socket.
                 return True
             return len(rd) > 0
+
+    def closed_sockets(self, socks):
+        """Return the sockets in `socks` that we know have been closed.
+
+        Checks all of them with a single poll() call. Without poll, each
+        socket is checked separately.
+        """
+        if not self._poller:
+            return [sock for sock in socks if self.socket_closed(sock)]
+
+        closed = []
+        by_fd = {}
+        with self._lock:
+            try:
+                for sock in socks:
+                    try:
+                        fd = sock.fileno()
+                        self._poller.register(fd, _EVENT_MASK)
+                    except Exception:
+                        # Closed sockets have a negative file descriptor.
+                        closed.append(sock)
+                        continue
+                    by_fd[fd] = sock
+                while True:
+                    try:
+                        events = self._poller.poll(0)
+                        break
+                    except (_SELECT_ERROR, IOError) as exc:
+                        if _errno_from_exception(exc) in (errno.EINTR,
+                                                          errno.EAGAIN):
+                            continue
+                        events = None
+                        break
+            finally:
+                for fd in by_fd:
+                    self._poller.unregister(fd)
+
+        if events is None:
+            # Fall back to checking the sockets one at a time.
+            return closed + [sock for sock in by_fd.values()
+                             if self.socket_closed(sock)]
+        closed.extend(by_fd[fd] for fd, _ in events if fd in by_fd)
+        return closed
+
+
+def wait_connected(socks, timeout):
+    """Wait up to `timeout` seconds (None means forever) for non-blocking
+    connect attempts on `socks` to finish.
+
+    Returns the sockets whose attempt finished, successfully or not: check
+    SO_ERROR to tell which. Returns an empty list if interrupted.
+    """
+    try:
+        if _HAS_POLL:
+            poller = poll()
+            by_fd = {}
+            for sock in socks:
+                by_fd[sock.fileno()] = sock
+                poller.register(
+                    sock, select.POLLOUT | select.POLLERR | select.POLLHUP)
+            if timeout is not None:
+                timeout = max(int(math.ceil(timeout * 1000)), 0)
+            return [by_fd[fd] for fd, _ in poller.poll(timeout)]
+        # Windows reports failed connection attempts as exceptional.
+        _, writable, exceptional = select.select([], socks, socks, timeout)
+        return list(set(writable) | set(exceptional))
+    except (_SELECT_ERROR, IOError) as exc:
+        if _errno_from_exception(exc) in (errno.EINTR, errno.EAGAIN):
+            return []
+        raise
+
+
+def wait_ready(readers, writers, timeout):
+    """Wait up to `timeout` seconds for any of the sockets in `readers` to
+    be readable or any in `writers` to be writable.
+
+    Returns the set of ready sockets. Sockets with errors are ready: reading
+    or writing raises the error. Returns an empty set if interrupted.
+    """
+    try:
+        if _HAS_POLL:
+            poller = poll()
+            by_fd = {}
+            for sock in readers:
+                by_fd[sock.fileno()] = sock
+                poller.register(sock, _EVENT_MASK)
+            for sock in writers:
+                by_fd[sock.fileno()] = sock
+                poller.register(
+                    sock, select.POLLOUT | select.POLLERR | select.POLLHUP)
+            timeout = max(int(math.ceil(timeout * 1000)), 0)
+            return set(by_fd[fd] for fd, _ in poller.poll(timeout))
+        if not readers and not writers:
+            # Windows' select() fails without any sockets.
+            time.sleep(timeout)
+            return set()
+        readable, writable, exceptional = select.select(
+            readers, writers, writers, timeout)
+        return set(readable) | set(writable) | set(exceptional)
+    except (_SELECT_ERROR, IOError) as exc:
+        if _errno_from_exception(exc) in (errno.EINTR, errno.EAGAIN):
+            return set()
+        raise
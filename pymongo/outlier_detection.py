@@ -0,0 +1,226 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Stop selecting servers with many errors or slow operations for a while."""
+
+import collections
+import random
+import threading
+
+from pymongo.monotonic import time as _time
+
+# Judge a server's error rate by its operations in this many seconds,
+_ERROR_RATE_WINDOW = 30
+# once there are at least this many.
+_MIN_OPERATIONS = 10
+# Eject a server if this fraction of its recent operations failed,
+_MAX_ERROR_RATE = 0.5
+# or this many in a row.
+_MAX_CONSECUTIVE_FAILURES = 5
+# Eject a server whose median operation latency is this many times the
+# lower median of the latencies of the servers of its type,
+_LATENCY_FACTOR = 3
+# and at least this many seconds.
+_MIN_OUTLIER_LATENCY = 0.05
+# Never eject more than this fraction of the servers at once.
+_MAX_EJECTED_FRACTION = 0.5
+# Each consecutive ejection of a server is longer, up to this many times
+# the ejection time.
+_MAX_EJECTION_MULTIPLIER = 10
+# A server on probation after an ejection is selected this fraction of the
+# times it's suitable at first, more and more often until it's restored.
+_MIN_PROBATION_WEIGHT = 0.1
+
+
+class _ServerHealth(object):
+    """Recent operation outcomes on one server, and its ejection."""
+
+    def __init__(self):
+        # (time, failed) pairs, oldest first.
+        self.outcomes = collections.deque()
+        self.failures = 0
+        self.consecutive_failures = 0
+        # Ejections since the server was last healthy for a while.
+        self.ejections = 0
+        self.ejected_until = 0
+        self.probation_until = 0
+        self.restored_at = None
+
+    def record(self, now, failed):
+        self.outcomes.append((now, failed))
+        if failed:
+            self.failures += 1
+            self.consecutive_failures += 1
+        else:
+            self.consecutive_failures = 0
+        cutoff = now - _ERROR_RATE_WINDOW
+        while self.outcomes[0][0] < cutoff:
+            _, old_failed = self.outcomes.popleft()
+            if old_failed:
+                self.failures -= 1
+
+    def too_many_errors(self):
+        if self.consecutive_failures >= _MAX_CONSECUTIVE_FAILURES:
+            return True
+        return (len(self.outcomes) >= _MIN_OPERATIONS and
+                self.failures >= _MAX_ERROR_RATE * len(self.outcomes))
+
+    def reset(self):
+        self.outcomes.clear()
+        self.failures = 0
+        self.consecutive_failures = 0
+
+
+class OutlierDetector(object):
+    """Ejects servers from selection when their operations fail or are
+    much slower than other servers', then lets them back gradually.
+
+    An ejected server isn't selected for a while, then it's on probation
+    for the ejection time: it's selected more and more often until it's
+    restored. Failing again on probation ejects it for longer.
+    """
+
+    def __init__(self, ejection_time, listeners=None, events=None,
+                 topology_id=None):
+        self._lock = threading.Lock()
+        self._ejection_time = ejection_time
+        # Maps each server's address to its _ServerHealth.
+        self._health = {}
+        # The ejected servers and those on probation.
+        self._unhealthy = {}
+        self._listeners = listeners
+        # A weakref to the Topology's events queue, or None.
+        self._events = events
+        self._topology_id = topology_id
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def add_server(self, address):
+        with self._lock:
+            self._health.setdefault(address, _ServerHealth())
+
+    def remove_server(self, address):
+        with self._lock:
+            self._health.pop(address, None)
+            self._unhealthy.pop(address, None)
+
+    def is_ejected(self, address, now=None):
+        health = self._unhealthy.get(address)
+        return health is not None and (now or _time()) < health.ejected_until
+
+    def record(self, address, failed):
+        """Count an operation on a server that succeeded or failed with a
+        network error, and eject the server if too many failed."""
+        now = _time()
+        events = []
+        with self._lock:
+            health = self._health.get(address)
+            # Ignore operations that were running when it was ejected.
+            if health is None or self.is_ejected(address, now):
+                return
+            health.record(now, failed)
+            if failed and health.too_many_errors():
+                self._eject(address, health, now, 'errors', events)
+        self._publish(events)
+
+    def check(self, latencies_by_type):
+        """Restore servers whose probation is over, and eject the servers
+        whose operations are much slower than the others'.
+
+        `latencies_by_type` is a list with a dict for each server type,
+        mapping the servers' addresses to their median latency or None.
+        """
+        now = _time()
+        events = []
+        with self._lock:
+            for address, health in list(self._unhealthy.items()):
+                if health.probation_until <= now:
+                    del self._unhealthy[address]
+                    health.restored_at = now
+                    health.reset()
+                    events.append(('restored', address, ()))
+
+            for latencies in latencies_by_type:
+                known = sorted(latency for latency in latencies.values()
+                               if latency is not None)
+                if len(known) < 2:
+                    continue
+                # The lower median, so that of two servers the slower one
+                # can be the outlier.
+                typical = known[(len(known) - 1) // 2]
+                threshold = max(_MIN_OUTLIER_LATENCY,
+                                typical * _LATENCY_FACTOR)
+                for address, latency in latencies.items():
+                    if (latency is None or latency < threshold or
+                            address in self._unhealthy):
+                        continue
+                    health = self._health.get(address)
+                    if health is not None:
+                        self._eject(address, health, now, 'latency', events)
+        self._publish(events)
+
+    def filter(self, server_descriptions):
+        """The server_descriptions to select from: without ejected servers,
+        and with servers on probation only some of the time. If that leaves
+        none, all of them."""
+        # Read without the lock, a stale answer is harmless.
+        unhealthy = self._unhealthy
+        if not unhealthy:
+            return server_descriptions
+        now = _time()
+        selected = []
+        for sd in server_descriptions:
+            health = unhealthy.get(sd.address)
+            if health is None:
+                selected.append(sd)
+            elif now >= health.ejected_until:
+                # On probation.
+                weight = 1 - ((health.probation_until - now) /
+                              float(self._ejection_time))
+                if random.random() < max(weight, _MIN_PROBATION_WEIGHT):
+                    selected.append(sd)
+        return selected or server_descriptions
+
+    def _eject(self, address, health, now, reason, events):
+        """Eject a server unless too many are ejected already. Hold the lock
+        when calling this."""
+        ejected = sum(1 for h in self._unhealthy.values()
+                      if now < h.ejected_until)
+        if ejected + 1 > len(self._health) * _MAX_EJECTED_FRACTION:
+            return
+        max_duration = self._ejection_time * _MAX_EJECTION_MULTIPLIER
+        if (health.restored_at is not None and
+                now - health.restored_at > max_duration):
+            health.ejections = 0
+        health.ejections += 1
+        duration = min(self._ejection_time * health.ejections, max_duration)
+        # Set both times before selection can see the server.
+        health.probation_until = now + duration + self._ejection_time
+        health.ejected_until = now + duration
+        health.reset()
+        self._unhealthy[address] = health
+        events.append(('ejected', address, (reason, duration)))
+
+    def _publish(self, events):
+        queue = self._events and self._events()
+        if not events or queue is None:
+            return
+        for kind, address, args in events:
+            if kind == 'ejected':
+                queue.put((self._listeners.publish_server_ejected,
+                           (address, self._topology_id) + args))
+            else:
+                queue.put((self._listeners.publish_server_restored,
+                           (address, self._topology_id)))
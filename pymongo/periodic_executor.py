@@ -12,75 +12,317 @@
 # implied.  See the License for the specific language governing
 # permissions and limitations under the License.
 
-"""Run a target function on a background thread."""
+"""Run target functions periodically on a few shared background threads."""
 
 import atexit
+import collections
+import heapq
+import itertools
+import os
 import threading
-import time
+import traceback
 import weakref
 
 from pymongo.monotonic import time as _time
 
+# How often the scheduler thread wakes at least, to notice executors woken
+# or closed while it couldn't be notified.
+_POLL_INTERVAL = 0.5
+
+# The most worker threads running targets at once, process-wide, unless
+# targets are blocked.
+_MAX_WORKERS = 16
+
+# Start a worker beyond _MAX_WORKERS for a target that has been due this many
+# seconds, because the other workers are blocked, for example connecting to
+# unresponsive servers.
+_MAX_READY_DELAY = 0.1
+
+# Seconds an idle worker thread waits for work before it exits.
+_WORKER_IDLE_TIMEOUT = 30
+
+
+class _Scheduler(object):
+    """Run PeriodicExecutors' targets on a bounded set of worker threads.
+
+    One thread keeps a heap of the executors' next run times and hands due
+    executors to the workers, which are started as needed, up to
+    _MAX_WORKERS, and exit after _WORKER_IDLE_TIMEOUT seconds without work.
+    If an executor has been due for _MAX_READY_DELAY seconds the other
+    workers are blocked: another worker is started regardless of the limit.
+
+    Executors can be woken or closed from weakref callbacks, which must not
+    block on a lock: wake() and close() only append to deques and try to
+    notify the scheduler thread without blocking. The scheduler thread
+    wakes every _POLL_INTERVAL seconds regardless.
+    """
+
+    def __init__(self, max_workers=_MAX_WORKERS):
+        self._max_workers = max_workers
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._timer_cond = threading.Condition(self._lock)
+        self._worker_cond = threading.Condition(self._lock)
+        # Notified when an executor's target returns or it's closed.
+        self._join_cond = threading.Condition(self._lock)
+        # (run time, sequence number, executor). Entries are invalidated by
+        # changing the executor's _sequence instead of being removed.
+        self._heap = []
+        self._counter = itertools.count()
+        # Executors to reschedule or drop, appended without the lock.
+        self._woken = collections.deque()
+        self._closed = collections.deque()
+        # Executors whose targets are due.
+        self._ready = collections.deque()
+        self._thread = None
+        self._workers = 0
+        self._idle_workers = 0
+        # Workers running long_running targets, not counted in the limit.
+        self._long_running_workers = 0
+        self._stopped = False
+
+    def _check_pid(self):
+        # After os.fork() the child has none of the parent's threads.
+        if self._pid != os.getpid():
+            self._reset()
+
+    def add(self, executor, run_time):
+        """Run `executor`'s target at `run_time`."""
+        with self._lock:
+            self._check_pid()
+            self._push(executor, run_time)
+            if self._thread is None and not self._stopped:
+                thread = threading.Thread(
+                    target=self._run, name="pymongo_periodic_scheduler")
+                thread.daemon = True
+                self._thread = thread
+                thread.start()
+            self._timer_cond.notify()
+
+    def is_scheduled(self, executor):
+        with self._lock:
+            return (self._thread is not None and self._thread.is_alive() and
+                    (executor._running or not executor._stopped and
+                     any(entry[2] is executor and
+                         entry[1] == executor._sequence
+                         for entry in self._heap)))
+
+    def wake(self, executor):
+        self._woken.append(executor)
+        self._notify()
+
+    def closed(self, executor):
+        self._closed.append(executor)
+        self._notify()
+
+    def _notify(self):
+        # Never block: this may run in a weakref callback.
+        if self._lock.acquire(False):
+            try:
+                self._timer_cond.notify()
+                self._join_cond.notify_all()
+            finally:
+                self._lock.release()
+
+    def join(self, executor, timeout):
+        """Wait until `executor` is stopped and its target isn't running."""
+        with self._lock:
+            deadline = None if timeout is None else _time() + timeout
+            while not executor._stopped or executor._running:
+                if deadline is None:
+                    # Wake now and then in case close() couldn't notify us.
+                    self._join_cond.wait(_POLL_INTERVAL)
+                    continue
+                remaining = deadline - _time()
+                if remaining <= 0:
+                    return
+                self._join_cond.wait(min(remaining, _POLL_INTERVAL))
+
+    def _push(self, executor, run_time):
+        executor._sequence = next(self._counter)
+        heapq.heappush(self._heap, (run_time, executor._sequence, executor))
+
+    def _run(self):
+        with self._lock:
+            while not self._stopped:
+                self._process_deques()
+                now = _time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, sequence, executor = heapq.heappop(self._heap)
+                    if sequence != executor._sequence or executor._stopped:
+                        continue
+                    executor._running = True
+                    executor._ready_time = now
+                    self._ready.append(executor)
+                if self._ready:
+                    self._dispatch()
+                if not self._heap and not self._ready and self._workers == 0:
+                    break
+                timeout = _POLL_INTERVAL
+                if self._heap:
+                    timeout = min(timeout, max(self._heap[0][0] - now, 0))
+                if self._ready:
+                    # Check again whether the workers are blocked.
+                    timeout = min(timeout, _MAX_READY_DELAY)
+                self._timer_cond.wait(timeout)
+            self._thread = None
+
+    def _process_deques(self):
+        """Handle executors woken or closed since the last pass. Hold the
+        lock when calling this."""
+        drop = False
+        while self._closed:
+            executor = self._closed.popleft()
+            # Unless it was reopened since.
+            if executor._stopped:
+                executor._sequence = None
+                drop = True
+                self._join_cond.notify_all()
+        if drop:
+            # Free closed executors now, not when their entries come due.
+            self._heap = [entry for entry in self._heap
+                          if entry[1] == entry[2]._sequence]
+            heapq.heapify(self._heap)
+        while self._woken:
+            executor = self._woken.popleft()
+            if executor._running or executor._stopped:
+                continue
+            run_time = executor._last_run + executor._min_interval
+            if executor._sequence is None or run_time < self._next_run(
+                    executor):
+                self._push(executor, run_time)
+
+    def _next_run(self, executor):
+        for run_time, sequence, entry_executor in self._heap:
+            if entry_executor is executor and sequence == executor._sequence:
+                return run_time
+        return float('inf')
+
+    def _dispatch(self):
+        """Wake idle workers, start more if needed. Hold the lock."""
+        needed = len(self._ready)
+        if self._idle_workers:
+            self._worker_cond.notify(min(needed, self._idle_workers))
+            needed -= self._idle_workers
+        # The executors due for too long, the workers must be blocked.
+        cutoff = _time() - _MAX_READY_DELAY
+        starved = sum(1 for executor in self._ready
+                      if executor._ready_time <= cutoff)
+        while needed > 0 and (starved > 0 or
+                              self._workers - self._long_running_workers <
+                              self._max_workers):
+            self._workers += 1
+            thread = threading.Thread(
+                target=self._work, name="pymongo_periodic_worker")
+            thread.daemon = True
+            thread.start()
+            needed -= 1
+            starved -= 1
+
+    def _work(self):
+        self._lock.acquire()
+        try:
+            while not self._stopped:
+                if not self._ready:
+                    self._idle_workers += 1
+                    start = _time()
+                    self._worker_cond.wait(_WORKER_IDLE_TIMEOUT)
+                    self._idle_workers -= 1
+                    if not self._ready:
+                        if _time() - start >= _WORKER_IDLE_TIMEOUT:
+                            break
+                        continue
+                executor = self._ready.popleft()
+                long_running = executor._long_running
+                if long_running:
+                    self._long_running_workers += 1
+                    # Replace this worker for the other executors.
+                    if self._ready:
+                        self._dispatch()
+                self._lock.release()
+                try:
+                    keep_going = executor._run_once()
+                finally:
+                    self._lock.acquire()
+                if long_running:
+                    self._long_running_workers -= 1
+                executor._running = False
+                self._join_cond.notify_all()
+                if keep_going and not executor._stopped:
+                    if executor._event:
+                        # Woken while the target was running.
+                        delay = executor._min_interval
+                    else:
+                        delay = executor._interval
+                    self._push(executor, executor._last_run + delay)
+                    self._timer_cond.notify()
+        finally:
+            self._workers -= 1
+            self._lock.release()
+
+    def shutdown(self, timeout):
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+            self._timer_cond.notify()
+            self._worker_cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+
+_scheduler = _Scheduler()
+
+if hasattr(os, 'register_at_fork'):
+    # Before MongoClient's hook reopens its executors in the child.
+    os.register_at_fork(after_in_child=_scheduler._reset)
+
 
 class PeriodicExecutor(object):
-    def __init__(self, interval, min_interval, target, name=None):
-        """"Run a target function periodically on a background thread.
+    def __init__(self, interval, min_interval, target, name=None,
+                 long_running=False):
+        """"Run a target function periodically in the background.
 
         If the target's return value is false, the executor stops.
 
+        All executors share the threads of a process-wide scheduler. The
+        target runs on at most one of them at a time.
+
         :Parameters:
           - `interval`: Seconds between calls to `target`.
           - `min_interval`: Minimum seconds between calls if `wake` is
             called very often.
           - `target`: A function.
-          - `name`: A name to give the underlying thread.
+          - `name`: A name for the executor, for debugging.
+          - `long_running`: If True, the target may block for minutes. Its
+            thread doesn't count toward the scheduler's limit.
         """
-        # threading.Event and its internal condition variable are expensive
-        # in Python 2, see PYTHON-983. Use a boolean to know when to wake.
-        # The executor's design is constrained by several Python issues, see
-        # "periodic_executor.rst" in this repository.
+        # wake() and close() don't take locks, see "periodic_executor.rst"
+        # in this repository.
         self._event = False
         self._interval = interval
         self._min_interval = min_interval
         self._target = target
         self._stopped = False
-        self._thread = None
+        self._opened = False
         self._name = name
-
-        self._thread_will_exit = False
-        self._lock = threading.Lock()
+        self._long_running = long_running
+        # Only changed by the scheduler, with its lock.
+        self._running = False
+        self._sequence = None
+        self._ready_time = None
+        self._last_run = _time()
 
     def open(self):
-        """Start. Multiple calls have no effect.
-
-        Not safe to call from multiple threads at once.
-        """
-        with self._lock:
-            if self._thread_will_exit:
-                # If the background thread has read self._stopped as True
-                # there is a chance that it has not yet exited. The call to
-                # join should not block indefinitely because there is no
-                # other work done outside the while loop in self._run.
-                try:
-                    self._thread.join()
-                except ReferenceError:
-                    # Thread terminated.
-                    pass
-            self._thread_will_exit = False
-            self._stopped = False
-        started = False
-        try:
-            started = self._thread and self._thread.is_alive()
-        except ReferenceError:
-            # Thread terminated.
-            pass
-
-        if not started:
-            thread = threading.Thread(target=self._run, name=self._name)
-            thread.daemon = True
-            self._thread = weakref.proxy(thread)
-            _register_executor(self)
-            thread.start()
+        """Start. Multiple calls have no effect."""
+        if self._opened and not self._stopped and self._is_scheduled():
+            return
+        self._stopped = False
+        self._opened = True
+        _register_executor(self)
+        _scheduler.add(self, _time())
 
     def close(self, dummy=None):
         """Stop. To restart, call open().
@@ -89,55 +331,62 @@ class PeriodicExecutor(object):
         callback; see monitor.py.
         """
         self._stopped = True
+        _scheduler.closed(self)
+
+    def _after_fork(self):
+        """Reinitialize in the child process after os.fork().
+
+        The scheduler's threads don't exist in the child. If the executor
+        was running, schedule it again.
+        """
+        running = self._opened and not self._stopped
+        self._running = False
+        self._sequence = None
+        self._opened = False
+        if running:
+            self.open()
+
+    def _is_scheduled(self):
+        """Will the target run again (or is it running)?"""
+        return _scheduler.is_scheduled(self)
 
     def join(self, timeout=None):
-        if self._thread is not None:
-            try:
-                self._thread.join(timeout)
-            except (ReferenceError, RuntimeError):
-                # Thread already terminated, or not yet started.
-                pass
+        """Wait until the executor is stopped and its target isn't
+        running."""
+        if not self._opened:
+            return
+        _scheduler.join(self, timeout)
 
     def wake(self):
         """Execute the target function soon."""
         self._event = True
+        _scheduler.wake(self)
 
-    def __should_stop(self):
-        with self._lock:
-            if self._stopped:
-                self._thread_will_exit = True
-                return True
-            return False
+    def update_interval(self, new_interval):
+        """Wait `new_interval` seconds between calls from now on."""
+        self._interval = new_interval
 
-    def _run(self):
-        while not self.__should_stop():
-            try:
-                if not self._target():
-                    self._stopped = True
-                    break
-            except:
-                with self._lock:
-                    self._stopped = True
-                    self._thread_will_exit = True
-
-                raise
-
-            deadline = _time() + self._interval
-
-            while not self._stopped and _time() < deadline:
-                time.sleep(self._min_interval)
-                if self._event:
-                    break  # Early wake.
-
-            self._event = False
+    def _run_once(self):
+        """Call the target on a scheduler thread. Return True to keep
+        going."""
+        self._event = False
+        try:
+            if not self._target():
+                self._stopped = True
+        except Exception:
+            self._stopped = True
+            traceback.print_exc()
+        finally:
+            self._last_run = _time()
+        return not self._stopped
 
 
 # _EXECUTORS has a weakref to each running PeriodicExecutor. Once started,
-# an executor is kept alive by a strong reference from its thread and perhaps
-# from other objects. When the thread dies and all other referrers are freed,
-# the executor is freed and removed from _EXECUTORS. If any threads are
-# running when the interpreter begins to shut down, we try to halt and join
-# them to avoid spurious errors.
+# an executor is kept alive by a strong reference from the scheduler and
+# perhaps from other objects. When it is closed and all other referrers are
+# freed, the executor is freed and removed from _EXECUTORS. If any executors
+# are running when the interpreter begins to shut down, we try to halt and
+# join them to avoid spurious errors.
 _EXECUTORS = set()
 
 
@@ -170,5 +419,6 @@ def _shutdown_executors():
             executor.join(1)
 
     executor = None
+    _scheduler.shutdown(1)
 
 atexit.register(_shutdown_executors)
@@ -0,0 +1,231 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License.  You
+# may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.  See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""High throughput unacknowledged (``w=0``) writes.
+
+.. versionadded:: 3.9
+
+A :class:`PipelinedWriter` buffers unacknowledged writes to one collection
+and streams them to the primary on a dedicated connection. Consecutive
+writes of the same type are coalesced into a single insert, update, or
+delete command which is sent as an OP_MSG with the ``moreToCome`` flag set,
+so the server never replies and the writer never waits for a round trip::
+
+    with collection.pipelined_writer(max_buffer_size=5000) as writer:
+        for event in events:
+            writer.insert_one(event)
+        # Block until the server has processed every write sent so far.
+        writer.flush()
+
+Like any unacknowledged write, write errors (for example duplicate key
+errors) are not reported. Network errors are raised by the call that was
+sending the buffered writes, and those writes are lost.
+
+Each command is ordered: a write error stops the writes after it in the
+same command, but not those sent in later commands.
+"""
+
+import threading
+
+from bson.son import SON
+from pymongo import common
+from pymongo.bulk import _Bulk, _DELETE_ALL, _DELETE_ONE
+from pymongo.errors import InvalidOperation
+from pymongo.server_selectors import writable_server_selector
+
+
+class _PipelinedBulk(_Bulk):
+    """An unacknowledged bulk write sent as ordered write commands."""
+
+    def __init__(self, collection, bypass_document_validation):
+        # Unordered so that _Bulk sends OP_MSG with moreToCome instead of
+        # acknowledged writes.
+        super(_PipelinedBulk, self).__init__(
+            collection, False, bypass_document_validation)
+
+    def execute_op_msg_no_results(self, sock_info, generator):
+        # An unordered command's writes may be applied in any order, for
+        # example in parallel on several shards.
+        return super(_PipelinedBulk, self).execute_op_msg_no_results(
+            sock_info, generator, ordered=True)
+
+
+class PipelinedWriter(object):
+    """Buffer unacknowledged writes and stream them to the primary.
+
+    Should not be called directly by application developers - see
+    :meth:`~pymongo.collection.Collection.pipelined_writer` instead.
+
+    Writes are applied in the order they are added, on MongoDB 3.6+. A
+    write error stops the writes after it that were sent in the same
+    command, like an ordered bulk write, but not the writes sent later. On
+    older servers inserts are sent with ``continueOnError`` and a sharded
+    cluster may apply them out of order.
+
+    :Parameters:
+      - `collection`: The :class:`~pymongo.collection.Collection` to write to.
+      - `max_buffer_size` (optional): The number of writes to buffer before
+        they are sent. The thread that fills the buffer sends it. The bound
+        is approximate: before it swaps the buffer out, other threads can
+        each add one more write and then wait for it, so the buffer holds
+        up to `max_buffer_size` plus one write per concurrent thread.
+      - `bypass_document_validation` (optional): Not supported with
+        unacknowledged writes on MongoDB 3.2+.
+    """
+
+    def __init__(self, collection, max_buffer_size=1000,
+                 bypass_document_validation=False):
+        max_buffer_size = common.validate_positive_integer(
+            "max_buffer_size", max_buffer_size)
+        self.__collection = collection
+        self.__max_buffer_size = max_buffer_size
+        self.__bypass_doc_val = bypass_document_validation
+        # Protects the buffer.
+        self.__lock = threading.Lock()
+        # Serializes use of the dedicated connection.
+        self.__send_lock = threading.Lock()
+        self.__bulk = self.__new_bulk()
+        self.__pool = None
+        self.__sock_info = None
+        self.__closed = False
+
+    def __new_bulk(self):
+        return _PipelinedBulk(self.__collection, self.__bypass_doc_val)
+
+    @property
+    def collection(self):
+        """The collection this writer writes to."""
+        return self.__collection
+
+    @property
+    def max_buffer_size(self):
+        """The number of writes buffered before they are sent."""
+        return self.__max_buffer_size
+
+    def insert_one(self, document):
+        """Buffer an insert of `document`. Like
+        :meth:`~pymongo.collection.Collection.insert_one`, an ``_id`` is
+        added to the document if it doesn't have one.
+        """
+        self.__add(_Bulk.add_insert, document)
+
+    def replace_one(self, filter, replacement, upsert=False):
+        """Buffer a replacement of a single document matching `filter`."""
+        self.__add(_Bulk.add_replace, filter, replacement, upsert)
+
+    def update_one(self, filter, update, upsert=False):
+        """Buffer an update of a single document matching `filter`."""
+        self.__add(_Bulk.add_update, filter, update, False, upsert)
+
+    def update_many(self, filter, update, upsert=False):
+        """Buffer an update of all documents matching `filter`."""
+        self.__add(_Bulk.add_update, filter, update, True, upsert)
+
+    def delete_one(self, filter):
+        """Buffer a delete of a single document matching `filter`."""
+        self.__add(_Bulk.add_delete, filter, _DELETE_ONE)
+
+    def delete_many(self, filter):
+        """Buffer a delete of all documents matching `filter`."""
+        self.__add(_Bulk.add_delete, filter, _DELETE_ALL)
+
+    def __add(self, add_method, *args):
+        with self.__lock:
+            if self.__closed:
+                raise InvalidOperation("Cannot use a closed PipelinedWriter")
+            add_method(self.__bulk, *args)
+            full = len(self.__bulk.ops) >= self.__max_buffer_size
+        if full:
+            # Other threads may each add a write before this one swaps the
+            # buffer out, then they wait here for the send lock.
+            self.__send(barrier=False)
+
+    def flush(self):
+        """Send all buffered writes, then wait for a reply to a ``ping``
+        sent on the same connection.
+
+        The server processes the messages on a connection in order, so when
+        this method returns every write sent by this writer has been
+        applied or has failed. Write errors are not reported.
+        """
+        self.__send(barrier=True)
+
+    def close(self):
+        """Flush buffered writes and return the connection to the pool.
+
+        Further writes raise :exc:`~pymongo.errors.InvalidOperation`.
+        Multiple calls have no effect.
+        """
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            # Nothing to wait for if nothing was ever sent or buffered.
+            barrier = self.__sock_info is not None or bool(self.__bulk.ops)
+        try:
+            if barrier:
+                self.flush()
+        finally:
+            with self.__send_lock:
+                self.__release_socket()
+
+    def __send(self, barrier):
+        with self.__send_lock:
+            with self.__lock:
+                bulk, self.__bulk = self.__bulk, self.__new_bulk()
+            if not (bulk.ops or barrier):
+                return
+            client = self.__collection.database.client
+            sock_info = self.__get_socket(client)
+            try:
+                with client._reset_on_error(sock_info.address, None):
+                    if bulk.ops:
+                        bulk.executed = True
+                        bulk.execute_no_results(sock_info, bulk.gen_ordered())
+                    if barrier:
+                        sock_info.command(
+                            self.__collection.database.name,
+                            SON([('ping', 1)]))
+            except:
+                # The connection is unusable or points at a stale primary.
+                self.__release_socket()
+                raise
+
+    def __get_socket(self, client):
+        """Check out the dedicated connection to the primary."""
+        if self.__sock_info is None or self.__sock_info.closed:
+            self.__release_socket()
+            server = client._select_server(writable_server_selector, None)
+            with client._get_socket(server, None, exhaust=True) as sock_info:
+                # Keep the socket checked out until release.
+                pass
+            self.__pool, self.__sock_info = server.pool, sock_info
+        return self.__sock_info
+
+    def __release_socket(self):
+        if self.__sock_info is not None:
+            pool, sock_info = self.__pool, self.__sock_info
+            self.__pool = self.__sock_info = None
+            pool.return_socket(sock_info)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        # Don't leak the checked out connection, buffered writes are lost.
+        if getattr(self, '_PipelinedWriter__sock_info', None) is not None:
+            self.__release_socket()
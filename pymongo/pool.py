@@ -12,21 +12,28 @@
 # implied.  See the License for the specific language governing
 # permissions and limitations under the License.
 
+import bisect
 import contextlib
 import copy
+import errno
 import os
 import platform
 import socket
 import sys
 import threading
+import time
 import collections
+import weakref
 
 try:
     import ssl
     from ssl import SSLError
     _HAVE_SNI = getattr(ssl, 'HAS_SNI', False)
+    # Python 3.6+ can resume TLS sessions.
+    _HAVE_TLS_SESSIONS = hasattr(ssl, 'SSLSession')
 except ImportError:
     _HAVE_SNI = False
+    _HAVE_TLS_SESSIONS = False
     class SSLError(socket.error):
         pass
 
@@ -40,13 +47,20 @@ except ImportError:
 from bson import DEFAULT_CODEC_OPTIONS
 from bson.py3compat import imap, itervalues, _unicode, integer_types
 from bson.son import SON
-from pymongo import auth, helpers, thread_util, __version__
+from pymongo import auth, dns_resolver, helpers, thread_util, __version__
 from pymongo.client_session import _validate_session_write_concern
 from pymongo.common import (MAX_BSON_SIZE,
+                            MAX_CONNECTING,
+                            MAX_IDLE_TIME_SEC,
                             MAX_MESSAGE_SIZE,
+                            MAX_POOL_SIZE,
                             MAX_WIRE_VERSION,
                             MAX_WRITE_BATCH_SIZE,
-                            ORDERED_TYPES)
+                            MIN_POOL_SIZE,
+                            ORDERED_TYPES,
+                            TRACK_OPERATION_LATENCY,
+                            WAIT_QUEUE_TIMEOUT)
+from pymongo.compression_support import CompressionStatistics
 from pymongo.errors import (AutoReconnect,
                             ConnectionFailure,
                             ConfigurationError,
@@ -56,10 +70,13 @@ from pymongo.errors import (AutoReconnect,
                             NotMasterError,
                             OperationFailure)
 from pymongo.ismaster import IsMaster
+from pymongo.monitoring import (ConnectionCheckOutFailedReason,
+                                ConnectionClosedReason)
 from pymongo.monotonic import time as _time
 from pymongo.network import (command,
                              receive_message,
-                             SocketChecker)
+                             SocketChecker,
+                             wait_connected)
 from pymongo.read_preferences import ReadPreference
 from pymongo.server_type import SERVER_TYPE
 # Always use our backport so we always have support for IP address matching
@@ -128,6 +145,13 @@ _MAX_TCP_KEEPIDLE = 300
 _MAX_TCP_KEEPINTVL = 10
 _MAX_TCP_KEEPCNT = 9
 
+# The median duration of the operations in the last minute, up to 1000 of
+# them, is a pool's operation latency. The median ignores occasional slow
+# queries.
+_OPERATION_LATENCY_PERCENTILE = 50
+_OPERATION_LATENCY_WINDOW = 60
+_MAX_OPERATION_LATENCY_SAMPLES = 1000
+
 if sys.platform == 'win32':
     try:
         import _winreg as winreg
@@ -291,7 +315,8 @@ class PoolOptions(object):
                  '__wait_queue_timeout', '__wait_queue_multiple',
                  '__ssl_context', '__ssl_match_hostname', '__socket_keepalive',
                  '__event_listeners', '__appname', '__driver', '__metadata',
-                 '__compression_settings')
+                 '__compression_settings', '__max_connecting',
+                 '__track_operation_latency')
 
     def __init__(self, max_pool_size=100, min_pool_size=0,
                  max_idle_time_seconds=None, connect_timeout=None,
@@ -299,7 +324,8 @@ class PoolOptions(object):
                  wait_queue_multiple=None, ssl_context=None,
                  ssl_match_hostname=True, socket_keepalive=True,
                  event_listeners=None, appname=None, driver=None,
-                 compression_settings=None):
+                 compression_settings=None, max_connecting=MAX_CONNECTING,
+                 track_operation_latency=TRACK_OPERATION_LATENCY):
 
         self.__max_pool_size = max_pool_size
         self.__min_pool_size = min_pool_size
@@ -315,6 +341,8 @@ class PoolOptions(object):
         self.__appname = appname
         self.__driver = driver
         self.__compression_settings = compression_settings
+        self.__max_connecting = max_connecting
+        self.__track_operation_latency = track_operation_latency
         self.__metadata = copy.deepcopy(_METADATA)
         if appname:
             self.__metadata['application'] = {'name': appname}
@@ -360,6 +388,22 @@ class PoolOptions(object):
         """
         return self.__min_pool_size
 
+    @property
+    def max_connecting(self):
+        """The maximum number of connections that each pool can establish
+        concurrently. Threads that need a new connection while this many are
+        being established wait for one to be returned to the pool instead.
+        """
+        return self.__max_connecting
+
+    @property
+    def track_operation_latency(self):
+        """Whether to measure the duration of operations, so the server
+        selection latency window accounts for it as well as for the
+        heartbeat round trip time.
+        """
+        return self.__track_operation_latency
+
     @property
     def max_idle_time_seconds(self):
         """The maximum number of seconds that a connection can remain
@@ -441,6 +485,193 @@ class PoolOptions(object):
         """
         return self.__metadata.copy()
 
+    @property
+    def non_default_options(self):
+        """The non-default options this pool was created with.
+
+        Added for CMAP's :class:`PoolCreatedEvent`.
+        """
+        opts = {}
+        if self.__max_pool_size != MAX_POOL_SIZE:
+            opts['maxPoolSize'] = self.__max_pool_size
+        if self.__min_pool_size != MIN_POOL_SIZE:
+            opts['minPoolSize'] = self.__min_pool_size
+        if self.__max_idle_time_seconds != MAX_IDLE_TIME_SEC:
+            opts['maxIdleTimeMS'] = self.__max_idle_time_seconds * 1000
+        if self.__wait_queue_timeout != WAIT_QUEUE_TIMEOUT:
+            opts['waitQueueTimeoutMS'] = self.__wait_queue_timeout * 1000
+        if self.__max_connecting != MAX_CONNECTING:
+            opts['maxConnecting'] = self.__max_connecting
+        return opts
+
+
+class PoolStatistics(object):
+    """Always-on counters for a single connection pool.
+
+    The counters are cheap to maintain and are kept whether or not any
+    :class:`~pymongo.monitoring.ConnectionPoolListener` is registered. Like
+    the compression counters they outlive :meth:`Pool.reset`.
+
+    .. versionadded:: 3.9
+    """
+
+    #: Upper bounds, in milliseconds, of the checkout wait time histogram
+    #: buckets. The last bucket counts all longer waits.
+    WAIT_TIME_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections_created = 0
+        self._connections_closed = {}
+        self._checkouts = 0
+        self._checkout_failures = {}
+        self._wait_time_histogram = [0] * (len(self.WAIT_TIME_BUCKETS_MS) + 1)
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._tls_handshakes = 0
+        self._tls_sessions_resumed = 0
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def connection_created(self):
+        with self._lock:
+            self._connections_created += 1
+
+    def connection_closed(self, reason):
+        with self._lock:
+            self._connections_closed[reason] = (
+                self._connections_closed.get(reason, 0) + 1)
+
+    def checked_out(self, wait_time):
+        """Record one checkout that took `wait_time` seconds, including any
+        time spent waiting for the pool and connecting."""
+        wait_ms = wait_time * 1000
+        index = bisect.bisect_left(self.WAIT_TIME_BUCKETS_MS, wait_ms)
+        with self._lock:
+            self._checkouts += 1
+            self._wait_time_histogram[index] += 1
+            self._wait_time_total += wait_time
+            if wait_time > self._wait_time_max:
+                self._wait_time_max = wait_time
+
+    def check_out_failed(self, reason):
+        with self._lock:
+            self._checkout_failures[reason] = (
+                self._checkout_failures.get(reason, 0) + 1)
+
+    def tls_handshake(self, resumed):
+        """Record one TLS handshake, `resumed` if it resumed a session."""
+        with self._lock:
+            self._tls_handshakes += 1
+            if resumed:
+                self._tls_sessions_resumed += 1
+
+    def snapshot(self):
+        """Return a copy of the counters as a dict, like::
+
+            {'connections_created': 12,
+             'connections_closed': {'stale': 2, 'idle': 1},
+             'checkouts': 1000,
+             'checkout_failures': {'timeout': 3},
+             'checkout_wait_time_histogram': [(1, 950), (5, 30), ...,
+                                              (None, 0)],
+             'checkout_wait_time_total': 1.2,
+             'checkout_wait_time_max': 0.4,
+             'tls_handshakes': 12,
+             'tls_sessions_resumed': 10}
+
+        Each histogram entry is (upper bound in milliseconds, count); the
+        last entry, with an upper bound of None, counts all longer waits.
+        Times are in seconds. ``tls_sessions_resumed`` counts the TLS
+        handshakes that resumed a previous session instead of doing a full
+        handshake.
+        """
+        with self._lock:
+            return {
+                'connections_created': self._connections_created,
+                'connections_closed': dict(self._connections_closed),
+                'checkouts': self._checkouts,
+                'checkout_failures': dict(self._checkout_failures),
+                'checkout_wait_time_histogram': list(zip(
+                    self.WAIT_TIME_BUCKETS_MS + (None,),
+                    self._wait_time_histogram)),
+                'checkout_wait_time_total': self._wait_time_total,
+                'checkout_wait_time_max': self._wait_time_max,
+                'tls_handshakes': self._tls_handshakes,
+                'tls_sessions_resumed': self._tls_sessions_resumed}
+
+
+class _OperationLatency(object):
+    """A decayed percentile of the durations of a pool's recent operations.
+
+    Samples older than `window` seconds are dropped, so the percentile
+    follows changes in the server's load within a minute or so.
+    """
+
+    def __init__(self, percentile=_OPERATION_LATENCY_PERCENTILE,
+                 window=_OPERATION_LATENCY_WINDOW,
+                 max_samples=_MAX_OPERATION_LATENCY_SAMPLES):
+        self._lock = threading.Lock()
+        self._percentile = percentile
+        self._window = window
+        # (time, duration) pairs, oldest first.
+        self._samples = collections.deque(maxlen=max_samples)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def add_sample(self, duration):
+        with self._lock:
+            self._samples.append((_time(), duration))
+
+    def get(self, percentile=None):
+        """The percentile of the recent durations, or None if there are
+        none. Defaults to the percentile this was created with."""
+        if percentile is None:
+            percentile = self._percentile
+        cutoff = _time() - self._window
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            durations = sorted(duration for _, duration in self._samples)
+        if not durations:
+            return None
+        index = int(len(durations) * percentile / 100.0)
+        return durations[min(index, len(durations) - 1)]
+
+
+class _TLSSessionCache(object):
+    """The most recent TLS session with one server.
+
+    New connections offer it to the server to resume the session with an
+    abbreviated handshake. Sessions are dropped when they expire or when a
+    handshake offering one fails.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session = None
+
+    def get(self):
+        """Return the session to resume, or None."""
+        with self._lock:
+            session = self._session
+            # SSLSession.time is in seconds since the epoch.
+            if (session is not None and
+                    session.time + session.timeout <= time.time()):
+                session = self._session = None
+        return session
+
+    def put(self, session):
+        if session is not None:
+            with self._lock:
+                self._session = session
+
+    def invalidate(self):
+        with self._lock:
+            self._session = None
+
 
 class SocketInfo(object):
     """Store a socket with some metadata.
@@ -449,12 +680,16 @@ class SocketInfo(object):
       - `sock`: a raw socket object
       - `pool`: a Pool instance
       - `address`: the server's (host, port)
+      - `id`: the id of this socket in it's pool
     """
-    def __init__(self, sock, pool, address):
+    def __init__(self, sock, pool, address, id):
         self.sock = sock
         self.address = address
+        self.id = id
         self.authset = set()
         self.closed = False
+        # True while idle in the pool's sockets deque.
+        self.in_pool = False
         self.last_checkin_time = _time()
         self.performed_handshake = False
         self.is_writable = False
@@ -467,18 +702,39 @@ class SocketInfo(object):
         self.op_msg_enabled = False
         self.listeners = pool.opts.event_listeners
         self.compression_settings = pool.opts.compression_settings
+        self.compression_statistics = pool.compression_statistics
         self.compression_context = None
+        self.enabled_for_cmap = pool.enabled_for_cmap
+        self.pool_statistics = pool.statistics
+        self.operation_latency = pool.operation_latency
+        # Speculative authentication from the handshake, by credentials.
+        self.auth_ctx = {}
+        # saslSupportedMechs from the handshake, by credentials.
+        self.negotiated_mechanisms = {}
 
         # The pool's pool_id changes with each reset() so we can close sockets
         # created before the last reset.
         self.pool_id = pool.pool_id
 
-    def ismaster(self, metadata, cluster_time):
+    def ismaster(self, metadata, cluster_time, all_credentials=None):
         cmd = SON([('ismaster', 1)])
+        creds = auth_ctx = None
         if not self.performed_handshake:
             cmd['client'] = metadata
             if self.compression_settings:
                 cmd['compression'] = self.compression_settings.compressors
+            # Start authenticating with the handshake, saving round trips.
+            # Only possible with a single set of credentials.
+            if all_credentials and len(all_credentials) == 1:
+                creds = next(itervalues(all_credentials))
+            if creds:
+                if creds.mechanism == 'DEFAULT' and creds.username:
+                    cmd['saslSupportedMechs'] = (
+                        creds.source + '.' + creds.username)
+                auth_ctx = auth._AuthContext.from_credentials(creds)
+                if auth_ctx:
+                    cmd['speculativeAuthenticate'] = (
+                        auth_ctx.speculate_command())
 
         if self.max_wire_version >= 6 and cluster_time is not None:
             cmd['$clusterTime'] = cluster_time
@@ -494,9 +750,18 @@ class SocketInfo(object):
         self.is_mongos = ismaster.server_type == SERVER_TYPE.Mongos
         if not self.performed_handshake and self.compression_settings:
             ctx = self.compression_settings.get_compression_context(
-                ismaster.compressors)
+                ismaster.compressors, self.compression_statistics)
             self.compression_context = ctx
 
+        if creds:
+            if 'saslSupportedMechs' in cmd:
+                self.negotiated_mechanisms[creds] = (
+                    ismaster.sasl_supported_mechs)
+            if auth_ctx:
+                auth_ctx.parse_response(ismaster)
+                if auth_ctx.speculate_succeeded():
+                    self.auth_ctx[creds] = auth_ctx
+
         self.performed_handshake = True
         self.op_msg_enabled = ismaster.max_wire_version >= 6
         return ismaster
@@ -570,23 +835,33 @@ class SocketInfo(object):
         unacknowledged = write_concern and not write_concern.acknowledged
         if self.op_msg_enabled:
             self._raise_if_not_writable(unacknowledged)
+        # Tailable getMores with maxTimeMS wait for data, don't time them.
+        timed = (self.operation_latency is not None and
+                 not unacknowledged and
+                 not ('getMore' in spec and 'maxTimeMS' in spec))
+        if timed:
+            start = _time()
         try:
-            return command(self.sock, dbname, spec, slave_ok,
-                           self.is_mongos, read_preference, codec_options,
-                           session, client, check, allowable_errors,
-                           self.address, check_keys, listeners,
-                           self.max_bson_size, read_concern,
-                           parse_write_concern_error=parse_write_concern_error,
-                           collation=collation,
-                           compression_ctx=self.compression_context,
-                           use_op_msg=self.op_msg_enabled,
-                           unacknowledged=unacknowledged,
-                           user_fields=user_fields)
+            result = command(self.sock, dbname, spec, slave_ok,
+                             self.is_mongos, read_preference, codec_options,
+                             session, client, check, allowable_errors,
+                             self.address, check_keys, listeners,
+                             self.max_bson_size, read_concern,
+                             parse_write_concern_error=(
+                                 parse_write_concern_error),
+                             collation=collation,
+                             compression_ctx=self.compression_context,
+                             use_op_msg=self.op_msg_enabled,
+                             unacknowledged=unacknowledged,
+                             user_fields=user_fields)
         except OperationFailure:
             raise
         # Catch socket.error, KeyboardInterrupt, etc. and close ourselves.
         except BaseException as error:
             self._raise_connection_failure(error)
+        if timed:
+            self.operation_latency.add_sample(_time() - start)
+        return result
 
     def send_message(self, message, max_doc_size):
         """Send a raw BSON message or raise ConnectionFailure.
@@ -605,14 +880,16 @@ class SocketInfo(object):
         except BaseException as error:
             self._raise_connection_failure(error)
 
-    def receive_message(self, request_id):
+    def receive_message(self, request_id, command_name=None):
         """Receive a raw BSON message or raise ConnectionFailure.
 
         If any exception is raised, the socket is closed.
         """
         try:
             return receive_message(self.sock, request_id,
-                                   self.max_message_size)
+                                   self.max_message_size,
+                                   compression_ctx=self.compression_context,
+                                   command_name=command_name)
         except BaseException as error:
             self._raise_connection_failure(error)
 
@@ -643,7 +920,7 @@ class SocketInfo(object):
             reply = self.receive_message(request_id)
             return helpers._check_gle_response(reply.command_response())
 
-    def write_command(self, request_id, msg):
+    def write_command(self, request_id, msg, command_name=None):
         """Send "insert" etc. command, returning response as a dict.
 
         Can raise ConnectionFailure or OperationFailure.
@@ -651,9 +928,11 @@ class SocketInfo(object):
         :Parameters:
           - `request_id`: an int.
           - `msg`: bytes, the command message.
+          - `command_name` (optional): the command name, for compression
+            statistics.
         """
         self.send_message(msg, 0)
-        reply = self.receive_message(request_id)
+        reply = self.receive_message(request_id, command_name)
         result = reply.command_response()
 
         # Raises NotMasterError or OperationFailure.
@@ -710,6 +989,32 @@ class SocketInfo(object):
                     ' credentials')
 
     def close(self):
+        """Close this connection without publishing an event."""
+        self.close_socket(None)
+
+    def close_socket(self, reason):
+        """Close this connection with a reason."""
+        if self.closed:
+            return
+        self._close_socket()
+        if reason:
+            self.pool_statistics.connection_closed(reason)
+            if self.enabled_for_cmap:
+                self.listeners.publish_connection_closed(
+                    self.address, self.id, reason)
+
+    def cancel(self):
+        """Interrupt the operation another thread is running on this
+        connection. The connection is closed when the operation fails."""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except Exception:
+            pass
+
+    def _close_socket(self):
+        """Close this connection."""
+        if self.closed:
+            return
         self.closed = True
         # Avoid exceptions on interpreter shutdown.
         try:
@@ -743,7 +1048,7 @@ class SocketInfo(object):
         # ...) is called in Python code, which experiences the signal as a
         # KeyboardInterrupt from the start, rather than as an initial
         # socket.error, so we catch that, close the socket, and reraise it.
-        self.close()
+        self.close_socket(ConnectionClosedReason.ERROR)
         if isinstance(error, socket.error):
             _raise_connection_failure(self.address, error)
         else:
@@ -797,59 +1102,202 @@ def _create_connection(address, options):
     if socket.has_ipv6 and host != 'localhost':
         family = socket.AF_UNSPEC
 
-    err = None
-    for res in socket.getaddrinfo(host, port, family, socket.SOCK_STREAM):
-        af, socktype, proto, dummy, sa = res
-        # SOCK_CLOEXEC was new in CPython 3.2, and only available on a limited
-        # number of platforms (newer Linux and *BSD). Starting with CPython 3.4
-        # all file descriptors are created non-inheritable. See PEP 446.
-        try:
-            sock = socket.socket(
-                af, socktype | getattr(socket, 'SOCK_CLOEXEC', 0), proto)
-        except socket.error:
-            # Can SOCK_CLOEXEC be defined even if the kernel doesn't support
-            # it?
-            sock = socket.socket(af, socktype, proto)
-        # Fallback when SOCK_CLOEXEC isn't available.
-        _set_non_inheritable_non_atomic(sock.fileno())
-        try:
-            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-            sock.settimeout(options.connect_timeout)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE,
-                            options.socket_keepalive)
-            if options.socket_keepalive:
-                _set_keepalive_times(sock)
-            sock.connect(sa)
-            return sock
-        except socket.error as e:
-            err = e
-            sock.close()
-
-    if err is not None:
-        raise err
-    else:
+    addrinfos = _address_preferences.sort(address, dns_resolver.getaddrinfo(
+        host, port, family, socket.SOCK_STREAM))
+    if not addrinfos:
         # This likely means we tried to connect to an IPv6 only
         # host with an OS/kernel or Python interpreter that doesn't
         # support IPv6. The test case is Jython2.5.1 which doesn't
         # support IPv6 at all.
         raise socket.error('getaddrinfo failed')
 
+    try:
+        if len(addrinfos) == 1:
+            sock = _new_socket(addrinfos[0], options)
+            try:
+                sock.connect(addrinfos[0][4])
+                return sock
+            except socket.error:
+                sock.close()
+                raise
+
+        sock, sa = _connect_staggered(addrinfos, options)
+    except socket.error:
+        # The host may have moved, look it up again next time.
+        dns_resolver.invalidate(host, port)
+        raise
+    _address_preferences.record(address, sa)
+    return sock
+
+
+def _new_socket(addrinfo, options):
+    """Create an unconnected socket for a getaddrinfo result."""
+    af, socktype, proto, dummy, sa = addrinfo
+    # SOCK_CLOEXEC was new in CPython 3.2, and only available on a limited
+    # number of platforms (newer Linux and *BSD). Starting with CPython 3.4
+    # all file descriptors are created non-inheritable. See PEP 446.
+    try:
+        sock = socket.socket(
+            af, socktype | getattr(socket, 'SOCK_CLOEXEC', 0), proto)
+    except socket.error:
+        # Can SOCK_CLOEXEC be defined even if the kernel doesn't support
+        # it?
+        sock = socket.socket(af, socktype, proto)
+    # Fallback when SOCK_CLOEXEC isn't available.
+    _set_non_inheritable_non_atomic(sock.fileno())
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(options.connect_timeout)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE,
+                        options.socket_keepalive)
+        if options.socket_keepalive:
+            _set_keepalive_times(sock)
+    except socket.error:
+        sock.close()
+        raise
+    return sock
+
+
+# How long to wait for a connection attempt before starting the next one,
+# the "Connection Attempt Delay" of RFC 8305.
+_CONNECTION_ATTEMPT_DELAY = 0.25
+
+_CONNECT_IN_PROGRESS = frozenset(
+    [errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, errno.EALREADY,
+     getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)])
+
+
+def _connect_staggered(addrinfos, options):
+    """Connect to the first of several addresses to accept, "Happy Eyeballs"
+    style (RFC 8305).
+
+    Starts a connection attempt every _CONNECTION_ATTEMPT_DELAY seconds, or
+    as soon as the previous one fails, without giving up on earlier attempts
+    until they time out. Returns (socket, sockaddr) of the first attempt to
+    succeed and closes the others, or raises the last error.
+    """
+    timeout = options.connect_timeout
+    remaining = list(addrinfos)
+    # Maps socket to (sockaddr, deadline).
+    attempts = {}
+    err = None
+    next_attempt = 0
+    try:
+        while remaining or attempts:
+            now = _time()
+            if remaining and (not attempts or now >= next_attempt):
+                addrinfo = remaining.pop(0)
+                next_attempt = now + _CONNECTION_ATTEMPT_DELAY
+                try:
+                    sock = _new_socket(addrinfo, options)
+                except socket.error as exc:
+                    err = exc
+                    continue
+                sa = addrinfo[4]
+                sock.setblocking(False)
+                code = sock.connect_ex(sa)
+                if code == 0:
+                    sock.settimeout(timeout)
+                    return sock, sa
+                if code not in _CONNECT_IN_PROGRESS:
+                    err = socket.error(code, os.strerror(code))
+                    sock.close()
+                    continue
+                deadline = None if timeout is None else now + timeout
+                attempts[sock] = (sa, deadline)
+                continue
+
+            waits = [deadline - now for _, deadline in attempts.values()
+                     if deadline is not None]
+            if remaining:
+                waits.append(next_attempt - now)
+            wait = max(min(waits), 0) if waits else None
+            for sock in wait_connected(list(attempts), wait):
+                sa, _ = attempts.pop(sock)
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if code == 0:
+                    sock.settimeout(timeout)
+                    return sock, sa
+                err = socket.error(code, os.strerror(code))
+                sock.close()
+                # Start the next attempt right away.
+                next_attempt = 0
+
+            now = _time()
+            for sock, (sa, deadline) in list(attempts.items()):
+                if deadline is not None and now >= deadline:
+                    del attempts[sock]
+                    sock.close()
+                    err = socket.timeout('timed out')
+    finally:
+        for sock in attempts:
+            sock.close()
+    raise err
+
+
+class _AddressPreferences(object):
+    """Remembers which resolved address of each host last accepted a
+    connection, so that new connections try it first."""
+
+    def __init__(self):
+        # Assignments to a dict are atomic, no lock is needed.
+        self._preferred = {}
+
+    def record(self, address, sockaddr):
+        self._preferred[address] = sockaddr
+
+    def sort(self, address, addrinfos):
+        """Order getaddrinfo results as RFC 8305 recommends: alternating
+        address families starting with the first result's family, the
+        address that last connected first."""
+        by_family = collections.OrderedDict()
+        for addrinfo in addrinfos:
+            by_family.setdefault(addrinfo[0], []).append(addrinfo)
+        ordered = []
+        groups = list(by_family.values())
+        while groups:
+            ordered.extend(group.pop(0) for group in groups)
+            groups = [group for group in groups if group]
+        preferred = self._preferred.get(address)
+        for i, addrinfo in enumerate(ordered):
+            if addrinfo[4] == preferred:
+                ordered.insert(0, ordered.pop(i))
+                break
+        return ordered
+
+
+_address_preferences = _AddressPreferences()
+
 
 _PY37PLUS = sys.version_info[:2] >= (3, 7)
 
+# Python 3.7+ lets MongoClient reinitialize its pools in the child right
+# after os.fork(). Otherwise pools check the pid on each checkout.
+_HAS_REGISTER_AT_FORK = hasattr(os, 'register_at_fork')
+
+# A checkout looks for the thread's last socket among this many of the most
+# recently returned idle sockets, so it takes constant time in large pools.
+_AFFINITY_SEARCH_DEPTH = 8
 
-def _configured_socket(address, options):
+
+def _configured_socket(address, options, tls_sessions=None):
     """Given (host, port) and PoolOptions, return a configured socket.
 
     Can raise socket.error, ConnectionFailure, or CertificateError.
 
-    Sets socket's SSL and timeout options.
+    Sets socket's SSL and timeout options. Resumes the TLS session in the
+    _TLSSessionCache `tls_sessions`, if any.
     """
     sock = _create_connection(address, options)
     ssl_context = options.ssl_context
 
     if ssl_context is not None:
         host = address[0]
+        kwargs = {}
+        if tls_sessions is not None:
+            session = tls_sessions.get()
+            if session is not None:
+                kwargs['session'] = session
         try:
             # According to RFC6066, section 3, IPv4 and IPv6 literals are
             # not permitted for SNI hostname.
@@ -859,16 +1307,22 @@ def _configured_socket(address, options):
             # We have to pass hostname / ip address to wrap_socket
             # to use SSLContext.check_hostname.
             if _HAVE_SNI and (not is_ip_address(host) or _PY37PLUS):
-                sock = ssl_context.wrap_socket(sock, server_hostname=host)
+                sock = ssl_context.wrap_socket(
+                    sock, server_hostname=host, **kwargs)
             else:
-                sock = ssl_context.wrap_socket(sock)
+                sock = ssl_context.wrap_socket(sock, **kwargs)
         except _SSLCertificateError:
             sock.close()
+            if kwargs:
+                tls_sessions.invalidate()
             # Raise CertificateError directly like we do after match_hostname
             # below.
             raise
         except IOError as exc:
             sock.close()
+            if kwargs:
+                # Don't offer the session again, the server may reject it.
+                tls_sessions.invalidate()
             # We raise AutoReconnect for transient and permanent SSL handshake
             # failures alike. Permanent handshake failures, like protocol
             # mismatch, will be turned into ServerSelectionTimeoutErrors later.
@@ -909,11 +1363,52 @@ class Pool:
         # Keep track of resets, so we notice sockets created before the most
         # recent reset and close them.
         self.pool_id = 0
+        # Sockets with a lower pool_id were checked out before os.fork().
+        self._fork_pool_id = 0
         self.pid = os.getpid()
         self.address = address
         self.opts = options
         self.handshake = handshake
 
+        self._socket_semaphore = self._create_semaphore()
+        # The socket each thread last returned, which it prefers to reuse.
+        self._local = threading.local()
+        self.socket_checker = SocketChecker()
+        # When remove_stale_sockets last checked all idle sockets.
+        self._last_liveness_check = _time()
+        # Threads blocked waiting for the semaphore.
+        self.waiters = 0
+        # Connections being established, at most max_connecting. Checkouts
+        # wait on _max_connecting_cond for a returned socket or a free slot.
+        self._pending = 0
+        self._max_connecting_cond = threading.Condition(self.lock)
+        # Number of background threads filling the pool to min_pool_size.
+        self._prewarm_workers = 0
+        # Monotonically increasing connection ID required for CMAP Events.
+        self.next_connection_id = 1
+        # Compression counters outlive reset() so they cover the whole life
+        # of the pool.
+        if self.opts.compression_settings:
+            self.compression_statistics = CompressionStatistics()
+        else:
+            self.compression_statistics = None
+        self.statistics = PoolStatistics()
+        if self.opts.track_operation_latency:
+            self.operation_latency = _OperationLatency()
+        else:
+            self.operation_latency = None
+        # The TLS session new connections resume.
+        self._tls_sessions = self._create_tls_session_cache()
+        # Don't publish events in Monitor pools.
+        self.enabled_for_cmap = (
+                self.handshake and
+                self.opts.event_listeners is not None and
+                self.opts.event_listeners.enabled_for_cmap)
+        if self.enabled_for_cmap:
+            self.opts.event_listeners.publish_pool_created(
+                self.address, self.opts.non_default_options)
+
+    def _create_semaphore(self):
         if (self.opts.wait_queue_multiple is None or
                 self.opts.max_pool_size is None):
             max_waiters = None
@@ -921,11 +1416,44 @@ class Pool:
             max_waiters = (
                 self.opts.max_pool_size * self.opts.wait_queue_multiple)
 
-        self._socket_semaphore = thread_util.create_semaphore(
-            self.opts.max_pool_size, max_waiters)
+        # Waiters are served in FIFO order, and a returned socket is handed
+        # straight to the longest waiting thread. The semaphore shares our
+        # lock so checkout and checkin each take it only once.
+        return thread_util.create_fifo_semaphore(
+            self.opts.max_pool_size, max_waiters, self.lock)
+
+    def _create_tls_session_cache(self):
+        if (_HAVE_TLS_SESSIONS and
+                isinstance(self.opts.ssl_context, ssl.SSLContext)):
+            return _TLSSessionCache()
+        return None
+
+    def _after_fork(self):
+        """Reinitialize the pool in the child process after os.fork().
+
+        Threads that held our locks don't exist in the child and our sockets
+        are shared with the parent, so replace the locks and counters and
+        discard all sockets. Sockets checked out before the fork are closed
+        when they are returned.
+        """
+        self.lock = threading.Lock()
+        self._socket_semaphore = self._create_semaphore()
+        self._max_connecting_cond = threading.Condition(self.lock)
+        self._local = threading.local()
         self.socket_checker = SocketChecker()
-
-    def reset(self):
+        self._tls_sessions = self._create_tls_session_cache()
+        self.statistics._after_fork()
+        if self.compression_statistics:
+            self.compression_statistics._after_fork()
+        if self.operation_latency:
+            self.operation_latency._after_fork()
+        self.waiters = 0
+        self._pending = 0
+        self._prewarm_workers = 0
+        self.reset()
+        self._fork_pool_id = self.pool_id
+
+    def _reset(self, close):
         with self.lock:
             self.pool_id += 1
             self.pid = os.getpid()
@@ -933,52 +1461,189 @@ class Pool:
             self.active_sockets = 0
 
         for sock_info in sockets:
-            sock_info.close()
+            sock_info.in_pool = False
+        listeners = self.opts.event_listeners
+        if close:
+            for sock_info in sockets:
+                sock_info.close_socket(ConnectionClosedReason.POOL_CLOSED)
+            if self.enabled_for_cmap:
+                listeners.publish_pool_closed(self.address)
+        else:
+            if self.enabled_for_cmap:
+                listeners.publish_pool_cleared(self.address)
+            for sock_info in sockets:
+                sock_info.close_socket(ConnectionClosedReason.STALE)
+
+    def reset(self):
+        """Clear the pool, closing idle connections. Connections in use are
+        closed when they are returned."""
+        self._reset(close=False)
+
+    def close(self):
+        """Close the pool and all of its idle connections.
+
+        Like :meth:`reset`, the pool creates new connections on demand.
+        """
+        self._reset(close=True)
 
     def remove_stale_sockets(self):
-        """Removes stale sockets then adds new ones if pool is too small."""
+        """Removes stale sockets then starts adding new ones in the
+        background if pool is too small."""
         if self.opts.max_idle_time_seconds is not None:
+            idle = []
             with self.lock:
                 while (self.sockets and
                        self.sockets[-1].idle_time_seconds() > self.opts.max_idle_time_seconds):
                     sock_info = self.sockets.pop()
-                    sock_info.close()
-        while True:
-            with self.lock:
-                if (len(self.sockets) + self.active_sockets >=
-                        self.opts.min_pool_size):
-                    # There are enough sockets in the pool.
-                    break
-
-            # We must acquire the semaphore to respect max_pool_size.
-            if not self._socket_semaphore.acquire(False):
-                break
-            try:
-                sock_info = self.connect()
+                    sock_info.in_pool = False
+                    idle.append(sock_info)
+            # Close after releasing the lock, listeners may use the pool.
+            for sock_info in idle:
+                sock_info.close_socket(ConnectionClosedReason.IDLE)
+        self._remove_closed_sockets()
+        # Don't wait for the new connections: this runs on a scheduler
+        # thread shared with every client's monitors.
+        self.prewarm()
+
+    def _remove_closed_sockets(self):
+        """Close idle sockets that were closed by the server or a network
+        error, checking them all with one poll() call.
+
+        Runs periodically in the background, so checkouts rarely need to
+        check a socket themselves. See :meth:`_perished`.
+        """
+        if self._check_interval_seconds is None:
+            return
+        with self.lock:
+            if self.sockets:
+                closed = set(id(sock) for sock in
+                             self.socket_checker.closed_sockets(
+                                 [sock_info.sock
+                                  for sock_info in self.sockets]))
+            else:
+                closed = ()
+            perished = [sock_info for sock_info in self.sockets
+                        if id(sock_info.sock) in closed]
+            for sock_info in perished:
+                self.sockets.remove(sock_info)
+                sock_info.in_pool = False
+            self._last_liveness_check = _time()
+        for sock_info in perished:
+            sock_info.close_socket(ConnectionClosedReason.ERROR)
+
+    def prewarm(self):
+        """Start establishing min_pool_size connections in the background.
+
+        Up to max_connecting connections are established in parallel.
+        Returns immediately.
+        """
+        with self.lock:
+            if self._prewarm_workers or (not _HAS_REGISTER_AT_FORK and
+                                         self.pid != os.getpid()):
+                # Already filling the pool, or we've forked and the next
+                # checkout will reset the pool.
+                return
+            needed = (self.opts.min_pool_size -
+                      len(self.sockets) - self.active_sockets)
+            if needed <= 0:
+                return
+            n_workers = min(needed, self.opts.max_connecting)
+            self._prewarm_workers = n_workers
+
+        for _ in range(n_workers):
+            worker = threading.Thread(target=self._prewarm_worker,
+                                      name="pymongo_prewarm_thread")
+            worker.daemon = True
+            worker.start()
+
+    def _prewarm_worker(self):
+        """Add connections until the pool reaches min_pool_size."""
+        try:
+            while True:
                 with self.lock:
-                    self.sockets.appendleft(sock_info)
-            finally:
-                self._socket_semaphore.release()
+                    if (len(self.sockets) + self.active_sockets +
+                            self._pending >= self.opts.min_pool_size):
+                        # There are enough sockets in the pool.
+                        return
+                    if self._pending >= self.opts.max_connecting:
+                        # Leave room for checkouts, retry on the next run.
+                        return
+                    # We must acquire the semaphore to respect max_pool_size.
+                    if not self._socket_semaphore.acquire_locked():
+                        return
+                    # Count the connection in the same critical section as
+                    # the checks, so workers can't exceed max_connecting.
+                    self._pending += 1
+                    pool_id = self.pool_id
+
+                try:
+                    try:
+                        sock_info = self.connect()
+                    finally:
+                        with self.lock:
+                            self._pending -= 1
+                            self._max_connecting_cond.notify()
+                    with self.lock:
+                        if pool_id == self.pool_id:
+                            self.sockets.appendleft(sock_info)
+                            sock_info.in_pool = True
+                            self._max_connecting_cond.notify()
+                            sock_info = None
+                    if sock_info is not None:
+                        # The pool was reset while we were connecting.
+                        sock_info.close_socket(ConnectionClosedReason.STALE)
+                finally:
+                    self._socket_semaphore.release()
+        except Exception:
+            # The server's monitor reports connection errors, the next
+            # call to remove_stale_sockets tries again.
+            pass
+        finally:
+            with self.lock:
+                self._prewarm_workers -= 1
 
-    def connect(self):
+    def connect(self, all_credentials=None):
         """Connect to Mongo and return a new SocketInfo.
 
-        Can raise ConnectionFailure or CertificateError.
+        Can raise ConnectionFailure or CertificateError. With a single set of
+        `all_credentials`, authentication starts with the handshake; the
+        caller finishes it with check_auth.
 
         Note that the pool does not keep a reference to the socket -- you
         must call return_socket() when you're done with it.
         """
+        with self.lock:
+            conn_id = self.next_connection_id
+            self.next_connection_id += 1
+
+        listeners = self.opts.event_listeners
+        self.statistics.connection_created()
+        if self.enabled_for_cmap:
+            listeners.publish_connection_created(self.address, conn_id)
+
         sock = None
         try:
-            sock = _configured_socket(self.address, self.opts)
+            sock = _configured_socket(
+                self.address, self.opts, self._tls_sessions)
         except socket.error as error:
             if sock is not None:
                 sock.close()
+            self.statistics.connection_closed(ConnectionClosedReason.ERROR)
+            if self.enabled_for_cmap:
+                listeners.publish_connection_closed(
+                    self.address, conn_id, ConnectionClosedReason.ERROR)
             _raise_connection_failure(self.address, error)
 
-        sock_info = SocketInfo(sock, self, self.address)
+        sock_info = SocketInfo(sock, self, self.address, conn_id)
         if self.handshake:
-            sock_info.ismaster(self.opts.metadata, None)
+            sock_info.ismaster(self.opts.metadata, None, all_credentials)
+            if self.enabled_for_cmap:
+                listeners.publish_connection_ready(self.address, conn_id)
+        if self._tls_sessions is not None:
+            self.statistics.tls_handshake(sock.session_reused)
+            # With TLS 1.3 the session ticket arrives after the handshake,
+            # so only take the session after reading the ismaster reply.
+            self._tls_sessions.put(sock.session)
         return sock_info
 
     @contextlib.contextmanager
@@ -1004,102 +1669,258 @@ class Pool:
           - `all_credentials`: dict, maps auth source to MongoCredential.
           - `checkout` (optional): keep socket checked out.
         """
+        listeners = self.opts.event_listeners
+        if self.enabled_for_cmap:
+            listeners.publish_connection_check_out_started(self.address)
+        start = _time()
         # First get a socket, then attempt authentication. Simplifies
         # semaphore management in the face of network errors during auth.
-        sock_info = self._get_socket_no_auth()
+        sock_info = self._get_socket_no_auth(all_credentials)
+        checked_auth = False
         try:
             sock_info.check_auth(all_credentials)
+            checked_auth = True
+            self.statistics.checked_out(_time() - start)
+            if self.enabled_for_cmap:
+                listeners.publish_connection_checked_out(
+                    self.address, sock_info.id)
             yield sock_info
         except:
             # Exception in caller. Decrement semaphore.
             self.return_socket(sock_info)
+            if not checked_auth:
+                self.statistics.check_out_failed(
+                    ConnectionCheckOutFailedReason.CONN_ERROR)
+                if self.enabled_for_cmap:
+                    listeners.publish_connection_check_out_failed(
+                        self.address,
+                        ConnectionCheckOutFailedReason.CONN_ERROR)
             raise
         else:
             if not checkout:
                 self.return_socket(sock_info)
 
-    def _get_socket_no_auth(self):
-        """Get or create a SocketInfo. Can raise ConnectionFailure."""
+    def _get_socket_no_auth(self, all_credentials=None):
+        """Get or create a SocketInfo. Can raise ConnectionFailure.
+
+        New sockets speculatively start authenticating `all_credentials`.
+        """
         # We use the pid here to avoid issues with fork / multiprocessing.
         # See test.test_client:TestClient.test_fork for an example of
-        # what could go wrong otherwise
-        if self.pid != os.getpid():
+        # what could go wrong otherwise. With os.register_at_fork our
+        # MongoClient calls _after_fork in the child instead.
+        if not _HAS_REGISTER_AT_FORK and self.pid != os.getpid():
             self.reset()
 
-        # Get a free socket or create one.
-        if not self._socket_semaphore.acquire(
-                True, self.opts.wait_queue_timeout):
-            self._raise_wait_queue_timeout()
+        # Common case: take a permit and an idle socket in one critical
+        # section. Only count waiters when the pool is exhausted.
         with self.lock:
-            self.active_sockets += 1
+            acquired = self._socket_semaphore.acquire_locked()
+            if acquired:
+                self.active_sockets += 1
+                sock_info = self._pop_socket()
+        if acquired:
+            if sock_info is not None and not self._perished(sock_info):
+                return sock_info
+            sock_info = None
+        else:
+            with self.lock:
+                self.waiters += 1
+            try:
+                acquired, sock_info = self._socket_semaphore.acquire_item(
+                    True, self.opts.wait_queue_timeout)
+            except thread_util.ExceededMaxWaiters:
+                # The wait queue is full, waiting any longer would time out.
+                self._check_out_failed(ConnectionCheckOutFailedReason.TIMEOUT)
+                raise
+            finally:
+                with self.lock:
+                    self.waiters -= 1
+            if not acquired:
+                self._check_out_failed(ConnectionCheckOutFailedReason.TIMEOUT)
+                self._raise_wait_queue_timeout()
+            with self.lock:
+                self.active_sockets += 1
+
+            if sock_info is not None:
+                # return_socket handed us its socket along with the permit.
+                if sock_info.pool_id == self.pool_id:
+                    return sock_info
+                sock_info.close_socket(ConnectionClosedReason.STALE)
 
         # We've now acquired the semaphore and must release it on error.
         try:
-            try:
-                # set.pop() isn't atomic in Jython less than 2.7, see
-                # http://bugs.jython.org/issue1854
-                with self.lock:
-                    # Can raise ConnectionFailure.
-                    sock_info = self.sockets.popleft()
-            except IndexError:
-                # Can raise ConnectionFailure or CertificateError.
-                sock_info = self.connect()
-            else:
-                # Can raise ConnectionFailure.
-                sock_info = self._check(sock_info)
+            # Can raise ConnectionFailure or CertificateError.
+            sock_info = self._get_or_create_socket(all_credentials)
         except Exception:
             self._socket_semaphore.release()
             with self.lock:
                 self.active_sockets -= 1
+            self._check_out_failed(ConnectionCheckOutFailedReason.CONN_ERROR)
             raise
 
+        if sock_info is None:
+            self._socket_semaphore.release()
+            with self.lock:
+                self.active_sockets -= 1
+            self._check_out_failed(ConnectionCheckOutFailedReason.TIMEOUT)
+            self._raise_wait_queue_timeout()
+
         return sock_info
 
+    def _get_or_create_socket(self, all_credentials=None):
+        """Pop a usable idle socket or connect a new one.
+
+        While max_connecting connections are already being established, wait
+        for one of them to finish or for a socket to be returned to the pool
+        instead of opening yet another connection. Returns None if that
+        takes longer than wait_queue_timeout.
+        """
+        deadline = None
+        if self.opts.wait_queue_timeout is not None:
+            deadline = _time() + self.opts.wait_queue_timeout
+        while True:
+            with self._max_connecting_cond:
+                while (not self.sockets and
+                       self._pending >= self.opts.max_connecting):
+                    timeout = None
+                    if deadline is not None:
+                        timeout = deadline - _time()
+                        if timeout <= 0:
+                            return None
+                    self._max_connecting_cond.wait(timeout)
+                sock_info = self._pop_socket()
+                if sock_info is None:
+                    self._pending += 1
+
+            if sock_info is None:
+                try:
+                    return self.connect(all_credentials)
+                finally:
+                    with self._max_connecting_cond:
+                        self._pending -= 1
+                        self._max_connecting_cond.notify()
+
+            if not self._perished(sock_info):
+                return sock_info
+
+    def _pop_socket(self):
+        """Pop the calling thread's last socket if it is one of the most
+        recently returned idle sockets, otherwise the most recently returned
+        socket, or None if the pool is empty.
+
+        The caller must hold the lock.
+        """
+        sockets = self.sockets
+        if not sockets:
+            return None
+        ref = getattr(self._local, 'sock_info', None)
+        last = ref and ref()
+        # Unless another thread has it, or it was discarded.
+        if last is not None and last.in_pool and last is not sockets[0]:
+            for i in range(1, min(len(sockets), _AFFINITY_SEARCH_DEPTH)):
+                if sockets[i] is last:
+                    del sockets[i]
+                    last.in_pool = False
+                    return last
+        sock_info = sockets.popleft()
+        sock_info.in_pool = False
+        return sock_info
+
+    def _check_out_failed(self, reason):
+        self.statistics.check_out_failed(reason)
+        if self.enabled_for_cmap:
+            self.opts.event_listeners.publish_connection_check_out_failed(
+                self.address, reason)
+
     def return_socket(self, sock_info):
         """Return the socket to the pool, or if it's closed discard it."""
-        if self.pid != os.getpid():
+        if self.enabled_for_cmap:
+            self.opts.event_listeners.publish_connection_checked_in(
+                self.address, sock_info.id)
+        if sock_info.pool_id < self._fork_pool_id:
+            # Checked out before os.fork(), its permit was the parent's.
+            sock_info.close_socket(ConnectionClosedReason.STALE)
+            return
+        if not _HAS_REGISTER_AT_FORK and self.pid != os.getpid():
             self.reset()
+            sock_info = None
+        elif sock_info.pool_id != self.pool_id:
+            sock_info.close_socket(ConnectionClosedReason.STALE)
+            sock_info = None
+        elif sock_info.closed:
+            sock_info = None
         else:
-            if sock_info.pool_id != self.pool_id:
-                sock_info.close()
-            elif not sock_info.closed:
-                sock_info.update_last_checkin_time()
-                with self.lock:
-                    self.sockets.appendleft(sock_info)
+            sock_info.update_last_checkin_time()
 
-        self._socket_semaphore.release()
         with self.lock:
             self.active_sockets -= 1
-
-    def _check(self, sock_info):
-        """This side-effecty function checks if this socket has been idle for
-        for longer than the max idle time, or if the socket has been closed by
-        some external network error, and if so, attempts to create a new
-        socket. If this connection attempt fails we raise the
-        ConnectionFailure.
+            if sock_info is None:
+                waiter = self._socket_semaphore.release_locked()
+            else:
+                # Hand the socket and our permit to the longest waiting
+                # checkout, if any.
+                waiter = self._socket_semaphore.transfer_locked(sock_info)
+                if waiter is None:
+                    self.sockets.appendleft(sock_info)
+                    sock_info.in_pool = True
+                    # Wake a checkout waiting for maxConnecting.
+                    self._max_connecting_cond.notify()
+                    self._socket_semaphore.release_locked()
+        if waiter is not None:
+            waiter.set()
+        elif sock_info is not None:
+            # A weak reference, not to keep discarded sockets alive.
+            self._local.sock_info = weakref.ref(sock_info)
+
+    def _perished(self, sock_info):
+        """Return True and close the socket if it has been idle for longer
+        than the max idle time, or if it has been closed by some external
+        network error. The caller then takes another socket or connects a
+        new one, within the max_connecting limit.
 
         Checking sockets lets us avoid seeing *some*
         :class:`~pymongo.errors.AutoReconnect` exceptions on server
         hiccups, etc. We only check if the socket was closed by an external
         error if it has been > 1 second since the socket was checked into the
-        pool, to keep performance reasonable - we can't avoid AutoReconnects
+        pool and since remove_stale_sockets last checked all idle sockets, to
+        keep performance reasonable - we can't avoid AutoReconnects
         completely anyway.
         """
         idle_time_seconds = sock_info.idle_time_seconds()
         # If socket is idle, open a new one.
         if (self.opts.max_idle_time_seconds is not None and
                 idle_time_seconds > self.opts.max_idle_time_seconds):
-            sock_info.close()
-            return self.connect()
+            sock_info.close_socket(ConnectionClosedReason.IDLE)
+            return True
 
+        # Only check sockets that neither we nor the periodic
+        # _remove_closed_sockets have checked recently.
+        unchecked_seconds = min(idle_time_seconds,
+                                _time() - self._last_liveness_check)
         if (self._check_interval_seconds is not None and (
                 0 == self._check_interval_seconds or
-                idle_time_seconds > self._check_interval_seconds)):
+                unchecked_seconds > self._check_interval_seconds)):
             if self.socket_checker.socket_closed(sock_info.sock):
-                sock_info.close()
-                return self.connect()
+                sock_info.close_socket(ConnectionClosedReason.ERROR)
+                return True
 
-        return sock_info
+        return False
+
+    def pool_statistics(self):
+        """Return a snapshot of this pool's :class:`PoolStatistics` together
+        with its current state: the number of connections (``size``),
+        connections checked out or being established (``in_use``), idle
+        connections (``available``), and threads waiting for a connection
+        (``waiters``).
+        """
+        stats = self.statistics.snapshot()
+        with self.lock:
+            stats['in_use'] = self.active_sockets
+            stats['available'] = len(self.sockets)
+            stats['waiters'] = self.waiters
+        stats['size'] = stats['in_use'] + stats['available']
+        return stats
 
     def _raise_wait_queue_timeout(self):
         raise ConnectionFailure(
@@ -1109,5 +1930,7 @@ class Pool:
 
     def __del__(self):
         # Avoid ResourceWarnings in Python 3
+        # Close all sockets without calling reset() or close() because it is
+        # not safe to acquire a lock in __del__.
         for sock_info in self.sockets:
-            sock_info.close()
+            sock_info._close_socket()
@@ -68,10 +68,10 @@ class Response(object):
         return self._docs
 
 class ExhaustResponse(Response):
-    __slots__ = ('_socket_info', '_pool')
+    __slots__ = ('_socket_info', '_pool', '_more_to_come')
 
     def __init__(self, data, address, socket_info, pool, request_id, duration,
-                 from_command, docs):
+                 from_command, docs, more_to_come=True):
         """Represent a response to an exhaust cursor's initial query.
 
         :Parameters:
@@ -82,6 +82,8 @@ class ExhaustResponse(Response):
           - `request_id`: The request id of this operation.
           - `duration`: The duration of the operation.
           - `from_command`: If the response is the result of a db command.
+          - `more_to_come`: Whether the server will stream another batch on
+            this socket without waiting for a getMore.
         """
         super(ExhaustResponse, self).__init__(data,
                                               address,
@@ -90,6 +92,7 @@ class ExhaustResponse(Response):
                                               from_command, docs)
         self._socket_info = socket_info
         self._pool = pool
+        self._more_to_come = more_to_come
 
     @property
     def socket_info(self):
@@ -105,3 +108,8 @@ class ExhaustResponse(Response):
     def pool(self):
         """The Pool from which the SocketInfo came."""
         return self._pool
+
+    @property
+    def more_to_come(self):
+        """If true, the server is streaming more batches on this socket."""
+        return self._more_to_come
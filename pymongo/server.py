@@ -14,25 +14,68 @@
 
 """Communicate with one MongoDB server in a topology."""
 
+import contextlib
+import threading
+
 from datetime import datetime
 
 from pymongo.errors import NotMasterError, OperationFailure
 from pymongo.helpers import _check_command_response
-from pymongo.message import _convert_exception
+from pymongo.message import _convert_exception, _OpMsg
+from pymongo.monotonic import time as _time
+from pymongo.read_preferences import MovingAverage
 from pymongo.response import Response, ExhaustResponse
 from pymongo.server_type import SERVER_TYPE
 
 _CURSOR_DOC_FIELDS = {'cursor': {'firstBatch': 1, 'nextBatch': 1}}
 
 
+class _ServerLoad(object):
+    """Operations in progress on one server, and their recent latency.
+
+    Used by the 'leastOutstanding' server selection policy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.operation_count = 0
+        self.latency = MovingAverage()
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self.operation_count = 0
+
+    @contextlib.contextmanager
+    def track(self):
+        """Count an operation in progress and time it."""
+        with self._lock:
+            self.operation_count += 1
+        start = _time()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.operation_count -= 1
+                self.latency.add_sample(_time() - start)
+
+    def cost(self, default_latency):
+        """The expected wait for one more operation on this server."""
+        latency = self.latency.get()
+        if latency is None:
+            latency = default_latency
+        # Without a latency yet, still prefer fewer operations in progress.
+        return (self.operation_count + 1) * max(latency, 1e-6)
+
+
 class Server(object):
     def __init__(self, server_description, pool, monitor, topology_id=None,
-                 listeners=None, events=None):
+                 listeners=None, events=None, track_load=False):
         """Represent one MongoDB server."""
         self._description = server_description
         self._pool = pool
         self._monitor = monitor
         self._topology_id = topology_id
+        self._load = _ServerLoad() if track_load else None
         self._publish = listeners is not None and listeners.enabled_for_server
         self._listener = listeners
         self._events = None
@@ -50,6 +93,13 @@ class Server(object):
         """Clear the connection pool."""
         self.pool.reset()
 
+    def _after_fork(self):
+        """Reinitialize in the child process after os.fork()."""
+        self._pool._after_fork()
+        self._monitor._after_fork()
+        if self._load is not None:
+            self._load._after_fork()
+
     def close(self):
         """Clear the connection pool and stop the monitor.
 
@@ -59,7 +109,7 @@ class Server(object):
             self._events.put((self._listener.publish_server_closed,
                               (self._description.address, self._topology_id)))
         self._monitor.close()
-        self._pool.reset()
+        self._pool.close()
 
     def request_check(self):
         """Check the server's state soon."""
@@ -92,7 +142,13 @@ class Server(object):
         if publish:
             start = datetime.now()
 
-        send_message = not operation.exhaust_mgr
+        # Exhaust cursors don't send getMores while the server is streaming
+        # batches to them.
+        send_message = not (operation.exhaust_mgr and
+                            operation.exhaust_mgr.more_to_come)
+        compression_ctx = sock_info.compression_context
+        if compression_ctx:
+            compression_ctx.reset_last()
 
         if send_message:
             use_cmd = operation.use_command(sock_info, exhaust)
@@ -109,12 +165,22 @@ class Server(object):
                 cmd, dbn, request_id, sock_info.address)
             start = datetime.now()
 
+        # Don't time getMores that wait for a tailable cursor's data.
+        timed = (sock_info.operation_latency is not None and
+                 send_message and
+                 not getattr(operation, 'max_await_time_ms', None))
+        if timed:
+            op_start = _time()
+
         try:
             if send_message:
                 sock_info.send_message(data, max_doc_size)
-                reply = sock_info.receive_message(request_id)
+                reply = sock_info.receive_message(request_id, operation.name)
             else:
-                reply = sock_info.receive_message(None)
+                reply = sock_info.receive_message(None, operation.name)
+                # A batch streamed over OP_MSG answers the getMore command
+                # that started the stream, like the batch before it.
+                use_cmd = isinstance(reply, _OpMsg)
 
             # Unpack and check for command errors.
             if use_cmd:
@@ -144,6 +210,9 @@ class Server(object):
                     request_id, sock_info.address)
             raise
 
+        if timed:
+            sock_info.operation_latency.add_sample(_time() - op_start)
+
         if publish:
             duration = datetime.now() - start
             # Must publish in find / getMore / explain command response
@@ -160,11 +229,21 @@ class Server(object):
                     res["cursor"]["firstBatch"] = docs
                 else:
                     res["cursor"]["nextBatch"] = docs
+            compression = None
+            if compression_ctx:
+                compression = compression_ctx.last_exchange()
             listeners.publish_command_success(
                 duration, res, operation.name, request_id,
-                sock_info.address)
+                sock_info.address, compression=compression)
 
         if exhaust:
+            if isinstance(reply, _OpMsg):
+                # In OP_MSG, the server keeps sending only if the
+                # moreToCome flag is set.
+                more_to_come = reply.more_to_come
+            else:
+                # In OP_REPLY, the server keeps sending until cursor_id is 0.
+                more_to_come = bool(reply.cursor_id)
             response = ExhaustResponse(
                 data=reply,
                 address=self._description.address,
@@ -173,7 +252,8 @@ class Server(object):
                 duration=duration,
                 request_id=request_id,
                 from_command=use_cmd,
-                docs=docs)
+                docs=docs,
+                more_to_come=more_to_come)
         else:
             response = Response(
                 data=reply,
@@ -186,7 +266,22 @@ class Server(object):
         return response
 
     def get_socket(self, all_credentials, checkout=False):
-        return self.pool.get_socket(all_credentials, checkout)
+        if self._load is None:
+            return self.pool.get_socket(all_credentials, checkout)
+        return self._get_socket_tracked(all_credentials, checkout)
+
+    @contextlib.contextmanager
+    def _get_socket_tracked(self, all_credentials, checkout):
+        with self._load.track():
+            with self.pool.get_socket(all_credentials, checkout) as sock_info:
+                yield sock_info
+
+    def load_cost(self):
+        """The expected wait for one more operation, or None if this
+        server's load isn't tracked."""
+        if self._load is None:
+            return None
+        return self._load.cost(self._description.round_trip_time or 0)
 
     @property
     def description(self):
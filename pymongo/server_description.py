@@ -36,7 +36,8 @@ class ServerDescription(object):
         '_max_write_batch_size', '_min_wire_version', '_max_wire_version',
         '_round_trip_time', '_me', '_is_writable', '_is_readable',
         '_ls_timeout_minutes', '_error', '_set_version', '_election_id',
-        '_cluster_time', '_last_write_date', '_last_update_time')
+        '_cluster_time', '_last_write_date', '_last_update_time',
+        '_topology_version')
 
     def __init__(
             self,
@@ -61,6 +62,7 @@ class ServerDescription(object):
         self._set_version = ismaster.set_version
         self._election_id = ismaster.election_id
         self._cluster_time = ismaster.cluster_time
+        self._topology_version = ismaster.topology_version
         self._is_writable = ismaster.is_writable
         self._is_readable = ismaster.is_readable
         self._ls_timeout_minutes = ismaster.logical_session_timeout_minutes
@@ -145,6 +147,27 @@ class ServerDescription(object):
     def cluster_time(self):
         return self._cluster_time
 
+    def _topology_state(self):
+        """The fields that decide this server's effect on the topology.
+
+        Two descriptions of a server with equal states differ only in round
+        trip time, last write date, and so on.
+        """
+        return (self._error is None, self._server_type,
+                self._replica_set_name, self._primary, self._all_hosts,
+                self._tags, self._set_version, self._election_id, self._me,
+                self._min_wire_version, self._max_wire_version,
+                self._ls_timeout_minutes, self._topology_version)
+
+    @property
+    def topology_version(self):
+        """The server's topologyVersion, or None if it can't stream
+        ismaster replies.
+
+        .. versionadded:: 3.9
+        """
+        return self._topology_version
+
     @property
     def election_tuple(self):
         return self._set_version, self._election_id
@@ -36,7 +36,14 @@ class TopologySettings(object):
                  local_threshold_ms=LOCAL_THRESHOLD_MS,
                  server_selection_timeout=SERVER_SELECTION_TIMEOUT,
                  heartbeat_frequency=common.HEARTBEAT_FREQUENCY,
-                 server_selector=None):
+                 max_heartbeat_frequency=common.MAX_HEARTBEAT_FREQUENCY,
+                 heartbeat_jitter=common.HEARTBEAT_JITTER,
+                 server_selector=None,
+                 server_selection_policy=common.SERVER_SELECTION_POLICY,
+                 server_monitoring_mode=common.SERVER_MONITORING_MODE,
+                 outlier_detection=common.OUTLIER_DETECTION,
+                 outlier_ejection_time=common.OUTLIER_EJECTION_TIME,
+                 fqdn=None):
         """Represent MongoClient's configuration.
 
         Take a list of (host, port) pairs and optional replica set name.
@@ -45,17 +52,34 @@ class TopologySettings(object):
             raise ConfigurationError(
                 "heartbeatFrequencyMS cannot be less than %d" % (
                     common.MIN_HEARTBEAT_INTERVAL * 1000,))
+        if (max_heartbeat_frequency is not None and
+                max_heartbeat_frequency < heartbeat_frequency):
+            raise ConfigurationError(
+                "maxHeartbeatFrequencyMS cannot be less than "
+                "heartbeatFrequencyMS")
 
         self._seeds = seeds or [('localhost', 27017)]
         self._replica_set_name = replica_set_name
         self._pool_class = pool_class or pool.Pool
         self._pool_options = pool_options or PoolOptions()
-        self._monitor_class = monitor_class or monitor.Monitor
+        self._server_monitoring_mode = server_monitoring_mode
+        if monitor_class is None:
+            if server_monitoring_mode == 'multiplexed':
+                monitor_class = monitor.MultiplexedMonitor
+            else:
+                monitor_class = monitor.Monitor
+        self._monitor_class = monitor_class
         self._condition_class = condition_class or threading.Condition
         self._local_threshold_ms = local_threshold_ms
         self._server_selection_timeout = server_selection_timeout
         self._server_selector = server_selector
+        self._server_selection_policy = server_selection_policy
         self._heartbeat_frequency = heartbeat_frequency
+        self._max_heartbeat_frequency = max_heartbeat_frequency
+        self._heartbeat_jitter = heartbeat_jitter
+        self._outlier_detection = outlier_detection
+        self._outlier_ejection_time = outlier_ejection_time
+        self._fqdn = fqdn
         self._direct = (len(self._seeds) == 1 and not replica_set_name)
         self._topology_id = ObjectId()
 
@@ -96,10 +120,49 @@ class TopologySettings(object):
     def server_selector(self):
         return self._server_selector
 
+    @property
+    def server_selection_policy(self):
+        return self._server_selection_policy
+
+    @property
+    def server_monitoring_mode(self):
+        return self._server_monitoring_mode
+
     @property
     def heartbeat_frequency(self):
         return self._heartbeat_frequency
 
+    @property
+    def max_heartbeat_frequency(self):
+        """With this many seconds, back off checking servers that aren't
+        changing, from heartbeat_frequency up to max_heartbeat_frequency.
+        None for a fixed heartbeat_frequency."""
+        return self._max_heartbeat_frequency
+
+    @property
+    def heartbeat_jitter(self):
+        """Lengthen or shorten each interval between checks by a random
+        fraction of up to heartbeat_jitter, from 0 to 1."""
+        return self._heartbeat_jitter
+
+    @property
+    def outlier_detection(self):
+        """Whether to eject servers with many errors or slow operations
+        from server selection for a while."""
+        return self._outlier_detection
+
+    @property
+    def outlier_ejection_time(self):
+        """Seconds to eject an outlier for the first time. Each consecutive
+        ejection is longer."""
+        return self._outlier_ejection_time
+
+    @property
+    def fqdn(self):
+        """The hostname of a mongodb+srv:// URI, whose SRV records are polled
+        for changes to the seed list, or None."""
+        return self._fqdn
+
     @property
     def direct(self):
         """Connect directly to a single server, or use a set of servers?
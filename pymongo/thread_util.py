@@ -14,6 +14,7 @@
 
 """Utilities for multi-threading support."""
 
+import collections
 import threading
 try:
     from time import monotonic as _time
@@ -87,6 +88,128 @@ class BoundedSemaphore(Semaphore):
 ### End backport from CPython 3.2
 
 
+class _Waiter(object):
+    __slots__ = ('event', 'granted', 'item')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.item = None
+
+
+class FifoSemaphore(object):
+    """Bounded semaphore that grants permits to blocked threads in the order
+    they started waiting.
+
+    A permit released while threads are waiting goes straight to the one
+    that has waited longest, so a thread that has not waited cannot barge
+    ahead of it. :meth:`transfer` also hands an item, like a connection,
+    along with the permit. Each waiter sleeps on its own event until it is
+    granted a permit or its own timeout expires.
+
+    The semaphore can share its owner's `lock`. The owner can then combine
+    the ``*_locked`` methods with its own bookkeeping in one critical
+    section.
+    """
+
+    def __init__(self, value=1, lock=None):
+        if value < 0:
+            raise ValueError("semaphore initial value must be >= 0")
+        self._lock = lock or threading.Lock()
+        self._value = value
+        self._initial_value = value
+        self._waiters = collections.deque()
+
+    def acquire(self, blocking=True, timeout=None):
+        return self.acquire_item(blocking, timeout)[0]
+
+    __enter__ = acquire
+
+    def acquire_item(self, blocking=True, timeout=None):
+        """Acquire a permit, returning a tuple (acquired, item).
+
+        `item` is what :meth:`transfer` handed over with the permit, or None.
+        """
+        if not blocking and timeout is not None:
+            raise ValueError("can't specify timeout for non-blocking acquire")
+        with self._lock:
+            if self.acquire_locked():
+                return True, None
+            if not blocking:
+                return False, None
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+
+        if not waiter.event.wait(timeout):
+            with self._lock:
+                # We may have been granted a permit since the wait timed out.
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    return False, None
+        return True, waiter.item
+
+    def acquire_locked(self):
+        """Take a permit without blocking. The caller holds the lock."""
+        # A permit is only ever free when no thread is waiting.
+        if self._value > 0:
+            self._value -= 1
+            return True
+        return False
+
+    def transfer(self, item):
+        """Give a held permit and `item` to the longest waiting thread.
+
+        Returns False, keeping the permit, if no thread is waiting.
+        """
+        with self._lock:
+            event = self.transfer_locked(item)
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    def transfer_locked(self, item):
+        """Like :meth:`transfer`, but the caller holds the lock.
+
+        Returns None if no thread is waiting, otherwise the waiter's event,
+        which the caller must set after releasing the lock.
+        """
+        if not self._waiters:
+            return None
+        waiter = self._waiters.popleft()
+        waiter.granted = True
+        waiter.item = item
+        return waiter.event
+
+    def release(self):
+        with self._lock:
+            event = self.release_locked()
+        if event is not None:
+            event.set()
+
+    def release_locked(self):
+        """Like :meth:`release`, but the caller holds the lock and must set
+        the returned event, if any, after releasing it."""
+        event = self.transfer_locked(None)
+        if event is None:
+            if self._value >= self._initial_value:
+                raise ValueError("Semaphore released too many times")
+            self._value += 1
+        return event
+
+    def __exit__(self, t, v, tb):
+        self.release()
+
+    @property
+    def counter(self):
+        return self._value
+
+    @property
+    def waiters(self):
+        """The number of threads waiting for a permit."""
+        return len(self._waiters)
+
+
 class DummySemaphore(object):
     def __init__(self, value=None):
         pass
@@ -94,9 +217,24 @@ class DummySemaphore(object):
     def acquire(self, blocking=True, timeout=None):
         return True
 
+    def acquire_item(self, blocking=True, timeout=None):
+        return True, None
+
+    def acquire_locked(self):
+        return True
+
+    def transfer(self, item):
+        return False
+
+    def transfer_locked(self, item):
+        return None
+
     def release(self):
         pass
 
+    def release_locked(self):
+        return None
+
 
 class MaxWaitersBoundedSemaphore(object):
     def __init__(self, semaphore_class, value=1, max_waiters=1):
@@ -121,6 +259,24 @@ class MaxWaitersBoundedSemaphoreThread(MaxWaitersBoundedSemaphore):
             self, BoundedSemaphore, value, max_waiters)
 
 
+class MaxWaitersFifoSemaphore(MaxWaitersBoundedSemaphore):
+    def __init__(self, value=1, max_waiters=1, lock=None):
+        MaxWaitersBoundedSemaphore.__init__(
+            self, BoundedSemaphore, value, max_waiters)
+        self.semaphore = FifoSemaphore(value, lock)
+
+    def acquire(self, blocking=True, timeout=None):
+        return self.acquire_item(blocking, timeout)[0]
+
+    def acquire_item(self, blocking=True, timeout=None):
+        if not self.waiter_semaphore.acquire(False):
+            raise ExceededMaxWaiters()
+        try:
+            return self.semaphore.acquire_item(blocking, timeout)
+        finally:
+            self.waiter_semaphore.release()
+
+
 def create_semaphore(max_size, max_waiters):
     if max_size is None:
         return DummySemaphore()
@@ -129,3 +285,16 @@ def create_semaphore(max_size, max_waiters):
             return BoundedSemaphore(max_size)
         else:
             return MaxWaitersBoundedSemaphoreThread(max_size, max_waiters)
+
+
+def create_fifo_semaphore(max_size, max_waiters, lock=None):
+    """Like create_semaphore, but waiters are granted permits in FIFO
+    order and permits can be transferred with an item. The semaphore uses
+    `lock` if given."""
+    if max_size is None:
+        return DummySemaphore()
+    else:
+        if max_waiters is None:
+            return FifoSemaphore(max_size, lock)
+        else:
+            return MaxWaitersFifoSemaphore(max_size, max_waiters, lock)
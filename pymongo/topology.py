@@ -30,10 +30,13 @@ from pymongo import common
 from pymongo import periodic_executor
 from pymongo.pool import PoolOptions
 from pymongo.topology_description import (updated_topology_description,
+                                          _updated_topology_description_srv_polling,
                                           TOPOLOGY_TYPE,
-                                          TopologyDescription)
+                                          TopologyDescription,
+                                          SRV_POLLING_TOPOLOGIES)
 from pymongo.errors import ServerSelectionTimeoutError, ConfigurationError
 from pymongo.monotonic import time as _time
+from pymongo.outlier_detection import OutlierDetector
 from pymongo.server import Server
 from pymongo.server_selectors import (any_server_selector,
                                       arbiter_server_selector,
@@ -42,6 +45,7 @@ from pymongo.server_selectors import (any_server_selector,
                                       writable_server_selector,
                                       Selection)
 from pymongo.client_session import _ServerSessionPool
+from pymongo.monitor import MonitorMultiplexer, SrvMonitor
 
 
 def process_events_queue(queue_ref):
@@ -112,6 +116,15 @@ class Topology(object):
         self._max_cluster_time = None
         self._session_pool = _ServerSessionPool()
 
+        # Runs the MultiplexedMonitors' heartbeats.
+        self._monitor_multiplexer = None
+        if self._settings.server_monitoring_mode == 'multiplexed':
+            self._monitor_multiplexer = MonitorMultiplexer()
+
+        self._srv_monitor = None
+        if self._settings.fqdn is not None:
+            self._srv_monitor = SrvMonitor(self, self._settings)
+
         if self._publish_server or self._publish_tp:
             def target():
                 return process_events_queue(weak)
@@ -129,6 +142,30 @@ class Topology(object):
             self.__events_executor = executor
             executor.open()
 
+        # Ejects failing or slow servers from selection.
+        self._outliers = None
+        self.__outliers_executor = None
+        if self._settings.outlier_detection:
+            self._outliers = OutlierDetector(
+                self._settings.outlier_ejection_time,
+                self._listeners,
+                weakref.ref(self._events) if self._publish_server else None,
+                self._topology_id)
+
+            def check_outliers():
+                topology = self_ref()
+                if topology is None:
+                    return False  # Topology was garbage-collected.
+                topology._check_outliers()
+                return True
+
+            self_ref = weakref.ref(self)
+            self.__outliers_executor = periodic_executor.PeriodicExecutor(
+                interval=common.OUTLIER_CHECK_INTERVAL,
+                min_interval=common.OUTLIER_CHECK_INTERVAL,
+                target=check_outliers,
+                name="pymongo_outlier_detection_thread")
+
     def open(self):
         """Start monitoring, or restart after a fork.
 
@@ -141,10 +178,14 @@ class Topology(object):
           forking.
 
         """
+        pid = os.getpid()
+        if self._opened and self._pid == pid:
+            # Already open, don't contend for the lock on every operation.
+            return
         if self._pid is None:
-            self._pid = os.getpid()
+            self._pid = pid
         else:
-            if os.getpid() != self._pid:
+            if pid != self._pid:
                 warnings.warn(
                     "MongoClient opened before fork. Create MongoClient only "
                     "after forking. See PyMongo's documentation for details: "
@@ -173,14 +214,51 @@ class Topology(object):
         Raises exc:`ServerSelectionTimeoutError` after
         `server_selection_timeout` if no matching servers are found.
         """
+        return self._select_servers(
+            selector, server_selection_timeout, address, None)
+
+    def _select_servers(self, selector, server_selection_timeout, address,
+                        sample):
+        """select_servers() guts. If `sample` is given, return at most that
+        many Servers, chosen at random from the matching ones."""
         if server_selection_timeout is None:
             server_timeout = self._settings.server_selection_timeout
         else:
             server_timeout = server_selection_timeout
 
+        # Fast path: select from the current description without the lock.
+        # Descriptions are immutable and cache their selections, only the
+        # Topology's reference to the current one changes.
+        if self._opened:
+            description = self._description
+            server_descriptions = description.apply_selector(
+                selector, address,
+                custom_selector=self._settings.server_selector)
+            if server_descriptions:
+                description.check_compatible()
+                if self._outliers is not None and address is None:
+                    server_descriptions = self._outliers.filter(
+                        server_descriptions)
+                if sample and len(server_descriptions) > sample:
+                    server_descriptions = random.sample(
+                        server_descriptions, sample)
+                servers = [self._servers.get(sd.address)
+                           for sd in server_descriptions]
+                # A server may have been removed since we read the
+                # description.
+                if None not in servers:
+                    return servers
+
+        # Wait with the lock for a suitable server.
         with self._lock:
             server_descriptions = self._select_servers_loop(
                 selector, server_timeout, address)
+            if self._outliers is not None and address is None:
+                server_descriptions = self._outliers.filter(
+                    server_descriptions)
+            if sample and len(server_descriptions) > sample:
+                server_descriptions = random.sample(
+                    server_descriptions, sample)
 
             return [self.get_server_by_address(sd.address)
                     for sd in server_descriptions]
@@ -219,10 +297,37 @@ class Topology(object):
                       selector,
                       server_selection_timeout=None,
                       address=None):
-        """Like select_servers, but choose a random server if several match."""
-        return random.choice(self.select_servers(selector,
-                                                 server_selection_timeout,
-                                                 address))
+        """Like select_servers, but choose one server if several match.
+
+        With the 'leastOutstanding' server selection policy, choose the less
+        loaded of two random servers, otherwise a random server.
+        """
+        if self._settings.server_selection_policy != 'leastOutstanding':
+            return self._select_servers(selector, server_selection_timeout,
+                                        address, 1)[0]
+        # "Power of two choices": nearly as good as choosing the least
+        # loaded server, without herding every thread onto it.
+        servers = self._select_servers(selector, server_selection_timeout,
+                                       address, 2)
+        if len(servers) == 1:
+            return servers[0]
+        return min(servers, key=lambda server: server.load_cost())
+
+    def select_other_server(self, selector, address):
+        """A random Server matching selector besides the one at address, or
+        None. Doesn't wait for one to be discovered."""
+        if not self._opened:
+            return None
+        server_descriptions = [
+            sd for sd in self._description.apply_selector(
+                selector, None,
+                custom_selector=self._settings.server_selector)
+            if sd.address != address]
+        if self._outliers is not None:
+            server_descriptions = self._outliers.filter(server_descriptions)
+        if not server_descriptions:
+            return None
+        return self._servers.get(random.choice(server_descriptions).address)
 
     def select_server_by_address(self, address,
                                  server_selection_timeout=None):
@@ -264,7 +369,17 @@ class Topology(object):
         self._description = updated_topology_description(
             self._description, server_description)
 
-        self._update_servers()
+        address = server_description.address
+        if self._description._updated_address == address:
+            # Only this server's description changed.
+            self._servers[address].description = server_description
+        else:
+            self._update_servers()
+        if (self._srv_monitor is not None and
+                self._description.topology_type not in SRV_POLLING_TOPOLOGIES):
+            # Only mongos seed lists are updated from SRV records.
+            self._srv_monitor.close()
+        self._prewarm_pool(td_old, server_description)
         self._receive_cluster_time_no_lock(server_description.cluster_time)
 
         if self._publish_tp:
@@ -275,6 +390,22 @@ class Topology(object):
         # Wake waiters in select_servers().
         self._condition.notify_all()
 
+    def _prewarm_pool(self, td_old, server_description):
+        """Start filling a newly discovered server's pool to minPoolSize
+        instead of waiting for the next periodic update_pool.
+
+        Hold the lock when calling this.
+        """
+        if not self._settings.pool_options.min_pool_size:
+            return
+        address = server_description.address
+        server = self._servers.get(address)
+        if server is None or not server_description.is_readable:
+            return
+        old_sd = td_old._server_descriptions.get(address)
+        if old_sd is None or not old_sd.is_server_type_known:
+            server.pool.prewarm()
+
     def on_change(self, server_description):
         """Process a new ServerDescription after an ismaster call completes."""
         # We do no I/O holding the lock.
@@ -291,6 +422,29 @@ class Topology(object):
                     self._description.has_server(server_description.address)):
                 self._process_change(server_description)
 
+    def _process_srv_update(self, seedlist):
+        """Process a new seedlist on an opened topology.
+
+        Hold the lock when calling this.
+        """
+        td_old = self._description
+        self._description = _updated_topology_description_srv_polling(
+            self._description, seedlist)
+
+        self._update_servers()
+
+        if self._publish_tp:
+            self._events.put((
+                self._listeners.publish_topology_description_changed,
+                (td_old, self._description, self._topology_id)))
+
+    def on_srv_update(self, seedlist):
+        """Process a new list of seeds from the SRV records."""
+        with self._lock:
+            if (self._opened and self._description.topology_type in
+                    SRV_POLLING_TOPOLOGIES):
+                self._process_srv_update(seedlist)
+
     def get_server_by_address(self, address):
         """Get a Server or None.
 
@@ -304,6 +458,34 @@ class Topology(object):
     def has_server(self, address):
         return address in self._servers
 
+    def operation_latency(self, address, percentile=None):
+        """Recent operation latency to a server in seconds, or None if it
+        isn't tracked or there were no operations.
+
+        The median by default, or the given percentile.
+        """
+        server = self._servers.get(address)
+        # Pool classes for testing may not track latency at all.
+        latency = getattr(server and server.pool, 'operation_latency', None)
+        if latency is None:
+            return None
+        return latency.get(percentile)
+
+    def record_operation(self, address, failed):
+        """Count an operation on a server for outlier detection, failed if
+        it raised a network error or timed out."""
+        if self._outliers is not None:
+            self._outliers.record(address, failed)
+
+    def _check_outliers(self):
+        """Eject servers with much higher operation latency than others of
+        their type, and restore servers whose ejection is over."""
+        latencies_by_type = {}
+        for address, sd in self._description.server_descriptions().items():
+            latencies_by_type.setdefault(sd.server_type, {})[address] = (
+                self.operation_latency(address))
+        self._outliers.check(list(latencies_by_type.values()))
+
     def get_primary(self):
         """Return primary's address or None."""
         # Implemented here in Topology instead of MongoClient, so it can lock.
@@ -387,11 +569,34 @@ class Topology(object):
             for server in self._servers.values():
                 server._pool.remove_stale_sockets()
 
+    def compression_statistics(self):
+        """Map each server address to a snapshot of its pool's compression
+        counters. Servers without compression are omitted."""
+        with self._lock:
+            pools = [(address, server.pool)
+                     for address, server in self._servers.items()]
+        return dict(
+            (address, pool.compression_statistics.snapshot())
+            for address, pool in pools
+            if pool.compression_statistics is not None)
+
+    def pool_statistics(self):
+        """Map each server address to a snapshot of its pool's statistics."""
+        with self._lock:
+            pools = [(address, server.pool)
+                     for address, server in self._servers.items()]
+        return dict((address, pool.pool_statistics())
+                    for address, pool in pools)
+
     def close(self):
         """Clear pools and terminate monitors. Topology reopens on demand."""
         with self._lock:
             for server in self._servers.values():
                 server.close()
+            if self._srv_monitor is not None:
+                self._srv_monitor.close()
+            if self.__outliers_executor is not None:
+                self.__outliers_executor.close()
 
             # Mark all servers Unknown.
             self._description = self._description.reset()
@@ -405,6 +610,35 @@ class Topology(object):
         if self._publish_server or self._publish_tp:
             self.__events_executor.close()
 
+    def _after_fork(self):
+        """Reinitialize in the child process after os.fork().
+
+        Replace the locks, whose owners may not exist in the child, discard
+        the parent's connections, server sessions and unpublished events,
+        and restart monitoring right away if the topology was open. Pools
+        with a minPoolSize start filling in the background.
+        """
+        self._lock = threading.Lock()
+        self._condition = self._settings.condition_class(self._lock)
+        self._pid = os.getpid()
+        self._session_pool.reset()
+        if self._publish_server or self._publish_tp:
+            # Re-running __init__ replaces the queue's locks.
+            self._events.__init__(self._events.maxsize)
+            self.__events_executor._after_fork()
+        if self._srv_monitor is not None:
+            self._srv_monitor._after_fork()
+        if self._outliers is not None:
+            self._outliers._after_fork()
+            self.__outliers_executor._after_fork()
+        for server in itervalues(self._servers):
+            server._after_fork()
+            if (self._settings.pool_options.min_pool_size and
+                    server.description.is_readable):
+                server.pool.prewarm()
+        if self._monitor_multiplexer is not None:
+            self._monitor_multiplexer._after_fork()
+
     @property
     def description(self):
         return self._description
@@ -471,6 +705,15 @@ class Topology(object):
             if self._publish_tp or self._publish_server:
                 self.__events_executor.open()
 
+            if self.__outliers_executor is not None:
+                self.__outliers_executor.open()
+
+            # Start polling the SRV records of a mongodb+srv:// URI.
+            if (self._srv_monitor is not None and
+                    self._description.topology_type in
+                    SRV_POLLING_TOPOLOGIES):
+                self._srv_monitor.open()
+
         # Ensure that the monitors are open.
         for server in itervalues(self._servers):
             server.open()
@@ -525,10 +768,14 @@ class Topology(object):
                     monitor=monitor,
                     topology_id=self._topology_id,
                     listeners=self._listeners,
-                    events=weak)
+                    events=weak,
+                    track_load=(self._settings.server_selection_policy ==
+                                'leastOutstanding'))
 
                 self._servers[address] = server
                 server.open()
+                if self._outliers is not None:
+                    self._outliers.add_server(address)
             else:
                 self._servers[address].description = sd
 
@@ -536,6 +783,8 @@ class Topology(object):
             if not self._description.has_server(address):
                 server.close()
                 self._servers.pop(address)
+                if self._outliers is not None:
+                    self._outliers.remove_server(address)
 
     def _create_pool_for_server(self, address):
         return self._settings.pool_class(address, self._settings.pool_options)
@@ -14,11 +14,12 @@
 
 """Represent a deployment of MongoDB servers."""
 
+import copy
 from collections import namedtuple
 
 from pymongo import common
 from pymongo.errors import ConfigurationError
-from pymongo.read_preferences import ReadPreference
+from pymongo.read_preferences import ReadPreference, _ServerMode
 from pymongo.server_description import ServerDescription
 from pymongo.server_selectors import Selection
 from pymongo.server_type import SERVER_TYPE
@@ -28,6 +29,12 @@ TOPOLOGY_TYPE = namedtuple('TopologyType', ['Single', 'ReplicaSetNoPrimary',
                                             'ReplicaSetWithPrimary', 'Sharded',
                                             'Unknown'])(*range(5))
 
+# Topologies whose seed list is updated from polling SRV records.
+SRV_POLLING_TOPOLOGIES = (TOPOLOGY_TYPE.Unknown, TOPOLOGY_TYPE.Sharded)
+
+# The most server selection results each TopologyDescription caches.
+_MAX_CACHED_SELECTIONS = 100
+
 
 class TopologyDescription(object):
     def __init__(self,
@@ -57,13 +64,25 @@ class TopologyDescription(object):
         # The heartbeat_frequency is used in staleness estimates.
         self._topology_settings = topology_settings
 
+        # Derived views, computed when first needed. A description never
+        # changes, so they stay valid.
+        self._known_servers = None
+        self._readable_servers = None
+
+        # The server whose description differs from the TopologyDescription
+        # this one was copied from, if that's the only change.
+        self._updated_address = None
+
         # Is PyMongo compatible with all servers' wire protocols?
         self._incompatible_err = None
 
-        for s in self._server_descriptions.values():
-            if not s.is_server_type_known:
-                continue
+        known_servers = self._get_known_servers()
+        self._common_wire_version = None
+        if known_servers:
+            self._common_wire_version = min(
+                s.max_wire_version for s in known_servers)
 
+        for s in known_servers:
             # s.min/max_wire_version is the server's wire protocol.
             # MIN/MAX_SUPPORTED_WIRE_VERSION is what PyMongo supports.
             server_too_new = (
@@ -101,7 +120,7 @@ class TopologyDescription(object):
         # data-bearing server types. If any have a null
         # logicalSessionTimeoutMinutes, then
         # TopologyDescription.logicalSessionTimeoutMinutes MUST be set to null.
-        readable_servers = self.readable_servers
+        readable_servers = self._get_readable_servers()
         if not readable_servers:
             self._ls_timeout_minutes = None
         elif any(s.logical_session_timeout_minutes is None
@@ -111,6 +130,10 @@ class TopologyDescription(object):
             self._ls_timeout_minutes = min(s.logical_session_timeout_minutes
                                            for s in readable_servers)
 
+        # Results of apply_selector. A description never changes, so they
+        # stay valid until the Topology replaces it.
+        self._selections = {}
+
     def check_compatible(self):
         """Raise ConfigurationError if any server is incompatible.
 
@@ -123,6 +146,23 @@ class TopologyDescription(object):
     def has_server(self, address):
         return address in self._server_descriptions
 
+    def _replace_server_description(self, server_description):
+        """A copy of this description with one server's description replaced
+        by one with the same _topology_state().
+
+        The topology type, its servers, their compatibility, and the session
+        timeout can't have changed, so they aren't recomputed.
+        """
+        address = server_description.address
+        td = copy.copy(self)
+        td._server_descriptions = self._server_descriptions.copy()
+        td._server_descriptions[address] = server_description
+        td._known_servers = None
+        td._readable_servers = None
+        td._updated_address = address
+        td._selections = {}
+        return td
+
     def reset_server(self, address):
         """A copy of this description, with one server marked Unknown."""
         return updated_topology_description(self, ServerDescription(address))
@@ -184,37 +224,82 @@ class TopologyDescription(object):
         """Minimum logical session timeout, or None."""
         return self._ls_timeout_minutes
 
+    def _get_known_servers(self):
+        if self._known_servers is None:
+            self._known_servers = [
+                s for s in self._server_descriptions.values()
+                if s.is_server_type_known]
+        return self._known_servers
+
+    def _get_readable_servers(self):
+        if self._readable_servers is None:
+            self._readable_servers = [
+                s for s in self._server_descriptions.values() if s.is_readable]
+        return self._readable_servers
+
     @property
     def known_servers(self):
         """List of Servers of types besides Unknown."""
-        return [s for s in self._server_descriptions.values()
-                if s.is_server_type_known]
+        return list(self._get_known_servers())
 
     @property
     def has_known_servers(self):
         """Whether there are any Servers of types besides Unknown."""
-        return any(s for s in self._server_descriptions.values()
-                   if s.is_server_type_known)
+        return bool(self._get_known_servers())
 
     @property
     def readable_servers(self):
         """List of readable Servers."""
-        return [s for s in self._server_descriptions.values() if s.is_readable]
+        return list(self._get_readable_servers())
 
     @property
     def common_wire_version(self):
         """Minimum of all servers' max wire versions, or None."""
-        servers = self.known_servers
-        if servers:
-            return min(s.max_wire_version for s in self.known_servers)
-
-        return None
+        return self._common_wire_version
 
     @property
     def heartbeat_frequency(self):
         return self._topology_settings.heartbeat_frequency
 
     def apply_selector(self, selector, address, custom_selector=None):
+        """List the ServerDescriptions matching `selector`, or the server
+        at `address`, within localThresholdMS of the fastest one.
+
+        Without a custom selector the result is cached: don't modify it.
+        """
+        if getattr(selector, 'min_wire_version', 0):
+            common_wv = self.common_wire_version
+            if common_wv and common_wv < selector.min_wire_version:
+                raise ConfigurationError(
+                    "%s requires min wire version %d, but topology's min"
+                    " wire version is %d" % (selector,
+                                             selector.min_wire_version,
+                                             common_wv))
+
+        if custom_selector is not None:
+            # Custom selectors may not be deterministic, don't cache.
+            return self._apply_selector(selector, address, custom_selector)
+
+        if isinstance(selector, _ServerMode):
+            # Read preferences compare by value but aren't hashable.
+            key = (selector.mode, repr(selector.tag_sets),
+                   selector.max_staleness, address)
+        else:
+            key = (selector, address)
+        try:
+            return self._selections[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable selector.
+            return self._apply_selector(selector, address, None)
+
+        server_descriptions = self._apply_selector(selector, address, None)
+        if len(self._selections) < _MAX_CACHED_SELECTIONS:
+            self._selections[key] = server_descriptions
+        return server_descriptions
+
+    def _apply_selector(self, selector, address, custom_selector):
 
         def apply_local_threshold(selection):
             if not selection:
@@ -229,21 +314,12 @@ class TopologyDescription(object):
             return [s for s in selection.server_descriptions
                     if (s.round_trip_time - fastest) <= threshold]
 
-        if getattr(selector, 'min_wire_version', 0):
-            common_wv = self.common_wire_version
-            if common_wv and common_wv < selector.min_wire_version:
-                raise ConfigurationError(
-                    "%s requires min wire version %d, but topology's min"
-                    " wire version is %d" % (selector,
-                                             selector.min_wire_version,
-                                             common_wv))
-
         if self.topology_type == TOPOLOGY_TYPE.Single:
             # Ignore selectors for standalone.
             return self.known_servers
         elif address:
             # Ignore selectors when explicit address is requested.
-            description = self.server_descriptions().get(address)
+            description = self._server_descriptions.get(address)
             return [description] if description else []
         elif self.topology_type == TOPOLOGY_TYPE.Sharded:
             # Ignore read preference.
@@ -296,6 +372,24 @@ _SERVER_TYPE_TO_TOPOLOGY_TYPE = {
 }
 
 
+def _unchanged_server_state(topology_type, old, new):
+    """Can the new description of a server replace the old one without
+    changing the rest of the topology?
+
+    Not for a primary, or a member of a replica set without a primary:
+    processing their responses adds any missing members from their host
+    lists, even if they are unchanged.
+    """
+    if new.server_type == SERVER_TYPE.RSPrimary:
+        return False
+    if (topology_type == TOPOLOGY_TYPE.ReplicaSetNoPrimary and
+            new.server_type in (SERVER_TYPE.RSSecondary,
+                                SERVER_TYPE.RSArbiter,
+                                SERVER_TYPE.RSOther)):
+        return False
+    return old._topology_state() == new._topology_state()
+
+
 def updated_topology_description(topology_description, server_description):
     """Return an updated copy of a TopologyDescription.
 
@@ -308,6 +402,15 @@ def updated_topology_description(topology_description, server_description):
     server at server_description.address. Does not modify topology_description.
     """
     address = server_description.address
+    old_server_description = topology_description._server_descriptions.get(
+        address)
+    if (old_server_description is not None and
+            _unchanged_server_state(topology_description.topology_type,
+                                    old_server_description,
+                                    server_description)):
+        # Usually a heartbeat only changes a server's round trip time.
+        return topology_description._replace_server_description(
+            server_description)
 
     # These values will be updated, if necessary, to form the new
     # TopologyDescription.
@@ -400,6 +503,42 @@ def updated_topology_description(topology_description, server_description):
                                topology_description._topology_settings)
 
 
+def _updated_topology_description_srv_polling(topology_description, seedlist):
+    """Return an updated copy of a TopologyDescription.
+
+    :Parameters:
+      - `topology_description`: the current TopologyDescription
+      - `seedlist`: list of (host, port) pairs from the latest poll of the
+        mongodb+srv:// hostname's SRV records
+
+    Servers no longer in the seedlist are removed and new ones are added as
+    Unknown. Does not modify topology_description.
+    """
+    # Create a copy of the server descriptions.
+    sds = topology_description.server_descriptions()
+
+    # If seeds haven't changed, don't do anything.
+    if set(sds) == set(seedlist):
+        return topology_description
+
+    # Remove SDs corresponding to servers no longer part of the SRV record.
+    for address in list(sds):
+        if address not in seedlist:
+            sds.pop(address)
+
+    # Add SDs corresponding to servers recently added to the SRV record.
+    for address in seedlist:
+        if address not in sds:
+            sds[address] = ServerDescription(address)
+    return TopologyDescription(
+        topology_description.topology_type,
+        sds,
+        topology_description.replica_set_name,
+        topology_description.max_set_version,
+        topology_description.max_election_id,
+        topology_description._topology_settings)
+
+
 def _update_rs_from_primary(
         sds,
         replica_set_name,
@@ -17,12 +17,6 @@
 import re
 import warnings
 
-try:
-    from dns import resolver
-    _HAVE_DNSPYTHON = True
-except ImportError:
-    _HAVE_DNSPYTHON = False
-
 from bson.py3compat import abc, iteritems, string_type, PY3
 
 if PY3:
@@ -30,8 +24,10 @@ if PY3:
 else:
     from urllib import unquote_plus
 
+from pymongo import dns_resolver
 from pymongo.common import (
     get_validated_options, URI_OPTIONS_DEPRECATION_MAP, INTERNAL_URI_OPTION_NAME_MAP)
+from pymongo.dns_resolver import _HAVE_DNSPYTHON
 from pymongo.errors import ConfigurationError, InvalidURI
 
 
@@ -351,45 +347,10 @@ def split_hosts(hosts, default_port=DEFAULT_PORT):
 _BAD_DB_CHARS = re.compile('[' + re.escape(r'/ "$') + ']')
 
 
-if PY3:
-    # dnspython can return bytes or str from various parts
-    # of its API depending on version. We always want str.
-    def maybe_decode(text):
-        if isinstance(text, bytes):
-            return text.decode()
-        return text
-else:
-    def maybe_decode(text):
-        return text
-
-
 _ALLOWED_TXT_OPTS = frozenset(
     ['authsource', 'authSource', 'replicaset', 'replicaSet'])
 
 
-def _get_dns_srv_hosts(hostname):
-    try:
-        results = resolver.query('_mongodb._tcp.' + hostname, 'SRV')
-    except Exception as exc:
-        raise ConfigurationError(str(exc))
-    return [(maybe_decode(res.target.to_text(omit_final_dot=True)), res.port)
-            for res in results]
-
-
-def _get_dns_txt_options(hostname):
-    try:
-        results = resolver.query(hostname, 'TXT')
-    except (resolver.NoAnswer, resolver.NXDOMAIN):
-        # No TXT records
-        return None
-    except Exception as exc:
-        raise ConfigurationError(str(exc))
-    if len(results) > 1:
-        raise ConfigurationError('Only one TXT record is supported')
-    return (
-        b'&'.join([b''.join(res.strings) for res in results])).decode('utf-8')
-
-
 def parse_uri(uri, default_port=DEFAULT_PORT, validate=True, warn=False):
     """Parse and validate a MongoDB URI.
 
@@ -401,7 +362,8 @@ def parse_uri(uri, default_port=DEFAULT_PORT, validate=True, warn=False):
             'password': <password> or None,
             'database': <database name> or None,
             'collection': <collection name> or None,
-            'options': <dict of MongoDB URI options>
+            'options': <dict of MongoDB URI options>,
+            'fqdn': <hostname of a mongodb+srv:// URI> or None
         }
 
     If the URI scheme is "mongodb+srv://" DNS SRV and TXT lookups will be done
@@ -418,6 +380,9 @@ def parse_uri(uri, default_port=DEFAULT_PORT, validate=True, warn=False):
           validation will error when options are unsupported or values are
           invalid.
 
+    .. versionchanged:: 3.9
+        Added the ``fqdn`` key.
+
     .. versionchanged:: 3.6
         Added support for mongodb+srv:// URIs
 
@@ -432,7 +397,7 @@ def parse_uri(uri, default_port=DEFAULT_PORT, validate=True, warn=False):
         is_srv = False
         scheme_free = uri[SCHEME_LEN:]
     elif uri.startswith(SRV_SCHEME):
-        if not _HAVE_DNSPYTHON:
+        if not dns_resolver.get_resolver().supports_srv():
             raise ConfigurationError('The "dnspython" module must be '
                                      'installed to use mongodb+srv:// URIs')
         is_srv = True
@@ -449,6 +414,7 @@ def parse_uri(uri, default_port=DEFAULT_PORT, validate=True, warn=False):
     dbase = None
     collection = None
     options = {}
+    fqdn = None
 
     host_part, _, path_part = scheme_free.partition('/')
     if not host_part:
@@ -481,24 +447,9 @@ def parse_uri(uri, default_port=DEFAULT_PORT, validate=True, warn=False):
         if port is not None:
             raise InvalidURI(
                 "%s URIs must not include a port number" % (SRV_SCHEME,))
-        nodes = _get_dns_srv_hosts(fqdn)
-
-        try:
-            plist = fqdn.split(".")[1:]
-        except Exception:
-            raise ConfigurationError("Invalid URI host")
-        slen = len(plist)
-        if slen < 2:
-            raise ConfigurationError("Invalid URI host")
-        for node in nodes:
-            try:
-                nlist = node[0].split(".")[1:][-slen:]
-            except Exception:
-                raise ConfigurationError("Invalid SRV host")
-            if plist != nlist:
-                raise ConfigurationError("Invalid SRV host")
-
-        dns_options = _get_dns_txt_options(fqdn)
+        nodes, _ = dns_resolver.get_srv_hosts(fqdn)
+
+        dns_options = dns_resolver.get_txt_options(fqdn)
         if dns_options:
             options = split_options(dns_options, validate, warn)
             if set(options) - _ALLOWED_TXT_OPTS:
@@ -533,7 +484,8 @@ def parse_uri(uri, default_port=DEFAULT_PORT, validate=True, warn=False):
         'password': passwd,
         'database': dbase,
         'collection': collection,
-        'options': options
+        'options': options,
+        'fqdn': fqdn
     }
 
 
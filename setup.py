@@ -338,6 +338,10 @@ extra_opts = {
     "packages": ["bson", "pymongo", "gridfs"]
 }
 
+# pymongo.asynchronous uses async / await syntax.
+if vi >= (3, 5, 2):
+    extra_opts["packages"].append("pymongo.asynchronous")
+
 if "--no_ext" in sys.argv:
     sys.argv.remove("--no_ext")
 elif (sys.platform.startswith("java") or
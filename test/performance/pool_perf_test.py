@@ -0,0 +1,115 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Multi-threaded connection pool checkout and checkin microbenchmarks.
+
+Unlike perf_test.py these don't need a MongoDB server: connections are made
+to a mock server once, then the benchmarks only exercise the pool.
+"""
+
+import os
+import sys
+import threading
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+sys.path[0:0] = [""]
+
+from pymongo.monotonic import time
+from pymongo.pool import Pool, PoolOptions
+from test import unittest
+from test.pymongo_mocks import MockMongoServer
+
+NUM_ITERATIONS = 5
+CHECKOUTS_PER_THREAD = int(os.environ.get('CHECKOUTS_PER_THREAD', 2000))
+THREAD_COUNTS = (1, 8, 64, 200)
+
+OUTPUT_FILE = os.environ.get('OUTPUT_FILE')
+
+result_data = []
+
+
+def tearDownModule():
+    output = json.dumps({
+        'results': result_data
+        }, indent=4)
+    if OUTPUT_FILE:
+        with open(OUTPUT_FILE, 'w') as opf:
+            opf.write(output)
+    else:
+        print(output)
+
+
+class PoolPerformanceTest(object):
+    max_pool_size = 100
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockMongoServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def do_task(self, pool):
+        for _ in range(CHECKOUTS_PER_THREAD):
+            with pool.get_socket({}):
+                pass
+
+    def run_threads(self, pool, num_threads):
+        threads = [threading.Thread(target=self.do_task, args=(pool,))
+                   for _ in range(num_threads)]
+        start = time()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time() - start
+
+    def runTest(self):
+        results = {}
+        for num_threads in THREAD_COUNTS:
+            pool = Pool(self.server.address, PoolOptions(
+                max_pool_size=self.max_pool_size))
+            # Open the connections before timing.
+            self.run_threads(pool, num_threads)
+            intervals = sorted(self.run_threads(pool, num_threads)
+                               for _ in range(NUM_ITERATIONS))
+            median = intervals[len(intervals) // 2]
+            ops_per_sec = num_threads * CHECKOUTS_PER_THREAD / median
+            print('Running %s with %d threads. OPS/SEC=%d' % (
+                self.__class__.__name__, num_threads, ops_per_sec))
+            results[str(num_threads)] = {'ops_per_sec': ops_per_sec}
+            pool.close()
+
+        result_data.append({
+            'name': self.__class__.__name__,
+            'results': results
+        })
+
+
+class TestPoolCheckout(PoolPerformanceTest, unittest.TestCase):
+    pass
+
+
+class TestPoolCheckoutContended(PoolPerformanceTest, unittest.TestCase):
+    # Fewer connections than threads, most checkouts wait in the queue.
+    max_pool_size = 4
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Heartbeat processing and server selection microbenchmarks for large
+topologies.
+
+Like pool_perf_test.py these don't need a MongoDB server: servers are never
+contacted, heartbeat results are passed to the Topology directly.
+"""
+
+import os
+import sys
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+sys.path[0:0] = [""]
+
+from pymongo.ismaster import IsMaster
+from pymongo.monotonic import time
+from pymongo.pool import PoolOptions
+from pymongo.read_preferences import ReadPreference
+from pymongo.server_description import ServerDescription
+from pymongo.server_selectors import any_server_selector
+from pymongo.settings import TopologySettings
+from pymongo.topology import Topology
+from test import unittest
+
+NUM_ITERATIONS = 5
+HEARTBEATS = int(os.environ.get('HEARTBEATS', 20000))
+SELECTIONS = int(os.environ.get('SELECTIONS', 20000))
+SERVER_COUNTS = (10, 100, 500)
+
+OUTPUT_FILE = os.environ.get('OUTPUT_FILE')
+
+result_data = []
+
+
+def tearDownModule():
+    output = json.dumps({
+        'results': result_data
+        }, indent=4)
+    if OUTPUT_FILE:
+        with open(OUTPUT_FILE, 'w') as opf:
+            opf.write(output)
+    else:
+        print(output)
+
+
+class _NoopPool(object):
+    def __init__(self, *args, **kwargs):
+        self.opts = PoolOptions()
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+    def remove_stale_sockets(self):
+        pass
+
+
+class _NoopMonitor(object):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def request_check(self):
+        pass
+
+
+class TopologyPerformanceTest(object):
+
+    def create_topology(self, num_servers):
+        """Return a Topology of `num_servers` known servers, and a function
+        that returns a heartbeat result for server number `i`."""
+        raise NotImplementedError
+
+    def time_heartbeats(self, topology, heartbeat, num_servers):
+        # Same state, new round trip time: the most common heartbeat.
+        descriptions = [heartbeat(i % num_servers, 0.001 * (i % 7))
+                        for i in range(HEARTBEATS)]
+        start = time()
+        for sd in descriptions:
+            topology.on_change(sd)
+        return time() - start
+
+    def time_selections(self, topology):
+        start = time()
+        for _ in range(SELECTIONS):
+            topology.select_server(self.selector)
+        return time() - start
+
+    def runTest(self):
+        results = {}
+        for num_servers in SERVER_COUNTS:
+            topology, heartbeat = self.create_topology(num_servers)
+            heartbeat_times = []
+            selection_times = []
+            for _ in range(NUM_ITERATIONS):
+                heartbeat_times.append(
+                    self.time_heartbeats(topology, heartbeat, num_servers))
+                selection_times.append(self.time_selections(topology))
+            topology.close()
+
+            heartbeat_median = sorted(heartbeat_times)[NUM_ITERATIONS // 2]
+            selection_median = sorted(selection_times)[NUM_ITERATIONS // 2]
+            heartbeats_per_sec = HEARTBEATS / heartbeat_median
+            selections_per_sec = SELECTIONS / selection_median
+            print('Running %s with %d servers. HEARTBEATS/SEC=%d '
+                  'SELECTIONS/SEC=%d' % (self.__class__.__name__, num_servers,
+                                         heartbeats_per_sec,
+                                         selections_per_sec))
+            results[str(num_servers)] = {
+                'heartbeats_per_sec': heartbeats_per_sec,
+                'selections_per_sec': selections_per_sec}
+
+        result_data.append({
+            'name': self.__class__.__name__,
+            'results': results
+        })
+
+
+class TestShardedTopology(TopologyPerformanceTest, unittest.TestCase):
+    selector = any_server_selector
+
+    def create_topology(self, num_servers):
+        seeds = [('mongos%d' % i, 27017) for i in range(num_servers)]
+        topology = Topology(TopologySettings(
+            seeds, pool_class=_NoopPool, monitor_class=_NoopMonitor))
+        topology.open()
+
+        def heartbeat(i, rtt):
+            return ServerDescription(seeds[i], IsMaster(
+                {'ok': 1, 'ismaster': True, 'msg': 'isdbgrid',
+                 'maxWireVersion': 7}), rtt)
+
+        for i in range(num_servers):
+            topology.on_change(heartbeat(i, 0))
+        return topology, heartbeat
+
+
+class TestReplicaSetTopology(TopologyPerformanceTest, unittest.TestCase):
+    # Large replica sets are mostly non-voting secondaries.
+    selector = ReadPreference.SECONDARY_PREFERRED
+
+    def create_topology(self, num_servers):
+        seeds = [('member%d' % i, 27017) for i in range(num_servers)]
+        hosts = ['%s:%d' % seed for seed in seeds]
+        topology = Topology(TopologySettings(
+            seeds, replica_set_name='rs', pool_class=_NoopPool,
+            monitor_class=_NoopMonitor))
+        topology.open()
+
+        def heartbeat(i, rtt):
+            response = {'ok': 1, 'setName': 'rs', 'hosts': hosts,
+                        'maxWireVersion': 7}
+            if i == 0:
+                response['ismaster'] = True
+            else:
+                response['secondary'] = True
+            return ServerDescription(seeds[i], IsMaster(response), rtt)
+
+        for i in range(num_servers):
+            topology.on_change(heartbeat(i, 0))
+        return topology, heartbeat
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,9 +15,15 @@
 """Tools for mocking parts of PyMongo to test other parts."""
 
 import contextlib
-from functools import partial
+import socket
+import struct
+import threading
 import weakref
+from functools import partial
 
+import bson
+from bson.py3compat import abc
+from bson.son import SON
 from pymongo import common
 from pymongo import MongoClient
 from pymongo.errors import AutoReconnect, NetworkTimeout
@@ -29,6 +35,119 @@ from pymongo.server_description import ServerDescription
 from test import client_context
 
 
+def _recv_all(sock, length):
+    data = b''
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            raise EOFError()
+        data += chunk
+    return data
+
+
+class MockMongoServer(object):
+    """A TCP server that speaks just enough of the wire protocol to test
+    connection pools without a mongod.
+
+    Every command is answered by ``handler(command)`` if given and it
+    returns a document, else with a standalone ismaster reply or ``ok: 1``.
+    The handler can answer an OP_MSG command with an iterable of documents
+    instead, which are streamed with the moreToCome flag set. If it's a
+    list, the last document is sent without the flag, ending the stream.
+    Connections use TLS if given a server-side `ssl_context`.
+    """
+
+    def __init__(self, handler=None, ssl_context=None):
+        self.handler = handler
+        self.ssl_context = ssl_context
+        self.listener = socket.socket()
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(('127.0.0.1', 0))
+        self.listener.listen(128)
+        self.address = self.listener.getsockname()
+        self.connections = []
+        self.lock = threading.Lock()
+        self.stopped = False
+
+    def start(self):
+        thread = threading.Thread(target=self._accept_loop)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        with self.lock:
+            self.stopped = True
+            connections, self.connections = self.connections, []
+        self.listener.close()
+        for conn in connections:
+            conn.close()
+
+    def _accept_loop(self):
+        while not self.stopped:
+            try:
+                conn, _ = self.listener.accept()
+            except (socket.error, OSError):
+                return
+            with self.lock:
+                if self.stopped:
+                    conn.close()
+                    return
+                self.connections.append(conn)
+            thread = threading.Thread(target=self._serve, args=(conn,))
+            thread.daemon = True
+            thread.start()
+
+    def _reply(self, cmd):
+        reply = None
+        if self.handler is not None:
+            reply = self.handler(cmd)
+        if reply is None:
+            if next(iter(cmd)).lower() == 'ismaster':
+                reply = {'ismaster': True, 'minWireVersion': 0,
+                         'maxWireVersion': 7, 'ok': 1}
+            else:
+                reply = {'ok': 1}
+        return reply
+
+    def _serve(self, conn):
+        codec_options = bson.CodecOptions(document_class=SON)
+        try:
+            if self.ssl_context is not None:
+                conn = self.ssl_context.wrap_socket(conn, server_side=True)
+            while not self.stopped:
+                length, request_id, _, op_code = struct.unpack(
+                    "<iiii", _recv_all(conn, 16))
+                body = _recv_all(conn, length - 16)
+                if op_code == 2004:
+                    # OP_QUERY: flags, namespace, skip, limit, query.
+                    pos = body.index(b'\x00', 4) + 9
+                    cmd = bson.BSON(body[pos:]).decode(codec_options)
+                    data = struct.pack("<iqii", 0, 0, 0, 1) + bson.BSON.encode(
+                        self._reply(cmd))
+                    conn.sendall(struct.pack(
+                        "<iiii", 16 + len(data), 0, request_id, 1) + data)
+                    continue
+                # OP_MSG with a single body section.
+                size, = struct.unpack("<i", body[5:9])
+                cmd = bson.BSON(body[5:5 + size]).decode(codec_options)
+                reply = self._reply(cmd)
+                if isinstance(reply, abc.Mapping):
+                    replies, flags = [reply], 0
+                else:
+                    replies, flags = reply, 2
+                last = len(reply) - 1 if isinstance(reply, list) else None
+                for i, doc in enumerate(replies):
+                    if i == last:
+                        flags = 0
+                    data = (struct.pack("<IB", flags, 0) +
+                            bson.BSON.encode(doc))
+                    conn.sendall(struct.pack(
+                        "<iiii", 16 + len(data), 0, request_id, 2013) + data)
+        except (EOFError, socket.error, OSError):
+            conn.close()
+
+
 class MockPool(Pool):
     def __init__(self, client, pair, *args, **kwargs):
         # MockPool gets a 'client' arg, regular pools don't. Weakref it to
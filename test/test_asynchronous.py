@@ -0,0 +1,297 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the pymongo.asynchronous package against a mock server."""
+
+import socket
+import struct
+import sys
+import time
+
+sys.path[0:0] = [""]
+
+import bson
+from bson.son import SON
+from pymongo import monitoring, outlier_detection
+from pymongo.errors import (DuplicateKeyError,
+                            NetworkTimeout,
+                            ServerSelectionTimeoutError)
+from pymongo.server_selectors import any_server_selector
+from pymongo.write_concern import WriteConcern
+from test import unittest
+
+try:
+    import asyncio
+    from pymongo.asynchronous import AsyncMongoClient
+    _HAVE_ASYNC = True
+except (ImportError, SyntaxError):
+    _HAVE_ASYNC = False
+
+_UNPACK_HEADER = struct.Struct("<iiii").unpack
+
+
+def _unused_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class _MockServerProtocol(object):
+    """Speak just enough of the wire protocol to run commands through
+    ``handle(name, command)``."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.buf = b''
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        pass
+
+    def eof_received(self):
+        pass
+
+    def data_received(self, data):
+        self.buf += data
+        while len(self.buf) >= 16:
+            length, request_id, _, op_code = _UNPACK_HEADER(self.buf[:16])
+            if len(self.buf) < length:
+                return
+            body, self.buf = self.buf[16:length], self.buf[length:]
+            if op_code == 2004:
+                # OP_QUERY: flags, namespace, skip, limit, query.
+                pos = body.index(b'\x00', 4) + 9
+                cmd = bson.BSON(body[pos:]).decode(
+                    bson.CodecOptions(document_class=SON))
+                reply = bson.BSON.encode(self.handle(next(iter(cmd)), cmd))
+                data = struct.pack("<iqii", 0, 0, 0, 1) + reply
+                op_reply = 1
+            else:
+                cmd = self._parse_op_msg(body)
+                reply = self.handle(next(iter(cmd)), cmd)
+                if reply is None:
+                    # moreToCome: no reply.
+                    continue
+                data = b'\x00\x00\x00\x00\x00' + bson.BSON.encode(reply)
+                op_reply = 2013
+            self.transport.write(struct.pack(
+                "<iiii", 16 + len(data), 0, request_id, op_reply) + data)
+
+    @staticmethod
+    def _parse_op_msg(body):
+        flags, = struct.unpack("<I", body[:4])
+        pos = 4
+        cmd = None
+        while pos < len(body):
+            kind = body[pos:pos + 1]
+            pos += 1
+            size, = struct.unpack("<i", body[pos:pos + 4])
+            if kind == b'\x00':
+                cmd = bson.BSON(body[pos:pos + size]).decode(
+                    bson.CodecOptions(document_class=SON))
+            else:
+                end = pos + size
+                ident_end = body.index(b'\x00', pos + 4)
+                identifier = body[pos + 4:ident_end].decode('utf8')
+                cmd[identifier] = bson.decode_all(body[ident_end + 1:end])
+            pos += size
+        cmd['$moreToCome'] = bool(flags & 2)
+        return cmd
+
+
+class _MockServer(object):
+    """A standalone with one in-memory collection."""
+
+    def __init__(self, max_write_batch_size=100000):
+        self.max_write_batch_size = max_write_batch_size
+        self.mongos = False
+        self.docs = []
+        self.commands = []
+        self.cursors = {}
+
+    def handle(self, name, cmd):
+        if name.lower() == 'ismaster':
+            reply = {'ismaster': True, 'minWireVersion': 0,
+                     'maxWireVersion': 7,
+                     'maxWriteBatchSize': self.max_write_batch_size,
+                     'ok': 1}
+            if self.mongos:
+                reply['msg'] = 'isdbgrid'
+            return reply
+        self.commands.append(cmd)
+        more_to_come = cmd.pop('$moreToCome', False)
+        if name == 'insert':
+            for doc in cmd['documents']:
+                if any(doc['_id'] == d['_id'] for d in self.docs):
+                    reply = {'n': 0, 'ok': 1, 'writeErrors': [
+                        {'index': 0, 'code': 11000, 'errmsg': 'E11000'}]}
+                    break
+            else:
+                self.docs.extend(cmd['documents'])
+                reply = {'n': len(cmd['documents']), 'ok': 1}
+        elif name == 'find':
+            batch_size = cmd.get('batchSize') or len(self.docs)
+            remaining = self.docs[batch_size:]
+            cursor_id = 0
+            if remaining:
+                cursor_id = len(self.cursors) + 1
+                self.cursors[cursor_id] = remaining
+            reply = {'cursor': {'id': cursor_id, 'ns': 'db.coll',
+                                'firstBatch': self.docs[:batch_size]},
+                     'ok': 1}
+        elif name == 'getMore':
+            reply = {'cursor': {'id': 0, 'ns': 'db.coll',
+                                'nextBatch': self.cursors.pop(cmd[name])},
+                     'ok': 1}
+        else:
+            reply = {'ok': 1}
+        if more_to_come:
+            return None
+        return reply
+
+
+@unittest.skipUnless(_HAVE_ASYNC, "requires Python 3.5.2+")
+class TestAsyncMongoClient(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.mock = _MockServer()
+        self.server = self.start_server(self.mock)
+        port = self.server.sockets[0].getsockname()[1]
+        self.client = AsyncMongoClient(
+            '127.0.0.1', port, serverSelectionTimeoutMS=2000)
+        self.coll = self.client.db.coll
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+        # Let the cancelled monitor tasks finish.
+        self.loop.run_until_complete(asyncio.sleep(0.01))
+        self.loop.close()
+
+    def run_loop(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def start_server(self, mock):
+        return self.loop.run_until_complete(self.loop.create_server(
+            lambda: _MockServerProtocol(mock.handle), '127.0.0.1', 0))
+
+    def test_insert_and_find(self):
+        result = self.run_loop(self.coll.insert_one({'_id': 0}))
+        self.assertEqual(0, result.inserted_id)
+        result = self.run_loop(self.coll.insert_many(
+            [{'_id': i} for i in range(1, 5)]))
+        self.assertEqual([1, 2, 3, 4], result.inserted_ids)
+
+        docs = self.run_loop(self.coll.find(batch_size=2).to_list())
+        self.assertEqual([{'_id': i} for i in range(5)], docs)
+        self.assertEqual(
+            ['insert', 'insert', 'find', 'getMore'],
+            [next(iter(cmd)) for cmd in self.mock.commands])
+        self.assertEqual('coll', self.mock.commands[-1]['collection'])
+
+        self.assertEqual({'_id': 0}, self.run_loop(self.coll.find_one()))
+
+    def test_insert_many_splits_batches(self):
+        self.mock.max_write_batch_size = 2
+        self.run_loop(self.coll.insert_many([{'_id': i} for i in range(5)]))
+        self.assertEqual(
+            [2, 2, 1],
+            [len(cmd['documents']) for cmd in self.mock.commands])
+        self.assertEqual(5, len(self.mock.docs))
+
+    def test_unacknowledged_insert(self):
+        coll = self.coll.with_options(
+            write_concern=WriteConcern(w=0))
+        result = self.run_loop(coll.insert_one({'_id': 1}))
+        self.assertFalse(result.acknowledged)
+        # A ping on the same connection is answered after the insert.
+        self.run_loop(self.client.admin.command('ping'))
+        self.assertEqual([{'_id': 1}], self.mock.docs)
+
+    def test_write_error(self):
+        self.run_loop(self.coll.insert_one({'_id': 1}))
+        with self.assertRaises(DuplicateKeyError):
+            self.run_loop(self.coll.insert_one({'_id': 1}))
+
+    def test_server_selection_timeout(self):
+        client = AsyncMongoClient(
+            '127.0.0.1', _unused_port(), serverSelectionTimeoutMS=100)
+        try:
+            with self.assertRaises(ServerSelectionTimeoutError):
+                self.run_loop(client.admin.command('ping'))
+        finally:
+            client.close()
+
+    def test_outlier_detection(self):
+        self.mock.mongos = True
+        other = _MockServer()
+        other.mongos = True
+        other_server = self.start_server(other)
+        good, bad = [server.sockets[0].getsockname()[:2]
+                     for server in (self.server, other_server)]
+
+        class Listener(monitoring.ServerListener):
+            def __init__(self):
+                self.ejected_addresses = []
+
+            def opened(self, event):
+                pass
+
+            def description_changed(self, event):
+                pass
+
+            def closed(self, event):
+                pass
+
+            def ejected(self, event):
+                self.ejected_addresses.append(event.server_address)
+
+        listener = Listener()
+        client = AsyncMongoClient(['%s:%d' % good, '%s:%d' % bad],
+                                  outlierDetection=True,
+                                  event_listeners=[listener],
+                                  serverSelectionTimeoutMS=2000)
+        topology = client._topology
+
+        def select():
+            return self.run_loop(topology.select_servers(any_server_selector))
+
+        try:
+            deadline = time.time() + 5
+            while len(select()) < 2:
+                self.assertLess(time.time(), deadline,
+                                'discover both mongoses')
+                self.run_loop(asyncio.sleep(0.01))
+            for _ in range(outlier_detection._MAX_CONSECUTIVE_FAILURES):
+                with self.assertRaises(NetworkTimeout):
+                    with client._reset_on_error(bad):
+                        raise NetworkTimeout('timed out')
+            servers = select()
+        finally:
+            client.close()
+            other_server.close()
+            self.run_loop(other_server.wait_closed())
+        self.assertEqual([good], [s.description.address for s in servers])
+        self.assertEqual([bad], listener.ejected_addresses)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,9 @@
 
 """Authentication Tests."""
 
+import base64
+import hashlib
+import hmac
 import os
 import sys
 import threading
@@ -26,12 +29,15 @@ except ImportError:
 
 sys.path[0:0] = [""]
 
-from pymongo import MongoClient, monitoring
+from bson.binary import Binary
+from pymongo import auth, MongoClient, monitoring
 from pymongo.auth import HAVE_KERBEROS, _build_credentials_tuple
 from pymongo.errors import OperationFailure
+from pymongo.pool import Pool, PoolOptions
 from pymongo.read_preferences import ReadPreference
 from pymongo.saslprep import HAVE_STRINGPREP
 from test import client_context, SkipTest, unittest, Version
+from test.pymongo_mocks import MockMongoServer
 from test.utils import (delay,
                         ignore_deprecations,
                         single_client,
@@ -724,5 +730,189 @@ class TestAuthURIOptions(unittest.TestCase):
             self.assertTrue(db.command('dbstats'))
 
 
+class ScramServer(object):
+    """MockMongoServer handler that authenticates one user with
+    SCRAM-SHA-256, with speculative authentication if `speculative`."""
+
+    def __init__(self, password, speculative=True):
+        self.speculative = speculative
+        self.commands = []
+        self.salt = os.urandom(16)
+        salted = hashlib.pbkdf2_hmac(
+            'sha256', password.encode('utf-8'), self.salt, 4096)
+        self.stored_key = hashlib.sha256(
+            self._hmac(salted, b'Client Key')).digest()
+        self.server_key = self._hmac(salted, b'Server Key')
+
+    @staticmethod
+    def _hmac(key, msg):
+        return hmac.new(key, msg, hashlib.sha256).digest()
+
+    def __call__(self, cmd):
+        self.commands.append(cmd)
+        name = next(iter(cmd))
+        if name.lower() == 'ismaster':
+            reply = {'ismaster': True, 'minWireVersion': 0,
+                     'maxWireVersion': 8, 'ok': 1}
+            if 'saslSupportedMechs' in cmd:
+                reply['saslSupportedMechs'] = ['SCRAM-SHA-256']
+            spec = cmd.get('speculativeAuthenticate')
+            if self.speculative and spec:
+                if 'saslStart' in spec:
+                    reply['speculativeAuthenticate'] = self.sasl_start(spec)
+                else:
+                    reply['speculativeAuthenticate'] = {
+                        'dbname': '$external', 'user': spec.get('user')}
+            return reply
+        if name == 'saslStart':
+            return self.sasl_start(cmd)
+        if name == 'saslContinue':
+            return self.sasl_continue(cmd)
+        return None
+
+    def sasl_start(self, cmd):
+        self.client_first_bare = bytes(cmd['payload'])[3:]
+        nonce = self.client_first_bare.split(b'r=', 1)[1] + b'server'
+        self.server_first = (b'r=' + nonce + b',s=' +
+                             base64.b64encode(self.salt) + b',i=4096')
+        return {'conversationId': 1, 'done': False,
+                'payload': Binary(self.server_first), 'ok': 1}
+
+    def sasl_continue(self, cmd):
+        without_proof, proof = bytes(cmd['payload']).split(b',p=')
+        auth_msg = b','.join(
+            (self.client_first_bare, self.server_first, without_proof))
+        client_sig = self._hmac(self.stored_key, auth_msg)
+        client_key = bytes(bytearray(
+            a ^ b for a, b in zip(bytearray(base64.b64decode(proof)),
+                                  bytearray(client_sig))))
+        if hashlib.sha256(client_key).digest() != self.stored_key:
+            return {'ok': 0, 'code': 18, 'errmsg': 'Authentication failed.'}
+        server_sig = base64.b64encode(self._hmac(self.server_key, auth_msg))
+        return {'conversationId': 1, 'done': True,
+                'payload': Binary(b'v=' + server_sig), 'ok': 1}
+
+    def command_names(self):
+        return [next(iter(cmd)) for cmd in self.commands]
+
+
+class TestSpeculativeAuth(unittest.TestCase):
+
+    def authenticate(self, handler, mechanism, source, user, password):
+        server = MockMongoServer(handler).start()
+        self.addCleanup(server.stop)
+        creds = _build_credentials_tuple(
+            mechanism, source, user, password, {}, None)
+        pool = Pool(server.address, PoolOptions())
+        with pool.get_socket({creds.source: creds}) as sock_info:
+            self.assertIn(creds, sock_info.authset)
+        return handler
+
+    def test_scram(self):
+        for mechanism in ('SCRAM-SHA-256', 'DEFAULT'):
+            handler = self.authenticate(
+                ScramServer('pencil'), mechanism, 'admin', 'user', 'pencil')
+            # saslStart went with the handshake.
+            self.assertEqual(['ismaster', 'saslContinue'],
+                             handler.command_names())
+            spec = handler.commands[0]['speculativeAuthenticate']
+            self.assertEqual('SCRAM-SHA-256', spec['mechanism'])
+            self.assertEqual('admin', spec['db'])
+
+    def test_scram_wrong_password(self):
+        with self.assertRaises(OperationFailure):
+            self.authenticate(
+                ScramServer('pencil'), 'DEFAULT', 'admin', 'user', 'pen')
+
+    def test_scram_fallback(self):
+        handler = self.authenticate(
+            ScramServer('pencil', speculative=False), 'DEFAULT', 'admin',
+            'user', 'pencil')
+        # saslSupportedMechs came with the handshake too.
+        self.assertEqual(['ismaster', 'saslStart', 'saslContinue'],
+                         handler.command_names())
+
+    def test_x509(self):
+        handler = self.authenticate(
+            ScramServer('unused'), 'MONGODB-X509', None, 'CN=client', None)
+        self.assertEqual(['ismaster'], handler.command_names())
+        self.assertEqual(
+            {'authenticate': 1, 'mechanism': 'MONGODB-X509',
+             'user': 'CN=client', 'db': '$external'},
+            handler.commands[0]['speculativeAuthenticate'])
+
+    def test_x509_fallback(self):
+        handler = self.authenticate(
+            ScramServer('unused', speculative=False), 'MONGODB-X509', None,
+            'CN=client', None)
+        self.assertEqual(['ismaster', 'authenticate'],
+                         handler.command_names())
+
+
+class TestScramKeyCache(unittest.TestCase):
+
+    def setUp(self):
+        auth._scram_key_cache.clear()
+        self.calls = 0
+        real_hi = auth._hi
+
+        def counting_hi(*args):
+            self.calls += 1
+            return real_hi(*args)
+
+        auth._hi = counting_hi
+        self.addCleanup(setattr, auth, '_hi', real_hi)
+
+    def authenticate(self, server, password='pencil'):
+        creds = _build_credentials_tuple(
+            'SCRAM-SHA-256', 'admin', 'user', password, {}, None)
+        pool = Pool(server.address, PoolOptions())
+        with pool.get_socket({'admin': creds}) as sock_info:
+            self.assertIn(creds, sock_info.authset)
+        pool.reset()
+
+    def test_shared_across_credentials(self):
+        server = MockMongoServer(ScramServer('pencil')).start()
+        self.addCleanup(server.stop)
+        # Separate MongoCredentials, as from separate MongoClients.
+        self.authenticate(server)
+        self.authenticate(server)
+        self.assertEqual(1, self.calls)
+        self.assertEqual(1, len(auth._scram_key_cache))
+
+        with self.assertRaises(OperationFailure):
+            self.authenticate(server, password='pen')
+        self.assertEqual(2, self.calls)
+
+    def test_lru_eviction(self):
+        cache = auth._ScramKeyCache(2)
+        keys = [cache.cache_key('SCRAM-SHA-256', 'user', str(i), b'salt',
+                                4096) for i in range(3)]
+        self.assertEqual(3, len(set(keys)))
+        cache.put(keys[0], b'c0', b's0')
+        cache.put(keys[1], b'c1', b's1')
+        evicted = cache._keys[keys[1]]
+        self.assertEqual((b'c0', b's0'), cache.get(keys[0]))
+        cache.put(keys[2], b'c2', b's2')
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual((b'c0', b's0'), cache.get(keys[0]))
+        self.assertEqual((b'c2', b's2'), cache.get(keys[2]))
+        # Evicted keys are overwritten.
+        self.assertEqual((bytearray(2), bytearray(2)), evicted)
+
+    def test_cache_key(self):
+        cache = auth._ScramKeyCache(2)
+        key = cache.cache_key('SCRAM-SHA-1', 'ab', 'c', b'salt', 4096)
+        self.assertNotEqual(
+            key, cache.cache_key('SCRAM-SHA-1', 'a', 'bc', b'salt', 4096))
+        self.assertNotEqual(
+            key, cache.cache_key('SCRAM-SHA-256', 'ab', 'c', b'salt', 4096))
+        self.assertNotEqual(
+            key, cache.cache_key('SCRAM-SHA-1', 'ab', 'c', b'salt', 10000))
+        # The password can't be checked against the key in other processes.
+        self.assertNotEqual(key, auth._ScramKeyCache(2).cache_key(
+            'SCRAM-SHA-1', 'ab', 'c', b'salt', 4096))
+
+
 if __name__ == "__main__":
     unittest.main()
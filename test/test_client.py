@@ -1401,9 +1401,9 @@ class TestExhaustCursor(IntegrationTest):
         cursor.next()
 
         # Cause a server error on getmore.
-        def receive_message(request_id):
+        def receive_message(request_id, *args):
             # Discard the actual server response.
-            SocketInfo.receive_message(sock_info, request_id)
+            SocketInfo.receive_message(sock_info, request_id, *args)
 
             # responseFlags bit 1 is QueryFailure.
             msg = struct.pack('<iiiii', 1 << 1, 0, 0, 0, 0)
@@ -0,0 +1,683 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test connection monitoring and pooling events and pool statistics."""
+
+import gc
+import os
+import socket
+import sys
+import threading
+import time
+import weakref
+
+try:
+    import ssl
+except ImportError:
+    ssl = None
+
+sys.path[0:0] = [""]
+
+from pymongo import MongoClient
+from pymongo.errors import ConnectionFailure
+from pymongo.monitoring import (ConnectionCheckedInEvent,
+                                ConnectionCheckedOutEvent,
+                                ConnectionCheckOutFailedEvent,
+                                ConnectionCheckOutFailedReason,
+                                ConnectionCheckOutStartedEvent,
+                                ConnectionClosedEvent,
+                                ConnectionClosedReason,
+                                ConnectionCreatedEvent,
+                                ConnectionReadyEvent,
+                                PoolClearedEvent,
+                                PoolClosedEvent,
+                                PoolCreatedEvent,
+                                _EventListeners)
+from pymongo import dns_resolver, pool as pool_module
+from pymongo.pool import (Pool,
+                          PoolOptions,
+                          _AddressPreferences,
+                          _CONNECTION_ATTEMPT_DELAY,
+                          _HAVE_TLS_SESSIONS,
+                          _OperationLatency)
+from test import unittest
+from test.pymongo_mocks import MockMongoServer
+from test.utils import CMAPListener, wait_until
+
+CERT_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                         'certificates')
+
+
+def _unused_address():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    address = sock.getsockname()
+    sock.close()
+    return address
+
+
+class TestCMAP(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockMongoServer().start()
+        self.listener = CMAPListener()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def create_pool(self, address=None, **kwargs):
+        kwargs['event_listeners'] = _EventListeners([self.listener])
+        return Pool(address or self.server.address, PoolOptions(**kwargs))
+
+    def event_types(self):
+        return [type(event) for event in self.listener.events]
+
+    def test_pool_created_options(self):
+        self.create_pool(max_pool_size=10, wait_queue_timeout=1)
+        event = self.listener.events[0]
+        self.assertIsInstance(event, PoolCreatedEvent)
+        self.assertEqual(self.server.address, event.address)
+        self.assertEqual({'maxPoolSize': 10, 'waitQueueTimeoutMS': 1000},
+                         event.options)
+
+    def test_checkout_and_checkin(self):
+        pool = self.create_pool()
+        with pool.get_socket({}) as sock_info:
+            pass
+        with pool.get_socket({}) as sock_info2:
+            self.assertIs(sock_info, sock_info2)
+
+        self.assertEqual([PoolCreatedEvent,
+                          ConnectionCheckOutStartedEvent,
+                          ConnectionCreatedEvent,
+                          ConnectionReadyEvent,
+                          ConnectionCheckedOutEvent,
+                          ConnectionCheckedInEvent,
+                          ConnectionCheckOutStartedEvent,
+                          ConnectionCheckedOutEvent,
+                          ConnectionCheckedInEvent],
+                         self.event_types())
+        self.assertEqual(
+            set([sock_info.id]),
+            set(event.connection_id for event in self.listener.events
+                if hasattr(event, 'connection_id')))
+
+    def test_reset_and_close(self):
+        pool = self.create_pool()
+        with pool.get_socket({}):
+            pass
+        with pool.get_socket({}, checkout=True) as in_use:
+            pass
+        pool.reset()
+        pool.return_socket(in_use)
+        with pool.get_socket({}):
+            pass
+        pool.close()
+
+        closed = [event for event in self.listener.events
+                  if isinstance(event, ConnectionClosedEvent)]
+        self.assertEqual(
+            [ConnectionClosedReason.STALE, ConnectionClosedReason.POOL_CLOSED],
+            [event.reason for event in closed])
+        self.assertEqual(1, self.listener.event_count(PoolClearedEvent))
+        self.assertIsInstance(self.listener.events[-1], PoolClosedEvent)
+
+        stats = pool.pool_statistics()
+        self.assertEqual(2, stats['connections_created'])
+        self.assertEqual({'stale': 1, 'poolClosed': 1},
+                         stats['connections_closed'])
+        self.assertEqual(3, stats['checkouts'])
+        self.assertEqual(0, stats['size'])
+
+    def test_connection_error(self):
+        pool = self.create_pool(_unused_address(), connect_timeout=1)
+        with self.assertRaises(ConnectionFailure):
+            with pool.get_socket({}):
+                pass
+
+        self.assertEqual([PoolCreatedEvent,
+                          ConnectionCheckOutStartedEvent,
+                          ConnectionCreatedEvent,
+                          ConnectionClosedEvent,
+                          ConnectionCheckOutFailedEvent],
+                         self.event_types())
+        self.assertEqual(ConnectionClosedReason.ERROR,
+                         self.listener.events[3].reason)
+        self.assertEqual(ConnectionCheckOutFailedReason.CONN_ERROR,
+                         self.listener.events[4].reason)
+        stats = pool.pool_statistics()
+        self.assertEqual({'connectionError': 1}, stats['checkout_failures'])
+        self.assertEqual({'error': 1}, stats['connections_closed'])
+
+    def test_wait_queue_timeout(self):
+        pool = self.create_pool(max_pool_size=1, wait_queue_timeout=0.01)
+        with pool.get_socket({}):
+            with self.assertRaises(ConnectionFailure):
+                with pool.get_socket({}):
+                    pass
+            stats = pool.pool_statistics()
+            self.assertEqual(1, stats['in_use'])
+            self.assertEqual(0, stats['waiters'])
+
+        failed = self.listener.events[-2]
+        self.assertIsInstance(failed, ConnectionCheckOutFailedEvent)
+        self.assertEqual(ConnectionCheckOutFailedReason.TIMEOUT, failed.reason)
+        stats = pool.pool_statistics()
+        self.assertEqual({'timeout': 1}, stats['checkout_failures'])
+        self.assertEqual(1, stats['available'])
+        self.assertEqual(1, stats['size'])
+
+    def test_wait_time_histogram(self):
+        pool = self.create_pool()
+        for _ in range(3):
+            with pool.get_socket({}):
+                pass
+        histogram = pool.pool_statistics()['checkout_wait_time_histogram']
+        self.assertEqual(None, histogram[-1][0])
+        self.assertEqual(3, sum(count for _, count in histogram))
+
+    def test_thread_affinity(self):
+        pool = self.create_pool()
+        checked_out = threading.Event()
+        mine_returned = threading.Event()
+        other = []
+
+        def checkout():
+            with pool.get_socket({}) as sock_info:
+                other.append(sock_info)
+                checked_out.set()
+                mine_returned.wait(10)
+
+        with pool.get_socket({}) as mine:
+            t = threading.Thread(target=checkout)
+            t.start()
+            checked_out.wait(10)
+        mine_returned.set()
+        t.join(10)
+        # The other thread's socket is the most recently returned, but this
+        # thread gets its own socket back.
+        self.assertIs(other[0], pool.sockets[0])
+        with pool.get_socket({}) as sock_info:
+            self.assertIs(mine, sock_info)
+
+    def test_thread_affinity_bounded(self):
+        depth = pool_module._AFFINITY_SEARCH_DEPTH
+        for others, expected in ((depth - 1, 0), (depth, -1)):
+            pool = self.create_pool()
+            sockets = []
+            for _ in range(others + 1):
+                with pool.get_socket({}, checkout=True) as sock_info:
+                    sockets.append(sock_info)
+            pool.return_socket(sockets[0])
+            # Other threads return their sockets after this thread.
+            t = threading.Thread(target=lambda: [
+                pool.return_socket(s) for s in sockets[1:]])
+            t.start()
+            t.join(10)
+            # Look for this thread's socket only among the most recently
+            # returned ones.
+            with pool.get_socket({}) as sock_info:
+                self.assertIs(sockets[expected], sock_info)
+
+    def test_thread_affinity_weak_reference(self):
+        pool = self.create_pool()
+        with pool.get_socket({}) as sock_info:
+            pass
+        ref = weakref.ref(sock_info)
+        pool.reset()
+        del sock_info
+        gc.collect()
+        self.assertIsNone(ref())
+        with pool.get_socket({}):
+            pass
+
+    def test_remove_closed_sockets(self):
+        pool = self.create_pool()
+        sockets = []
+        for _ in range(3):
+            with pool.get_socket({}, checkout=True) as sock_info:
+                sockets.append(sock_info)
+        for sock_info in sockets:
+            pool.return_socket(sock_info)
+        # Simulate the server closing a connection.
+        sockets[1].sock.shutdown(socket.SHUT_RDWR)
+        pool.remove_stale_sockets()
+
+        self.assertTrue(sockets[1].closed)
+        self.assertEqual(set([sockets[0], sockets[2]]), set(pool.sockets))
+        closed = [event for event in self.listener.events
+                  if isinstance(event, ConnectionClosedEvent)]
+        self.assertEqual([ConnectionClosedReason.ERROR],
+                         [event.reason for event in closed])
+
+    def test_idle_sockets_closed_without_pool_lock(self):
+        pool = self.create_pool(max_idle_time_seconds=1)
+        statistics = []
+        # A listener may use the pool when a connection is closed.
+        self.listener.connection_closed = (
+            lambda event: statistics.append(pool.pool_statistics()))
+        with pool.get_socket({}) as sock_info:
+            pass
+        sock_info.last_checkin_time -= 10
+        t = threading.Thread(target=pool.remove_stale_sockets)
+        t.daemon = True
+        t.start()
+        t.join(10)
+        self.assertFalse(t.is_alive())
+        self.assertTrue(sock_info.closed)
+        self.assertEqual(1, len(statistics))
+
+    def test_checkout_skips_recently_checked_socket(self):
+        pool = self.create_pool()
+        with pool.get_socket({}) as sock_info:
+            pass
+        checked = []
+        socket_closed = pool.socket_checker.socket_closed
+
+        def check(sock):
+            checked.append(sock)
+            return socket_closed(sock)
+
+        pool.socket_checker.socket_closed = check
+        # Idle for longer than the check interval.
+        sock_info.last_checkin_time -= 10
+        pool.remove_stale_sockets()
+        with pool.get_socket({}):
+            pass
+        self.assertEqual([], checked)
+
+        sock_info.last_checkin_time -= 10
+        pool._last_liveness_check -= 10
+        with pool.get_socket({}):
+            pass
+        self.assertEqual([sock_info.sock], checked)
+
+    def test_no_events_for_monitor_pools(self):
+        pool = Pool(self.server.address, PoolOptions(
+            event_listeners=_EventListeners([self.listener])),
+            handshake=False)
+        with pool.get_socket({}):
+            pass
+        pool.close()
+        self.assertEqual([], self.listener.events)
+        self.assertEqual(1, pool.pool_statistics()['checkouts'])
+
+
+class SlowHandshakeHandler(object):
+    """Delays ismaster to make connection establishment overlap, recording
+    the maximum number of concurrent handshakes."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.handshakes = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    def __call__(self, cmd):
+        if next(iter(cmd)).lower() != 'ismaster':
+            return None
+        with self.lock:
+            self.handshakes += 1
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        time.sleep(self.delay)
+        with self.lock:
+            self.concurrent -= 1
+        return None
+
+
+class TestMaxConnecting(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = SlowHandshakeHandler(0.1)
+        self.server = MockMongoServer(self.handler).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_max_connecting(self):
+        pool = Pool(self.server.address, PoolOptions(max_connecting=2))
+
+        def checkout():
+            with pool.get_socket({}):
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=checkout) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        self.assertEqual(2, self.handler.max_concurrent)
+        # Waiters reused returned connections instead of each opening one.
+        self.assertLess(self.handler.handshakes, 10)
+        stats = pool.pool_statistics()
+        self.assertEqual(10, stats['checkouts'])
+        self.assertEqual(self.handler.handshakes, stats['size'])
+
+    def test_max_connecting_wait_queue_timeout(self):
+        pool = Pool(self.server.address, PoolOptions(
+            max_connecting=1, wait_queue_timeout=0.02))
+        errors = []
+
+        def checkout():
+            try:
+                with pool.get_socket({}):
+                    pass
+            except ConnectionFailure as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=checkout) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        self.assertEqual(1, len(errors))
+        self.assertEqual({'timeout': 1},
+                         pool.pool_statistics()['checkout_failures'])
+
+    def test_prewarm_in_parallel(self):
+        pool = Pool(self.server.address, PoolOptions(
+            min_pool_size=4, max_connecting=2))
+        pool.remove_stale_sockets()
+
+        wait_until(lambda: len(pool.sockets) == 4, 'fill the pool')
+        self.assertEqual(2, self.handler.max_concurrent)
+
+    def test_prewarm_with_checkouts(self):
+        pool = Pool(self.server.address, PoolOptions(
+            min_pool_size=10, max_connecting=2))
+
+        def checkout():
+            with pool.get_socket({}):
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=checkout) for _ in range(10)]
+        pool.prewarm()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        pool.remove_stale_sockets()
+
+        wait_until(lambda: len(pool.sockets) == 10, 'fill the pool')
+        # Prewarm workers and checkouts share the max_connecting limit.
+        self.assertEqual(2, self.handler.max_concurrent)
+
+    def test_prewarm_background(self):
+        pool = Pool(self.server.address, PoolOptions(
+            min_pool_size=3, max_connecting=3))
+        pool.prewarm()
+        # prewarm() doesn't block.
+        self.assertEqual(0, len(pool.sockets))
+        deadline = time.time() + 10
+        while len(pool.sockets) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(3, len(pool.sockets))
+        self.assertEqual(3, self.handler.max_concurrent)
+        # The pool is full, nothing more to do.
+        pool.prewarm()
+        pool.remove_stale_sockets()
+        self.assertEqual(3, self.handler.handshakes)
+
+
+class TestWaitQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = SlowHandshakeHandler(0)
+        self.server = MockMongoServer(self.handler).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def wait_for_waiters(self, pool, count):
+        deadline = time.time() + 10
+        while pool.waiters < count and time.time() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(count, pool.waiters)
+
+    def test_fifo_order(self):
+        pool = Pool(self.server.address, PoolOptions(max_pool_size=1))
+        order = []
+
+        def checkout(i):
+            with pool.get_socket({}):
+                order.append(i)
+
+        threads = []
+        with pool.get_socket({}):
+            for i in range(5):
+                t = threading.Thread(target=checkout, args=(i,))
+                t.start()
+                threads.append(t)
+                self.wait_for_waiters(pool, i + 1)
+        for t in threads:
+            t.join(10)
+
+        self.assertEqual(list(range(5)), order)
+
+    def test_direct_hand_off(self):
+        pool = Pool(self.server.address, PoolOptions(max_pool_size=1))
+        received = []
+
+        def checkout():
+            with pool.get_socket({}) as sock_info:
+                received.append(sock_info)
+
+        with pool.get_socket({}) as sock_info:
+            t = threading.Thread(target=checkout)
+            t.start()
+            self.wait_for_waiters(pool, 1)
+        t.join(10)
+
+        self.assertEqual([sock_info], received)
+        self.assertEqual(1, self.handler.handshakes)
+        stats = pool.pool_statistics()
+        self.assertEqual(2, stats['checkouts'])
+        self.assertEqual(0, stats['in_use'])
+        self.assertEqual(1, stats['available'])
+
+    def test_wait_queue_timeout_leaves_queue(self):
+        pool = Pool(self.server.address, PoolOptions(
+            max_pool_size=1, wait_queue_timeout=0.01))
+        with pool.get_socket({}):
+            with self.assertRaises(ConnectionFailure):
+                with pool.get_socket({}):
+                    pass
+            self.assertEqual(0, pool._socket_semaphore.waiters)
+        # The timed out waiter didn't take the returned permit.
+        with pool.get_socket({}):
+            pass
+
+
+@unittest.skipUnless(_HAVE_TLS_SESSIONS, "requires ssl.SSLSession")
+class TestTLSSessionCache(unittest.TestCase):
+
+    def setUp(self):
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        # The test certificates use SHA-1 signatures.
+        server_context.set_ciphers('DEFAULT:@SECLEVEL=0')
+        server_context.load_cert_chain(os.path.join(CERT_PATH, 'server.pem'))
+        self.server = MockMongoServer(ssl_context=server_context).start()
+        self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+
+    def tearDown(self):
+        self.server.stop()
+
+    def create_pool(self):
+        return Pool(self.server.address, PoolOptions(
+            ssl_context=self.ssl_context, ssl_match_hostname=False))
+
+    def test_resume_session(self):
+        pool = self.create_pool()
+        sockets = []
+        for _ in range(3):
+            with pool.get_socket({}, checkout=True) as sock_info:
+                sockets.append(sock_info)
+
+        self.assertEqual([False, True, True],
+                         [s.sock.session_reused for s in sockets])
+        stats = pool.pool_statistics()
+        self.assertEqual(3, stats['tls_handshakes'])
+        self.assertEqual(2, stats['tls_sessions_resumed'])
+
+    def test_expired_session_not_resumed(self):
+        pool = self.create_pool()
+        with pool.get_socket({}, checkout=True):
+            pass
+
+        class ExpiredSession(object):
+            time = 0
+            timeout = 1
+
+        pool._tls_sessions.put(ExpiredSession())
+        with pool.get_socket({}, checkout=True) as sock_info:
+            self.assertFalse(sock_info.sock.session_reused)
+
+    def test_invalidate_on_handshake_error(self):
+        pool = self.create_pool()
+        with pool.get_socket({}, checkout=True):
+            pass
+        self.assertIsNotNone(pool._tls_sessions.get())
+
+        def wrap_socket(sock, **kwargs):
+            raise ssl.SSLError('handshake failed')
+
+        self.ssl_context.wrap_socket = wrap_socket
+        with self.assertRaises(ConnectionFailure):
+            with pool.get_socket({}, checkout=True):
+                pass
+        self.assertIsNone(pool._tls_sessions.get())
+
+
+def _unused_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class TestOperationLatency(unittest.TestCase):
+
+    def test_percentile(self):
+        latency = _OperationLatency(percentile=50, window=60)
+        self.assertIsNone(latency.get())
+        for duration in (0.3, 0.1, 0.2, 5):
+            latency.add_sample(duration)
+        self.assertEqual(0.3, latency.get())
+
+    def test_old_samples_dropped(self):
+        latency = _OperationLatency(window=0.1)
+        latency.add_sample(1)
+        time.sleep(0.2)
+        self.assertIsNone(latency.get())
+        latency.add_sample(2)
+        self.assertEqual(2, latency.get())
+
+    def test_disabled_by_default(self):
+        pool = Pool(('127.0.0.1', 27017), PoolOptions())
+        self.assertIsNone(pool.operation_latency)
+
+    def test_round_trip_time_includes_operations(self):
+        def handler(cmd):
+            if next(iter(cmd)) == 'ping':
+                time.sleep(0.2)
+
+        server = MockMongoServer(handler).start()
+        self.addCleanup(server.stop)
+        client = MongoClient(*server.address, trackOperationLatency=True,
+                             heartbeatFrequencyMS=500)
+        self.addCleanup(client.close)
+        client.admin.command('ping')
+        selected = client._topology.select_server_by_address(server.address)
+        self.assertGreaterEqual(selected.pool.operation_latency.get(), 0.2)
+        wait_until(lambda: selected.description.round_trip_time >= 0.2,
+                   'include the operation latency in the round trip time')
+
+
+class TestHappyEyeballs(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockMongoServer().start()
+        self.addCleanup(self.server.stop)
+        self.address = ('db.example.com', self.server.address[1])
+        self.good = (socket.AF_INET, socket.SOCK_STREAM, 6, '',
+                     self.server.address)
+        pool_module._address_preferences = _AddressPreferences()
+        self.addCleanup(setattr, pool_module, '_address_preferences',
+                        _AddressPreferences())
+
+    def set_addrinfos(self, addrinfos):
+        class Resolver(dns_resolver.Resolver):
+            def getaddrinfo(self, *args):
+                return list(addrinfos), 30
+
+        dns_resolver.set_resolver(Resolver())
+        self.addCleanup(dns_resolver.set_resolver, None)
+
+    def connect(self):
+        start = time.time()
+        sock = pool_module._create_connection(
+            self.address, PoolOptions(connect_timeout=10))
+        sock.close()
+        return time.time() - start
+
+    def test_failed_attempt_starts_next(self):
+        refused = (socket.AF_INET, socket.SOCK_STREAM, 6, '',
+                   ('127.0.0.1', _unused_port()))
+        self.set_addrinfos([refused, self.good])
+        self.assertLess(self.connect(), _CONNECTION_ATTEMPT_DELAY)
+
+    def test_stalled_attempt(self):
+        # TEST-NET-1 is unroutable: the attempt hangs or fails right away.
+        stalled = (socket.AF_INET, socket.SOCK_STREAM, 6, '',
+                   ('192.0.2.1', 27017))
+        self.set_addrinfos([stalled, self.good])
+        self.assertLess(self.connect(), 2)
+        # The address that connected is tried first from now on.
+        preferences = pool_module._address_preferences
+        self.assertEqual(
+            [self.good, stalled],
+            preferences.sort(self.address, [stalled, self.good]))
+        self.assertLess(self.connect(), _CONNECTION_ATTEMPT_DELAY)
+
+    def test_all_attempts_fail(self):
+        self.set_addrinfos([
+            (socket.AF_INET, socket.SOCK_STREAM, 6, '',
+             ('127.0.0.1', _unused_port())) for _ in range(2)])
+        self.assertRaises(socket.error, self.connect)
+
+    def test_interleave_families(self):
+        v6 = [(socket.AF_INET6, socket.SOCK_STREAM, 6, '', ('::%d' % i, 1))
+              for i in range(3)]
+        v4 = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.%d' % i, 1))
+              for i in range(2)]
+        preferences = _AddressPreferences()
+        self.assertEqual(
+            [v6[0], v4[0], v6[1], v4[1], v6[2]],
+            preferences.sort(('host', 1), v6 + v4))
+        preferences.record(('host', 1), ('10.0.0.1', 1))
+        self.assertEqual(
+            [v4[1], v6[0], v4[0], v6[1], v6[2]],
+            preferences.sort(('host', 1), v6 + v4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -96,7 +96,7 @@ class TestCollation(unittest.TestCase):
     def setUpClass(cls):
         cls.listener = EventListener()
         cls.saved_listeners = monitoring._LISTENERS
-        monitoring._LISTENERS = monitoring._Listeners([], [], [], [])
+        monitoring._LISTENERS = monitoring._Listeners([], [], [], [], [])
         cls.client = rs_or_single_client(event_listeners=[cls.listener])
         cls.db = cls.client.pymongo_test
         cls.collation = Collation('en_US')
@@ -0,0 +1,120 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test wire protocol compression statistics."""
+
+import struct
+import sys
+
+sys.path[0:0] = [""]
+
+from bson import DEFAULT_CODEC_OPTIONS
+from bson.son import SON
+from pymongo import message
+from pymongo.compression_support import (CompressionSettings,
+                                         CompressionStatistics,
+                                         _HAVE_ZLIB)
+from pymongo.network import receive_message
+from pymongo.read_preferences import ReadPreference
+from test import unittest
+
+
+class _FakeSocket(object):
+    """A socket that replays a single buffered message."""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def recv_into(self, buf):
+        n = min(len(buf), len(self.data) - self.pos)
+        buf[:n] = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+
+@unittest.skipUnless(_HAVE_ZLIB, "zlib is not available")
+class TestCompressionStatistics(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = CompressionStatistics()
+        settings = CompressionSettings(['zlib'], -1)
+        self.ctx = settings.get_compression_context(['zlib'], self.stats)
+
+    def test_record(self):
+        self.stats.record_compressed('insert', 100, 40, 0.5)
+        self.stats.record_compressed('find', 10, 8, 0.25)
+        self.stats.record_decompressed('find', 8, 10, 0.125)
+        self.stats.record_skipped('saslStart')
+        snapshot = self.stats.snapshot()
+        total = snapshot['total']
+        self.assertEqual(2, total['messages_compressed'])
+        self.assertEqual(110, total['bytes_before_compression'])
+        self.assertEqual(48, total['bytes_after_compression'])
+        self.assertEqual(0.75, total['compress_time'])
+        self.assertEqual(1, total['messages_decompressed'])
+        self.assertEqual(1, total['messages_skipped'])
+        commands = snapshot['commands']
+        self.assertEqual(
+            ['find', 'insert', 'saslStart'], sorted(commands))
+        self.assertEqual(100, commands['insert']['bytes_before_compression'])
+        self.assertEqual(10, commands['find']['bytes_after_decompression'])
+        self.assertEqual(1, commands['saslStart']['messages_skipped'])
+
+        # Snapshots are copies.
+        snapshot['total']['messages_compressed'] = 0
+        self.assertEqual(
+            2, self.stats.snapshot()['total']['messages_compressed'])
+
+    def test_op_msg_compression_is_recorded(self):
+        cmd = SON([('insert', 'coll'), ('documents', [{'x': 'y' * 1000}])])
+        message._op_msg(0, cmd, 'db', ReadPreference.PRIMARY, False, False,
+                        DEFAULT_CODEC_OPTIONS, ctx=self.ctx)
+        counters = self.stats.snapshot()['commands']['insert']
+        self.assertEqual(1, counters['messages_compressed'])
+        self.assertGreater(counters['bytes_before_compression'],
+                           counters['bytes_after_compression'])
+
+        before, after, _ = self.ctx.last_compression
+        info = self.ctx.last_exchange()
+        self.assertEqual('zlib', info['compressor'])
+        self.assertEqual(before, info['bytes_before_compression'])
+        self.assertEqual(after, info['bytes_after_compression'])
+        self.assertNotIn('bytes_before_decompression', info)
+
+        self.ctx.reset_last()
+        self.assertIsNone(self.ctx.last_exchange())
+
+    def test_decompression_is_recorded(self):
+        # A compressed OP_REPLY, as sent by the server.
+        reply = message._OpReply
+        docs = message._dict_to_bson({'ok': 1}, False, DEFAULT_CODEC_OPTIONS)
+        data = struct.pack("<iqii", 0, 0, 0, 1) + docs
+        compressed = self.ctx.compress(data)
+        header = struct.pack(
+            "<iiiiiiB", 25 + len(compressed), 1, 0, 2012, reply.OP_CODE,
+            len(data), self.ctx.compressor_id)
+        sock = _FakeSocket(header + compressed)
+
+        receive_message(sock, 0, compression_ctx=self.ctx,
+                        command_name='ping')
+        counters = self.stats.snapshot()['commands']['ping']
+        self.assertEqual(1, counters['messages_decompressed'])
+        self.assertEqual(len(compressed),
+                         counters['bytes_before_decompression'])
+        self.assertEqual(len(data), counters['bytes_after_decompression'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,6 +33,7 @@ from pymongo import (monitoring,
                      ASCENDING,
                      DESCENDING,
                      ALL,
+                     MongoClient,
                      OFF)
 from pymongo.collation import Collation
 from pymongo.cursor import CursorType
@@ -45,6 +46,7 @@ from test import (client_context,
                   SkipTest,
                   unittest,
                   IntegrationTest, Version)
+from test.pymongo_mocks import MockMongoServer
 from test.utils import (EventListener,
                         ignore_deprecations,
                         rs_or_single_client,
@@ -228,7 +230,7 @@ class TestCursor(IntegrationTest):
 
         listener = WhiteListEventListener('find', 'getMore')
         saved_listeners = monitoring._LISTENERS
-        monitoring._LISTENERS = monitoring._Listeners([], [], [], [])
+        monitoring._LISTENERS = monitoring._Listeners([], [], [], [], [])
         coll = rs_or_single_client(
             event_listeners=[listener])[self.db.name].pymongo_test
         results = listener.results
@@ -1254,6 +1256,27 @@ class TestCursor(IntegrationTest):
         self.assertFalse(c2.alive)
         self.assertTrue(c1.alive)
 
+    @client_context.require_no_mongos
+    @client_context.require_version_min(4, 2)
+    def test_exhaust_op_msg_streams_getmores(self):
+        self.db.test.drop()
+        self.db.test.insert_many([{'i': i} for i in range(500)])
+        listener = WhiteListEventListener('find', 'getMore')
+        client = rs_or_single_client(event_listeners=[listener])
+        self.addCleanup(client.close)
+        coll = client[self.db.name].test
+
+        cursor = coll.find(cursor_type=CursorType.EXHAUST, batch_size=50)
+        self.assertEqual(500, len(list(cursor)))
+
+        # The find command is followed by a single getMore, the server
+        # streams the remaining batches without waiting for more getMores.
+        # Streamed batches are published with a request_id of 0.
+        sent = [e.command_name for e in listener.results['started']
+                if e.request_id]
+        self.assertEqual(['find', 'getMore'], sent)
+        self.assertGreater(len(listener.results['succeeded']), 2)
+
     @client_context.require_no_mongos
     @ignore_deprecations
     def test_comment(self):
@@ -1614,5 +1637,52 @@ class TestRawBatchCommandCursor(IntegrationTest):
             listener.results.clear()
 
 
+class TestExhaustOpMsg(unittest.TestCase):
+
+    def setUp(self):
+        self.commands = []
+        self.server = MockMongoServer(self.handler).start()
+        self.addCleanup(self.server.stop)
+
+    def handler(self, cmd):
+        name = next(iter(cmd))
+        if name.lower() == 'ismaster':
+            return {'ismaster': True, 'minWireVersion': 0,
+                    'maxWireVersion': 8, 'ok': 1}
+        self.commands.append(name)
+        if name == 'find':
+            return {'cursor': {'id': 42, 'ns': 'db.test',
+                               'firstBatch': [{'i': 0}, {'i': 1}]},
+                    'ok': 1}
+        if name == 'getMore':
+            # Stream four batches, the last one ends the cursor.
+            return [{'cursor': {'id': 0 if i == 4 else 42, 'ns': 'db.test',
+                                'nextBatch': [{'i': i * 2},
+                                              {'i': i * 2 + 1}]},
+                     'ok': 1}
+                    for i in range(1, 5)]
+
+    def test_streamed_batches(self):
+        listener = EventListener()
+        client = MongoClient(*self.server.address,
+                             event_listeners=[listener])
+        self.addCleanup(client.close)
+        cursor = client.db.test.find(cursor_type=CursorType.EXHAUST,
+                                     batch_size=2)
+        self.assertEqual(list(range(10)), [doc['i'] for doc in cursor])
+        self.assertFalse(cursor.alive)
+        # One getMore started the stream.
+        self.assertEqual(['find', 'getMore'], self.commands)
+        succeeded = listener.results['succeeded']
+        self.assertEqual(['find'] + ['getMore'] * 4,
+                         [event.command_name for event in succeeded])
+        self.assertEqual([0, 0, 0],
+                         [event.request_id for event in succeeded[2:]])
+        # The connection was returned when the stream ended.
+        pool = client._topology.select_server_by_address(
+            self.server.address).pool
+        self.assertEqual(1, len(pool.sockets))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -57,6 +57,9 @@ class MockPool(object):
         with self._lock:
             self.pool_id += 1
 
+    def close(self):
+        self.reset()
+
 
 class MockMonitor(object):
     def __init__(self, server_description, topology, pool, topology_settings):
@@ -17,15 +17,22 @@
 import glob
 import json
 import os
+import socket
 import sys
 
 sys.path[0:0] = [""]
 
+from pymongo import common, dns_resolver
 from pymongo.common import validate_read_preference_tags
 from pymongo.errors import ConfigurationError
 from pymongo.mongo_client import MongoClient
+from pymongo.pool import PoolOptions, _create_connection
+from pymongo.settings import TopologySettings
+from pymongo.topology import Topology
+from pymongo.topology_description import TOPOLOGY_TYPE
 from pymongo.uri_parser import parse_uri, split_hosts, _HAVE_DNSPYTHON
 from test import client_context, unittest
+from test.test_topology import got_ismaster, MockMonitor, MockPool
 from test.utils import wait_until
 
 
@@ -106,5 +113,175 @@ def create_tests():
 create_tests()
 
 
+class StubResolver(dns_resolver.Resolver):
+    """Answers from dicts instead of DNS."""
+
+    def __init__(self, addresses=None, srv=None, txt=None, ttl=30):
+        self.addresses = addresses or {}
+        self.srv = srv or {}
+        self.txt = txt or {}
+        self.ttl = ttl
+        self.lookups = []
+
+    def supports_srv(self):
+        return True
+
+    def getaddrinfo(self, host, port, family, socktype):
+        self.lookups.append(host)
+        if host not in self.addresses:
+            raise socket.gaierror('unknown host %s' % (host,))
+        return [(socket.AF_INET, socktype, 6, '', (ip, port))
+                for ip in self.addresses[host]], self.ttl
+
+    def srv_records(self, name):
+        self.lookups.append(name)
+        if name not in self.srv:
+            raise Exception('NXDOMAIN')
+        return list(self.srv[name]), self.ttl
+
+    def txt_records(self, name):
+        return self.txt.get(name, [])
+
+
+class ResolverTestCase(unittest.TestCase):
+
+    def set_resolver(self, resolver):
+        dns_resolver.set_resolver(resolver)
+        self.addCleanup(dns_resolver.set_resolver, None)
+
+
+class TestAddressCache(ResolverTestCase):
+
+    def test_cache(self):
+        resolver = StubResolver(addresses={'db': ['10.0.0.1']})
+        self.set_resolver(resolver)
+        expected = [(socket.AF_INET, socket.SOCK_STREAM, 6, '',
+                     ('10.0.0.1', 27017))]
+        for _ in range(3):
+            self.assertEqual(expected, dns_resolver.getaddrinfo(
+                'db', 27017, socket.AF_INET, socket.SOCK_STREAM))
+        self.assertEqual(['db'], resolver.lookups)
+
+        dns_resolver.invalidate('db', 27017)
+        dns_resolver.getaddrinfo(
+            'db', 27017, socket.AF_INET, socket.SOCK_STREAM)
+        self.assertEqual(['db', 'db'], resolver.lookups)
+
+    def test_ttl(self):
+        resolver = StubResolver(addresses={'db': ['10.0.0.1']}, ttl=0)
+        self.set_resolver(resolver)
+        for _ in range(2):
+            dns_resolver.getaddrinfo(
+                'db', 27017, socket.AF_INET, socket.SOCK_STREAM)
+        self.assertEqual(['db', 'db'], resolver.lookups)
+
+    def test_failed_connection_invalidates(self):
+        resolver = StubResolver(addresses={'db': ['127.0.0.1']})
+        self.set_resolver(resolver)
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        for _ in range(2):
+            with self.assertRaises(socket.error):
+                _create_connection(('db', port), PoolOptions())
+        # The host is looked up again after failing to connect.
+        self.assertEqual(['db', 'db'], resolver.lookups)
+
+
+class TestSrvPolling(ResolverTestCase):
+
+    fqdn = 'test1.test.build.10gen.cc'
+    srv_name = '_mongodb._tcp.test1.test.build.10gen.cc'
+
+    def setUp(self):
+        self.resolver = StubResolver(srv={self.srv_name: [
+            ('localhost.test.build.10gen.cc', 27017),
+            ('localhost.test.build.10gen.cc', 27018)]})
+        self.set_resolver(self.resolver)
+
+    def create_topology(self):
+        seeds, _ = dns_resolver.get_srv_hosts(self.fqdn)
+        topology = Topology(TopologySettings(
+            seeds, pool_class=MockPool, monitor_class=MockMonitor,
+            fqdn=self.fqdn))
+        topology.open()
+        self.addCleanup(topology.close)
+        return topology
+
+    def poll(self, topology):
+        monitor = topology._srv_monitor
+        monitor._startup_time = 0
+        monitor._run()
+
+    def addresses(self, topology):
+        return set(topology.description.server_descriptions())
+
+    def test_parse_uri(self):
+        self.resolver.txt[self.fqdn] = ['replicaSet=repl0']
+        res = parse_uri('mongodb+srv://%s/db' % (self.fqdn,))
+        self.assertEqual(self.fqdn, res['fqdn'])
+        self.assertEqual(self.resolver.srv[self.srv_name], res['nodelist'])
+        self.assertEqual('repl0', res['options']['replicaset'])
+
+    def test_invalid_srv_host(self):
+        self.resolver.srv[self.srv_name] = [('evil.example.com', 27017)]
+        self.assertRaises(ConfigurationError, parse_uri,
+                          'mongodb+srv://%s' % (self.fqdn,))
+
+    def test_hosts_added_and_removed(self):
+        topology = self.create_topology()
+        self.assertTrue(topology._srv_monitor._executor._is_scheduled())
+        self.resolver.srv[self.srv_name] = [
+            ('localhost.test.build.10gen.cc', 27018),
+            ('localhost.test.build.10gen.cc', 27019)]
+        self.poll(topology)
+        self.assertEqual(
+            set([('localhost.test.build.10gen.cc', 27018),
+                 ('localhost.test.build.10gen.cc', 27019)]),
+            self.addresses(topology))
+        self.assertEqual(self.addresses(topology), set(topology._servers))
+
+    def test_ttl(self):
+        topology = self.create_topology()
+        executor = topology._srv_monitor._executor
+        self.resolver.ttl = 300
+        self.poll(topology)
+        self.assertEqual(300, executor._interval)
+        self.resolver.ttl = 1
+        self.poll(topology)
+        self.assertEqual(common.MIN_SRV_RESCAN_INTERVAL, executor._interval)
+
+    def test_lookup_failure(self):
+        topology = self.create_topology()
+        before = self.addresses(topology)
+        del self.resolver.srv[self.srv_name]
+        self.poll(topology)
+        self.assertEqual(before, self.addresses(topology))
+        self.assertEqual(common.HEARTBEAT_FREQUENCY,
+                         topology._srv_monitor._executor._interval)
+
+        self.resolver.srv[self.srv_name] = []
+        self.poll(topology)
+        self.assertEqual(before, self.addresses(topology))
+
+    def test_replica_set_not_polled(self):
+        topology = self.create_topology()
+        got_ismaster(topology, ('localhost.test.build.10gen.cc', 27017), {
+            'ok': 1, 'ismaster': True, 'setName': 'rs', 'hosts': [
+                'localhost.test.build.10gen.cc:27017',
+                'localhost.test.build.10gen.cc:27018'],
+            'maxWireVersion': 6})
+        self.assertEqual(TOPOLOGY_TYPE.ReplicaSetWithPrimary,
+                         topology.description.topology_type)
+        self.assertTrue(topology._srv_monitor._executor._stopped)
+
+        self.resolver.srv[self.srv_name] = [
+            ('localhost.test.build.10gen.cc', 27019)]
+        before = self.addresses(topology)
+        self.poll(topology)
+        self.assertEqual(before, self.addresses(topology))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,119 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test that MongoClient reinitializes itself in the child after fork."""
+
+import os
+import sys
+import time
+import traceback
+
+sys.path[0:0] = [""]
+
+from pymongo import MongoClient
+from pymongo.client_session import _ServerSessionPool
+from test import unittest
+from test.pymongo_mocks import MockMongoServer
+
+
+@unittest.skipUnless(hasattr(os, 'register_at_fork'),
+                     "requires os.register_at_fork")
+class TestFork(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockMongoServer().start()
+        host, port = self.server.address
+        self.client = MongoClient(host, port, minPoolSize=2)
+        self.client.admin.command('ping')
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def run_in_child(self, func):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                func()
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(0, status, "child process failed")
+
+    def test_child_gets_clean_pools(self):
+        server = self.client._topology.select_server_by_address(
+            self.server.address)
+        pool = server.pool
+        with pool.get_socket({}, checkout=True) as checked_out:
+            pass
+        parent_sockets = set(pool.sockets)
+        self.assertTrue(parent_sockets)
+
+        def child():
+            self.assertEqual(set(), parent_sockets & set(pool.sockets))
+            self.assertEqual(0, pool.active_sockets)
+            # Monitoring restarted without waiting for an operation.
+            self.assertTrue(server._monitor._executor._is_scheduled())
+            self.assertTrue(
+                self.client._kill_cursors_executor._is_scheduled())
+            self.client.admin.command('ping')
+            # Checked out before the fork, closed instead of pooled.
+            pool.return_socket(checked_out)
+            self.assertTrue(checked_out.closed)
+            self.assertNotIn(checked_out, pool.sockets)
+            # The pool is filled back up to minPoolSize in the background.
+            deadline = time.time() + 10
+            while len(pool.sockets) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(2, len(pool.sockets))
+
+        self.run_in_child(child)
+        # The parent's connections are unaffected.
+        self.assertTrue(parent_sockets <= set(pool.sockets))
+        pool.return_socket(checked_out)
+        self.client.admin.command('ping')
+
+    def test_multiplexed_monitor_restarted(self):
+        client = MongoClient(*self.server.address,
+                             serverMonitoringMode='multiplexed')
+        self.addCleanup(client.close)
+        client.admin.command('ping')
+        multiplexer = client._topology._monitor_multiplexer
+
+        def child():
+            self.assertTrue(multiplexer._thread.is_alive())
+            client.admin.command('ping')
+
+        self.run_in_child(child)
+        self.assertTrue(multiplexer._thread.is_alive())
+
+    def test_session_pool_reset(self):
+        session_pool = _ServerSessionPool()
+        in_use = session_pool.get_server_session(30)
+        session_pool.return_server_session(
+            session_pool.get_server_session(30), 30)
+        session_pool.reset()
+        self.assertEqual(0, len(session_pool))
+        # Sessions from before the reset are discarded when returned.
+        session_pool.return_server_session(in_use, 30)
+        session_pool.return_server_session_no_lock(in_use)
+        self.assertEqual(0, len(session_pool))
+
+
+if __name__ == "__main__":
+    unittest.main()
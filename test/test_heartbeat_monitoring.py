@@ -55,6 +55,9 @@ class MockPool(object):
         with self._lock:
             self.pool_id += 1
 
+    def close(self):
+        self.reset()
+
     def remove_stale_sockets(self):
         pass
 
@@ -63,7 +66,7 @@ class TestHeartbeatMonitoring(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.saved_listeners = monitoring._LISTENERS
-        monitoring._LISTENERS = monitoring._Listeners([], [], [], [])
+        monitoring._LISTENERS = monitoring._Listeners([], [], [], [], [])
 
     @classmethod
     def tearDownClass(cls):
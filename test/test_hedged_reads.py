@@ -0,0 +1,264 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test hedged reads."""
+
+import sys
+import threading
+import time
+from functools import partial
+
+sys.path[0:0] = [""]
+
+from pymongo import MongoClient
+from pymongo.errors import AutoReconnect, OperationFailure
+from pymongo.hedged_read import HedgedRead
+from pymongo.read_preferences import ReadPreference
+from pymongo.server_type import SERVER_TYPE
+from test import unittest
+from test.pymongo_mocks import MockMongoServer
+from test.utils import wait_until
+
+
+class TestHedgedRead(unittest.TestCase):
+
+    def setUp(self):
+        # Maps each server to the thread its request ran on.
+        self.threads = {}
+
+    def race(self, outcomes):
+        # outcomes maps a server to (seconds, result or exception).
+        def target(race, attempt):
+            self.threads[attempt.server] = threading.current_thread()
+            race.started(attempt, None)
+            delay, outcome = outcomes[attempt.server]
+            time.sleep(delay)
+            if isinstance(outcome, Exception):
+                race.failed(attempt, outcome)
+            else:
+                race.succeeded(attempt, outcome)
+
+        race = HedgedRead(target)
+        race.run('a', 'b', 0.05)
+        race.wait()
+        return race.outcome()
+
+    def test_first_answer_wins(self):
+        self.assertEqual('a', self.race({'a': (0, 'a'), 'b': (0, 'b')}))
+        self.assertEqual('b', self.race({'a': (0.3, 'a'), 'b': (0, 'b')}))
+
+    def test_hedge_thread_started_after_delay(self):
+        self.assertEqual('a', self.race({'a': (0, 'a'), 'b': (0, 'b')}))
+        self.assertIs(threading.current_thread(), self.threads['a'])
+        time.sleep(0.1)
+        # The request was answered within the delay.
+        self.assertNotIn('b', self.threads)
+
+        self.assertEqual('b', self.race({'a': (0.3, 'a'), 'b': (0, 'b')}))
+        self.assertIs(threading.current_thread(), self.threads['a'])
+        self.assertIsNot(threading.current_thread(), self.threads['b'])
+
+    def test_error_before_hedging(self):
+        error = OperationFailure('a')
+        with self.assertRaises(OperationFailure):
+            self.race({'a': (0, error), 'b': (0, 'b')})
+
+    def test_hedge_succeeds_after_error(self):
+        self.assertEqual('b', self.race({'a': (0.1, AutoReconnect('a')),
+                                         'b': (0.2, 'b')}))
+
+    def test_first_error_raised(self):
+        with self.assertRaisesRegex(AutoReconnect, 'a'):
+            self.race({'a': (0.2, AutoReconnect('a')),
+                       'b': (0.1, AutoReconnect('b'))})
+
+    def test_only_connections_in_use_cancelled(self):
+        class Connection(object):
+            cancelled = False
+
+            def cancel(self):
+                self.cancelled = True
+
+        connections = dict((server, Connection()) for server in 'abc')
+        attempts = {}
+
+        def target(race, attempt):
+            attempts[attempt.server] = attempt
+            race.started(attempt, connections[attempt.server])
+
+        race = HedgedRead(target)
+        race.run('a')
+        race.start('b')
+        race.start('c')
+        wait_until(lambda: len(attempts) == 3, 'start all attempts')
+        # 'a' is done with its connection, 'c' is still reading.
+        self.assertFalse(race.finished(attempts['a']))
+        self.assertTrue(race.succeeded(attempts['b'], 'b'))
+        self.assertFalse(connections['a'].cancelled)
+        self.assertTrue(connections['c'].cancelled)
+        # 'c' must close its connection once it's done.
+        self.assertTrue(race.finished(attempts['c']))
+
+
+class TestHedgedReads(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.slow = None
+        self.sessions = False
+        self.cursor_id = 0
+        # (server index, command name, lsid) for each command.
+        self.commands = []
+        self.servers = [MockMongoServer(partial(self.handler, i)).start()
+                        for i in range(2)]
+
+    def tearDown(self):
+        self.release.set()
+        for server in self.servers:
+            server.stop()
+
+    def handler(self, index, cmd):
+        name = next(iter(cmd))
+        if name == 'ismaster':
+            reply = {'ismaster': True, 'msg': 'isdbgrid', 'minWireVersion': 0,
+                     'maxWireVersion': 7, 'ok': 1}
+            if self.sessions:
+                reply['logicalSessionTimeoutMinutes'] = 30
+            return reply
+        self.commands.append((index, name, cmd.get('lsid')))
+        if name in ('aggregate', 'find'):
+            if index == self.slow:
+                self.release.wait(10)
+            # Each server counts a different number of documents.
+            return {'cursor': {'id': self.cursor_id, 'ns': 'db.test',
+                               'firstBatch': [{'_id': 1, 'n': index}]},
+                    'ok': 1}
+        if name == 'getMore':
+            return {'cursor': {'id': 0, 'ns': 'db.test', 'nextBatch': []},
+                    'ok': 1}
+
+    def create_client(self, **kwargs):
+        client = MongoClient(['%s:%d' % server.address
+                              for server in self.servers],
+                             hedgedReads=True, localThresholdMS=1000,
+                             **kwargs)
+        self.addCleanup(client.close)
+        wait_until(lambda: len(client.nodes) == 2, 'discover both mongoses')
+        # Time some operations on both servers.
+        topology = client._topology
+        wait_until(lambda: (
+            client.db.test.count_documents({}) is not None and
+            all(topology.operation_latency(server.address) is not None
+                for server in self.servers)),
+            'time operations on both servers')
+        return client
+
+    def test_slow_read_hedged(self):
+        client = self.create_client(readPreference='nearest')
+        self.slow = 1
+        start = time.time()
+        # Reads sent to the slow server are answered by the other one.
+        coll = client.db.test
+        for _ in range(5):
+            self.assertEqual(0, coll.count_documents({}))
+            self.assertEqual(0, coll.find_one()['n'])
+            self.assertEqual(0, next(coll.aggregate([]))['n'])
+        self.assertLess(time.time() - start, 5)
+        # The cancelled reads don't mark the slow server Unknown.
+        description = client._topology.description
+        for server in self.servers:
+            self.assertEqual(
+                SERVER_TYPE.Mongos,
+                description.server_descriptions()[server.address].server_type)
+
+    def check_hedged_in_own_session(self, read, name):
+        hedged = 0
+        for _ in range(20):
+            del self.commands[:]
+            self.assertEqual([0], [doc['n'] for doc in read()])
+            lsids = dict(((index, cmd_name), lsid)
+                         for index, cmd_name, lsid in self.commands)
+            # The cursor is continued in the session that created it.
+            self.assertNotIn((1, 'getMore'), lsids)
+            self.assertEqual(lsids[(0, name)], lsids[(0, 'getMore')])
+            if (1, name) in lsids:
+                # Sent to the slow server first, then hedged in another
+                # implicit session.
+                hedged += 1
+                self.assertNotEqual(lsids[(1, name)], lsids[(0, name)])
+        self.assertGreater(hedged, 0)
+
+    def test_implicit_session_hedged(self):
+        self.sessions = True
+        client = self.create_client(readPreference='nearest')
+        self.slow = 1
+        self.cursor_id = 7
+        coll = client.db.test
+        self.check_hedged_in_own_session(
+            lambda: coll.find(batch_size=1), 'find')
+        self.check_hedged_in_own_session(
+            lambda: coll.aggregate([]), 'aggregate')
+
+    def test_not_hedged(self):
+        client = self.create_client(readPreference='nearest')
+        coll = client.db.test
+        calls = []
+        original = client._hedged_read
+
+        def hedged_read(*args):
+            calls.append(args)
+            return original(*args)
+
+        client._hedged_read = hedged_read
+
+        class ExplicitSession(object):
+            _implicit = False
+            _in_transaction = False
+            _pinned_address = None
+
+        def read(session, server, sock_info, slave_ok):
+            return 'result'
+
+        client._retryable_read(read, coll.read_preference, None, hedge=True)
+        self.assertEqual(1, len(calls))
+        # Not an idempotent read.
+        client._retryable_read(read, coll.read_preference, None)
+        # The primary read preference.
+        client._retryable_read(read, ReadPreference.PRIMARY, None,
+                               hedge=True)
+        # An explicit session.
+        client._retryable_read(read, coll.read_preference,
+                               ExplicitSession(), hedge=True)
+        self.assertEqual(1, len(calls))
+
+    def test_options(self):
+        client = MongoClient(connect=False, hedgedReads=True)
+        options = client._MongoClient__options
+        self.assertTrue(options.hedged_reads)
+        self.assertEqual(95, options.hedge_delay_percentile)
+        self.assertTrue(options.pool_options.track_operation_latency)
+
+        client = MongoClient(
+            'mongodb://host/?hedgedReads=true&hedgeDelayPercentile=99.9',
+            connect=False)
+        self.assertEqual(
+            99.9, client._MongoClient__options.hedge_delay_percentile)
+
+        for value in (0, 100, -1):
+            self.assertRaises(ValueError, MongoClient, connect=False,
+                              hedgeDelayPercentile=value)
+
+
+if __name__ == "__main__":
+    unittest.main()
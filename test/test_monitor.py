@@ -15,14 +15,43 @@
 """Test the monitor module."""
 
 import gc
+import os
 import sys
+import threading
+import time
 from functools import partial
 
+try:
+    import ssl
+except ImportError:
+    ssl = None
+
+try:
+    import queue as Queue
+except ImportError:
+    import Queue
+
 sys.path[0:0] = [""]
 
+from bson.objectid import ObjectId
+from pymongo import MongoClient, dns_resolver
+from pymongo.errors import NetworkTimeout
+from pymongo.monitor import MultiplexedMonitor
+from pymongo.monitoring import (ServerHeartbeatFailedEvent,
+                                ServerHeartbeatStartedEvent,
+                                ServerHeartbeatSucceededEvent)
 from pymongo.periodic_executor import _EXECUTORS
+from pymongo.server_type import SERVER_TYPE
 from test import client_context, unittest, IntegrationTest
-from test.utils import single_client, one, connected, wait_until
+from test.pymongo_mocks import MockMongoServer
+from test.utils import (HeartbeatEventListener,
+                        single_client,
+                        one,
+                        connected,
+                        wait_until)
+
+CERT_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                         'certificates')
 
 
 def unregistered(ref):
@@ -46,5 +75,246 @@ class TestMonitor(IntegrationTest):
                    timeout=5)
 
 
+def monitor_threads():
+    return [t for t in threading.enumerate()
+            if t.name in ('pymongo_monitor_multiplexer_thread',
+                          'pymongo_server_monitor_thread')]
+
+
+class TestMultiplexedMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.delay = threading.Event()
+        self.servers = [MockMongoServer(self.handler).start()
+                        for _ in range(3)]
+        self.listener = HeartbeatEventListener()
+
+    def tearDown(self):
+        self.delay.set()
+        for server in self.servers:
+            server.stop()
+
+    def handler(self, cmd):
+        if next(iter(cmd)).lower() == 'ismaster':
+            self.delay.wait(2)
+            return {'ismaster': True, 'msg': 'isdbgrid', 'ok': 1,
+                    'minWireVersion': 0, 'maxWireVersion': 7}
+
+    def create_client(self, **kwargs):
+        self.delay.set()
+        seeds = ['%s:%d' % server.address for server in self.servers]
+        client = MongoClient(seeds, serverMonitoringMode='multiplexed',
+                             event_listeners=[self.listener],
+                             heartbeatFrequencyMS=500, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def wait_for_mongoses(self, client, count):
+        def discovered():
+            sds = client._topology.description.server_descriptions()
+            return count == len([sd for sd in sds.values()
+                                 if sd.server_type == SERVER_TYPE.Mongos])
+        wait_until(discovered, 'discover %d mongoses' % (count,))
+
+    def test_one_thread(self):
+        before = len(monitor_threads())
+        client = self.create_client()
+        self.wait_for_mongoses(client, 3)
+        multiplexer = client._topology._monitor_multiplexer
+        self.assertTrue(multiplexer._thread.is_alive())
+        for server in client._topology._servers.values():
+            self.assertIsInstance(server._monitor, MultiplexedMonitor)
+        self.assertLessEqual(len(monitor_threads()), before + 1)
+        client.admin.command('ping')
+        client.close()
+        wait_until(lambda: multiplexer._thread is None, 'stop the thread')
+
+    def test_heartbeat_events(self):
+        client = self.create_client()
+        self.wait_for_mongoses(client, 3)
+        events = list(self.listener.results)
+        for server in self.servers:
+            by_server = [type(event) for event in events
+                         if event.connection_id == server.address]
+            self.assertEqual(ServerHeartbeatStartedEvent, by_server[0])
+            self.assertIn(ServerHeartbeatSucceededEvent, by_server)
+            self.assertNotIn(ServerHeartbeatFailedEvent, by_server)
+
+    def test_server_down(self):
+        client = self.create_client()
+        self.wait_for_mongoses(client, 3)
+        self.servers[0].stop()
+        client._topology.request_check_all()
+        self.wait_for_mongoses(client, 2)
+        sd = client._topology.description.server_descriptions()[
+            self.servers[0].address]
+        self.assertEqual(SERVER_TYPE.Unknown, sd.server_type)
+        self.assertIsNotNone(sd.error)
+        self.assertTrue(any(
+            isinstance(event, ServerHeartbeatFailedEvent) and
+            event.connection_id == self.servers[0].address
+            for event in self.listener.results))
+
+    def test_timeout(self):
+        client = self.create_client(connectTimeoutMS=200)
+        self.wait_for_mongoses(client, 3)
+        self.delay.clear()
+        client._topology.request_check_all()
+        self.wait_for_mongoses(client, 0)
+        failures = [event for event in self.listener.results
+                    if isinstance(event, ServerHeartbeatFailedEvent)]
+        self.assertTrue(failures)
+        self.assertIsInstance(failures[0].reply, NetworkTimeout)
+        self.delay.set()
+        self.wait_for_mongoses(client, 3)
+
+    def test_slow_dns_lookup(self):
+        lookup = threading.Event()
+        self.addCleanup(lookup.set)
+
+        class SlowResolver(dns_resolver.Resolver):
+            def getaddrinfo(self, host, port, family, socktype):
+                if host == 'slowhost':
+                    lookup.wait(10)
+                    host = '127.0.0.1'
+                return super(SlowResolver, self).getaddrinfo(
+                    host, port, family, socktype)
+
+        dns_resolver.set_resolver(SlowResolver())
+        self.addCleanup(dns_resolver.set_resolver, None)
+        self.delay.set()
+        seeds = ['slowhost:%d' % self.servers[0].address[1]] + [
+            '%s:%d' % server.address for server in self.servers[1:]]
+        client = MongoClient(seeds, serverMonitoringMode='multiplexed',
+                             heartbeatFrequencyMS=500)
+        self.addCleanup(client.close)
+        # The lookup doesn't block the other servers' heartbeats.
+        self.wait_for_mongoses(client, 2)
+        lookup.set()
+        self.wait_for_mongoses(client, 3)
+
+
+class TestStreamingMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.topology_version = {'processId': ObjectId(), 'counter': 0}
+        self.pushes = Queue.Queue()
+        self.awaited = []
+        self.polls = []
+        self.stopped = False
+        self.server = MockMongoServer(self.handler).start()
+
+    def tearDown(self):
+        self.stopped = True
+        self.server.stop()
+
+    def ismaster(self, **kwargs):
+        reply = {'ismaster': True, 'minWireVersion': 0, 'maxWireVersion': 9,
+                 'topologyVersion': self.topology_version, 'ok': 1}
+        reply.update(kwargs)
+        return reply
+
+    def handler(self, cmd):
+        if next(iter(cmd)).lower() != 'ismaster':
+            return None
+        if 'topologyVersion' in cmd:
+            self.awaited.append(cmd['maxAwaitTimeMS'])
+            return self.stream()
+        self.polls.append(cmd)
+        return self.ismaster()
+
+    def stream(self):
+        while not self.stopped:
+            try:
+                reply = self.pushes.get(timeout=0.1)
+            except Queue.Empty:
+                continue
+            if reply is None:
+                # Drop the connection.
+                raise EOFError()
+            yield reply
+
+    def create_client(self, heartbeat_frequency_ms=60000):
+        client = MongoClient(*self.server.address,
+                             serverMonitoringMode='streaming',
+                             heartbeatFrequencyMS=heartbeat_frequency_ms)
+        self.addCleanup(client.close)
+        wait_until(lambda: self.awaited, 'start streaming')
+        return client
+
+    def server_type(self, client):
+        return client._topology.description.server_descriptions()[
+            self.server.address].server_type
+
+    def test_pushed_change(self):
+        client = self.create_client()
+        self.assertEqual([60000], self.awaited)
+        self.assertEqual(SERVER_TYPE.Standalone, self.server_type(client))
+        # Discovered long before the next heartbeat.
+        self.pushes.put(self.ismaster(msg='isdbgrid'))
+        wait_until(lambda: self.server_type(client) == SERVER_TYPE.Mongos,
+                   'discover the pushed change', timeout=5)
+        self.assertEqual(1, len(self.awaited))
+
+    def test_rtt_measured_on_another_connection(self):
+        client = self.create_client(heartbeat_frequency_ms=500)
+        polls = len(self.polls)
+        wait_until(lambda: len(self.polls) >= polls + 2,
+                   'measure the round trip time')
+        self.assertEqual(1, len(self.awaited))
+        sd = client._topology.description.server_descriptions()[
+            self.server.address]
+        self.assertIsNotNone(sd.round_trip_time)
+
+    def test_stream_restarted(self):
+        client = self.create_client()
+        self.pushes.put(self.ismaster())
+        self.pushes.put(None)
+        wait_until(lambda: len(self.awaited) == 2, 'stream again', timeout=5)
+        self.assertEqual(SERVER_TYPE.Standalone, self.server_type(client))
+
+    def test_close_interrupts_stream(self):
+        client = self.create_client()
+        server = client._topology.get_server_by_address(self.server.address)
+        monitor = server._monitor
+        wait_until(lambda: monitor._stream_sock is not None,
+                   'wait for a pushed reply')
+        start = time.time()
+        client.close()
+        monitor.join(5)
+        self.assertLess(time.time() - start, 5)
+        self.assertFalse(monitor._executor._running)
+        self.assertIsNone(monitor._stream_sock)
+
+    def test_server_without_streaming_polled(self):
+        self.topology_version = None
+        client = MongoClient(*self.server.address,
+                             serverMonitoringMode='streaming',
+                             heartbeatFrequencyMS=500)
+        self.addCleanup(client.close)
+        wait_until(lambda: len(self.polls) >= 3, 'poll the server')
+        self.assertEqual([], self.awaited)
+
+
+@unittest.skipUnless(hasattr(ssl, 'PROTOCOL_TLS_SERVER'),
+                     "requires ssl.PROTOCOL_TLS_SERVER")
+class TestMultiplexedMonitorTLS(unittest.TestCase):
+
+    def test_tls(self):
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        # The test certificates use SHA-1 signatures.
+        server_context.set_ciphers('DEFAULT:@SECLEVEL=0')
+        server_context.load_cert_chain(os.path.join(CERT_PATH, 'server.pem'))
+        server = MockMongoServer(ssl_context=server_context).start()
+        self.addCleanup(server.stop)
+        client = MongoClient(*server.address, tls=True,
+                             tlsAllowInvalidCertificates=True,
+                             serverMonitoringMode='multiplexed')
+        self.addCleanup(client.close)
+        wait_until(lambda: client._topology.description.has_known_servers,
+                   'discover the server over TLS')
+        client.admin.command('ping')
+
+
 if __name__ == "__main__":
     unittest.main()
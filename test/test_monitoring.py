@@ -47,7 +47,7 @@ class TestCommandMonitoring(PyMongoTestCase):
         cls.listener = EventListener()
         cls.saved_listeners = monitoring._LISTENERS
         # Don't use any global subscribers.
-        monitoring._LISTENERS = monitoring._Listeners([], [], [], [])
+        monitoring._LISTENERS = monitoring._Listeners([], [], [], [], [])
         cls.client = rs_or_single_client(
             event_listeners=[cls.listener],
             retryWrites=False)
@@ -0,0 +1,295 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test outlier detection."""
+
+import sys
+
+sys.path[0:0] = [""]
+
+from bson.py3compat import imap
+from pymongo import MongoClient, common, monitoring, outlier_detection
+from pymongo.ismaster import IsMaster
+from pymongo.monitoring import _EventListeners
+from pymongo.outlier_detection import OutlierDetector
+from pymongo.pool import PoolOptions
+from pymongo.server_description import ServerDescription
+from pymongo.server_selectors import any_server_selector
+from pymongo.settings import TopologySettings
+from pymongo.topology import Topology
+from test import unittest
+from test.test_topology import MockMonitor, MockPool
+from test.utils import wait_until
+
+A, B, C, D = [(host, 27017) for host in 'abcd']
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class SD(object):
+    def __init__(self, address):
+        self.address = address
+
+
+class Latency(object):
+    def __init__(self):
+        self.median = None
+
+    def get(self, percentile=None):
+        return self.median
+
+
+class LatencyPool(MockPool):
+    def __init__(self, *args, **kwargs):
+        super(LatencyPool, self).__init__(*args, **kwargs)
+        self.operation_latency = Latency()
+
+
+class EventRecorder(monitoring.ServerListener):
+    def __init__(self):
+        self.events = []
+
+    def opened(self, event):
+        pass
+
+    def description_changed(self, event):
+        pass
+
+    def closed(self, event):
+        pass
+
+    def ejected(self, event):
+        self.events.append(event)
+
+    def restored(self, event):
+        self.events.append(event)
+
+
+class OutlierDetectorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.original_time = outlier_detection._time
+        outlier_detection._time = self.clock
+        self.detector = OutlierDetector(30)
+        for address in (A, B, C, D):
+            self.detector.add_server(address)
+
+    def tearDown(self):
+        outlier_detection._time = self.original_time
+
+    def selectable(self, addresses=(A, B, C, D)):
+        return set(sd.address for sd in
+                   self.detector.filter([SD(a) for a in addresses]))
+
+    def fail(self, address, times):
+        for _ in range(times):
+            self.detector.record(address, True)
+
+    def test_consecutive_failures(self):
+        self.fail(A, outlier_detection._MAX_CONSECUTIVE_FAILURES - 1)
+        self.detector.record(A, False)
+        self.fail(A, outlier_detection._MAX_CONSECUTIVE_FAILURES - 1)
+        self.assertEqual(set([A, B, C, D]), self.selectable())
+        self.fail(A, 1)
+        self.assertTrue(self.detector.is_ejected(A))
+        self.assertEqual(set([B, C, D]), self.selectable())
+
+    def test_error_rate(self):
+        for _ in range(outlier_detection._MIN_OPERATIONS // 2):
+            self.detector.record(A, False)
+            self.detector.record(A, True)
+        self.assertTrue(self.detector.is_ejected(A))
+
+    def test_error_rate_window(self):
+        for _ in range(outlier_detection._MIN_OPERATIONS // 2):
+            self.detector.record(A, True)
+            self.detector.record(A, False)
+            # The failures age out.
+            self.clock.now += outlier_detection._ERROR_RATE_WINDOW
+        self.assertFalse(self.detector.is_ejected(A))
+
+    def test_max_ejected(self):
+        for address in (A, B, C):
+            self.fail(address, outlier_detection._MAX_CONSECUTIVE_FAILURES)
+        self.assertTrue(self.detector.is_ejected(A))
+        self.assertTrue(self.detector.is_ejected(B))
+        # At most half the servers are ejected.
+        self.assertFalse(self.detector.is_ejected(C))
+
+    def test_nothing_else_suitable(self):
+        self.fail(A, outlier_detection._MAX_CONSECUTIVE_FAILURES)
+        self.assertEqual(set([A]), self.selectable([A]))
+
+    def test_latency(self):
+        latencies = {A: 0.01, B: 0.012, C: 0.011, D: 0.02}
+        self.detector.check([latencies])
+        self.assertEqual(set([A, B, C, D]), self.selectable())
+        # Three times slower, but too fast to matter.
+        latencies[D] = 0.04
+        self.detector.check([latencies])
+        self.assertEqual(set([A, B, C, D]), self.selectable())
+
+        latencies[D] = 0.5
+        self.detector.check([latencies])
+        self.assertEqual(set([A, B, C]), self.selectable())
+
+    def test_latency_by_type(self):
+        # Servers are only compared with others of the same type.
+        self.detector.check([{A: 0.01, B: None}, {C: 0.5, D: 0.4}])
+        self.assertEqual(set([A, B, C, D]), self.selectable())
+
+    def test_probation(self):
+        self.fail(A, outlier_detection._MAX_CONSECUTIVE_FAILURES)
+        self.clock.now += 29
+        self.assertEqual(set([B, C, D]), self.selectable())
+
+        # Early in probation A is selected some of the time.
+        self.clock.now += 1
+        counts = [A in self.selectable() for _ in range(1000)]
+        self.assertLess(sum(counts), 300)
+        self.assertGreater(sum(counts), 0)
+
+        # Then most of the time.
+        self.clock.now += 29
+        counts = [A in self.selectable() for _ in range(1000)]
+        self.assertGreater(sum(counts), 900)
+
+        self.clock.now += 1
+        self.detector.check([])
+        self.assertFalse(A in self.detector._unhealthy)
+        self.assertEqual(set([A, B, C, D]), self.selectable())
+
+    def test_longer_ejections(self):
+        durations = []
+        for _ in range(12):
+            self.fail(A, outlier_detection._MAX_CONSECUTIVE_FAILURES)
+            health = self.detector._unhealthy[A]
+            durations.append(health.ejected_until - self.clock.now)
+            # Failing again on probation.
+            self.clock.now = health.ejected_until
+        self.assertEqual([30 * i for i in range(1, 11)] + [300, 300],
+                         durations)
+
+        # After a long healthy period the ejection time is reset.
+        self.clock.now = self.detector._unhealthy[A].probation_until
+        self.detector.check([])
+        self.clock.now += 301
+        self.fail(A, outlier_detection._MAX_CONSECUTIVE_FAILURES)
+        health = self.detector._unhealthy[A]
+        self.assertEqual(30, health.ejected_until - self.clock.now)
+
+    def test_ignore_ejected_server(self):
+        self.fail(A, outlier_detection._MAX_CONSECUTIVE_FAILURES)
+        # Operations that were running when it was ejected.
+        self.fail(A, outlier_detection._MAX_CONSECUTIVE_FAILURES)
+        self.assertEqual(1, self.detector._unhealthy[A].ejections)
+
+    def test_remove_server(self):
+        self.fail(A, outlier_detection._MAX_CONSECUTIVE_FAILURES)
+        self.detector.remove_server(A)
+        self.assertFalse(self.detector.is_ejected(A))
+        self.detector.record(A, True)
+
+
+class TestTopologyOutlierDetection(unittest.TestCase):
+
+    def create_topology(self, listener=None):
+        seeds = list(imap(common.partition_node, ['a', 'b', 'c', 'd']))
+        pool_options = PoolOptions(
+            event_listeners=_EventListeners([listener] if listener else []))
+        settings = TopologySettings(
+            seeds, pool_class=LatencyPool, monitor_class=MockMonitor,
+            outlier_detection=True, outlier_ejection_time=30,
+            pool_options=pool_options)
+        topology = Topology(settings)
+        self.addCleanup(topology.close)
+        topology.open()
+        for address in seeds:
+            topology.on_change(ServerDescription(address, IsMaster(
+                {'ok': 1, 'ismaster': True, 'msg': 'isdbgrid',
+                 'maxWireVersion': 7}), 0))
+        return topology
+
+    def selectable(self, topology):
+        return set(server.description.address for server in
+                   topology.select_servers(any_server_selector))
+
+    def test_errors(self):
+        listener = EventRecorder()
+        topology = self.create_topology(listener)
+        for _ in range(outlier_detection._MAX_CONSECUTIVE_FAILURES):
+            topology.record_operation(A, True)
+        self.assertEqual(set([B, C, D]), self.selectable(topology))
+        for _ in range(100):
+            self.assertNotEqual(A, topology.select_server(
+                any_server_selector).description.address)
+            self.assertNotEqual(A, topology.select_other_server(
+                any_server_selector, B).description.address)
+        # An explicitly selected server is still used.
+        self.assertEqual(A, topology.select_server_by_address(
+            A).description.address)
+
+        wait_until(lambda: listener.events, 'publish ServerEjectedEvent')
+        event = listener.events[0]
+        self.assertIsInstance(event, monitoring.ServerEjectedEvent)
+        self.assertEqual(A, event.server_address)
+        self.assertEqual('errors', event.reason)
+        self.assertEqual(30, event.duration)
+
+    def test_latency(self):
+        topology = self.create_topology()
+        for address, latency in ((A, 0.01), (B, 0.01), (C, 0.01), (D, 1)):
+            topology.get_server_by_address(
+                address).pool.operation_latency.median = latency
+        wait_until(lambda: self.selectable(topology) == set([A, B, C]),
+                   'eject the slow server')
+
+    def test_removed_server(self):
+        topology = self.create_topology()
+        topology.on_change(ServerDescription(A, IsMaster(
+            {'ok': 1, 'setName': 'rs', 'hosts': ['a:27017']}), 0))
+        self.assertNotIn(A, topology._outliers._health)
+
+    def test_options(self):
+        client = MongoClient(connect=False, outlierDetection=True)
+        options = client._MongoClient__options
+        self.assertTrue(options.outlier_detection)
+        self.assertEqual(30, options.outlier_ejection_time)
+        self.assertTrue(options.pool_options.track_operation_latency)
+
+        client = MongoClient(
+            'mongodb://host/?outlierDetection=true'
+            '&outlierEjectionTimeMS=5000', connect=False)
+        settings = client._topology._settings
+        self.assertTrue(settings.outlier_detection)
+        self.assertEqual(5, settings.outlier_ejection_time)
+
+        self.assertIsNone(MongoClient(connect=False)._topology._outliers)
+
+        self.assertRaises(TypeError, MongoClient, connect=False,
+                          outlierEjectionTimeMS=None)
+        for value in (0, -1):
+            self.assertRaises(ValueError, MongoClient, connect=False,
+                              outlierEjectionTimeMS=value)
+
+
+if __name__ == "__main__":
+    unittest.main()
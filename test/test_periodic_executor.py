@@ -0,0 +1,169 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test PeriodicExecutor and the scheduler it runs on."""
+
+import sys
+import threading
+import time
+
+sys.path[0:0] = [""]
+
+from pymongo import periodic_executor
+from pymongo.periodic_executor import PeriodicExecutor
+from test import unittest
+from test.utils import wait_until
+
+
+class TestPeriodicExecutor(unittest.TestCase):
+
+    def create_executor(self, target, interval=60, min_interval=0.01):
+        executor = PeriodicExecutor(interval=interval,
+                                    min_interval=min_interval,
+                                    target=target,
+                                    name="test_executor")
+        self.addCleanup(executor.close)
+        return executor
+
+    def test_interval(self):
+        calls = []
+        executor = self.create_executor(lambda: calls.append(1) or True,
+                                        interval=0.05)
+        executor.open()
+        wait_until(lambda: len(calls) >= 3, 'call the target 3 times')
+
+    def test_wake(self):
+        calls = []
+        executor = self.create_executor(lambda: calls.append(1) or True)
+        executor.open()
+        wait_until(lambda: len(calls) == 1, 'call the target')
+        executor.wake()
+        wait_until(lambda: len(calls) == 2, 'call the target when woken')
+
+    def test_update_interval(self):
+        calls = []
+        executor = self.create_executor(lambda: calls.append(1) or True)
+        executor.open()
+        wait_until(lambda: len(calls) == 1, 'call the target')
+        executor.update_interval(0.05)
+        # Applies after the next call.
+        executor.wake()
+        wait_until(lambda: len(calls) >= 4, 'use the new interval')
+
+    def test_close_and_reopen(self):
+        calls = []
+        executor = self.create_executor(lambda: calls.append(1) or True,
+                                        interval=0.05)
+        executor.open()
+        wait_until(lambda: calls, 'call the target')
+        executor.close()
+        executor.join(5)
+        self.assertFalse(executor._is_scheduled())
+        count = len(calls)
+        time.sleep(0.2)
+        self.assertEqual(count, len(calls))
+
+        executor.open()
+        self.assertTrue(executor._is_scheduled())
+        wait_until(lambda: len(calls) > count, 'call the target again')
+
+    def test_target_returns_false(self):
+        calls = []
+        executor = self.create_executor(lambda: calls.append(1) and False,
+                                        interval=0.01)
+        executor.open()
+        executor.join(5)
+        self.assertTrue(executor._stopped)
+        self.assertEqual(1, len(calls))
+
+    def test_never_runs_concurrently_with_itself(self):
+        running = []
+        overlaps = []
+
+        def target():
+            if running:
+                overlaps.append(1)
+            running.append(1)
+            time.sleep(0.05)
+            running.pop()
+            return True
+
+        executor = self.create_executor(target, interval=0.001,
+                                        min_interval=0.001)
+        executor.open()
+        for _ in range(20):
+            executor.wake()
+            time.sleep(0.01)
+        self.assertEqual([], overlaps)
+
+    def test_bounded_threads(self):
+        # Executors share a few threads, instead of one thread each.
+        before = threading.active_count()
+        started = []
+        executors = [
+            self.create_executor(lambda: started.append(1) or True)
+            for _ in range(100)]
+        for executor in executors:
+            executor.open()
+        wait_until(lambda: len(started) == 100, 'run all the targets')
+        self.assertLessEqual(threading.active_count(),
+                             before + 1 + periodic_executor._MAX_WORKERS)
+
+    def test_blocked_workers(self):
+        # Targets blocked on every worker don't starve the others.
+        release = threading.Event()
+        self.addCleanup(release.set)
+        blocked = []
+
+        def block():
+            blocked.append(1)
+            release.wait(10)
+            return True
+
+        for _ in range(periodic_executor._MAX_WORKERS):
+            self.create_executor(block).open()
+        wait_until(lambda: len(blocked) == periodic_executor._MAX_WORKERS,
+                   'block every worker')
+        calls = []
+        self.create_executor(lambda: calls.append(1) or True).open()
+        wait_until(lambda: calls, 'call the target', timeout=2)
+
+    def test_join(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def target():
+            started.set()
+            release.wait(10)
+            return True
+
+        executor = self.create_executor(target)
+        executor.open()
+        started.wait(10)
+        executor.close()
+        # Times out while the target runs.
+        start = time.time()
+        executor.join(0.1)
+        self.assertTrue(executor._running)
+        self.assertLess(time.time() - start, 1)
+        # Returns as soon as the target does.
+        threading.Timer(0.1, release.set).start()
+        start = time.time()
+        executor.join(10)
+        self.assertFalse(executor._running)
+        self.assertLess(time.time() - start, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
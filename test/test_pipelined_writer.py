@@ -0,0 +1,111 @@
+# Copyright 2019-present MongoDB, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the pipelined_writer module."""
+
+import sys
+import threading
+
+sys.path[0:0] = [""]
+
+from pymongo import MongoClient
+from pymongo.errors import InvalidOperation
+from pymongo.pipelined_writer import PipelinedWriter
+from test import unittest, IntegrationTest
+from test.utils import EventListener, rs_or_single_client
+
+
+class TestPipelinedWriterOptions(unittest.TestCase):
+
+    def test_max_buffer_size(self):
+        for size in (0, -1):
+            self.assertRaises(ValueError, PipelinedWriter, None, size)
+        for size in (1.5, None):
+            self.assertRaises(TypeError, PipelinedWriter, None, size)
+        coll = MongoClient(connect=False).db.test
+        self.assertEqual(5, PipelinedWriter(coll, 5).max_buffer_size)
+
+
+class TestPipelinedWriter(IntegrationTest):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestPipelinedWriter, cls).setUpClass()
+        cls.listener = EventListener()
+        cls.listener_client = rs_or_single_client(
+            event_listeners=[cls.listener])
+        cls.coll = cls.listener_client[cls.db.name].test
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.listener_client.close()
+
+    def setUp(self):
+        self.coll.drop()
+        self.listener.results.clear()
+
+    def test_writes_are_batched(self):
+        with self.coll.pipelined_writer(max_buffer_size=10) as writer:
+            for i in range(25):
+                writer.insert_one({'i': i})
+            # Two full buffers have been sent, the rest is buffered.
+            self.assertEqual(
+                ['insert', 'insert'],
+                self.listener.started_command_names())
+            writer.update_many({'i': {'$lt': 5}}, {'$set': {'small': True}})
+            writer.delete_one({'i': 24})
+            writer.replace_one({'i': 0}, {'i': 0, 'replaced': True})
+            writer.flush()
+
+        self.assertEqual(24, self.coll.count_documents({}))
+        self.assertEqual(5, self.coll.count_documents({'small': True}))
+        self.assertEqual({'i': 0, 'replaced': True},
+                         self.coll.find_one({'i': 0}, {'_id': False}))
+
+        names = self.listener.started_command_names()
+        self.assertEqual(['insert', 'insert', 'insert', 'update', 'delete',
+                          'update', 'ping'], names[:7])
+        # Every write used the same connection.
+        started = self.listener.results['started']
+        self.assertEqual(1, len(set(e.connection_id for e in started[:7])))
+        # Writes are applied in order, even on sharded clusters.
+        self.assertTrue(all(e.command['ordered'] for e in started[:6]))
+
+    def test_close(self):
+        writer = self.coll.pipelined_writer()
+        writer.insert_one({})
+        writer.close()
+        writer.close()
+        self.assertEqual(1, self.coll.count_documents({}))
+        self.assertRaises(InvalidOperation, writer.insert_one, {})
+
+    def test_concurrent_writers(self):
+        writer = self.coll.pipelined_writer(max_buffer_size=7)
+
+        def insert(n):
+            for i in range(100):
+                writer.insert_one({'thread': n, 'i': i})
+
+        threads = [threading.Thread(target=insert, args=(n,))
+                   for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.close()
+        self.assertEqual(400, self.coll.count_documents({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -31,7 +31,7 @@ class TestReadConcern(PyMongoTestCase):
         cls.listener = OvertCommandListener()
         cls.saved_listeners = monitoring._LISTENERS
         # Don't use any global subscribers.
-        monitoring._LISTENERS = monitoring._Listeners([], [], [], [])
+        monitoring._LISTENERS = monitoring._Listeners([], [], [], [], [])
         cls.client = single_client(event_listeners=[cls.listener])
         cls.db = cls.client.pymongo_test
 
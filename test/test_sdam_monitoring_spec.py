@@ -173,7 +173,7 @@ class TestAllScenarios(unittest.TestCase):
     def setUp(cls):
         cls.all_listener = ServerAndTopologyEventListener()
         cls.saved_listeners = monitoring._LISTENERS
-        monitoring._LISTENERS = monitoring._Listeners([], [], [], [])
+        monitoring._LISTENERS = monitoring._Listeners([], [], [], [], [])
 
     @classmethod
     def tearDown(cls):
@@ -141,6 +141,14 @@ class TestServerDescription(unittest.TestCase):
         self.assertTrue(s.is_writable)
         self.assertTrue(s.is_readable)
 
+    def test_topology_version(self):
+        s = parse_ismaster_response({'ok': 1, 'ismaster': True})
+        self.assertIsNone(s.topology_version)
+        topology_version = {'processId': 'a', 'counter': 1}
+        s = parse_ismaster_response({'ok': 1, 'ismaster': True,
+                                     'topologyVersion': topology_version})
+        self.assertEqual(topology_version, s.topology_version)
+
     def test_ok_false(self):
         s = parse_ismaster_response({'ok': 0, 'ismaster': True})
         self.assertEqual(SERVER_TYPE.Unknown, s.server_type)
@@ -57,7 +57,7 @@ class MockPool(object):
         self._lock = threading.Lock()
         self.opts = PoolOptions()
 
-    def get_socket(self, all_credentials):
+    def get_socket(self, all_credentials, checkout=False):
         return MockSocketInfo()
 
     def return_socket(self, _):
@@ -67,6 +67,9 @@ class MockPool(object):
         with self._lock:
             self.pool_id += 1
 
+    def close(self):
+        self.reset()
+
     def remove_stale_sockets(self):
         pass
 
@@ -98,13 +101,15 @@ address = ('a', 27017)
 def create_mock_topology(
         seeds=None,
         replica_set_name=None,
-        monitor_class=MockMonitor):
+        monitor_class=MockMonitor,
+        server_selection_policy=common.SERVER_SELECTION_POLICY):
     partitioned_seeds = list(imap(common.partition_node, seeds or ['a']))
     topology_settings = TopologySettings(
         partitioned_seeds,
         replica_set_name=replica_set_name,
         pool_class=MockPool,
-        monitor_class=monitor_class)
+        monitor_class=monitor_class,
+        server_selection_policy=server_selection_policy)
 
     t = Topology(topology_settings)
     t.open()
@@ -673,6 +678,267 @@ def wait_for_master(topology):
     return wait_until(get_master, 'find master')
 
 
+class TestServerSelectionFastPath(TopologyTest):
+    def create_replica_set(self, **kwargs):
+        t = create_mock_topology(replica_set_name='rs', **kwargs)
+        got_ismaster(t, ('a', 27017), {
+            'ok': 1,
+            'ismaster': True,
+            'setName': 'rs',
+            'hosts': ['a', 'b'],
+            'maxWireVersion': 6})
+        got_ismaster(t, ('b', 27017), {
+            'ok': 1,
+            'ismaster': False,
+            'secondary': True,
+            'setName': 'rs',
+            'hosts': ['a', 'b'],
+            'maxWireVersion': 6})
+        return t
+
+    def test_selection_cached(self):
+        t = self.create_replica_set()
+        td = t.description
+        selection = td.apply_selector(Secondary(), None)
+        self.assertEqual([('b', 27017)], [sd.address for sd in selection])
+        # Equal read preferences share the result.
+        self.assertIs(selection, td.apply_selector(Secondary(), None))
+        self.assertIs(selection,
+                      td.apply_selector(ReadPreference.SECONDARY, None))
+        self.assertIsNot(selection, td.apply_selector(
+            Secondary(tag_sets=[{'dc': 'ny'}]), None))
+        self.assertIs(td.apply_selector(writable_server_selector, None),
+                      td.apply_selector(writable_server_selector, None))
+
+        # A new description starts over.
+        disconnected(t, ('b', 27017))
+        self.assertEqual([], t.description.apply_selector(Secondary(), None))
+        self.assertEqual(1, len(selection))
+
+    def test_custom_selector_not_cached(self):
+        calls = []
+
+        def custom_selector(server_descriptions):
+            calls.append(1)
+            return server_descriptions
+
+        td = self.create_replica_set().description
+        for _ in range(2):
+            td.apply_selector(any_server_selector, None,
+                              custom_selector=custom_selector)
+        self.assertEqual(2, len(calls))
+
+    def test_select_without_lock(self):
+        t = self.create_replica_set()
+        servers = []
+        with t._lock:
+            thread = threading.Thread(target=lambda: servers.append(
+                t.select_server(writable_server_selector)))
+            thread.start()
+            thread.join(10)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(('a', 27017), servers[0].description.address)
+
+    def test_wait_for_server(self):
+        t = self.create_replica_set()
+        disconnected(t, ('a', 27017))
+        servers = []
+        thread = threading.Thread(target=lambda: servers.append(
+            t.select_server(writable_server_selector,
+                            server_selection_timeout=10)))
+        thread.start()
+        got_ismaster(t, ('a', 27017), {
+            'ok': 1,
+            'ismaster': True,
+            'setName': 'rs',
+            'hosts': ['a', 'b'],
+            'maxWireVersion': 6})
+        thread.join(10)
+        self.assertEqual(('a', 27017), servers[0].description.address)
+
+
+class TestIncrementalUpdate(TopologyTest):
+    def heartbeat(self, t, host, rtt, **kwargs):
+        response = {'ok': 1, 'maxWireVersion': 6}
+        response.update(kwargs)
+        t.on_change(ServerDescription((host, 27017), IsMaster(response), rtt))
+
+    def test_unchanged_server(self):
+        t = create_mock_topology(seeds=['a', 'b'])
+        for host in 'ab':
+            self.heartbeat(t, host, 0.1, ismaster=True, msg='isdbgrid')
+        td_old = t.description
+        self.assertIsNone(td_old._updated_address)
+
+        # Only the round trip time is new.
+        self.heartbeat(t, 'a', 0.5, ismaster=True, msg='isdbgrid')
+        td = t.description
+        self.assertEqual(('a', 27017), td._updated_address)
+        self.assertEqual(TOPOLOGY_TYPE.Sharded, td.topology_type)
+        self.assertEqual(0.1, td_old.server_descriptions()[
+            ('a', 27017)].round_trip_time)
+        self.assertEqual(0.5, td.server_descriptions()[
+            ('a', 27017)].round_trip_time)
+        self.assertEqual(0.5, get_server(t, 'a').description.round_trip_time)
+        self.assertEqual(6, td.common_wire_version)
+        self.assertEqual(2, len(td.known_servers))
+
+        # Changes are processed in full.
+        self.heartbeat(t, 'a', 0.5, ismaster=True, msg='isdbgrid',
+                       maxWireVersion=7)
+        self.assertIsNone(t.description._updated_address)
+
+    def test_primary_processed_in_full(self):
+        t = create_mock_topology(seeds=['a'], replica_set_name='rs')
+        for _ in range(2):
+            self.heartbeat(t, 'a', 0, ismaster=True, setName='rs',
+                           hosts=['a:27017', 'b:27017'])
+            self.assertIsNone(t.description._updated_address)
+        self.heartbeat(t, 'b', 0, ismaster=False, secondary=True,
+                       setName='rs', hosts=['a:27017', 'b:27017'])
+        self.heartbeat(t, 'b', 0, ismaster=False, secondary=True,
+                       setName='rs', hosts=['a:27017', 'b:27017'])
+        self.assertEqual(('b', 27017), t.description._updated_address)
+        self.assertEqual(TOPOLOGY_TYPE.ReplicaSetWithPrimary,
+                         t.description.topology_type)
+
+    def test_derived_views_cached(self):
+        t = create_mock_topology(seeds=['a', 'b'])
+        for host in 'ab':
+            self.heartbeat(t, host, 0, ismaster=True, msg='isdbgrid')
+        td = t.description
+        self.assertIs(td._get_known_servers(), td._get_known_servers())
+        self.assertIs(td._get_readable_servers(), td._get_readable_servers())
+        # Callers get their own copy.
+        td.known_servers.pop()
+        self.assertEqual(2, len(td.known_servers))
+
+
+class TestLeastOutstandingSelection(TopologyTest):
+    def create_sharded_cluster(self, policy='leastOutstanding'):
+        t = create_mock_topology(seeds=['a', 'b', 'c'],
+                                 server_selection_policy=policy)
+        for host in 'abc':
+            got_ismaster(t, (host, 27017), {
+                'ok': 1,
+                'ismaster': True,
+                'msg': 'isdbgrid',
+                'maxWireVersion': 6})
+        return t
+
+    def test_least_loaded_server_chosen(self):
+        t = self.create_sharded_cluster()
+        a, b = (t.select_server_by_address((host, 27017)) for host in 'ab')
+        contexts = [a.get_socket({}), a.get_socket({}), b.get_socket({})]
+        for context in contexts:
+            context.__enter__()
+        self.assertEqual(2, a._load.operation_count)
+
+        # Whichever two servers are compared, "a" is the busiest.
+        addresses = set(
+            t.select_server(any_server_selector).description.address
+            for _ in range(50))
+        self.assertNotIn(('a', 27017), addresses)
+        self.assertIn(('c', 27017), addresses)
+
+        for context in contexts:
+            context.__exit__(None, None, None)
+        self.assertEqual(0, a._load.operation_count)
+        self.assertEqual(0, b._load.operation_count)
+        self.assertIsNotNone(a._load.latency.get())
+
+    def test_slow_server_avoided(self):
+        t = self.create_sharded_cluster()
+        a = t.select_server_by_address(('a', 27017))
+        a._load.latency.add_sample(1)
+        for host in 'bc':
+            t.select_server_by_address(
+                (host, 27017))._load.latency.add_sample(0.001)
+        addresses = set(
+            t.select_server(any_server_selector).description.address
+            for _ in range(50))
+        self.assertNotIn(('a', 27017), addresses)
+
+    def test_random_policy_does_not_track_load(self):
+        t = self.create_sharded_cluster(policy='random')
+        server = t.select_server(any_server_selector)
+        self.assertIsNone(server.load_cost())
+        self.assertIsNone(server._load)
+
+    def test_invalid_policy(self):
+        self.assertRaises(ValueError, common.validate,
+                          'serverSelectionPolicy', 'fastest')
+        self.assertEqual(
+            ('serverselectionpolicy', 'leastOutstanding'),
+            common.validate('serverSelectionPolicy', 'leastOutstanding'))
+
+
+class TestAdaptiveHeartbeat(TopologyTest):
+    def create_monitor(self, replica_set_name=None, **kwargs):
+        settings = TopologySettings([address],
+                                    replica_set_name=replica_set_name,
+                                    pool_class=MockPool,
+                                    heartbeat_frequency=1,
+                                    **kwargs)
+        self.topology = Topology(settings)
+        return Monitor(ServerDescription(address), self.topology, MockPool(),
+                       settings)
+
+    def intervals(self, monitor, descriptions):
+        previous = descriptions[0]
+        intervals = []
+        for sd in descriptions[1:]:
+            intervals.append(monitor._next_heartbeat_interval(previous, sd))
+            previous = sd
+        return intervals
+
+    def standalone(self, **kwargs):
+        response = {'ok': 1, 'ismaster': True, 'maxWireVersion': 6}
+        response.update(kwargs)
+        return ServerDescription(address, IsMaster(response), 0)
+
+    def test_fixed_by_default(self):
+        monitor = self.create_monitor()
+        sds = [self.standalone() for _ in range(4)]
+        self.assertEqual([1, 1, 1], self.intervals(monitor, sds))
+
+    def test_back_off_while_unchanged(self):
+        monitor = self.create_monitor(max_heartbeat_frequency=5)
+        sds = [self.standalone() for _ in range(5)]
+        self.assertEqual([2, 4, 5, 5], self.intervals(monitor, sds))
+
+        # Changes and errors reset the interval.
+        sds = [self.standalone(), self.standalone(msg='isdbgrid'),
+               self.standalone(msg='isdbgrid'),
+               ServerDescription(address, error=AutoReconnect('error')),
+               self.standalone(), self.standalone()]
+        self.assertEqual([1, 2, 1, 1, 2], self.intervals(monitor, sds))
+
+    def test_no_back_off_without_primary(self):
+        monitor = self.create_monitor(replica_set_name='rs',
+                                      max_heartbeat_frequency=5)
+        self.assertEqual(TOPOLOGY_TYPE.ReplicaSetNoPrimary,
+                         self.topology.description.topology_type)
+        sds = [self.standalone() for _ in range(4)]
+        self.assertEqual([1, 1, 1], self.intervals(monitor, sds))
+
+    def test_jitter(self):
+        monitor = self.create_monitor(heartbeat_jitter=0.5)
+        intervals = self.intervals(
+            monitor, [self.standalone() for _ in range(50)])
+        self.assertTrue(all(0.5 <= i <= 1.5 for i in intervals))
+        self.assertGreater(len(set(intervals)), 1)
+
+    def test_invalid_options(self):
+        self.assertRaises(ConfigurationError, TopologySettings,
+                          heartbeat_frequency=10, max_heartbeat_frequency=5)
+        self.assertRaises(ValueError, common.validate, 'heartbeatJitter', 1)
+        self.assertEqual(('heartbeatjitter', 0.1),
+                         common.validate('heartbeatJitter', '0.1'))
+        self.assertEqual(('maxheartbeatfrequencyms', 60),
+                         common.validate('maxHeartbeatFrequencyMS', 60000))
+
+
 class TestTopologyErrors(TopologyTest):
     # Errors when calling ismaster.
 
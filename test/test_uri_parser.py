@@ -194,7 +194,8 @@ class TestURI(unittest.TestCase):
             'password': None,
             'database': None,
             'collection': None,
-            'options': {}
+            'options': {},
+            'fqdn': None
         }
 
         res = copy.deepcopy(orig)
@@ -451,7 +452,8 @@ class TestURI(unittest.TestCase):
              'nodelist': [('/MongoDB.sock', None)],
              'options': {'ssl_certfile': '/a/b'},
              'password': 'foo/bar',
-             'username': 'jesse'},
+             'username': 'jesse',
+             'fqdn': None},
             parse_uri(
                 'mongodb://jesse:foo%2Fbar@%2FMongoDB.sock/?ssl_certfile=/a/b',
                 validate=False))
@@ -462,7 +464,8 @@ class TestURI(unittest.TestCase):
              'nodelist': [('/MongoDB.sock', None)],
              'options': {'ssl_certfile': 'a/b'},
              'password': 'foo/bar',
-             'username': 'jesse'},
+             'username': 'jesse',
+             'fqdn': None},
             parse_uri(
                 'mongodb://jesse:foo%2Fbar@%2FMongoDB.sock/?ssl_certfile=a/b',
                 validate=False))
@@ -135,6 +135,53 @@ class HeartbeatEventListener(monitoring.ServerHeartbeatListener):
         self.results.append(event)
 
 
+class CMAPListener(monitoring.ConnectionPoolListener):
+    """Listens to all connection pool events."""
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def add_event(self, event):
+        with self.lock:
+            self.events.append(event)
+
+    def event_count(self, event_type):
+        with self.lock:
+            return len([event for event in self.events
+                        if isinstance(event, event_type)])
+
+    def connection_created(self, event):
+        self.add_event(event)
+
+    def connection_ready(self, event):
+        self.add_event(event)
+
+    def connection_closed(self, event):
+        self.add_event(event)
+
+    def connection_check_out_started(self, event):
+        self.add_event(event)
+
+    def connection_check_out_failed(self, event):
+        self.add_event(event)
+
+    def connection_checked_out(self, event):
+        self.add_event(event)
+
+    def connection_checked_in(self, event):
+        self.add_event(event)
+
+    def pool_created(self, event):
+        self.add_event(event)
+
+    def pool_cleared(self, event):
+        self.add_event(event)
+
+    def pool_closed(self, event):
+        self.add_event(event)
+
+
 class ScenarioDict(dict):
     """Dict that returns {} for any unknown key, recursively."""
     def __init__(self, data):